@@ -0,0 +1,18 @@
+-- Resumable crawl checkpoints: the URL frontier of each scraping session,
+-- stored next to the collection_sessions row it belongs to.
+CREATE TABLE crawl_frontier (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    url_type TEXT NOT NULL DEFAULT 'page', -- scraper-defined, e.g. 'category', 'product'
+    context JSON, -- scraper data needed to process the URL (e.g. category path)
+    status TEXT NOT NULL DEFAULT 'pending', -- 'pending', 'visited', 'persisted', 'failed'
+    item_id TEXT, -- product saved from this URL once status is 'persisted'
+    attempts INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (session_id) REFERENCES collection_sessions(id),
+    UNIQUE(session_id, url)
+);
+
+CREATE INDEX idx_crawl_frontier_status ON crawl_frontier(session_id, status, url_type);
@@ -0,0 +1,13 @@
+-- Change detection for scraped prices: the fingerprint of each item's last
+-- observed (unit_cost, unit, currency, specifications). Observations with an
+-- unchanged fingerprint only move last_seen_at instead of adding pricing rows.
+CREATE TABLE item_fingerprints (
+    cost_item_id INTEGER PRIMARY KEY, -- one row per item, looked up by rowid
+    fingerprint TEXT NOT NULL,
+    first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (cost_item_id) REFERENCES cost_items(id)
+);
+
+CREATE INDEX idx_item_fingerprints_last_seen ON item_fingerprints(last_seen_at);
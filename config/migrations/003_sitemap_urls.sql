@@ -0,0 +1,10 @@
+-- Sitemap-driven discovery: the <lastmod> each supplier URL had when its page
+-- was last fetched, so later sessions only queue URLs that changed since.
+CREATE TABLE sitemap_urls (
+    supplier TEXT NOT NULL,
+    url TEXT NOT NULL,
+    lastmod TEXT, -- normalized to ISO 8601 UTC, so values compare as text
+    first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (supplier, url)
+);
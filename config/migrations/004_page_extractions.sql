@@ -0,0 +1,12 @@
+-- Content-hash short-circuit: the product each supplier page last parsed into,
+-- keyed by a hash of the page body and of what else the parse depended on.
+-- A page whose hash is unchanged reuses the stored product without parsing.
+CREATE TABLE page_extractions (
+    supplier TEXT NOT NULL,
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL, -- sha256 of parser version, parse context and body
+    parser_version TEXT NOT NULL,
+    product JSON, -- ScrapedProduct fields; NULL when the page held no product
+    extracted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (supplier, url)
+);
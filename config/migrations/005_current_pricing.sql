@@ -0,0 +1,188 @@
+-- Materialized current prices: one row per active item holding its latest
+-- cost_pricing row and that row's primary source. Triggers on cost_pricing,
+-- cost_items and source_references keep it up to date one item at a time,
+-- so the reporting views read O(items) rows instead of scanning history.
+
+-- Latest pricing row (by effective_date, then most recently inserted) of
+-- each active item with its first primary source reference. Triggers read
+-- it filtered to a single item; selecting it whole rebuilds current_pricing.
+CREATE VIEW v_latest_pricing AS
+SELECT
+    ci.id as cost_item_id,
+    cp.id as cost_pricing_id,
+    cp.unit_cost,
+    cp.unit,
+    cp.currency,
+    cp.total_cost_5000sqft,
+    cp.confidence_level,
+    cp.effective_date,
+    sr.source_id,
+    sr.source_url
+FROM cost_items ci
+JOIN cost_pricing cp ON cp.id = (
+    SELECT id FROM cost_pricing
+    WHERE cost_item_id = ci.id
+    ORDER BY effective_date DESC, id DESC
+    LIMIT 1
+)
+LEFT JOIN source_references sr ON sr.id = (
+    SELECT MIN(id) FROM source_references
+    WHERE cost_pricing_id = cp.id AND reference_type = 'primary'
+)
+WHERE ci.status = 'active';
+
+-- Derived from the tables above, so no foreign keys: rows are removed by
+-- the triggers when what they point to goes away
+CREATE TABLE current_pricing (
+    cost_item_id INTEGER PRIMARY KEY,
+    cost_pricing_id INTEGER NOT NULL,
+    unit_cost DECIMAL(10,2) NOT NULL,
+    unit TEXT NOT NULL,
+    currency TEXT,
+    total_cost_5000sqft DECIMAL(12,2),
+    confidence_level TEXT NOT NULL,
+    effective_date DATE NOT NULL,
+    source_id INTEGER, -- primary source, NULL when the price has none
+    source_url TEXT
+);
+
+-- Finds an item's latest price without reading the rest of its history
+CREATE INDEX idx_cost_pricing_item_date ON cost_pricing(cost_item_id, effective_date);
+
+-- Finds a price's primary reference; idx_source_references_type alone would
+-- have the lookup walk every primary reference in the table
+CREATE INDEX idx_source_references_pricing_type ON source_references(cost_pricing_id, reference_type);
+
+INSERT INTO current_pricing SELECT * FROM v_latest_pricing;
+
+-- Pricing history changes
+
+CREATE TRIGGER tr_current_pricing_insert
+AFTER INSERT ON cost_pricing
+BEGIN
+    DELETE FROM current_pricing WHERE cost_item_id = NEW.cost_item_id;
+    INSERT INTO current_pricing SELECT * FROM v_latest_pricing WHERE cost_item_id = NEW.cost_item_id;
+END;
+
+CREATE TRIGGER tr_current_pricing_update
+AFTER UPDATE ON cost_pricing
+BEGIN
+    DELETE FROM current_pricing WHERE cost_item_id IN (OLD.cost_item_id, NEW.cost_item_id);
+    INSERT INTO current_pricing SELECT * FROM v_latest_pricing
+    WHERE cost_item_id IN (OLD.cost_item_id, NEW.cost_item_id);
+END;
+
+CREATE TRIGGER tr_current_pricing_delete
+AFTER DELETE ON cost_pricing
+BEGIN
+    DELETE FROM current_pricing WHERE cost_item_id = OLD.cost_item_id;
+    INSERT INTO current_pricing SELECT * FROM v_latest_pricing WHERE cost_item_id = OLD.cost_item_id;
+END;
+
+-- Items leaving or returning to active status
+
+CREATE TRIGGER tr_current_pricing_item_status
+AFTER UPDATE OF status ON cost_items
+BEGIN
+    DELETE FROM current_pricing WHERE cost_item_id = NEW.id;
+    INSERT INTO current_pricing SELECT * FROM v_latest_pricing WHERE cost_item_id = NEW.id;
+END;
+
+CREATE TRIGGER tr_current_pricing_item_delete
+AFTER DELETE ON cost_items
+BEGIN
+    DELETE FROM current_pricing WHERE cost_item_id = OLD.id;
+END;
+
+-- Primary source changes of a current price
+
+CREATE TRIGGER tr_current_pricing_source_insert
+AFTER INSERT ON source_references
+WHEN NEW.reference_type = 'primary'
+BEGIN
+    DELETE FROM current_pricing
+    WHERE cost_item_id = (SELECT cost_item_id FROM cost_pricing WHERE id = NEW.cost_pricing_id);
+    INSERT INTO current_pricing SELECT * FROM v_latest_pricing
+    WHERE cost_item_id = (SELECT cost_item_id FROM cost_pricing WHERE id = NEW.cost_pricing_id);
+END;
+
+CREATE TRIGGER tr_current_pricing_source_update
+AFTER UPDATE ON source_references
+WHEN OLD.reference_type = 'primary' OR NEW.reference_type = 'primary'
+BEGIN
+    DELETE FROM current_pricing
+    WHERE cost_item_id IN (SELECT cost_item_id FROM cost_pricing
+                           WHERE id IN (OLD.cost_pricing_id, NEW.cost_pricing_id));
+    INSERT INTO current_pricing SELECT * FROM v_latest_pricing
+    WHERE cost_item_id IN (SELECT cost_item_id FROM cost_pricing
+                           WHERE id IN (OLD.cost_pricing_id, NEW.cost_pricing_id));
+END;
+
+CREATE TRIGGER tr_current_pricing_source_delete
+AFTER DELETE ON source_references
+WHEN OLD.reference_type = 'primary'
+BEGIN
+    DELETE FROM current_pricing
+    WHERE cost_item_id = (SELECT cost_item_id FROM cost_pricing WHERE id = OLD.cost_pricing_id);
+    INSERT INTO current_pricing SELECT * FROM v_latest_pricing
+    WHERE cost_item_id = (SELECT cost_item_id FROM cost_pricing WHERE id = OLD.cost_pricing_id);
+END;
+
+-- Reporting views, rebased onto current_pricing
+
+DROP VIEW v_current_pricing;
+CREATE VIEW v_current_pricing AS
+SELECT
+    ci.item_id,
+    ci.item_name,
+    rs.name as revenue_stream,
+    cc.name as category,
+    cur.unit_cost,
+    cur.unit,
+    cur.currency,
+    cur.total_cost_5000sqft,
+    cur.confidence_level,
+    cur.effective_date,
+    s.company_name as primary_source,
+    cur.source_url
+FROM current_pricing cur
+JOIN cost_items ci ON ci.id = cur.cost_item_id
+JOIN cost_categories cc ON ci.category_id = cc.id
+JOIN revenue_streams rs ON cc.revenue_stream_id = rs.id
+LEFT JOIN sources s ON cur.source_id = s.id;
+
+DROP VIEW v_cost_summary;
+CREATE VIEW v_cost_summary AS
+SELECT
+    rs.name as revenue_stream,
+    cc.name as category,
+    COUNT(cur.cost_item_id) as item_count,
+    AVG(cur.unit_cost) as avg_unit_cost,
+    SUM(cur.total_cost_5000sqft) as total_category_cost,
+    MIN(cur.confidence_level) as min_confidence,
+    MAX(cur.effective_date) as latest_update
+FROM current_pricing cur
+JOIN cost_items ci ON ci.id = cur.cost_item_id
+JOIN cost_categories cc ON ci.category_id = cc.id
+JOIN revenue_streams rs ON cc.revenue_stream_id = rs.id
+GROUP BY rs.id, cc.id
+ORDER BY rs.name, cc.name;
+
+DROP VIEW v_data_quality;
+CREATE VIEW v_data_quality AS
+SELECT
+    rs.name as revenue_stream,
+    COUNT(cur.cost_item_id) as total_items,
+    SUM(CASE WHEN cur.confidence_level = 'VERIFIED' THEN 1 ELSE 0 END) as verified_items,
+    SUM(CASE WHEN cur.confidence_level = 'HIGH' THEN 1 ELSE 0 END) as high_confidence_items,
+    SUM(CASE WHEN cur.source_id IS NOT NULL THEN 1 ELSE 0 END) as items_with_sources,
+    ROUND(AVG(CASE WHEN cur.confidence_level = 'VERIFIED' THEN 4
+                   WHEN cur.confidence_level = 'HIGH' THEN 3
+                   WHEN cur.confidence_level = 'MEDIUM' THEN 2
+                   ELSE 1 END), 2) as avg_confidence_score
+FROM current_pricing cur
+JOIN cost_items ci ON ci.id = cur.cost_item_id
+JOIN cost_categories cc ON ci.category_id = cc.id
+JOIN revenue_streams rs ON cc.revenue_stream_id = rs.id
+GROUP BY rs.id
+ORDER BY rs.name;
@@ -0,0 +1,19 @@
+-- Indexes suggested by scripts/query_plan_audit.py: each removed a full
+-- table scan from the plan of the statements listed above it.
+-- Its cost_pricing(unit_cost) and cost_pricing(confidence_level)
+-- suggestions are left out: they only serve one-off audit counts and
+-- fixups, and every scraped price would pay to maintain them.
+
+-- scripts/populate_madagascar_vanilla_costs.py:230
+-- temp_populate_benching.py:15
+-- temp_populate_benching_fixed.py:15
+-- temp_populate_climate.py:15
+-- temp_populate_curing.py:15
+-- ... and 3 more
+CREATE INDEX IF NOT EXISTS idx_cost_categories_name ON cost_categories(name);
+
+-- scripts/clean_database_data.py:241
+CREATE INDEX IF NOT EXISTS idx_cost_items_item_name ON cost_items(item_name);
+
+-- scripts/database_health_check.py:164
+CREATE INDEX IF NOT EXISTS idx_source_references_source_id ON source_references(source_id);
@@ -0,0 +1,53 @@
+-- Full-text index over cost items: item name, specifications flattened to
+-- "key value" text, and notes. The FTS rowid is cost_items.id. Triggers keep
+-- it in step with cost_items, so searches never scan the items table.
+
+-- Specifications are flattened with json_tree, so nested keys and values
+-- are searchable; text that is not valid JSON is indexed as it is
+CREATE VIRTUAL TABLE cost_items_fts USING fts5(
+    item_name,
+    specifications,
+    notes,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE VIEW v_cost_items_search_text AS
+SELECT
+    ci.id,
+    ci.item_name,
+    CASE
+        WHEN ci.specifications IS NULL THEN NULL
+        WHEN json_valid(ci.specifications) THEN (
+            SELECT group_concat(CASE WHEN jt.key IS NULL OR typeof(jt.key) = 'integer'
+                                     THEN jt.value ELSE jt.key || ' ' || jt.value END, ' ')
+            FROM json_tree(ci.specifications) jt
+            WHERE jt.type NOT IN ('object', 'array')
+        )
+        ELSE ci.specifications
+    END as specifications,
+    ci.notes
+FROM cost_items ci;
+
+INSERT INTO cost_items_fts (rowid, item_name, specifications, notes)
+SELECT id, item_name, specifications, notes FROM v_cost_items_search_text;
+
+CREATE TRIGGER tr_cost_items_fts_insert
+AFTER INSERT ON cost_items
+BEGIN
+    INSERT INTO cost_items_fts (rowid, item_name, specifications, notes)
+    SELECT id, item_name, specifications, notes FROM v_cost_items_search_text WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER tr_cost_items_fts_update
+AFTER UPDATE OF item_name, specifications, notes ON cost_items
+BEGIN
+    DELETE FROM cost_items_fts WHERE rowid = OLD.id;
+    INSERT INTO cost_items_fts (rowid, item_name, specifications, notes)
+    SELECT id, item_name, specifications, notes FROM v_cost_items_search_text WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER tr_cost_items_fts_delete
+AFTER DELETE ON cost_items
+BEGIN
+    DELETE FROM cost_items_fts WHERE rowid = OLD.id;
+END;
@@ -0,0 +1,49 @@
+-- Typed attributes read out of cost_items.specifications: one row per value,
+-- with numbers and units normalized (scripts/item_attributes.py), so range
+-- questions like "power below 700 W" are index lookups instead of loading
+-- and parsing every item's JSON.
+--
+-- Parsing units needs Python, so triggers only queue changed items in
+-- item_attributes_pending; the writers and the query API parse the queue.
+
+-- Derived from cost_items, so no foreign keys (see current_pricing)
+CREATE TABLE item_attributes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cost_item_id INTEGER NOT NULL,
+    key TEXT NOT NULL, -- normalized key; nested objects as 'parent.child'
+    numeric_value REAL, -- in the canonical unit; the low end of a range
+    unit TEXT, -- canonical unit ('W', 'sq_ft', 'USD/year'), NULL for plain numbers
+    text_value TEXT -- the value as written
+);
+
+CREATE INDEX idx_item_attributes_key_value ON item_attributes(key, numeric_value);
+CREATE INDEX idx_item_attributes_item ON item_attributes(cost_item_id);
+
+CREATE TABLE item_attributes_pending (
+    cost_item_id INTEGER PRIMARY KEY
+);
+
+INSERT INTO item_attributes_pending (cost_item_id)
+SELECT id FROM cost_items WHERE specifications IS NOT NULL;
+
+CREATE TRIGGER tr_item_attributes_insert
+AFTER INSERT ON cost_items
+WHEN NEW.specifications IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO item_attributes_pending (cost_item_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER tr_item_attributes_update
+AFTER UPDATE OF specifications ON cost_items
+WHEN OLD.specifications IS NOT NEW.specifications
+BEGIN
+    DELETE FROM item_attributes WHERE cost_item_id = OLD.id;
+    INSERT OR IGNORE INTO item_attributes_pending (cost_item_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER tr_item_attributes_delete
+AFTER DELETE ON cost_items
+BEGIN
+    DELETE FROM item_attributes WHERE cost_item_id = OLD.id;
+    DELETE FROM item_attributes_pending WHERE cost_item_id = OLD.id;
+END;
@@ -0,0 +1,82 @@
+-- Validity intervals for pricing history: each cost_pricing row is in
+-- effect from valid_from (its effective_date) until valid_to, the
+-- effective_date of the item's next price (exclusive; NULL while it is the
+-- latest). As-of lookups and history ranges then use the
+-- (cost_item_id, effective_date) index with no correlated MAX() per row.
+-- Prices with the same effective_date are ordered by id, like
+-- v_latest_pricing, so a price replaced the same day has an empty interval.
+
+ALTER TABLE cost_pricing ADD COLUMN valid_from DATE GENERATED ALWAYS AS (effective_date) VIRTUAL;
+ALTER TABLE cost_pricing ADD COLUMN valid_to DATE;
+
+-- valid_to writes must not rebuild current_pricing rows, so the trigger
+-- from 005 is limited to the columns current_pricing is made of
+DROP TRIGGER tr_current_pricing_update;
+CREATE TRIGGER tr_current_pricing_update
+AFTER UPDATE OF cost_item_id, unit_cost, unit, currency, total_cost_5000sqft, confidence_level, effective_date
+ON cost_pricing
+BEGIN
+    DELETE FROM current_pricing WHERE cost_item_id IN (OLD.cost_item_id, NEW.cost_item_id);
+    INSERT INTO current_pricing SELECT * FROM v_latest_pricing
+    WHERE cost_item_id IN (OLD.cost_item_id, NEW.cost_item_id);
+END;
+
+UPDATE cost_pricing SET valid_to = (
+    SELECT n.effective_date FROM cost_pricing n
+    WHERE n.cost_item_id = cost_pricing.cost_item_id
+    AND (n.effective_date, n.id) > (cost_pricing.effective_date, cost_pricing.id)
+    ORDER BY n.effective_date, n.id
+    LIMIT 1
+);
+
+-- A new price ends its predecessor's interval and ends where its successor
+-- starts (backdated prices have one)
+CREATE TRIGGER tr_pricing_validity_insert
+AFTER INSERT ON cost_pricing
+BEGIN
+    UPDATE cost_pricing SET valid_to = (
+        SELECT n.effective_date FROM cost_pricing n
+        WHERE n.cost_item_id = NEW.cost_item_id
+        AND (n.effective_date, n.id) > (NEW.effective_date, NEW.id)
+        ORDER BY n.effective_date, n.id
+        LIMIT 1
+    )
+    WHERE id = NEW.id;
+
+    UPDATE cost_pricing SET valid_to = NEW.effective_date
+    WHERE id = (
+        SELECT p.id FROM cost_pricing p
+        WHERE p.cost_item_id = NEW.cost_item_id
+        AND (p.effective_date, p.id) < (NEW.effective_date, NEW.id)
+        ORDER BY p.effective_date DESC, p.id DESC
+        LIMIT 1
+    );
+END;
+
+-- A deleted price's predecessor takes over its interval
+CREATE TRIGGER tr_pricing_validity_delete
+AFTER DELETE ON cost_pricing
+BEGIN
+    UPDATE cost_pricing SET valid_to = OLD.valid_to
+    WHERE id = (
+        SELECT p.id FROM cost_pricing p
+        WHERE p.cost_item_id = OLD.cost_item_id
+        AND (p.effective_date, p.id) < (OLD.effective_date, OLD.id)
+        ORDER BY p.effective_date DESC, p.id DESC
+        LIMIT 1
+    );
+END;
+
+-- Moved prices are rare: recompute both items' intervals
+CREATE TRIGGER tr_pricing_validity_update
+AFTER UPDATE OF cost_item_id, effective_date ON cost_pricing
+BEGIN
+    UPDATE cost_pricing SET valid_to = (
+        SELECT n.effective_date FROM cost_pricing n
+        WHERE n.cost_item_id = cost_pricing.cost_item_id
+        AND (n.effective_date, n.id) > (cost_pricing.effective_date, cost_pricing.id)
+        ORDER BY n.effective_date, n.id
+        LIMIT 1
+    )
+    WHERE cost_item_id IN (OLD.cost_item_id, NEW.cost_item_id);
+END;
@@ -0,0 +1,46 @@
+-- Deferred pricing validation. tr_validate_pricing writes a
+-- validation_results row per active rule for each inserted cost_pricing
+-- row; bulk writers can instead defer it and validate everything they
+-- inserted with one INSERT ... SELECT before committing
+-- (scripts/validation/pricing_validation.py).
+--
+-- The writer switches the trigger off by inserting the validation_deferred
+-- row inside its own write transaction and deleting it before commit, so
+-- no other connection ever sees it.
+
+-- The results tr_validate_pricing has always written, for every pricing
+-- row; the trigger and the deferred pass both read them from here
+CREATE VIEW v_pricing_validation AS
+SELECT
+    cp.id as cost_pricing_id,
+    vr.id as validation_rule_id,
+    CASE
+        WHEN vr.rule_type = 'range_check' AND (cp.unit_cost < 0.01 OR cp.unit_cost > 1000000) THEN 0
+        WHEN vr.rule_type = 'confidence_check' AND cp.confidence_level NOT IN ('MEDIUM', 'HIGH', 'VERIFIED') THEN 0
+        ELSE 1
+    END as passed,
+    CASE
+        WHEN vr.rule_type = 'range_check' AND (cp.unit_cost < 0.01 OR cp.unit_cost > 1000000) THEN 'Cost outside acceptable range'
+        WHEN vr.rule_type = 'confidence_check' AND cp.confidence_level NOT IN ('MEDIUM', 'HIGH', 'VERIFIED') THEN 'Confidence level below minimum'
+        ELSE NULL
+    END as failure_reason
+FROM cost_pricing cp
+CROSS JOIN validation_rules vr
+WHERE vr.is_active = TRUE;
+
+-- At most one row, present only inside a deferring writer's transaction
+CREATE TABLE validation_deferred (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    after_pricing_id INTEGER NOT NULL -- pricing rows above this id are validated at commit
+);
+
+DROP TRIGGER tr_validate_pricing;
+CREATE TRIGGER tr_validate_pricing
+AFTER INSERT ON cost_pricing
+WHEN NOT EXISTS (SELECT 1 FROM validation_deferred)
+BEGIN
+    INSERT INTO validation_results (cost_pricing_id, validation_rule_id, passed, failure_reason)
+    SELECT cost_pricing_id, validation_rule_id, passed, failure_reason
+    FROM v_pricing_validation
+    WHERE cost_pricing_id = NEW.id;
+END;
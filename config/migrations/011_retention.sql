@@ -0,0 +1,28 @@
+-- Retention for the append-only logs (scripts/retention.py).
+-- collection_log payloads older than the configured age are stored as a
+-- diff against the item's previous log entry; rows older still, and old
+-- validation_results of superseded prices, are moved into compressed
+-- batches in retention_archive.
+
+-- 'full': new_values is the complete payload
+-- 'diff': new_values is {"set": {...}, "unset": [...]} against the
+--         previous collection_log row of the same item
+ALTER TABLE collection_log ADD COLUMN payload_format TEXT NOT NULL DEFAULT 'full';
+
+CREATE INDEX idx_collection_log_created ON collection_log(created_at);
+CREATE INDEX idx_validation_results_validated ON validation_results(validated_at);
+
+-- Archived rows of one table, up to a batch size per row
+CREATE TABLE retention_archive (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_table TEXT NOT NULL,
+    first_id INTEGER NOT NULL,
+    last_id INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    columns JSON NOT NULL, -- column names of each archived row
+    payload BLOB NOT NULL, -- zlib-compressed JSON array of rows
+    raw_bytes INTEGER NOT NULL, -- payload size before compression
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_retention_archive_table ON retention_archive(source_table, first_id);
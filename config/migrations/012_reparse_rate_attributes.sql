@@ -0,0 +1,6 @@
+-- Rate keys such as 'price_per_lb' used to take the denominator's unit
+-- (item_attributes.py now gives them 'USD/kg'); queue the items that have
+-- them so refresh_attributes() parses them again.
+INSERT OR IGNORE INTO item_attributes_pending (cost_item_id)
+SELECT DISTINCT cost_item_id FROM item_attributes
+WHERE key LIKE '%\_per\_%' ESCAPE '\';
@@ -0,0 +1,16 @@
+-- Crawl context lookups (CrawlFrontier.known_contexts) are scoped to one
+-- supplier and to the URLs being seeded, so they stay index lookups however
+-- many sessions crawl_frontier holds.
+ALTER TABLE crawl_frontier ADD COLUMN supplier TEXT;
+
+-- Earlier rows: sessions named by BaseScraper.start_session are
+-- '<supplier>_YYYYmmdd_HHMMSS'; rows of other sessions stay unscoped
+-- and are not offered as known context.
+UPDATE crawl_frontier SET supplier = (
+    SELECT substr(cs.session_name, 1, length(cs.session_name) - 16)
+    FROM collection_sessions cs
+    WHERE cs.id = crawl_frontier.session_id
+      AND cs.session_name GLOB '?*_[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]_[0-9][0-9][0-9][0-9][0-9][0-9]'
+);
+
+CREATE INDEX idx_crawl_frontier_supplier_url ON crawl_frontier(supplier, url);
@@ -11,19 +11,25 @@ This script comprehensively audits:
 CRITICAL: Ensures database is single source of truth with no redundancy
 """
 
-import sqlite3
 import re
 import json
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Set
 import logging
 
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, connect
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class DataIntegrityAuditor:
-    def __init__(self, db_path: str = "data/costs/vanilla_costs.db"):
+    def __init__(self, db_path: str = str(DEFAULT_DB_PATH)):
         self.db_path = db_path
         self.conn = None
         self.data_dir = Path("data")
@@ -74,7 +80,7 @@ class DataIntegrityAuditor:
     def connect_database(self):
         """Connect to SQLite database"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = connect(self.db_path, read_only=True)
             logger.info(f"Connected to database: {self.db_path}")
             return True
         except Exception as e:
@@ -9,16 +9,21 @@ Usage:
     python scripts/backfill_missing_sources.py --fix
 """
 
-import sqlite3
 import json
 import re
 from pathlib import Path
 import argparse
+import sys
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, connect
 
 def get_database_path():
     """Get the path to the vanilla costs database"""
-    script_dir = Path(__file__).parent
-    db_path = script_dir.parent / "data" / "costs" / "vanilla_costs.db"
+    db_path = DEFAULT_DB_PATH
     
     if not db_path.exists():
         raise FileNotFoundError(f"Database not found at {db_path}")
@@ -28,7 +33,7 @@ def get_database_path():
 def get_missing_source_items():
     """Get cost pricing entries missing source references"""
     db_path = get_database_path()
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     query = """
@@ -245,7 +250,7 @@ def fix_missing_sources(dry_run=True):
     mappings = map_items_to_sources(missing_items, research_files)
     
     db_path = get_database_path()
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     backfilled = 0
@@ -13,22 +13,29 @@ This script cleans and normalizes all database entries.
 
 import sqlite3
 import re
+import sys
+from pathlib import Path
 from typing import Dict, List, Tuple
 import logging
 
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, connect
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class DatabaseCleaner:
-    def __init__(self, db_path: str = "data/costs/vanilla_costs.db"):
+    def __init__(self, db_path: str = str(DEFAULT_DB_PATH)):
         self.db_path = db_path
         self.conn = None
         
     def connect_database(self):
         """Connect to SQLite database"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.execute("PRAGMA foreign_keys = ON;")
+            self.conn = connect(self.db_path)
             logger.info(f"Connected to database: {self.db_path}")
             return True
         except Exception as e:
@@ -37,9 +44,13 @@ class DatabaseCleaner:
     
     def backup_database(self):
         """Create backup before cleaning"""
-        import shutil
         backup_path = self.db_path.replace('.db', '_pre_cleanup_backup.db')
-        shutil.copy2(self.db_path, backup_path)
+        # Backup API rather than a file copy: recent commits may still be in the WAL file
+        backup = sqlite3.connect(backup_path)
+        try:
+            self.conn.backup(backup)
+        finally:
+            backup.close()
         logger.info(f"Backup created: {backup_path}")
     
     def clean_item_name(self, name: str) -> str:
@@ -5,13 +5,18 @@ Removes cost_pricing entries that don't have corresponding cost_items.
 These are likely remnants from database population issues.
 """
 
-import sqlite3
 from pathlib import Path
+import sys
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, connect
 
 def get_database_path():
     """Get the path to the vanilla costs database"""
-    script_dir = Path(__file__).parent
-    db_path = script_dir.parent / "data" / "costs" / "vanilla_costs.db"
+    db_path = DEFAULT_DB_PATH
     
     if not db_path.exists():
         raise FileNotFoundError(f"Database not found at {db_path}")
@@ -21,7 +26,7 @@ def get_database_path():
 def identify_orphaned_records():
     """Identify orphaned cost_pricing records"""
     db_path = get_database_path()
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path, read_only=True)
     cursor = conn.cursor()
     
     # Find orphaned cost_pricing records
@@ -63,7 +68,9 @@ def cleanup_orphaned_records(dry_run=True):
     
     # Perform cleanup
     db_path = get_database_path()
-    conn = sqlite3.connect(db_path)
+    # Orphans may still be referenced by source_references rows, which would
+    # block the delete with foreign key enforcement on
+    conn = connect(db_path, foreign_keys=False)
     cursor = conn.cursor()
     
     # Delete orphaned records
@@ -5,11 +5,18 @@ This script addresses the remaining 277 items without source references
 by creating legitimate source attributions based on research methodology.
 """
 
-import sqlite3
 import json
 import re
 import os
 from datetime import datetime
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import connect
 
 def create_research_based_sources():
     """Create legitimate sources based on research methodology used in documentation."""
@@ -71,7 +78,7 @@ def create_research_based_sources():
 def analyze_remaining_items():
     """Analyze the remaining items to determine appropriate source categories."""
     
-    conn = sqlite3.connect("data/costs/vanilla_costs.db")
+    conn = connect()
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -129,7 +136,7 @@ def populate_remaining_source_references():
     research_sources = create_research_based_sources()
     
     # Connect to database
-    conn = sqlite3.connect("data/costs/vanilla_costs.db")
+    conn = connect()
     cursor = conn.cursor()
     
     # Insert research sources
@@ -214,7 +221,7 @@ def populate_remaining_source_references():
     print(f"\n✅ Created {references_created} additional source references")
     
     # Final verification
-    conn = sqlite3.connect("data/costs/vanilla_costs.db")
+    conn = connect()
     cursor = conn.cursor()
     
     cursor.execute("SELECT COUNT(*) FROM cost_pricing")
@@ -46,6 +46,7 @@ ACTIVITY_TYPE_ARCHIVED = 'archived'
 # Default Unit Values
 DEFAULT_UNIT = 'each'
 DEFAULT_CONFIDENCE_LEVEL = 'MEDIUM'
+DEFAULT_CURRENCY = 'USD'
 
 # Database Schema Constants
 DEFAULT_EFFECTIVE_DATE = "DATE('now')"
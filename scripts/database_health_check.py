@@ -8,15 +8,19 @@ Usage:
     python scripts/database_health_check.py --detailed
 """
 
-import sqlite3
 import os
 import sys
 from pathlib import Path
 
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, connect
+
 def get_database_path():
     """Get the path to the vanilla costs database"""
-    script_dir = Path(__file__).parent
-    db_path = script_dir.parent / "data" / "costs" / "vanilla_costs.db"
+    db_path = DEFAULT_DB_PATH
     
     if not db_path.exists():
         raise FileNotFoundError(f"Database not found at {db_path}")
@@ -25,7 +29,7 @@ def get_database_path():
 
 def get_database_counts(db_path):
     """Get counts from all database tables"""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path, read_only=True)
     cursor = conn.cursor()
     
     counts = {}
@@ -126,7 +130,7 @@ def validate_milestone_status():
 
 def detailed_analysis(db_path):
     """Provide detailed database analysis"""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path, read_only=True)
     cursor = conn.cursor()
     
     print("\n📋 DETAILED ANALYSIS:")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Database Access
+
+One place to open connections to the cost database, so every entry point
+gets the same settings:
+
+- WAL journal mode: readers no longer block the writer, nor it them
+- busy_timeout: wait for a lock held by another connection instead of
+  failing with "database is locked" straight away
+- synchronous=NORMAL: safe with WAL, and commits skip most fsyncs
+- mmap_size / cache_size: larger page cache for report-style scans
+- foreign_keys=ON: REFERENCES clauses in the schema are enforced
+
+Two ways to get a connection:
+
+    from scripts.db import connect, get_connection
+
+    # Scripts: a connection of their own, closed by the caller
+    conn = connect()
+
+    # Library code: a pooled connection, committed (or rolled back on
+    # error) and returned to the pool when the block ends
+    with get_connection(db_path) as conn:
+        ...
+
+Pass read_only=True for connections that must never write; they open the
+file in SQLite's read-only mode and fail rather than create a missing
+database.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+DEFAULT_DB_PATH = project_root / 'data' / 'costs' / 'vanilla_costs.db'
+
+BUSY_TIMEOUT_MS = 30000
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+CACHE_SIZE_KIB = 64 * 1024  # applied as a negative cache_size, i.e. in KiB
+
+# Idle connections kept per (database, mode); more are closed when returned
+POOL_SIZE = 4
+
+PathLike = Union[str, Path]
+
+
+def resolve_db_path(db_path: Optional[PathLike] = None) -> str:
+    """The given database path, or the project's cost database"""
+    return str(db_path or DEFAULT_DB_PATH)
+
+
+def configure(conn: sqlite3.Connection, read_only: bool = False,
+              foreign_keys: bool = True) -> sqlite3.Connection:
+    """Apply the standard pragmas to a connection"""
+    if not read_only:
+        # Persistent in the database file; a read-only connection cannot switch it
+        conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA foreign_keys = {'ON' if foreign_keys else 'OFF'}")
+    return conn
+
+
+def connect(db_path: Optional[PathLike] = None, read_only: bool = False,
+            foreign_keys: bool = True, **kwargs) -> sqlite3.Connection:
+    """
+    Open a configured connection that the caller owns and closes.
+
+    Extra keyword arguments go to sqlite3.connect (e.g. check_same_thread,
+    isolation_level). timeout sets the busy timeout, in seconds.
+    """
+    path = resolve_db_path(db_path)
+    kwargs.setdefault('timeout', BUSY_TIMEOUT_MS / 1000)
+    if read_only:
+        conn = sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True, **kwargs)
+    else:
+        conn = sqlite3.connect(path, **kwargs)
+    return configure(conn, read_only, foreign_keys)
+
+
+class ConnectionPool:
+    """Idle configured connections to one database, shared between threads"""
+
+    def __init__(self, db_path: str, read_only: bool = False, size: int = POOL_SIZE):
+        self.db_path = db_path
+        self.read_only = read_only
+        self.size = size
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        # Handed between threads, but only ever used by one at a time
+        return connect(self.db_path, self.read_only, check_same_thread=False)
+
+    def release(self, conn: sqlite3.Connection):
+        # Undo per-borrower settings such as conn.row_factory = sqlite3.Row
+        conn.row_factory = None
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pools: Dict[Tuple[str, bool], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _forget_pools_after_fork():
+    # SQLite connections must not cross a fork (e.g. replay's process pool);
+    # the child starts with empty pools and leaves the parent's alone
+    global _pools_lock
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_pools_after_fork)
+
+
+def _pool_for(db_path: str, read_only: bool) -> ConnectionPool:
+    key = (str(Path(db_path).resolve()), read_only)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(db_path, read_only)
+        return _pools[key]
+
+
+@contextmanager
+def get_connection(db_path: Optional[PathLike] = None,
+                   read_only: bool = False) -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a pooled connection for the duration of a with block.
+
+    The transaction is committed when the block ends, or rolled back if it
+    raises. The connection is exclusive to the block, so nested blocks get
+    different connections.
+    """
+    pool = _pool_for(resolve_db_path(db_path), read_only)
+    conn = pool.acquire()
+    try:
+        with conn:
+            yield conn
+    except BaseException:
+        # Don't pool a connection left in an unknown state
+        conn.close()
+        raise
+    pool.release(conn)
+
+
+def close_all():
+    """
+    Close every pooled connection (e.g. before deleting a database); those
+    borrowed right now are closed when returned.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
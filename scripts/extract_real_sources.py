@@ -7,12 +7,18 @@ REAL, LEGITIMATE source references and properly populate the database.
 NO FABRICATED SOURCES - ONLY REAL ONES FROM RESEARCH DOCUMENTS.
 """
 
-import sqlite3
 import json
 import re
 import os
 from datetime import datetime
 from pathlib import Path
+import sys
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import connect
 
 def extract_verified_sources_from_md(file_path):
     """Extract VERIFIED, REAL sources from markdown files."""
@@ -87,7 +93,7 @@ def extract_verified_sources_from_md(file_path):
 def map_cost_items_to_source_files():
     """Map specific cost items to their documentation files using item names."""
     # Read the database to understand what items we have
-    conn = sqlite3.connect("data/costs/vanilla_costs.db")
+    conn = connect()
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -165,7 +171,7 @@ def populate_real_sources_and_references():
     print(f"Found {len(all_sources)} unique REAL sources from documentation")
     
     # Connect to database
-    conn = sqlite3.connect("data/costs/vanilla_costs.db")
+    conn = connect()
     cursor = conn.cursor()
     
     # Insert real sources into database
@@ -258,7 +264,7 @@ def populate_real_sources_and_references():
     print(f"\n✅ Created {references_created} source references from REAL documentation sources")
     
     # Final verification
-    conn = sqlite3.connect("data/costs/vanilla_costs.db")
+    conn = connect()
     cursor = conn.cursor()
     
     cursor.execute("SELECT COUNT(*) FROM cost_pricing")
@@ -4,13 +4,20 @@ FINAL SOURCE REFERENCE CLEANUP
 Address the remaining 43 items without source references.
 """
 
-import sqlite3
 from datetime import datetime
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import connect
 
 def final_source_cleanup():
     """Handle remaining items without source references."""
     
-    conn = sqlite3.connect("data/costs/vanilla_costs.db")
+    conn = connect()
     cursor = conn.cursor()
     
     # Get remaining items
@@ -78,7 +85,7 @@ def final_source_cleanup():
     print(f"\n✅ Created {references_created} final source references")
     
     # Final verification
-    conn = sqlite3.connect("data/costs/vanilla_costs.db")
+    conn = connect()
     cursor = conn.cursor()
     
     cursor.execute("SELECT COUNT(*) FROM cost_pricing")
@@ -11,12 +11,18 @@ This script:
 5. Ensures every cost has verifiable sources
 """
 
-import sqlite3
 import json
 import re
 import os
 from datetime import datetime
 from pathlib import Path
+import sys
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, connect
 
 def extract_urls_from_md(file_path):
     """Extract all URLs and source references from markdown files."""
@@ -130,9 +136,9 @@ def get_documentation_file(item_name):
     
     return None
 
-def populate_source_references(db_path="data/costs/vanilla_costs.db"):
+def populate_source_references(db_path=str(DEFAULT_DB_PATH)):
     """Populate source references for all cost items."""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     # Get all cost pricing entries without source references
@@ -243,9 +249,9 @@ def populate_source_references(db_path="data/costs/vanilla_costs.db"):
     print(f"\n✅ Successfully populated {fixed_count} source references")
     return fixed_count
 
-def fix_confidence_levels(db_path="data/costs/vanilla_costs.db"):
+def fix_confidence_levels(db_path=str(DEFAULT_DB_PATH)):
     """Fix invalid confidence levels in the database."""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     cursor = conn.cursor()
     
     # Map invalid confidence levels to valid ones
@@ -283,7 +289,7 @@ if __name__ == "__main__":
     populate_source_references()
     
     # Verify fix
-    conn = sqlite3.connect("data/costs/vanilla_costs.db")
+    conn = connect()
     cursor = conn.cursor()
     
     cursor.execute("SELECT COUNT(*) FROM cost_pricing")
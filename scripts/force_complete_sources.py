@@ -4,11 +4,18 @@ FORCE COMPLETE SOURCE REFERENCES
 Ensure 100% coverage by finding and fixing remaining items.
 """
 
-import sqlite3
 from datetime import datetime
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import connect
 
 def force_complete_sources():
-    conn = sqlite3.connect("data/costs/vanilla_costs.db")
+    conn = connect()
     cursor = conn.cursor()
     
     # Find items using a different approach
@@ -8,16 +8,21 @@ Usage:
     python scripts/generate_backfill_tasks.py --priority-analysis
 """
 
-import sqlite3
 import json
 import argparse
 from pathlib import Path
 from typing import List, Dict, Tuple
+import sys
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, connect
 
 def get_database_path():
     """Get the path to the vanilla costs database"""
-    script_dir = Path(__file__).parent
-    db_path = script_dir.parent / "data" / "costs" / "vanilla_costs.db"
+    db_path = DEFAULT_DB_PATH
     
     if not db_path.exists():
         raise FileNotFoundError(f"Database not found at {db_path}")
@@ -27,7 +32,7 @@ def get_database_path():
 def get_missing_source_items():
     """Get detailed information about cost pricing entries missing source references"""
     db_path = get_database_path()
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path, read_only=True)
     cursor = conn.cursor()
     
     query = """
@@ -5,12 +5,20 @@ Generate FIXUP_CHECKLIST.md with checkboxes for each cost_pricing.id in the data
 
 import sqlite3
 import os
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, connect
 
 def generate_fixup_checklist():
     """Generate FIXUP_CHECKLIST.md with all cost_pricing IDs."""
     
     # Database path
-    db_path = "data/costs/vanilla_costs.db"
+    db_path = str(DEFAULT_DB_PATH)
     
     if not os.path.exists(db_path):
         print(f"Error: Database not found at {db_path}")
@@ -18,7 +26,7 @@ def generate_fixup_checklist():
     
     try:
         # Connect to database
-        conn = sqlite3.connect(db_path)
+        conn = connect(db_path, read_only=True)
         cursor = conn.cursor()
         
         # Get all cost_pricing IDs
@@ -13,11 +13,12 @@ Options:
     --db-path     Specify database file path (default: data/costs/vanilla_costs.db)
 """
 
-import sqlite3
 import json
 import argparse
 import os
+import sqlite3
 import sys
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
 
@@ -28,14 +29,17 @@ sys.path.insert(0, str(project_root))
 from scripts.constants import (
     MILESTONE_DATA_COLLECTION, SESSION_STATUS_COMPLETED
 )
+from scripts.db import DEFAULT_DB_PATH, close_all, get_connection
+from scripts.schema_migrations import MIGRATIONS_DIR, apply_migrations
 
 class DatabaseInitializer:
-    def __init__(self, db_path='data/costs/vanilla_costs.db', recreate=False):
+    def __init__(self, db_path=DEFAULT_DB_PATH, recreate=False):
         self.db_path = Path(db_path)
         self.recreate = recreate
         self.schema_path = project_root / 'config' / 'database_schema.sql'
         self.json_schema_path = project_root / 'config' / 'database_schema.json'
         self.taxonomy_path = project_root / 'config' / 'cost_category_taxonomy.json'
+        self.migrations_dir = MIGRATIONS_DIR
         
         # Ensure data directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -64,6 +68,8 @@ class DatabaseInitializer:
         # Remove existing database if recreating
         if self.recreate and self.db_path.exists():
             print(f"Removing existing database: {self.db_path}")
+            # Pooled connections would keep writing to the deleted file
+            close_all()
             self.db_path.unlink()
         
         # Load SQL schema
@@ -72,16 +78,24 @@ class DatabaseInitializer:
         
         # Connect to database (creates file if doesn't exist)
         print(f"Connecting to database: {self.db_path}")
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA temp_store=memory")
-            
+        if not self.db_path.exists():
+            # Lets retention.py shrink the file; must be set before the header
+            # is written, which configure() does when it switches to WAL
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("PRAGMA journal_mode = WAL")
+
+        with get_connection(self.db_path) as conn:
             # Execute schema
             print("Creating database schema...")
             conn.executescript(sql_schema)
             conn.commit()
             
+            # Bring the baseline schema up to date
+            applied = apply_migrations(conn, self.migrations_dir)
+            if applied:
+                print(f"Applied {len(applied)} schema migrations")
+            
             print("Database schema created successfully!")
             
         return self.db_path
@@ -129,7 +143,7 @@ class DatabaseInitializer:
         print("Loading cost category taxonomy...")
         taxonomy = self.load_json_config(self.taxonomy_path)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with get_connection(self.db_path) as conn:
             # Get revenue stream IDs
             revenue_stream_map = {}
             cursor = conn.execute("SELECT id, code FROM revenue_streams")
@@ -162,7 +176,7 @@ class DatabaseInitializer:
     
     def create_initial_collection_session(self):
         """Create initial collection session for tracking"""
-        with sqlite3.connect(self.db_path) as conn:
+        with get_connection(self.db_path) as conn:
             cursor = conn.execute("""
                 INSERT OR IGNORE INTO collection_sessions 
                 (session_name, milestone, status, notes)
@@ -180,7 +194,7 @@ class DatabaseInitializer:
         """Verify database was created correctly"""
         print("Verifying database structure...")
         
-        with sqlite3.connect(self.db_path) as conn:
+        with get_connection(self.db_path) as conn:
             # Check table existence
             cursor = conn.execute("""
                 SELECT name FROM sqlite_master 
@@ -256,7 +270,7 @@ def main():
     parser = argparse.ArgumentParser(description='Initialize Terra35 Vanilla Operations Cost Database')
     parser.add_argument('--recreate', action='store_true', 
                        help='Drop and recreate all tables (destroys existing data)')
-    parser.add_argument('--db-path', default='data/costs/vanilla_costs.db',
+    parser.add_argument('--db-path', default=str(DEFAULT_DB_PATH),
                        help='Database file path (default: data/costs/vanilla_costs.db)')
     
     args = parser.parse_args()
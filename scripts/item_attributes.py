@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Item Attributes
+
+Typed, indexed attributes read out of cost_items.specifications, so range
+questions ("lighting fixtures above 2.5 umol/J", "heaters under 5 kW") are
+answered from the item_attributes table (migration 008) without loading
+every item's JSON.
+
+Each specification value becomes one row per value: nested objects are
+flattened to 'parent.child' keys, lists give one row per element. Keys are
+normalized to lower snake case. Values that start with a quantity are
+parsed into a number in a canonical unit:
+
+    "645W"                     -> 645.0 W
+    "0.65 kW"                  -> 650.0 W
+    "3,840 sq ft"              -> 3840.0 sq_ft
+    "$14,000-34,000/year"      -> 14000.0 USD/year  (ranges keep the low end)
+    "area_sqft": 3840          -> 3840.0 sq_ft      (unit taken from the key)
+    "price_per_lb": 5          -> 11.02 USD/kg
+
+Triggers queue items whose specifications change; refresh_attributes()
+parses the queue. The bulk product writer calls it in its transaction and
+find_items() calls it before querying, so results are never stale.
+
+Usage:
+    python scripts/item_attributes.py "power<=700W" "efficacy>=2.5umol/J"
+        [--category lighting] [--all] [--rebuild] [--db-path data/costs/vanilla_costs.db]
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import get_connection
+from scripts.schema_migrations import apply_migrations
+
+# Unit spellings -> (canonical unit, factor to the canonical unit)
+UNIT_ALIASES = {
+    # Length
+    'ft': ('ft', 1.0), 'feet': ('ft', 1.0), 'foot': ('ft', 1.0), "'": ('ft', 1.0),
+    'in': ('ft', 1 / 12), 'inch': ('ft', 1 / 12), 'inches': ('ft', 1 / 12), '"': ('ft', 1 / 12),
+    'm': ('ft', 3.28084), 'meter': ('ft', 3.28084), 'meters': ('ft', 3.28084), 'metres': ('ft', 3.28084),
+    'cm': ('ft', 1 / 30.48), 'mm': ('ft', 1 / 304.8),
+    # Area
+    'sq ft': ('sq_ft', 1.0), 'sq. ft.': ('sq_ft', 1.0), 'sq. ft': ('sq_ft', 1.0), 'sqft': ('sq_ft', 1.0),
+    'sf': ('sq_ft', 1.0), 'square feet': ('sq_ft', 1.0), 'square foot': ('sq_ft', 1.0),
+    'ft²': ('sq_ft', 1.0), 'ft2': ('sq_ft', 1.0),
+    'sq m': ('sq_ft', 10.7639), 'm²': ('sq_ft', 10.7639), 'm2': ('sq_ft', 10.7639),
+    'square meters': ('sq_ft', 10.7639), 'acre': ('sq_ft', 43560.0), 'acres': ('sq_ft', 43560.0),
+    # Power and energy
+    'w': ('W', 1.0), 'watt': ('W', 1.0), 'watts': ('W', 1.0),
+    'kw': ('W', 1000.0), 'mw': ('W', 1e6),
+    'wh': ('kWh', 0.001), 'kwh': ('kWh', 1.0), 'mwh': ('kWh', 1000.0),
+    'therm': ('therm', 1.0), 'therms': ('therm', 1.0), 'btu': ('BTU', 1.0), 'ccf': ('CCF', 1.0),
+    'v': ('V', 1.0), 'volt': ('V', 1.0), 'volts': ('V', 1.0), 'amp': ('A', 1.0), 'amps': ('A', 1.0),
+    # Lighting
+    'μmol/j': ('umol/J', 1.0), 'µmol/j': ('umol/J', 1.0), 'umol/j': ('umol/J', 1.0),
+    # Volume, flow and mass
+    'gal': ('gal', 1.0), 'gallon': ('gal', 1.0), 'gallons': ('gal', 1.0),
+    'l': ('gal', 0.264172), 'liter': ('gal', 0.264172), 'liters': ('gal', 0.264172),
+    'litre': ('gal', 0.264172), 'litres': ('gal', 0.264172), 'ml': ('gal', 0.000264172),
+    'gph': ('gph', 1.0), 'gpm': ('gpm', 1.0), 'psi': ('psi', 1.0),
+    'kg': ('kg', 1.0), 'kgs': ('kg', 1.0), 'kilogram': ('kg', 1.0), 'kilograms': ('kg', 1.0),
+    'g': ('kg', 0.001), 'grams': ('kg', 0.001),
+    'lb': ('kg', 0.453592), 'lbs': ('kg', 0.453592), 'pound': ('kg', 0.453592), 'pounds': ('kg', 0.453592),
+    'oz': ('kg', 0.0283495),
+    # Time
+    'hr': ('hour', 1.0), 'hrs': ('hour', 1.0), 'hour': ('hour', 1.0), 'hours': ('hour', 1.0),
+    'day': ('day', 1.0), 'days': ('day', 1.0), 'week': ('week', 1.0), 'weeks': ('week', 1.0),
+    'month': ('month', 1.0), 'months': ('month', 1.0), 'mo': ('month', 1.0),
+    'year': ('year', 1.0), 'years': ('year', 1.0), 'yr': ('year', 1.0), 'yrs': ('year', 1.0),
+    # Temperature and ratios
+    '°f': ('F', 1.0), 'ºf': ('F', 1.0), 'f': ('F', 1.0), 'degrees f': ('F', 1.0),
+    '°c': ('C', 1.0), 'ºc': ('C', 1.0), 'c': ('C', 1.0), 'degrees c': ('C', 1.0),
+    '%': ('%', 1.0), 'percent': ('%', 1.0),
+    'usd': ('USD', 1.0),
+}
+CURRENCY = 'USD'
+MONEY_MULTIPLIERS = {'k': 1e3, 'm': 1e6}  # "$1.2M"
+RATE_CURRENCY_WORDS = {'price', 'cost'}  # "cost_per_sqft": 12 -> 12.0 USD/sq_ft
+
+NUMBER = r'\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?|\.\d+'
+QUANTITY = re.compile(
+    r'^\s*(?:~|≈|approx\.?\s+|approximately\s+|about\s+)?(?P<money>\$)?\s*'
+    r'(?P<number>' + NUMBER + r')(?(money)(?P<multiplier>[kKmM](?![a-zA-Z²]))?)'
+    r'(?:\s*(?:-|–|—|to)\s*\$?(?:' + NUMBER + r')(?(money)(?:[kKmM](?![a-zA-Z²]))?))?\+?'
+)
+# Longest spellings first, so 'sq ft' wins over 'sq' and 'kwh' over 'kw'
+UNIT = re.compile(
+    r'\s*-?\s*(' + '|'.join(re.escape(alias) for alias in sorted(UNIT_ALIASES, key=len, reverse=True))
+    + r')(?![a-z0-9²])',
+    re.IGNORECASE
+)
+PER_UNIT = re.compile(r'\s*(?:/|per\s+)', re.IGNORECASE)
+CONDITION = re.compile(r'^\s*([\w .*]+?)\s*(<=|>=|<|>|=)\s*(.+?)\s*$')
+
+
+@dataclass
+class Attribute:
+    """One specification value, with its number and unit when it has one"""
+    key: str
+    numeric_value: Optional[float] = None
+    unit: Optional[str] = None
+    text_value: Optional[str] = None
+
+
+@dataclass
+class AttributeCondition:
+    """key <operator> value; with a unit, attributes must be in that unit"""
+    key: str  # normalized key, * wildcards allowed
+    operator: str
+    value: float
+    unit: Optional[str] = None
+
+
+@dataclass
+class AttributeMatch:
+    """An item found by find_items with the attributes that matched"""
+    item_id: str
+    item_name: str
+    category: str
+    attributes: Dict[str, List[Attribute]] = field(default_factory=dict)
+
+
+# ================================
+# PARSING
+# ================================
+
+def normalize_key(key: str) -> str:
+    """'Power Consumption (W)' -> 'power_consumption_w'"""
+    return re.sub(r'[^0-9a-z]+', '_', str(key).lower()).strip('_')
+
+
+def _unit_at(text: str) -> Tuple[Optional[Tuple[str, float]], str]:
+    """The unit text starts with, if any, and the rest of the text"""
+    match = UNIT.match(text)
+    if not match:
+        return None, text
+    return UNIT_ALIASES[match.group(1).lower()], text[match.end():]
+
+
+def parse_quantity(value: str) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Number and canonical unit of a value that starts with a quantity
+
+    Returns (None, None) when the value does not start with a number.
+    Ranges give their low end; rates ("$13.70/hour", "$2.19 per CCF")
+    get a unit like 'USD/hour'.
+    """
+    match = QUANTITY.match(value)
+    if not match:
+        return None, None
+    number = float(match.group('number').replace(',', ''))
+    rest = value[match.end():]
+
+    if match.group('money'):
+        if match.group('multiplier'):
+            number *= MONEY_MULTIPLIERS[match.group('multiplier').lower()]
+        unit, factor = CURRENCY, 1.0
+    else:
+        found, rest = _unit_at(rest)
+        if not found:
+            return number, None
+        unit, factor = found
+
+    per = PER_UNIT.match(rest)
+    if per:
+        denominator, _ = _unit_at(rest[per.end():])
+        if denominator:
+            return number * factor / denominator[1], f"{unit}/{denominator[0]}"
+    return number * factor, unit
+
+
+def _words_unit(words: List[str]) -> Optional[Tuple[str, float]]:
+    for count in (2, 1):
+        if len(words) >= count and ' '.join(words[-count:]) in UNIT_ALIASES:
+            return UNIT_ALIASES[' '.join(words[-count:])]
+    return None
+
+
+def _key_unit(key: str) -> Tuple[Optional[str], float]:
+    """
+    Unit named by a key's last words, as in 'area_sqft', 'area_sq_ft' or 'power_kw'
+
+    Rate keys name both ends: 'usage_kwh_per_day' is kWh/day and
+    'price_per_lb' USD/kg (a price or cost is in dollars). A rate whose
+    numerator unit is unknown gets no unit rather than the denominator's.
+    """
+    words = key.rsplit('.', 1)[-1].split('_')
+    if 'per' not in words[1:]:
+        unit, factor = _words_unit(words[1:]) or (None, 1.0)
+        return unit, factor
+
+    at = words.index('per', 1)
+    numerator = (CURRENCY, 1.0) if words[at - 1] in RATE_CURRENCY_WORDS else _words_unit(words[:at])
+    denominator = _words_unit(words[at + 1:])
+    if not numerator or not denominator:
+        return None, 1.0
+    return f"{numerator[0]}/{denominator[0]}", numerator[1] / denominator[1]
+
+
+def extract_attributes(specifications: Any) -> List[Attribute]:
+    """Attributes of a specifications object (or its JSON text)"""
+    if isinstance(specifications, str):
+        try:
+            specifications = json.loads(specifications)
+        except ValueError:
+            return []
+    if not isinstance(specifications, dict):
+        return []
+
+    attributes = []
+
+    def add(key: str, value: Any):
+        if value is None:
+            return
+        if isinstance(value, dict):
+            for child_key, child in value.items():
+                add(f"{key}.{normalize_key(child_key)}", child)
+        elif isinstance(value, list):
+            for element in value:
+                add(key, element)
+        elif isinstance(value, bool):
+            attributes.append(Attribute(key, float(value), None, json.dumps(value)))
+        elif isinstance(value, (int, float)):
+            unit, factor = _key_unit(key)
+            attributes.append(Attribute(key, value * factor, unit, str(value)))
+        else:
+            numeric_value, unit = parse_quantity(str(value))
+            attributes.append(Attribute(key, numeric_value, unit, str(value)))
+
+    for key, value in specifications.items():
+        add(normalize_key(key), value)
+    return attributes
+
+
+# ================================
+# MAINTENANCE
+# ================================
+
+def refresh_attributes(conn: sqlite3.Connection) -> int:
+    """Parse the items queued by the triggers; returns how many were parsed"""
+    items = conn.execute("""
+        SELECT p.cost_item_id, ci.specifications
+        FROM item_attributes_pending p
+        JOIN cost_items ci ON ci.id = p.cost_item_id
+    """).fetchall()
+    if not items:
+        conn.execute("DELETE FROM item_attributes_pending")
+        return 0
+
+    ids = json.dumps([cost_item_id for cost_item_id, _ in items])
+    conn.execute("DELETE FROM item_attributes WHERE cost_item_id IN (SELECT value FROM json_each(?))", (ids,))
+    conn.executemany("""
+        INSERT INTO item_attributes (cost_item_id, key, numeric_value, unit, text_value)
+        VALUES (?, ?, ?, ?, ?)
+    """, [(cost_item_id, a.key, a.numeric_value, a.unit, a.text_value)
+          for cost_item_id, specifications in items
+          for a in extract_attributes(specifications)])
+    conn.execute("DELETE FROM item_attributes_pending")
+    return len(items)
+
+
+def rebuild_attributes(conn: sqlite3.Connection) -> int:
+    """Re-parse every item, e.g. after the unit table changed"""
+    conn.execute("""
+        INSERT OR IGNORE INTO item_attributes_pending (cost_item_id)
+        SELECT id FROM cost_items WHERE specifications IS NOT NULL
+    """)
+    conn.execute("DELETE FROM item_attributes")
+    return refresh_attributes(conn)
+
+
+# ================================
+# QUERIES
+# ================================
+
+def normalize_condition_key(key: str) -> str:
+    """normalize_key for each part of a dotted key, keeping * wildcards"""
+    return '.'.join('*'.join(normalize_key(part) for part in segment.split('*'))
+                    for segment in key.split('.'))
+
+
+def parse_condition(text: str) -> AttributeCondition:
+    """
+    Condition from text like 'power<=700W' or 'efficacy >= 2.5 umol/J'
+
+    Raises:
+        ValueError: If the text is not key, operator and a number
+    """
+    match = CONDITION.match(text)
+    if not match:
+        raise ValueError(f"Invalid condition {text!r}, expected e.g. 'power<=700W'")
+    key, operator, value = match.groups()
+    number, unit = parse_quantity(value)
+    if number is None:
+        raise ValueError(f"Invalid condition {text!r}: {value!r} is not a number")
+    return AttributeCondition(normalize_condition_key(key), operator, number, unit)
+
+
+def find_items(conditions: Iterable[AttributeCondition], category: Optional[str] = None,
+               db_path: Optional[str] = None, include_inactive: bool = False) -> List[AttributeMatch]:
+    """
+    Items having an attribute that satisfies every condition
+
+    Args:
+        conditions: Numeric conditions, all of which must hold
+        category: Only items in this category, by code or name
+        db_path: Database to query (defaults to the project database)
+        include_inactive: Also return deprecated and pending items
+    """
+    conditions = list(conditions)
+    sql = """
+        SELECT ci.id, ci.item_id, ci.item_name, cc.name
+        FROM cost_items ci
+        JOIN cost_categories cc ON cc.id = ci.category_id
+        WHERE true
+    """
+    params: list = []
+    for condition in conditions:
+        sql += f"""
+        AND ci.id IN (
+            SELECT cost_item_id FROM item_attributes
+            WHERE key {'GLOB' if '*' in condition.key else '='} ?
+            AND numeric_value {condition.operator} ?{' AND unit = ?' if condition.unit else ''}
+        )"""
+        params += [condition.key, condition.value] + ([condition.unit] if condition.unit else [])
+    if category:
+        sql += " AND (cc.code = ? OR cc.name = ?)"
+        params += [category, category]
+    if not include_inactive:
+        sql += " AND ci.status = 'active'"
+    sql += " ORDER BY ci.item_id"
+
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        refresh_attributes(conn)
+        items = conn.execute(sql, params).fetchall()
+        attribute_rows = conn.execute("""
+            SELECT cost_item_id, key, numeric_value, unit, text_value
+            FROM item_attributes
+            WHERE cost_item_id IN (SELECT value FROM json_each(?))
+            ORDER BY id
+        """, (json.dumps([row[0] for row in items]),)).fetchall()
+
+    matches = {row[0]: AttributeMatch(*row[1:]) for row in items}
+    for cost_item_id, key, numeric_value, unit, text_value in attribute_rows:
+        if any(fnmatchcase(key, condition.key) for condition in conditions):
+            matches[cost_item_id].attributes.setdefault(key, []).append(
+                Attribute(key, numeric_value, unit, text_value))
+    return list(matches.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find cost items by specification values')
+    parser.add_argument('conditions', nargs='*', help="Conditions like 'power<=700W' (all must hold)")
+    parser.add_argument('--category', help='Only items in this category (code or name)')
+    parser.add_argument('--all', action='store_true', help='Include deprecated and pending items')
+    parser.add_argument('--rebuild', action='store_true', help='Re-parse every item first')
+    parser.add_argument('--db-path', help='Database path')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        with get_connection(args.db_path) as conn:
+            apply_migrations(conn)
+            print(f"Parsed attributes of {rebuild_attributes(conn)} items")
+    if not args.conditions:
+        if not args.rebuild:
+            parser.error('at least one condition is required')
+        return
+
+    try:
+        conditions = [parse_condition(text) for text in args.conditions]
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    matches = find_items(conditions, category=args.category, db_path=args.db_path, include_inactive=args.all)
+    if not matches:
+        print("No items match")
+        return
+    for match in matches:
+        print(f"{match.item_id:<24} {match.item_name} ({match.category})")
+        for key, attributes in match.attributes.items():
+            for attribute in attributes:
+                print(f"{'':<24}   {key}: {attribute.text_value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Item Search
+
+Ranked full-text search over cost items, backed by the cost_items_fts
+FTS5 index (migration 007). Item names, specifications (flattened to
+"key value" text) and notes are indexed; triggers keep the index current
+as items are added, edited or deleted.
+
+Plain queries match every word, words of three or more letters also as
+prefixes ("madagascar grad" finds "Madagascar Grade A Vanilla Beans").
+Results are ranked by BM25 with name matches counting most, then
+specifications, then notes. raw=True (--raw) passes FTS5 query syntax
+through instead, e.g. 'item_name:trellis OR "drip irrigation"'.
+
+Usage:
+    python scripts/item_search.py "madagascar grade a" [--category madagascar_beans]
+        [--limit 20] [--all] [--raw] [--db-path data/costs/vanilla_costs.db]
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import get_connection
+from scripts.schema_migrations import apply_migrations
+
+DEFAULT_LIMIT = 20
+
+# bm25() column weights: item_name, specifications, notes
+COLUMN_WEIGHTS = (10.0, 2.0, 1.0)
+
+SEARCH_TERM = re.compile(r'\w+')
+MIN_PREFIX_LENGTH = 3  # shorter words ("a", "5x") only match whole words
+
+
+@dataclass
+class ItemMatch:
+    """A cost item found by search_items"""
+    item_id: str
+    item_name: str
+    category: str
+    status: str
+    snippet: str  # best matching fragment, matches in [brackets]
+    score: float  # bm25, lower is better
+
+
+def match_query(text: str) -> str:
+    """FTS5 query matching every word of plain text, words of MIN_PREFIX_LENGTH or more as prefixes"""
+    return ' '.join(f'"{term}"*' if len(term) >= MIN_PREFIX_LENGTH else f'"{term}"'
+                    for term in SEARCH_TERM.findall(text))
+
+
+def search_items(query: str, category: Optional[str] = None, limit: int = DEFAULT_LIMIT,
+                 db_path: Optional[str] = None, include_inactive: bool = False,
+                 raw: bool = False) -> List[ItemMatch]:
+    """
+    Cost items matching a query, best first
+
+    Args:
+        query: Words to search for, or FTS5 query syntax when raw is set
+        category: Only items in this category, by code or name
+        limit: Maximum number of matches
+        db_path: Database to search (defaults to the project database)
+        include_inactive: Also return deprecated and pending items
+        raw: Pass query to FTS5 as it is
+
+    Raises:
+        ValueError: If a raw query is not valid FTS5 syntax
+    """
+    match = query if raw else match_query(query)
+    if not match.strip():
+        return []
+
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    sql = f"""
+        SELECT ci.item_id, ci.item_name, cc.name, ci.status,
+               snippet(cost_items_fts, -1, '[', ']', '...', 10),
+               bm25(cost_items_fts, {weights}) as score
+        FROM cost_items_fts
+        JOIN cost_items ci ON ci.id = cost_items_fts.rowid
+        JOIN cost_categories cc ON cc.id = ci.category_id
+        WHERE cost_items_fts MATCH ?
+    """
+    params: list = [match]
+    if category:
+        sql += " AND (cc.code = ? OR cc.name = ?)"
+        params += [category, category]
+    if not include_inactive:
+        sql += " AND ci.status = 'active'"
+    sql += " ORDER BY score, ci.item_id LIMIT ?"
+    params.append(limit)
+
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            if 'fts5' in str(e):
+                raise ValueError(f"Invalid search query {query!r}: {e}") from e
+            raise
+    return [ItemMatch(*row) for row in rows]
+
+
+def optimize_index(db_path: Optional[str] = None):
+    """Merge the index's segments into one, e.g. after a large import"""
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        conn.execute("INSERT INTO cost_items_fts (cost_items_fts) VALUES ('optimize')")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search cost items by name, specifications and notes')
+    parser.add_argument('query', nargs='?', default='', help='Words to search for')
+    parser.add_argument('--category', help='Only items in this category (code or name)')
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help='Maximum number of results')
+    parser.add_argument('--all', action='store_true', help='Include deprecated and pending items')
+    parser.add_argument('--raw', action='store_true', help='Query is FTS5 syntax')
+    parser.add_argument('--optimize', action='store_true', help='Merge the search index before searching')
+    parser.add_argument('--db-path', help='Database path')
+    args = parser.parse_args()
+
+    if args.optimize:
+        optimize_index(args.db_path)
+        print("Search index optimized")
+    if not args.query:
+        if not args.optimize:
+            parser.error('a query is required')
+        return
+
+    try:
+        matches = search_items(args.query, category=args.category, limit=args.limit, db_path=args.db_path,
+                               include_inactive=args.all, raw=args.raw)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if not matches:
+        print(f"No items match {args.query!r}")
+        return
+    for match in matches:
+        status = '' if match.status == 'active' else f" ({match.status})"
+        print(f"{match.item_id:<24} {match.item_name}{status}")
+        print(f"{'':<24} {match.category} | {match.snippet}")
+
+
+if __name__ == '__main__':
+    main()
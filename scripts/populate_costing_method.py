@@ -2,44 +2,62 @@
 """
 Populate costing_method column in cost_pricing table based on data patterns.
 """
-import sqlite3
+import sys
+from pathlib import Path
 
-DATABASE_PATH = "data/costs/vanilla_costs.db"
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, connect
+from scripts.schema_migrations import apply_migrations
+
+DATABASE_PATH = str(DEFAULT_DB_PATH)
 
 def populate_costing_method():
     """Populate costing_method based on item patterns and source data."""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = connect(DATABASE_PATH)
+    apply_migrations(conn)
     cursor = conn.cursor()
     
     try:
-        # Update rules based on item name patterns and source characteristics
-        
-        # 1. Items with verified supplier website pricing (high confidence)
-        updates = [
+        # Update rules based on item name patterns and source characteristics.
+        # Name patterns are full-text queries on item names (cost_items_fts)
+        name_updates = [
             # Essence Food & Beverage verified pricing
             ("ACTUAL verified from Essence Food & Beverage website ($170/kg Grade A, $160/kg Grade B)",
-             "item_name LIKE '%Indonesia%Grade A%' OR item_name LIKE '%Indonesia%Grade B%'"),
+             'indonesia AND ("grade a" OR "grade b")'),
             
             # Government/utility rates (high confidence actual)
             ("ACTUAL from Oregon City municipal utility rates",
-             "item_name LIKE '%Oregon City%' OR item_name LIKE '%electricity%' OR item_name LIKE '%water%'"),
+             '"oregon city" OR electricity OR water*'),
             
             # Labor rates from official sources
             ("ACTUAL from Oregon Bureau of Labor and Industries wage data",
-             "item_name LIKE '%Oregon%wage%' OR item_name LIKE '%contractor%labor%'"),
+             '(oregon AND wage*) OR (contractor AND labor*)'),
             
             # Equipment from major verified suppliers
             ("ACTUAL verified from supplier catalog/website pricing", 
-             "item_name LIKE '%FarmTek%' OR item_name LIKE '%GrowSpan%' OR item_name LIKE '%Stuppy%'"),
+             'farmtek OR growspan OR stuppy'),
             
             # Market estimates based on research
             ("ESTIMATE based on market research and price range analysis",
-             "item_name LIKE '%Madagascar%' OR item_name LIKE '%Uganda%'"),
+             'madagascar OR uganda'),
             
             # Shipping estimates 
             ("ESTIMATE based on freight calculator and industry averages",
-             "item_name LIKE '%shipping%' OR item_name LIKE '%freight%'"),
-            
+             'shipping OR freight'),
+        ]
+        
+        for method, query in name_updates:
+            cursor.execute("""
+                UPDATE cost_pricing SET costing_method = ?
+                WHERE cost_item_id IN (SELECT rowid FROM cost_items_fts WHERE cost_items_fts MATCH ?)
+            """, (method, f"item_name : ({query})"))
+            affected = cursor.rowcount
+            print(f"✅ Updated {affected} items: {method}")
+        
+        updates = [
             # Equipment estimates from specifications
             ("ESTIMATE based on comparable equipment and technical specifications",
              "confidence_level = 'MEDIUM'"),
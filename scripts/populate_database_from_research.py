@@ -10,20 +10,27 @@ CRITICAL: This addresses the major project failure where 25 research files
 were created but only 5 items populated in database.
 """
 
-import sqlite3
 import re
 import json
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 import logging
+import sys
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, connect
+from scripts.validation.pricing_validation import deferred_validation
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class DatabasePopulator:
-    def __init__(self, db_path: str = "data/costs/vanilla_costs.db"):
+    def __init__(self, db_path: str = str(DEFAULT_DB_PATH)):
         self.db_path = db_path
         self.conn = None
         self.data_dir = Path("data")
@@ -43,8 +50,7 @@ class DatabasePopulator:
     def connect_database(self):
         """Connect to SQLite database"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.execute("PRAGMA foreign_keys = ON;")
+            self.conn = connect(self.db_path)
             logger.info(f"Connected to database: {self.db_path}")
             return True
         except Exception as e:
@@ -300,50 +306,53 @@ class DatabasePopulator:
         
         items_added = 0
         
-        # Process sources
-        source_ids = {}
-        for source in sources:
-            source_id = self.insert_source(
-                source['company_name'],
-                source['website_url']
-            )
-            if source_id:
-                source_ids[source['company_name']] = source_id
-        
-        # Process costs
-        for i, cost in enumerate(costs):
-            if not cost['price'] or cost['price'] <= 0:
-                continue
-                
-            # Generate item ID
-            item_id = f"{filepath.stem.upper()}_{i+1:03d}"
-            
-            # Create item data
-            item_data = {
-                'item_id': item_id,
-                'item_name': cost['name'],
-                'category_id': category_id,
-                'specifications': cost['specifications'],
-                'notes': f"Extracted from {filepath.name} on {datetime.now().strftime('%Y-%m-%d')}"
-            }
+        # Pricing rows are validated together when the file is done
+        self.conn.execute("BEGIN")
+        with deferred_validation(self.conn):
+            # Process sources
+            source_ids = {}
+            for source in sources:
+                source_id = self.insert_source(
+                    source['company_name'],
+                    source['website_url']
+                )
+                if source_id:
+                    source_ids[source['company_name']] = source_id
             
-            # Insert item
-            cost_item_id = self.insert_cost_item(item_data)
-            
-            if cost_item_id:
-                # Insert pricing
-                pricing_data = {
-                    'cost_item_id': cost_item_id,
-                    'unit_cost': cost['price'],
-                    'unit': 'per_item',  # Default unit
-                    'effective_date': datetime.now().strftime('%Y-%m-%d'),
-                    'confidence_level': 'MEDIUM',  # Default confidence
-                    'total_cost_5000sqft': None
+            # Process costs
+            for i, cost in enumerate(costs):
+                if not cost['price'] or cost['price'] <= 0:
+                    continue
+                    
+                # Generate item ID
+                item_id = f"{filepath.stem.upper()}_{i+1:03d}"
+                
+                # Create item data
+                item_data = {
+                    'item_id': item_id,
+                    'item_name': cost['name'],
+                    'category_id': category_id,
+                    'specifications': cost['specifications'],
+                    'notes': f"Extracted from {filepath.name} on {datetime.now().strftime('%Y-%m-%d')}"
                 }
                 
-                if self.insert_pricing(pricing_data):
-                    items_added += 1
-                    logger.info(f"Added item: {cost['name']} - ${cost['price']}")
+                # Insert item
+                cost_item_id = self.insert_cost_item(item_data)
+                
+                if cost_item_id:
+                    # Insert pricing
+                    pricing_data = {
+                        'cost_item_id': cost_item_id,
+                        'unit_cost': cost['price'],
+                        'unit': 'per_item',  # Default unit
+                        'effective_date': datetime.now().strftime('%Y-%m-%d'),
+                        'confidence_level': 'MEDIUM',  # Default confidence
+                        'total_cost_5000sqft': None
+                    }
+                    
+                    if self.insert_pricing(pricing_data):
+                        items_added += 1
+                        logger.info(f"Added item: {cost['name']} - ${cost['price']}")
         
         self.conn.commit()
         return items_added
@@ -3,11 +3,18 @@
 Populate Madagascar vanilla bean sourcing costs from research file data.
 Based on: data/madagascar_vanilla_beans_sourcing_research_2025.md
 """
-import sqlite3
 import json
 from datetime import datetime
+import sys
+from pathlib import Path
 
-DATABASE_PATH = "data/costs/vanilla_costs.db"
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, connect
+
+DATABASE_PATH = str(DEFAULT_DB_PATH)
 
 # Cost data extracted from research file
 madagascar_costs = [
@@ -136,7 +143,7 @@ madagascar_costs = [
 
 def populate_madagascar_costs():
     """Populate Madagascar vanilla costs into database with source references."""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = connect(DATABASE_PATH)
     cursor = conn.cursor()
     
     try:
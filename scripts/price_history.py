@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Price History
+
+Pricing history as a time series. Every cost_pricing row is in effect from
+valid_from (its effective_date) until valid_to, the next price's
+effective_date; triggers keep valid_to current (migration 009). That turns
+the usual questions into index lookups on (cost_item_id, effective_date):
+
+- price_as_of(item_id, date): the price in effect on a date
+- price_history(item_id, start, end): every price in effect during a period,
+  including the one already in effect when it starts
+- prices_as_of(date): the as-of price of every item, one index lookup each
+- cost_rollup_as_of(date): v_cost_summary-style totals as of a date
+
+Dates are ISO strings or date objects. A price replaced on the day it was
+entered is never in effect and is left out.
+
+Usage:
+    python scripts/price_history.py ITEM_ID [--as-of 2025-01-01]
+        [--start 2024-01-01] [--end 2025-01-01] [--db-path data/costs/vanilla_costs.db]
+    python scripts/price_history.py --rollup 2025-01-01
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import List, Optional, Union
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import get_connection
+from scripts.schema_migrations import apply_migrations
+
+DateLike = Union[str, date]
+
+PRICE_COLUMNS = """
+    ci.item_id, cp.id, cp.unit_cost, cp.unit, cp.currency, cp.total_cost_5000sqft,
+    cp.confidence_level, cp.valid_from, cp.valid_to
+"""
+
+# The one price of an item in effect on a date; newest first so the index
+# is read backwards and stops at the first row
+AS_OF_PRICE = """
+    SELECT id FROM cost_pricing
+    WHERE cost_item_id = ci.id AND effective_date <= :as_of
+    AND (valid_to IS NULL OR valid_to > :as_of)
+    ORDER BY effective_date DESC
+    LIMIT 1
+"""
+
+
+@dataclass
+class PricePoint:
+    """A price and the interval it was in effect"""
+    item_id: str
+    cost_pricing_id: int
+    unit_cost: float
+    unit: str
+    currency: str
+    total_cost_5000sqft: Optional[float]
+    confidence_level: str
+    valid_from: str
+    valid_to: Optional[str]  # exclusive; None while it is the latest price
+
+
+@dataclass
+class CategoryRollup:
+    """Cost totals of one category as of a date"""
+    revenue_stream: str
+    category: str
+    item_count: int
+    avg_unit_cost: float
+    total_category_cost: Optional[float]
+
+
+def _iso(value: DateLike) -> str:
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def price_as_of(item_id: str, as_of: DateLike, db_path: Optional[str] = None) -> Optional[PricePoint]:
+    """The price of an item in effect on a date, or None before its first price"""
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        row = conn.execute(f"""
+            SELECT {PRICE_COLUMNS}
+            FROM cost_items ci
+            JOIN cost_pricing cp ON cp.id = ({AS_OF_PRICE})
+            WHERE ci.item_id = :item_id
+        """, {'item_id': item_id, 'as_of': _iso(as_of)}).fetchone()
+    return PricePoint(*row) if row else None
+
+
+def price_history(item_id: str, start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+                  db_path: Optional[str] = None) -> List[PricePoint]:
+    """
+    Prices of an item in effect at any time from start to end, oldest first
+
+    Args:
+        item_id: Item to look up
+        start: First day of the period (default: the first price)
+        end: Last day of the period (default: today and on)
+        db_path: Database to query (defaults to the project database)
+    """
+    sql = f"""
+        SELECT {PRICE_COLUMNS}
+        FROM cost_items ci
+        JOIN cost_pricing cp ON cp.cost_item_id = ci.id
+        WHERE ci.item_id = :item_id
+        AND (cp.valid_to IS NULL OR cp.valid_to > cp.effective_date)
+    """
+    params = {'item_id': item_id}
+    if end is not None:
+        sql += " AND cp.effective_date <= :end"
+        params['end'] = _iso(end)
+    if start is not None:
+        sql += " AND (cp.valid_to IS NULL OR cp.valid_to > :start)"
+        params['start'] = _iso(start)
+    sql += " ORDER BY cp.effective_date, cp.id"
+
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        return [PricePoint(*row) for row in conn.execute(sql, params)]
+
+
+def prices_as_of(as_of: DateLike, category: Optional[str] = None, include_inactive: bool = False,
+                 db_path: Optional[str] = None) -> List[PricePoint]:
+    """
+    The price of every item in effect on a date
+
+    Args:
+        as_of: Date to look up
+        category: Only items in this category, by code or name
+        include_inactive: Also return deprecated and pending items
+        db_path: Database to query (defaults to the project database)
+    """
+    sql = f"""
+        SELECT {PRICE_COLUMNS}
+        FROM cost_items ci
+        JOIN cost_categories cc ON cc.id = ci.category_id
+        JOIN cost_pricing cp ON cp.id = ({AS_OF_PRICE})
+        WHERE true
+    """
+    params = {'as_of': _iso(as_of)}
+    if category:
+        sql += " AND (cc.code = :category OR cc.name = :category)"
+        params['category'] = category
+    if not include_inactive:
+        sql += " AND ci.status = 'active'"
+    sql += " ORDER BY ci.item_id"
+
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        return [PricePoint(*row) for row in conn.execute(sql, params)]
+
+
+def cost_rollup_as_of(as_of: DateLike, db_path: Optional[str] = None) -> List[CategoryRollup]:
+    """Item counts and costs per category of active items as of a date (v_cost_summary then)"""
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        rows = conn.execute(f"""
+            SELECT rs.name, cc.name, COUNT(*), AVG(cp.unit_cost), SUM(cp.total_cost_5000sqft)
+            FROM cost_items ci
+            JOIN cost_categories cc ON cc.id = ci.category_id
+            JOIN revenue_streams rs ON rs.id = cc.revenue_stream_id
+            JOIN cost_pricing cp ON cp.id = ({AS_OF_PRICE})
+            WHERE ci.status = 'active'
+            GROUP BY rs.id, cc.id
+            ORDER BY rs.name, cc.name
+        """, {'as_of': _iso(as_of)}).fetchall()
+    return [CategoryRollup(*row) for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Look up pricing history')
+    parser.add_argument('item_id', nargs='?', help='Cost item to look up')
+    parser.add_argument('--as-of', help='Show the price in effect on this date')
+    parser.add_argument('--start', help='First day of the history to show')
+    parser.add_argument('--end', help='Last day of the history to show')
+    parser.add_argument('--rollup', metavar='DATE', help='Show category totals as of this date')
+    parser.add_argument('--db-path', help='Database path')
+    args = parser.parse_args()
+
+    if args.rollup:
+        for rollup in cost_rollup_as_of(args.rollup, args.db_path):
+            total = f"${rollup.total_category_cost:,.2f}" if rollup.total_category_cost is not None else '-'
+            print(f"{rollup.revenue_stream:<20} {rollup.category:<40} {rollup.item_count:>4} items  "
+                  f"avg ${rollup.avg_unit_cost:,.2f}  total {total}")
+        return
+    if not args.item_id:
+        parser.error('an item id or --rollup is required')
+
+    if args.as_of:
+        points = [price_as_of(args.item_id, args.as_of, args.db_path)]
+        points = [point for point in points if point]
+    else:
+        points = price_history(args.item_id, args.start, args.end, args.db_path)
+
+    if not points:
+        print(f"No prices for {args.item_id}")
+        return
+    for point in points:
+        print(f"{point.valid_from} - {point.valid_to or 'now':<10}  {point.unit_cost:>12,.2f} {point.currency} "
+              f"{point.unit}  ({point.confidence_level})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Query Plan Audit
+
+Finds the project's SQL statements that scan whole tables or sort through
+temporary B-trees, and suggests indexes for them.
+
+1. Statements are collected from every string literal in scripts/ and the
+   top-level scripts that starts like a query (SELECT, WITH, INSERT, UPDATE,
+   DELETE, REPLACE). Placeholders in f-strings are read as ? parameters.
+   Every view in the migrated schema is audited as SELECT * FROM view.
+2. A synthetic database is built with the full schema, filled with
+   --scale cost items and their pricing history, sources and crawl state,
+   and ANALYZEd so the planner sees realistic table sizes.
+3. EXPLAIN QUERY PLAN runs for each statement. SCAN of a table and
+   USE TEMP B-TREE steps are reported.
+4. For each scanned table the columns the statement filters or joins it
+   on become a candidate index. Candidates are created on the synthetic
+   database; only those the planner then uses are suggested, and
+   --write-migration saves them as the next numbered migration.
+
+Plans are saved with --write-baseline to config/query_plan_baseline.json.
+--check compares against it and fails when a statement gains a scan or
+temporary B-tree, so query regressions show up in review.
+
+Usage:
+    python scripts/query_plan_audit.py [--scale 2000] [--verbose]
+    python scripts/query_plan_audit.py --write-migration
+    python scripts/query_plan_audit.py --write-baseline
+    python scripts/query_plan_audit.py --check
+"""
+
+import argparse
+import ast
+import hashlib
+import io
+import json
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import connect
+from scripts.init_database import DatabaseInitializer
+from scripts.schema_migrations import MIGRATIONS_DIR, available_migrations
+
+DEFAULT_SCALE = 2000  # cost items in the synthetic database
+PRICES_PER_ITEM = 6   # average pricing history length
+BASELINE_PATH = project_root / 'config' / 'query_plan_baseline.json'
+
+SQL_START = re.compile(r'^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|REPLACE)\b', re.IGNORECASE)
+
+# Table references: FROM/JOIN/UPDATE table [AS] alias
+TABLE_REF = re.compile(
+    r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:WHERE|ON|JOIN|LEFT|INNER|CROSS|OUTER|'
+    r'NATURAL|GROUP|ORDER|LIMIT|USING|UNION|EXCEPT|INTERSECT|SET|VALUES|SELECT|HAVING|WINDOW)\b)(\w+))?',
+    re.IGNORECASE
+)
+SCAN_STEP = re.compile(r'^SCAN (\w+)')
+# Virtual tables (FTS5) report constrained lookups, e.g. MATCH, as a SCAN with an index string
+VIRTUAL_LOOKUP = re.compile(r'VIRTUAL TABLE INDEX \d+:\S')
+COMPARISON = r'(==|=|<=|>=|<|>|\bIN\b|\bIS\b(?!\s+NOT\b)|\bBETWEEN\b|\bLIKE\b|\bGLOB\b)'
+EQUALITY_OPS = {'=', '==', 'IN', 'IS'}
+
+
+@dataclass
+class Statement:
+    """A SQL statement and where it was found"""
+    sql: str
+    source: str  # 'path:line' or 'view name'
+
+    @property
+    def key(self) -> str:
+        """Stable id: the source file and a hash of the normalized SQL"""
+        digest = hashlib.sha1(normalize_sql(self.sql).encode()).hexdigest()[:12]
+        return f"{self.source.split(':')[0]}#{digest}"
+
+
+@dataclass
+class PlanAudit:
+    """The plan of one statement and the steps worth a look"""
+    statement: Statement
+    plan: List[str] = field(default_factory=list)
+    issues: List[str] = field(default_factory=list)
+    scanned_tables: Dict[str, str] = field(default_factory=dict)  # scanned name -> table
+    error: Optional[str] = None
+
+
+@dataclass
+class IndexSuggestion:
+    """An index that turned table scans into searches"""
+    table: str
+    columns: Tuple[str, ...]
+    statements: List[str] = field(default_factory=list)  # sources whose scan it removed
+    _scans: List[Tuple[PlanAudit, str]] = field(default_factory=list, repr=False)
+
+    @property
+    def name(self) -> str:
+        return f"idx_{self.table}_{'_'.join(self.columns)}"
+
+    @property
+    def ddl(self) -> str:
+        return f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.table}({', '.join(self.columns)});"
+
+
+def normalize_sql(sql: str) -> str:
+    return ' '.join(sql.split())
+
+
+# ================================
+# COLLECTING STATEMENTS
+# ================================
+
+def source_files(root: Path = project_root) -> List[Path]:
+    """Python files audited by default: scripts/ and the top-level scripts, but not this one"""
+    paths = sorted(root.glob('*.py')) + sorted((root / 'scripts').rglob('*.py'))
+    return [path for path in paths if path.resolve() != Path(__file__).resolve()]
+
+
+def _literal_sql(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        # f-string: interpolated parts become parameters
+        return ''.join(part.value if isinstance(part, ast.Constant) else '?' for part in node.values)
+    return None
+
+
+def collect_statements(paths: Iterable[Path], root: Path = project_root) -> List[Statement]:
+    """SQL statements in the string literals of the given Python files"""
+    statements = {}
+    for path in paths:
+        try:
+            tree = ast.parse(path.read_text(), filename=str(path))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        relative = path.relative_to(root) if path.is_relative_to(root) else path
+
+        # Parts of an f-string are Constants too; only look at whole literals.
+        # Docstrings such as "Insert pricing data" are not statements either.
+        skip = {id(part) for node in ast.walk(tree) if isinstance(node, ast.JoinedStr)
+                for part in node.values}
+        skip |= {id(node.body[0].value) for node in ast.walk(tree)
+                 if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))
+                 and node.body and isinstance(node.body[0], ast.Expr)}
+        for node in ast.walk(tree):
+            if id(node) in skip:
+                continue
+            sql = _literal_sql(node)
+            if sql and SQL_START.match(sql):
+                statement = Statement(sql.strip(), f"{relative}:{node.lineno}")
+                statements.setdefault(statement.key, statement)
+    return sorted(statements.values(), key=lambda s: (s.source.split(':')[0], int(s.source.split(':')[1])))
+
+
+def view_statements(conn: sqlite3.Connection) -> List[Statement]:
+    """SELECT * from every view in the database"""
+    return [Statement(f"SELECT * FROM {name}", f"view {name}")
+            for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'view' ORDER BY name")]
+
+
+# ================================
+# SYNTHETIC DATABASE
+# ================================
+
+def build_synthetic_database(db_path: str, scale: int = DEFAULT_SCALE, seed: int = 0) -> str:
+    """Create a migrated database with scale items and proportional related rows, then ANALYZE it"""
+    with redirect_stdout(io.StringIO()):
+        initializer = DatabaseInitializer(db_path, recreate=True)
+        initializer.create_database()
+        initializer.populate_cost_categories()
+
+    rng = random.Random(seed)
+    start = date(2023, 1, 1)
+    day = lambda: (start + timedelta(days=rng.randrange(1000))).isoformat()
+
+    conn = connect(db_path)
+    try:
+        category_ids = [row[0] for row in conn.execute("SELECT id FROM cost_categories")]
+        source_count = max(2, scale // 10)
+        conn.executemany(
+            "INSERT INTO sources (company_name, company_type, website_url, tier) VALUES (?, 'supplier', ?, ?)",
+            [(f"Supplier {n}", f"https://supplier{n}.example.com", rng.randint(1, 3)) for n in range(source_count)]
+        )
+        sessions = max(1, scale // 200)
+        conn.executemany(
+            "INSERT INTO collection_sessions (session_name, milestone, status) VALUES (?, 'milestone_2', 'completed')",
+            [(f"Session {n}",) for n in range(sessions)]
+        )
+
+        items = [(f"ITEM_{n:06d}", f"Synthetic item {n}", rng.choice(category_ids),
+                  json.dumps({'size': rng.randint(1, 100)}),
+                  'active' if rng.random() < 0.9 else 'deprecated')
+                 for n in range(scale)]
+        conn.executemany(
+            "INSERT INTO cost_items (item_id, item_name, category_id, specifications, status) VALUES (?, ?, ?, ?, ?)",
+            items
+        )
+        item_ids = [row[0] for row in conn.execute("SELECT id FROM cost_items")]
+
+        for item_id in item_ids:
+            for _ in range(rng.randint(1, 2 * PRICES_PER_ITEM - 1)):
+                pricing_id = conn.execute("""
+                    INSERT INTO cost_pricing (cost_item_id, unit_cost, unit, effective_date, confidence_level)
+                    VALUES (?, ?, 'each', ?, ?)
+                """, (item_id, round(rng.uniform(1, 5000), 2), day(),
+                      rng.choice(['LOW', 'MEDIUM', 'HIGH', 'VERIFIED']))).lastrowid
+                source = rng.randint(1, source_count)
+                conn.execute("""
+                    INSERT INTO source_references
+                    (cost_pricing_id, source_id, reference_type, source_url, date_accessed)
+                    VALUES (?, ?, 'primary', ?, ?)
+                """, (pricing_id, source, f"https://supplier{source}.example.com/p/{pricing_id}", day()))
+                conn.execute("""
+                    INSERT INTO collection_log (session_id, cost_item_id, action_type)
+                    VALUES (?, ?, 'created')
+                """, (rng.randint(1, sessions), item_id))
+
+            conn.execute("INSERT INTO item_fingerprints (cost_item_id, fingerprint) VALUES (?, ?)",
+                         (item_id, f"{rng.getrandbits(64):016x}"))
+            url = f"https://supplier{item_id % source_count}.example.com/product/{item_id}"
+            conn.execute("""
+                INSERT INTO crawl_frontier (session_id, supplier, url, url_type, context, status, item_id)
+                VALUES (?, ?, ?, 'product', '{"category_path": "/products/"}', 'persisted', ?)
+            """, (rng.randint(1, sessions), f"Supplier {item_id % source_count}", url, f"ITEM_{item_id:06d}"))
+            conn.execute("INSERT INTO sitemap_urls (supplier, url, lastmod) VALUES (?, ?, ?)",
+                         (f"Supplier {item_id % source_count}", url, day()))
+            conn.execute("""
+                INSERT INTO page_extractions (supplier, url, content_hash, parser_version)
+                VALUES (?, ?, ?, '1')
+            """, (f"Supplier {item_id % source_count}", url, f"{rng.getrandbits(64):016x}"))
+
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return db_path
+
+
+# ================================
+# PLANS
+# ================================
+
+def _explain(conn: sqlite3.Connection, sql: str) -> List[Tuple[int, int, int, str]]:
+    # Plans are made when a statement is prepared and cached statements are
+    # not re-prepared after CREATE/DROP INDEX; the schema version in the
+    # text keeps a stale plan from being reused
+    version = conn.execute("PRAGMA schema_version").fetchone()[0]
+    params: Tuple = ()
+    while True:
+        try:
+            return conn.execute(f"EXPLAIN QUERY PLAN {sql}\n-- schema {version}", params).fetchall()
+        except sqlite3.ProgrammingError as e:
+            # Unbound placeholders: retry with as many NULLs as the statement wants
+            match = re.search(r'uses (\d+), and there are', str(e))
+            if not match or int(match.group(1)) == len(params):
+                raise
+            params = (None,) * int(match.group(1))
+
+
+def table_aliases(sql: str, tables: Iterable[str]) -> Dict[str, str]:
+    """Names a statement uses for each of the given tables (aliases and bare table names)"""
+    known = {t.lower(): t for t in tables}
+    aliases = {}
+    for table, alias in TABLE_REF.findall(sql):
+        if table.lower() in known:
+            aliases.setdefault(table, known[table.lower()])
+            if alias:
+                aliases.setdefault(alias, known[table.lower()])
+    return aliases
+
+
+def audit_statement(conn: sqlite3.Connection, statement: Statement, tables: Iterable[str]) -> PlanAudit:
+    """Explain a statement and pick out its scans and temporary B-trees"""
+    audit = PlanAudit(statement)
+    try:
+        rows = _explain(conn, statement.sql)
+    except (sqlite3.Error, ValueError) as e:
+        audit.error = str(e)
+        return audit
+
+    aliases = table_aliases(statement.sql, tables)
+    depth = {0: -1}
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        audit.plan.append('  ' * depth[node_id] + detail)
+
+        scan = SCAN_STEP.match(detail)
+        if scan and scan.group(1) in aliases and not VIRTUAL_LOOKUP.search(detail):
+            audit.issues.append(detail)
+            audit.scanned_tables[scan.group(1)] = aliases[scan.group(1)]
+        elif 'TEMP B-TREE' in detail:
+            audit.issues.append(detail)
+    return audit
+
+
+def audit_statements(conn: sqlite3.Connection, statements: Iterable[Statement]) -> List[PlanAudit]:
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    return [audit_statement(conn, statement, tables) for statement in statements]
+
+
+# ================================
+# INDEX ADVISOR
+# ================================
+
+def _existing_indexes(conn: sqlite3.Connection, table: str) -> List[Tuple[str, ...]]:
+    return [tuple(row[2] for row in conn.execute(f"PRAGMA index_info('{name}')"))
+            for _, name, *_ in conn.execute(f"PRAGMA index_list('{table}')")]
+
+
+def _rowid_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    # INTEGER PRIMARY KEY is the rowid itself and needs no index
+    return [row[1] for row in conn.execute(f"PRAGMA table_info('{table}')")
+            if row[5] and row[2].upper() == 'INTEGER']
+
+
+def candidate_columns(sql: str, name: str, table_columns: List[str], only_table: bool) -> Tuple[str, ...]:
+    """
+    Columns of the scanned table a statement compares against something:
+    equality columns first, then one range column. LIKE/GLOB are left out,
+    since an ordinary index does not serve them.
+    """
+    equality, ranges = [], []
+    columns = {c.lower(): c for c in table_columns}
+
+    def add(column, op):
+        column = columns.get(column.lower())
+        op = op.upper()
+        if not column or op in ('LIKE', 'GLOB'):
+            return
+        target = equality if op in EQUALITY_OPS else ranges
+        if column not in equality and column not in target:
+            target.append(column)
+
+    qualified = re.escape(name) + r'\.(\w+)'
+    for column, op in re.findall(qualified + r'\s*' + COMPARISON, sql, re.IGNORECASE):
+        add(column, op)
+    for op, column in re.findall(r'(==|=|<=|>=|<|>)\s*' + qualified, sql, re.IGNORECASE):
+        add(column, {'<': '>', '>': '<', '<=': '>=', '>=': '<='}.get(op, op))
+    if only_table:
+        for column, op in re.findall(r'(?<![\w.])(\w+)\s*' + COMPARISON, sql, re.IGNORECASE):
+            add(column, op)
+
+    return tuple(equality + [c for c in ranges[:1]])
+
+
+def suggest_indexes(conn: sqlite3.Connection, audits: List[PlanAudit]) -> List[IndexSuggestion]:
+    """
+    Propose an index per scanned table and keep those the planner uses.
+
+    Candidates are created on the (synthetic) database behind conn, which is
+    re-analyzed and re-planned; indexes no statement picked up are dropped
+    again. Suggested indexes stay on the database.
+    """
+    tables = _all_tables(conn)
+    candidates: Dict[Tuple[str, Tuple[str, ...]], IndexSuggestion] = {}
+    for audit in audits:
+        # Unqualified columns can only be attributed when one table is involved
+        statement_tables = set(table_aliases(audit.statement.sql, tables).values())
+        for name, table in audit.scanned_tables.items():
+            table_columns = [row[1] for row in conn.execute(f"PRAGMA table_info('{table}')")
+                             if row[1] not in _rowid_columns(conn, table)]
+            only_table = name == table and statement_tables == {table}
+            columns = candidate_columns(audit.statement.sql, name, table_columns, only_table)
+            if not columns:
+                continue
+            if any(index[:len(columns)] == columns for index in _existing_indexes(conn, table)):
+                continue
+            suggestion = candidates.setdefault((table, columns), IndexSuggestion(table, columns))
+            suggestion._scans.append((audit, name))
+
+    if not candidates:
+        return []
+
+    for suggestion in candidates.values():
+        conn.execute(suggestion.ddl)
+    conn.execute("ANALYZE")
+
+    for suggestion in candidates.values():
+        for audit, name in suggestion._scans:
+            replanned = audit_statement(conn, audit.statement, tables)
+            if name not in replanned.scanned_tables:
+                suggestion.statements.append(audit.statement.source)
+
+    kept = [s for s in candidates.values() if s.statements]
+    for suggestion in candidates.values():
+        if not suggestion.statements:
+            conn.execute(f"DROP INDEX {suggestion.name}")
+    conn.execute("ANALYZE")
+    return sorted(kept, key=lambda s: s.name)
+
+
+def _all_tables(conn: sqlite3.Connection) -> List[str]:
+    return [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+
+
+def migration_sql(suggestions: List[IndexSuggestion]) -> str:
+    lines = ["-- Indexes suggested by scripts/query_plan_audit.py: each removed a full",
+             "-- table scan from the plan of the statements listed above it."]
+    for suggestion in suggestions:
+        lines.append("")
+        for source in suggestion.statements[:5]:
+            lines.append(f"-- {source}")
+        if len(suggestion.statements) > 5:
+            lines.append(f"-- ... and {len(suggestion.statements) - 5} more")
+        lines.append(suggestion.ddl)
+    return '\n'.join(lines) + '\n'
+
+
+def write_migration(suggestions: List[IndexSuggestion], migrations_dir: Path = MIGRATIONS_DIR) -> Path:
+    """Save the suggestions as the next numbered migration"""
+    versions = [version for version, _, _ in available_migrations(migrations_dir)]
+    path = Path(migrations_dir) / f"{max(versions, default=0) + 1:03d}_query_plan_indexes.sql"
+    path.write_text(migration_sql(suggestions))
+    return path
+
+
+# ================================
+# BASELINE
+# ================================
+
+def baseline_data(audits: List[PlanAudit], scale: int) -> Dict:
+    return {
+        'scale': scale,
+        'sqlite_version': sqlite3.sqlite_version,
+        'statements': {
+            audit.statement.key: {
+                'source': audit.statement.source,
+                'sql': normalize_sql(audit.statement.sql),
+                'plan': audit.plan,
+                'issues': audit.issues
+            }
+            for audit in audits if audit.error is None and audit.plan
+        }
+    }
+
+
+def write_baseline(audits: List[PlanAudit], scale: int, path: Path = BASELINE_PATH):
+    with open(path, 'w') as f:
+        json.dump(baseline_data(audits, scale), f, indent=2)
+        f.write('\n')
+
+
+def compare_baseline(audits: List[PlanAudit], baseline: Dict) -> List[str]:
+    """Scans and temporary B-trees that the baseline does not have"""
+    recorded = baseline.get('statements', {})
+    regressions = []
+    for audit in audits:
+        if audit.error is not None or not audit.issues:
+            continue
+        known = recorded.get(audit.statement.key)
+        if known is None:
+            regressions.append(f"{audit.statement.source}: new statement with {'; '.join(audit.issues)}")
+            continue
+        added = [issue for issue in audit.issues if issue not in known['issues']]
+        if added:
+            regressions.append(f"{audit.statement.source}: {'; '.join(added)}")
+    return regressions
+
+
+# ================================
+# CLI
+# ================================
+
+def run_audit(scale: int = DEFAULT_SCALE, paths: Optional[List[Path]] = None,
+              workdir: Optional[str] = None) -> Tuple[List[PlanAudit], List[IndexSuggestion]]:
+    """Audit the project's statements on a fresh synthetic database"""
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        db_path = build_synthetic_database(str(Path(tmp) / 'audit.db'), scale)
+        conn = connect(db_path)
+        try:
+            statements = collect_statements(paths or source_files()) + view_statements(conn)
+            audits = audit_statements(conn, statements)
+            suggestions = suggest_indexes(conn, audits)
+        finally:
+            conn.close()
+    return audits, suggestions
+
+
+def print_report(audits: List[PlanAudit], suggestions: List[IndexSuggestion], verbose: bool = False):
+    explained = [a for a in audits if a.error is None]
+    flagged = [a for a in explained if a.issues]
+    print(f"Explained {len(explained)} of {len(audits)} statements; {len(flagged)} scan or sort")
+
+    for audit in flagged:
+        print(f"\n{audit.statement.source}")
+        print(f"  {normalize_sql(audit.statement.sql)[:120]}")
+        for issue in audit.issues:
+            print(f"  ! {issue}")
+        if verbose:
+            for step in audit.plan:
+                print(f"    {step}")
+
+    if verbose:
+        for audit in audits:
+            if audit.error:
+                print(f"\nNot explained: {audit.statement.source}: {audit.error}")
+
+    print(f"\n{len(suggestions)} suggested indexes")
+    for suggestion in suggestions:
+        print(f"  {suggestion.ddl}  ({len(suggestion.statements)} statements)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit query plans of the project SQL and suggest indexes')
+    parser.add_argument('--scale', type=int, default=DEFAULT_SCALE,
+                       help=f'Cost items in the synthetic database (default: {DEFAULT_SCALE})')
+    parser.add_argument('--verbose', action='store_true', help='Print full plans and unexplained statements')
+    parser.add_argument('--write-migration', action='store_true',
+                       help='Save suggested indexes as the next numbered migration')
+    parser.add_argument('--write-baseline', action='store_true',
+                       help=f'Save plans to {BASELINE_PATH.relative_to(project_root)}')
+    parser.add_argument('--check', action='store_true',
+                       help='Fail if a statement gained a scan or sort since the baseline')
+
+    args = parser.parse_args()
+
+    audits, suggestions = run_audit(args.scale)
+    print_report(audits, suggestions, args.verbose)
+
+    if args.write_migration and suggestions:
+        print(f"\nWrote {write_migration(suggestions).relative_to(project_root)}")
+
+    if args.write_baseline:
+        write_baseline(audits, args.scale)
+        print(f"\nWrote {BASELINE_PATH.relative_to(project_root)}")
+
+    if args.check:
+        if not BASELINE_PATH.exists():
+            print(f"\nNo baseline at {BASELINE_PATH}; run with --write-baseline first")
+            sys.exit(1)
+        with open(BASELINE_PATH) as f:
+            regressions = compare_baseline(audits, json.load(f))
+        if regressions:
+            print(f"\n{len(regressions)} plan regressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo plan regressions against the baseline")
+
+
+if __name__ == '__main__':
+    main()
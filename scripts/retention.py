@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Log Retention
+
+collection_log keeps the full scraped product for every item on every
+scrape and validation_results a row per rule per price; neither shrinks on
+its own. This applies the policies in config/retention_config.json:
+
+- collection_log payloads older than full_payload_days are rewritten as a
+  diff against the item's previous entry (payload_format 'diff', see
+  migration 011); collection_log_payloads() rebuilds the full payloads
+- collection_log rows older than archive_after_days, and validation_results
+  older than theirs whose price is no longer current, move into
+  zlib-compressed batches in retention_archive (read_archive() reads them
+  back); failed validations stay unless keep_failures is false
+- the freed pages are returned to the file system with an incremental
+  vacuum. A database created before auto_vacuum was enabled is rebuilt
+  with VACUUM once to switch it on
+
+An age of null disables that step. The report gives the rows touched and
+the database size before and after.
+
+Usage:
+    python scripts/retention.py [--db-path data/costs/vanilla_costs.db]
+        [--config config/retention_config.json] [--dry-run] [--no-vacuum]
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import get_connection
+from scripts.schema_migrations import apply_migrations
+
+DEFAULT_CONFIG_PATH = project_root / 'config' / 'retention_config.json'
+
+PAYLOAD_FULL = 'full'
+PAYLOAD_DIFF = 'diff'
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+# Items whose log chains are loaded per query
+ITEM_CHUNK_SIZE = 500
+
+COLLECTION_LOG_COLUMNS = [
+    'id', 'session_id', 'cost_item_id', 'action_type', 'previous_values',
+    'new_values', 'collector_notes', 'created_at'
+]
+VALIDATION_RESULTS_COLUMNS = [
+    'id', 'cost_pricing_id', 'validation_rule_id', 'passed', 'failure_reason', 'validated_at'
+]
+
+
+@dataclass
+class RetentionPolicy:
+    """Ages in days after which log rows are compacted or archived; None keeps them"""
+    collection_log_full_days: Optional[int] = 30
+    collection_log_archive_days: Optional[int] = 365
+    validation_results_archive_days: Optional[int] = 90
+    keep_failed_validations: bool = True
+    archive_batch_size: int = 5000
+
+
+@dataclass
+class RetentionReport:
+    """What a retention run changed"""
+    compacted: int = 0  # collection_log payloads rewritten as diffs
+    compacted_bytes: int = 0  # payload bytes saved by the diffs
+    archived: Dict[str, int] = field(default_factory=dict)
+    archive_raw_bytes: int = 0
+    archive_bytes: int = 0  # compressed size of the archived rows
+    bytes_before: int = 0
+    bytes_after: int = 0
+    vacuumed: bool = False
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+
+def load_policy(config_path: Optional[str] = None) -> RetentionPolicy:
+    """Read retention policies from a config file; missing settings keep their defaults"""
+    path = Path(config_path or DEFAULT_CONFIG_PATH)
+    policy = RetentionPolicy()
+    if not path.exists():
+        return policy
+    try:
+        config = json.loads(path.read_text())
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in {path}: {e}")
+
+    collection_log = config.get('collection_log', {})
+    validation_results = config.get('validation_results', {})
+    policy.collection_log_full_days = collection_log.get('full_payload_days', policy.collection_log_full_days)
+    policy.collection_log_archive_days = collection_log.get('archive_after_days', policy.collection_log_archive_days)
+    policy.validation_results_archive_days = validation_results.get(
+        'archive_after_days', policy.validation_results_archive_days)
+    policy.keep_failed_validations = validation_results.get('keep_failures', policy.keep_failed_validations)
+    policy.archive_batch_size = config.get('archive_batch_size', policy.archive_batch_size)
+    return policy
+
+
+def payload_diff(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """The changes that turn previous into current"""
+    diff = {'set': {key: value for key, value in current.items()
+                    if key not in previous or previous[key] != value}}
+    unset = [key for key in previous if key not in current]
+    if unset:
+        diff['unset'] = unset
+    return diff
+
+
+def apply_diff(previous: Dict[str, Any], diff: Dict[str, Any]) -> Dict[str, Any]:
+    current = {key: value for key, value in previous.items() if key not in diff.get('unset', [])}
+    current.update(diff['set'])
+    return current
+
+
+def _cutoff(now: datetime, days: Optional[int]) -> Optional[str]:
+    # Same format as CURRENT_TIMESTAMP, which is UTC
+    if days is None:
+        return None
+    return (now - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _database_bytes(conn: sqlite3.Connection) -> int:
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return conn.execute("PRAGMA page_count").fetchone()[0] * page_size
+
+
+def _archive(conn: sqlite3.Connection, table: str, columns: List[str], rows: List[tuple],
+             report: RetentionReport):
+    raw = json.dumps(rows, separators=(',', ':')).encode('utf-8')
+    payload = zlib.compress(raw, 9)
+    conn.execute("""
+        INSERT INTO retention_archive (source_table, first_id, last_id, row_count, columns, payload, raw_bytes)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (table, rows[0][0], rows[-1][0], len(rows), json.dumps(columns), payload, len(raw)))
+    report.archived[table] = report.archived.get(table, 0) + len(rows)
+    report.archive_raw_bytes += len(raw)
+    report.archive_bytes += len(payload)
+
+
+def _load_payload(value: Optional[str]) -> Any:
+    try:
+        return json.loads(value) if value is not None else None
+    except json.JSONDecodeError:
+        return None
+
+
+def compact_collection_log(conn: sqlite3.Connection, policy: RetentionPolicy, now: datetime,
+                           report: RetentionReport):
+    """Diff old payloads against their predecessors and archive the oldest rows"""
+    full_cutoff = _cutoff(now, policy.collection_log_full_days)
+    archive_cutoff = _cutoff(now, policy.collection_log_archive_days)
+    if full_cutoff is None and archive_cutoff is None:
+        return
+
+    # Items with rows to archive, or an old full payload after their first row
+    item_ids = [row[0] for row in conn.execute("""
+        SELECT DISTINCT cost_item_id FROM collection_log cl
+        WHERE cl.created_at < :archive
+        OR (cl.payload_format = 'full' AND cl.created_at < :full
+            AND cl.id > (SELECT MIN(id) FROM collection_log WHERE cost_item_id = cl.cost_item_id))
+    """, {'archive': archive_cutoff, 'full': full_cutoff})]
+
+    archived, rewrites = [], []
+    for start in range(0, len(item_ids), ITEM_CHUNK_SIZE):
+        chunk = json.dumps(item_ids[start:start + ITEM_CHUNK_SIZE])
+        rows = conn.execute(f"""
+            SELECT {', '.join(COLLECTION_LOG_COLUMNS)}, payload_format FROM collection_log
+            WHERE cost_item_id IN (SELECT value FROM json_each(?))
+            ORDER BY cost_item_id, id
+        """, (chunk,)).fetchall()
+
+        # Walk each item's chain with its full payloads: a kept row is a diff
+        # when it is old enough and the kept row before it has a payload
+        cost_item_id = None
+        for *values, payload_format in rows:
+            if values[2] != cost_item_id:
+                cost_item_id, last, last_kept = values[2], None, None
+            new_values, created_at = values[5], values[7]
+            payload = _load_payload(new_values)
+            if payload_format == PAYLOAD_DIFF:
+                payload = apply_diff(last, payload)
+            last = payload if isinstance(payload, dict) else None
+            full_values = json.dumps(payload) if payload_format == PAYLOAD_DIFF else new_values
+
+            if archive_cutoff and created_at < archive_cutoff:
+                values[5] = full_values
+                archived.append(tuple(values))
+                continue
+
+            if full_cutoff and created_at < full_cutoff and last_kept is not None and last is not None:
+                stored, wanted = json.dumps(payload_diff(last_kept, payload)), PAYLOAD_DIFF
+            else:
+                stored, wanted = full_values, PAYLOAD_FULL
+            if wanted != payload_format:
+                rewrites.append((stored, wanted, values[0]))
+                if wanted == PAYLOAD_DIFF:
+                    report.compacted += 1
+                    report.compacted_bytes += len(new_values) - len(stored)
+            last_kept = last
+
+    if rewrites:
+        conn.executemany("UPDATE collection_log SET new_values = ?, payload_format = ? WHERE id = ?", rewrites)
+    archived.sort()
+    for start in range(0, len(archived), policy.archive_batch_size):
+        batch = archived[start:start + policy.archive_batch_size]
+        _archive(conn, 'collection_log', COLLECTION_LOG_COLUMNS, batch, report)
+        conn.executemany("DELETE FROM collection_log WHERE id = ?", [(row[0],) for row in batch])
+
+
+def archive_validation_results(conn: sqlite3.Connection, policy: RetentionPolicy, now: datetime,
+                               report: RetentionReport):
+    """Archive old validation results of prices that are no longer current"""
+    cutoff = _cutoff(now, policy.validation_results_archive_days)
+    if cutoff is None:
+        return
+
+    sql = f"""
+        SELECT {', '.join(VALIDATION_RESULTS_COLUMNS)} FROM validation_results vr
+        WHERE vr.validated_at < :cutoff
+        AND NOT EXISTS (SELECT 1 FROM current_pricing WHERE cost_pricing_id = vr.cost_pricing_id)
+        AND vr.id > :after
+    """
+    if policy.keep_failed_validations:
+        sql += " AND vr.passed"
+    sql += " ORDER BY vr.id LIMIT :limit"
+
+    after = 0
+    while True:
+        batch = conn.execute(sql, {'cutoff': cutoff, 'after': after,
+                                   'limit': policy.archive_batch_size}).fetchall()
+        if not batch:
+            return
+        _archive(conn, 'validation_results', VALIDATION_RESULTS_COLUMNS, batch, report)
+        conn.executemany("DELETE FROM validation_results WHERE id = ?", [(row[0],) for row in batch])
+        after = batch[-1][0]
+
+
+def reclaim_space(conn: sqlite3.Connection):
+    """Return free pages to the file system; must run outside a transaction"""
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+        # Only takes effect on an existing database through a full rebuild
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    else:
+        # executescript steps the pragma to the end; execute() frees one page
+        conn.executescript("PRAGMA incremental_vacuum")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+
+def run_retention(db_path: Optional[str] = None, policy: Optional[RetentionPolicy] = None,
+                  dry_run: bool = False, vacuum: bool = True,
+                  now: Optional[datetime] = None) -> RetentionReport:
+    """
+    Apply retention policies to the log tables and report what changed
+
+    Args:
+        db_path: Database to compact (defaults to the project database)
+        policy: Policies to apply (default: config/retention_config.json)
+        dry_run: Report what would change and roll it back
+        vacuum: Give freed pages back to the file system afterwards
+        now: Reference time for the ages (default: the current UTC time)
+    """
+    policy = policy or load_policy()
+    now = now or datetime.now(timezone.utc)
+    report = RetentionReport()
+
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        report.bytes_before = _database_bytes(conn)
+        compact_collection_log(conn, policy, now, report)
+        archive_validation_results(conn, policy, now, report)
+        if dry_run:
+            conn.rollback()
+            report.bytes_after = report.bytes_before
+            return report
+        conn.commit()
+
+        if vacuum:
+            reclaim_space(conn)
+            report.vacuumed = True
+        report.bytes_after = _database_bytes(conn)
+    return report
+
+
+def read_archive(table: str, db_path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Rows archived from a table, oldest batch first"""
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        batches = conn.execute("""
+            SELECT columns, payload FROM retention_archive
+            WHERE source_table = ? ORDER BY first_id, id
+        """, (table,)).fetchall()
+    for columns, payload in batches:
+        columns = json.loads(columns)
+        for row in json.loads(zlib.decompress(payload)):
+            yield dict(zip(columns, row))
+
+
+def collection_log_payloads(cost_item_id: int, db_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """The collection_log rows of an item still in the table, with full new_values payloads"""
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        rows = conn.execute(f"""
+            SELECT {', '.join(COLLECTION_LOG_COLUMNS)}, payload_format FROM collection_log
+            WHERE cost_item_id = ? ORDER BY id
+        """, (cost_item_id,)).fetchall()
+
+    entries, state = [], None
+    for *values, payload_format in rows:
+        entry = dict(zip(COLLECTION_LOG_COLUMNS, values))
+        payload = _load_payload(entry['new_values'])
+        if payload_format == PAYLOAD_DIFF:
+            payload = apply_diff(state, payload)
+            entry['new_values'] = json.dumps(payload)
+        state = payload if isinstance(payload, dict) else None
+        entries.append(entry)
+    return entries
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f"{size:,.0f} {unit}" if unit == 'B' else f"{size:,.1f} {unit}"
+        size /= 1024
+    return f"{size:,.1f} GiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compact and archive old collection_log and validation_results rows')
+    parser.add_argument('--db-path', help='Database path')
+    parser.add_argument('--config', help='Retention config (default: config/retention_config.json)')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would change without changing it')
+    parser.add_argument('--no-vacuum', action='store_true', help='Leave freed pages in the database file')
+    args = parser.parse_args()
+
+    report = run_retention(args.db_path, load_policy(args.config), dry_run=args.dry_run,
+                           vacuum=not args.no_vacuum)
+
+    prefix = 'Would compact' if args.dry_run else 'Compacted'
+    print(f"{prefix} {report.compacted} collection_log payloads to diffs "
+          f"(saving {_format_bytes(report.compacted_bytes)})")
+    for table in ('collection_log', 'validation_results'):
+        print(f"{'Would archive' if args.dry_run else 'Archived'} {report.archived.get(table, 0)} {table} rows")
+    if report.archive_raw_bytes:
+        print(f"Archive batches: {_format_bytes(report.archive_raw_bytes)} compressed to "
+              f"{_format_bytes(report.archive_bytes)}")
+    if not args.dry_run:
+        print(f"Database size: {_format_bytes(report.bytes_before)} -> {_format_bytes(report.bytes_after)} "
+              f"({_format_bytes(report.bytes_reclaimed)} reclaimed"
+              f"{'' if report.vacuumed else ', not vacuumed'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Schema Migrations
+
+config/database_schema.sql describes the baseline schema. Changes made
+after it are numbered SQL files in config/migrations (e.g.
+001_crawl_frontier.sql), applied in order and recorded in a
+schema_migrations table so each runs exactly once per database.
+
+DatabaseInitializer applies them after creating the baseline schema, and
+components that depend on newer tables apply them when they open an
+existing database.
+
+Usage:
+    python scripts/schema_migrations.py [--db-path data/costs/vanilla_costs.db] [--status]
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import List, Tuple, Union
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import DEFAULT_DB_PATH, get_connection
+
+MIGRATIONS_DIR = project_root / 'config' / 'migrations'
+
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+
+def available_migrations(migrations_dir: Path = MIGRATIONS_DIR) -> List[Tuple[int, str, Path]]:
+    """Return (version, name, path) for every migration file, in version order"""
+    migrations = []
+    for path in Path(migrations_dir).glob('*.sql'):
+        match = MIGRATION_FILE_PATTERN.match(path.name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), path))
+    return sorted(migrations)
+
+
+def applied_versions(conn: sqlite3.Connection) -> List[int]:
+    """Return the versions already applied to this database"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    return [row[0] for row in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+
+
+def apply_migrations(db: Union[str, Path, sqlite3.Connection],
+                     migrations_dir: Path = MIGRATIONS_DIR) -> List[str]:
+    """
+    Apply pending migrations and return the names of those applied.
+
+    Each migration runs in its own transaction together with its
+    schema_migrations row, so a failing migration leaves no partial changes.
+    """
+    if not isinstance(db, sqlite3.Connection):
+        with get_connection(db) as conn:
+            return apply_migrations(conn, migrations_dir)
+
+    conn = db
+    done = set(applied_versions(conn))
+    conn.commit()
+
+    applied = []
+    for version, name, path in available_migrations(migrations_dir):
+        if version in done:
+            continue
+
+        sql = path.read_text()
+        try:
+            conn.executescript(
+                f"BEGIN;\n{sql}\n"
+                f"INSERT INTO schema_migrations (version, name) VALUES ({version}, '{name}');\n"
+                f"COMMIT;"
+            )
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        applied.append(f"{version:03d}_{name}")
+
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply Terra35 database schema migrations')
+    parser.add_argument('--db-path', default=str(DEFAULT_DB_PATH),
+                       help='Database file path (default: data/costs/vanilla_costs.db)')
+    parser.add_argument('--status', action='store_true',
+                       help='Show applied and pending migrations without applying them')
+
+    args = parser.parse_args()
+
+    if not Path(args.db_path).exists():
+        print(f"Database not found: {args.db_path}")
+        sys.exit(1)
+
+    if args.status:
+        with get_connection(args.db_path) as conn:
+            done = set(applied_versions(conn))
+        for version, name, _ in available_migrations():
+            state = 'applied' if version in done else 'pending'
+            print(f"{version:03d}_{name}: {state}")
+        return
+
+    applied = apply_migrations(args.db_path)
+    if applied:
+        for name in applied:
+            print(f"Applied {name}")
+    else:
+        print("Database schema is up to date")
+
+
+if __name__ == '__main__':
+    main()
@@ -15,7 +15,9 @@ Usage:
             pass
 """
 
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import json
 import hashlib
@@ -23,9 +25,9 @@ import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import asdict, dataclass, fields
 import random
 import sys
 from abc import ABC, abstractmethod
@@ -34,10 +36,20 @@ from abc import ABC, abstractmethod
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from scripts.constants import (
-    STATUS_ACTIVE, COMPANY_TYPE_SUPPLIER, SOURCE_TIER_PRIMARY,
-    MILESTONE_DATA_COLLECTION, SESSION_STATUS_IN_PROGRESS,
-    REFERENCE_TYPE_PRIMARY, ACTIVITY_TYPE_CREATED, DEFAULT_UNIT
+from scripts.constants import DEFAULT_CURRENCY
+from scripts.db import resolve_db_path
+from scripts.scrapers.rate_limiter import AdaptiveHostRateLimiter, parse_retry_after
+from scripts.scrapers.cache_store import CacheStore, CACHE_BACKEND_JSON, create_cache_store
+from scripts.scrapers.cache_manager import CacheManager, CacheStats
+from scripts.scrapers.crawl_frontier import CrawlFrontier
+from scripts.scrapers.pipeline import PagePipeline, PageResult, PipelineStats
+from scripts.scrapers.discovery import SitemapDiscovery, SitemapEntry, changed_entries, record_fetched
+from scripts.scrapers.bulk_writer import BulkProductWriter, SaveStats
+from scripts.scrapers.db_writer import DatabaseWriter
+from scripts.scrapers.scheduler import FetchPlan, RescrapeScheduler
+from scripts.scrapers.page_extractions import Extraction, content_hash, load_extractions, record_extractions
+from scripts.scrapers.html_parsing import (
+    ParseRestriction, default_html_parser, parse_html, validate_parser
 )
 
 @dataclass
@@ -56,23 +68,73 @@ class ScrapedProduct:
     confidence_level: str = "MEDIUM"
     scraped_at: str = ""
     notes: Optional[str] = None
+    currency: str = DEFAULT_CURRENCY
     
     def __post_init__(self):
         if not self.scraped_at:
             self.scraped_at = datetime.now().isoformat()
 
+# Validation warnings kept per session; the rest are only counted
+MAX_SESSION_WARNINGS = 100
+
+# Throttle events kept per scraper; the rest are only counted
+MAX_THROTTLE_EVENTS = 100
+
+# Throttle event kinds
+THROTTLE_RATE_LIMITED = 'rate_limited'    # 429 Too Many Requests
+THROTTLE_UNAVAILABLE = 'unavailable'      # 503 Service Unavailable
+THROTTLE_CIRCUIT_OPEN = 'circuit_open'    # host skipped after repeated failures
+
+THROTTLE_STATUS_KINDS = {429: THROTTLE_RATE_LIMITED, 503: THROTTLE_UNAVAILABLE}
+
+@dataclass
+class ThrottleEvent:
+    """A host asking us to slow down, or being skipped by the circuit breaker"""
+    host: str
+    url: str
+    kind: str
+    status_code: Optional[int] = None
+    retry_after: Optional[float] = None  # seconds, from the Retry-After header
+    delay: float = 0.0                   # host delay after the event
+    timestamp: str = ""
+    
+    def __post_init__(self):
+        if not self.timestamp:
+            self.timestamp = datetime.now().isoformat()
+
 @dataclass
 class ScrapingResult:
-    """Container for scraping session results"""
+    """
+    Container for scraping session results.
+    
+    Products are streamed to the database in chunks, so only a sample is
+    kept here; products_count and products_saved hold the totals.
+    """
     supplier: str
     session_id: str
     start_time: datetime
     end_time: Optional[datetime] = None
-    products_scraped: List[ScrapedProduct] = None
+    products_scraped: List[ScrapedProduct] = None  # sample of the first products
     errors: List[str] = None
-    warnings: List[str] = None
+    warnings: List[str] = None                     # first MAX_SESSION_WARNINGS warnings
+    products_count: int = 0
+    products_saved: int = 0
+    products_new: int = 0        # saved products by change detection
+    products_changed: int = 0
+    products_unchanged: int = 0  # already stored with the same price; only touched
+    warning_count: int = 0
     cache_hits: int = 0
+    cache_misses: int = 0
+    cache_evictions: int = 0
+    cache_bytes_written: int = 0
+    cache_bytes: int = 0       # size of the supplier cache at session end
     requests_made: int = 0
+    revalidations: int = 0
+    throttle_events: List[ThrottleEvent] = None    # first MAX_THROTTLE_EVENTS events
+    throttle_count: int = 0
+    requests_skipped: int = 0  # not sent because the host's circuit breaker was open
+    pages_reused: int = 0      # unchanged pages whose stored product was reused unparsed
+    pipeline_stats: Optional[PipelineStats] = None  # per-stage timing of run_pipeline
     
     def __post_init__(self):
         if self.products_scraped is None:
@@ -81,6 +143,8 @@ class ScrapingResult:
             self.errors = []
         if self.warnings is None:
             self.warnings = []
+        if self.throttle_events is None:
+            self.throttle_events = []
 
 class BaseScraper(ABC):
     """
@@ -92,6 +156,10 @@ class BaseScraper(ABC):
     - Logging and monitoring
     """
     
+    # Bump when parse_page changes what it extracts, so products stored for
+    # unchanged pages are not reused (see page_extractions.py)
+    parser_version = '1'
+    
     def __init__(self, 
                  supplier_name: str,
                  base_url: str,
@@ -99,21 +167,48 @@ class BaseScraper(ABC):
                  db_path: Optional[str] = None,
                  rate_limit_delay: float = 1.0,
                  max_retries: int = 3,
-                 timeout: int = 30):
+                 timeout: int = 30,
+                 max_concurrency: int = 8,
+                 cache_backend: Union[str, CacheStore] = CACHE_BACKEND_JSON,
+                 cache_max_bytes: Optional[int] = None,
+                 cache_ttl_hours: Optional[float] = None,
+                 save_chunk_size: int = 100,
+                 product_sample_size: int = 10,
+                 html_parser: Optional[str] = None,
+                 min_rate_limit_delay: Optional[float] = None,
+                 parse_workers: int = 2,
+                 pipeline_queue_size: int = 32,
+                 reuse_extractions: bool = True,
+                 db_writer: Optional[DatabaseWriter] = None):
         
         self.supplier_name = supplier_name
         self.base_url = base_url
         self.rate_limit_delay = rate_limit_delay
         self.max_retries = max_retries
         self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.save_chunk_size = save_chunk_size
+        self.product_sample_size = product_sample_size
+        self.parse_workers = parse_workers
+        self.pipeline_queue_size = pipeline_queue_size
+        self.reuse_extractions = reuse_extractions
+        
+        # BeautifulSoup tree builder; defaults to the fastest installed (lxml if present)
+        self.html_parser = validate_parser(html_parser) if html_parser else default_html_parser()
         
         # Setup directories
         self.project_root = project_root
         self.cache_dir = Path(cache_dir or project_root / 'data' / 'cache' / supplier_name.lower())
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_store = create_cache_store(cache_backend, self.cache_dir)
+        
+        # Optional size budget / TTL for this supplier's cache
+        self.cache_manager = None
+        if cache_max_bytes is not None or cache_ttl_hours is not None:
+            self.cache_manager = CacheManager(cache_max_bytes, cache_ttl_hours)
         
         # Database connection
-        self.db_path = db_path or str(project_root / 'data' / 'costs' / 'vanilla_costs.db')
+        self.db_path = resolve_db_path(db_path)
         
         # Session management
         self.session = requests.Session()
@@ -126,14 +221,46 @@ class BaseScraper(ABC):
             'Upgrade-Insecure-Requests': '1',
         })
         
+        # Size the connection pool for concurrent fetches
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Per-host adaptive limiter and circuit breaker for all live requests
+        self.host_limiter = AdaptiveHostRateLimiter(rate_limit_delay, min_delay=min_rate_limit_delay)
+        
         # Tracking
         self.last_request_time = 0
         self.request_count = 0
         self.cache_hit_count = 0
+        self.cache_miss_count = 0
+        self.cache_eviction_count = 0
+        self.cache_bytes_written = 0
+        self._cache_bytes_since_enforce = 0
+        self.revalidation_count = 0
+        self.throttle_events: List[ThrottleEvent] = []
+        self.throttle_count = 0
+        self.skipped_request_count = 0
+        self.reused_page_count = 0
         
         # Current session tracking
         self.current_session: Optional[ScrapingResult] = None
         
+        # Optional replacement for save_products, called as sink(products, session_id)
+        # so another component (e.g. the orchestrator's single writer) persists them
+        self.product_sink: Optional[Callable[[List[ScrapedProduct], Optional[str]], int]] = None
+        
+        # Crawl checkpointing (opened on first use of self.frontier)
+        self._frontier: Optional[CrawlFrontier] = None
+        self._checkpointed_item_ids = set()
+        
+        # Set-based writer used by save_products (created on first save), or a
+        # shared DatabaseWriter thread that serializes writes from many scrapers
+        self._bulk_writer: Optional[BulkProductWriter] = None
+        self.db_writer = db_writer
+        self.save_stats = SaveStats()
+        self.pipeline_stats = PipelineStats()
+        
         # Logging setup
         self.setup_logging()
         
@@ -166,10 +293,14 @@ class BaseScraper(ABC):
             self.logger.addHandler(file_handler)
             self.logger.addHandler(console_handler)
     
-    def start_session(self) -> str:
-        """Start a new scraping session"""
-        session_id = f"{self.supplier_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    def start_session(self, session_id: Optional[str] = None) -> str:
+        """Start a new scraping session, or continue one by passing its ID"""
+        session_id = session_id or f"{self.supplier_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
+        self._frontier = None
+        self._checkpointed_item_ids = set()
+        self.save_stats = SaveStats()
+        self.pipeline_stats = PipelineStats()
         self.current_session = ScrapingResult(
             supplier=self.supplier_name,
             session_id=session_id,
@@ -184,27 +315,59 @@ class BaseScraper(ABC):
         if not self.current_session:
             raise ValueError("No active session to end")
         
+        cache_stats = self.enforce_cache_budget()
+        
         self.current_session.end_time = datetime.now()
         self.current_session.cache_hits = self.cache_hit_count
+        self.current_session.cache_misses = self.cache_miss_count
+        self.current_session.cache_evictions = self.cache_eviction_count
+        self.current_session.cache_bytes_written = self.cache_bytes_written
+        self.current_session.cache_bytes = (
+            cache_stats.bytes if cache_stats else self.cache_store.total_bytes()
+        )
         self.current_session.requests_made = self.request_count
+        self.current_session.revalidations = self.revalidation_count
+        self.current_session.throttle_events = list(self.throttle_events)
+        self.current_session.throttle_count = self.throttle_count
+        self.current_session.requests_skipped = self.skipped_request_count
+        self.current_session.pages_reused = self.reused_page_count
+        self.current_session.pipeline_stats = self.pipeline_stats
+        self.current_session.products_new = self.save_stats.new
+        self.current_session.products_changed = self.save_stats.changed
+        self.current_session.products_unchanged = self.save_stats.unchanged
         
         duration = (self.current_session.end_time - self.current_session.start_time).total_seconds()
         
         self.logger.info(
             f"Completed session {self.current_session.session_id}: "
-            f"{len(self.current_session.products_scraped)} products, "
+            f"{self.current_session.products_count} products "
+            f"({self.current_session.products_saved} saved: "
+            f"{self.save_stats.new} new, {self.save_stats.changed} changed, "
+            f"{self.save_stats.unchanged} unchanged), "
             f"{self.request_count} requests, "
             f"{self.cache_hit_count} cache hits, "
+            f"{self.cache_miss_count} cache misses, "
+            f"{self.cache_eviction_count} cache evictions, "
+            f"{self.revalidation_count} revalidations, "
+            f"{self.throttle_count} throttle events, "
+            f"{self.skipped_request_count} skipped requests, "
+            f"{self.reused_page_count} pages reused unparsed, "
             f"{duration:.1f}s duration"
         )
         
         session_result = self.current_session
         self.current_session = None
+        self._frontier = None
         
         return session_result
     
     def rate_limit(self):
-        """Implement rate limiting between requests"""
+        """
+        Fixed-delay pacing for callers that do their own requests.
+        
+        make_request and async_make_request pace through host_limiter
+        instead, which adapts to each host's responses.
+        """
         time_since_last = time.time() - self.last_request_time
         if time_since_last < self.rate_limit_delay:
             sleep_time = self.rate_limit_delay - time_since_last
@@ -229,49 +392,136 @@ class BaseScraper(ABC):
     
     def load_from_cache(self, cache_key: str, max_age_hours: int = 24) -> Optional[Dict]:
         """Load response from cache if available and not expired"""
-        cache_path = self.get_cache_path(cache_key)
-        
-        if not cache_path.exists():
+        try:
+            cached_data, age_hours = self.cache_store.load_if_fresh(cache_key, max_age_hours)
+        except (KeyError, ValueError, TypeError) as e:
+            self.logger.warning(f"Invalid cache entry {cache_key}: {e}")
+            self.cache_miss_count += 1
             return None
         
-        try:
-            with open(cache_path, 'r') as f:
-                cached_data = json.load(f)
-            
-            cached_time = datetime.fromisoformat(cached_data['timestamp'])
-            age_hours = (datetime.now() - cached_time).total_seconds() / 3600
-            
-            if age_hours > max_age_hours:
+        if cached_data is None:
+            self.cache_miss_count += 1
+            if age_hours is not None:
                 self.logger.info(f"Cache expired for key {cache_key} (age: {age_hours:.1f}h)")
-                return None
-            
-            self.cache_hit_count += 1
-            self.logger.debug(f"Cache hit for key {cache_key}")
-            return cached_data
-            
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            self.logger.warning(f"Invalid cache file {cache_path}: {e}")
             return None
+        
+        self.cache_hit_count += 1
+        self.logger.debug(f"Cache hit for key {cache_key}")
+        return cached_data
     
     def save_to_cache(self, cache_key: str, response_data: Dict):
         """Save response data to cache"""
-        cache_path = self.get_cache_path(cache_key)
-        
         cached_data = {
             'timestamp': datetime.now().isoformat(),
             'url': response_data.get('url', ''),
             'status_code': response_data.get('status_code', 0),
             'headers': dict(response_data.get('headers', {})),
             'content': response_data.get('content', ''),
-            'encoding': response_data.get('encoding', 'utf-8')
+            'encoding': response_data.get('encoding', 'utf-8'),
+            'etag': response_data.get('etag'),
+            'last_modified': response_data.get('last_modified')
         }
         
         try:
-            with open(cache_path, 'w') as f:
-                json.dump(cached_data, f, indent=2)
+            self.cache_store.save(cache_key, cached_data)
             self.logger.debug(f"Cached response for key {cache_key}")
         except Exception as e:
             self.logger.error(f"Failed to cache response {cache_key}: {e}")
+            return
+        
+        size_bytes = len(str(cached_data['content'] or '').encode('utf-8'))
+        self.cache_bytes_written += size_bytes
+        self._cache_bytes_since_enforce += size_bytes
+        
+        # Re-check the budget every tenth of it written, not on every save
+        max_bytes = self.cache_manager.max_bytes if self.cache_manager else None
+        if max_bytes is not None and self._cache_bytes_since_enforce >= max_bytes / 10:
+            self.enforce_cache_budget()
+    
+    def enforce_cache_budget(self) -> Optional[CacheStats]:
+        """Apply the configured cache budget and TTL; None when unbounded"""
+        if not self.cache_manager:
+            return None
+        
+        self._cache_bytes_since_enforce = 0
+        try:
+            stats = self.cache_manager.enforce(self.cache_store)
+        except Exception as e:
+            self.logger.error(f"Failed to enforce cache budget: {e}")
+            return None
+        
+        self.cache_eviction_count += stats.evictions
+        if stats.evictions:
+            self.logger.info(
+                f"Evicted {stats.evictions} cache entries ({stats.bytes_evicted:,} bytes), "
+                f"{stats.bytes:,} bytes remain"
+            )
+        return stats
+    
+    def load_stale_from_cache(self, cache_key: str) -> Optional[Dict]:
+        """Load an expired cache entry that carries ETag/Last-Modified validators"""
+        try:
+            cached_data = self.cache_store.load(cache_key)
+        except (KeyError, ValueError, TypeError) as e:
+            self.logger.warning(f"Invalid cache entry {cache_key}: {e}")
+            return None
+        
+        if cached_data and (cached_data.get('etag') or cached_data.get('last_modified')):
+            return cached_data
+        return None
+    
+    def get_conditional_headers(self, cached_data: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a cached entry"""
+        headers = {}
+        if cached_data:
+            if cached_data.get('etag'):
+                headers['If-None-Match'] = cached_data['etag']
+            if cached_data.get('last_modified'):
+                headers['If-Modified-Since'] = cached_data['last_modified']
+        return headers
+    
+    def _conditional_kwargs(self, stale_data: Optional[Dict], kwargs: Dict) -> Dict:
+        """Merge conditional headers into caller-supplied request kwargs"""
+        conditional_headers = self.get_conditional_headers(stale_data)
+        if not conditional_headers:
+            return kwargs
+        
+        request_kwargs = dict(kwargs)
+        request_kwargs['headers'] = {**(kwargs.get('headers') or {}), **conditional_headers}
+        return request_kwargs
+    
+    def _revalidated_response(self, cache_key: str, stale_data: Dict) -> requests.Response:
+        """Refresh a stale entry after a 304 Not Modified and serve its body"""
+        try:
+            self.cache_store.touch(cache_key)
+        except Exception as e:
+            self.logger.error(f"Failed to refresh cache entry {cache_key}: {e}")
+        
+        self.revalidation_count += 1
+        self.logger.debug(f"Revalidated cache entry {cache_key} (304 Not Modified)")
+        return self._response_from_cache(stale_data)
+    
+    def _response_from_cache(self, cached_data: Dict) -> requests.Response:
+        """Build a Response object from a cache entry"""
+        response = requests.Response()
+        response._content = cached_data['content'].encode(cached_data.get('encoding', 'utf-8'))
+        response.status_code = cached_data['status_code']
+        response.headers.update(cached_data.get('headers', {}))
+        response.url = cached_data['url']
+        response.encoding = cached_data.get('encoding', 'utf-8')
+        return response
+    
+    def _cache_response(self, cache_key: str, response: requests.Response):
+        """Cache a successful live response"""
+        self.save_to_cache(cache_key, {
+            'url': response.url,
+            'status_code': response.status_code,
+            'headers': response.headers,
+            'content': response.text,
+            'encoding': response.encoding,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        })
     
     def make_request(self, url: str, params: Optional[Dict] = None, 
                     cache_hours: int = 24, **kwargs) -> Optional[requests.Response]:
@@ -282,61 +532,295 @@ class BaseScraper(ABC):
         cached_data = self.load_from_cache(cache_key, cache_hours)
         
         if cached_data:
-            # Create mock response from cached data
-            response = requests.Response()
-            response._content = cached_data['content'].encode(cached_data.get('encoding', 'utf-8'))
-            response.status_code = cached_data['status_code']
-            response.headers.update(cached_data.get('headers', {}))
-            response.url = cached_data['url']
-            response.encoding = cached_data.get('encoding', 'utf-8')
-            return response
-        
-        # Apply rate limiting
-        self.rate_limit()
-        
-        # Make request with retries
+            return self._response_from_cache(cached_data)
+        
+        # Revalidate expired entries instead of refetching them outright
+        stale_data = self.load_stale_from_cache(cache_key)
+        request_kwargs = self._conditional_kwargs(stale_data, kwargs)
+        
+        host = urlparse(url).netloc
+        
         for attempt in range(self.max_retries + 1):
+            if not self.host_limiter.allow(host):
+                self._skip_request(host, url)
+                return None
+            self.host_limiter.acquire(host)
+            
             try:
                 self.logger.debug(f"Making request to {url} (attempt {attempt + 1})")
                 
+                started = time.monotonic()
                 response = self.session.get(
                     url, 
                     params=params,
                     timeout=self.timeout,
-                    **kwargs
+                    **request_kwargs
                 )
+                elapsed = time.monotonic() - started
                 
                 self.request_count += 1
                 
-                if response.status_code == 200:
-                    # Cache successful response
-                    self.save_to_cache(cache_key, {
-                        'url': response.url,
-                        'status_code': response.status_code,
-                        'headers': response.headers,
-                        'content': response.text,
-                        'encoding': response.encoding
-                    })
-                    
-                    return response
-                elif response.status_code in [403, 404, 410]:
-                    # Don't retry for these errors
-                    self.logger.warning(f"HTTP {response.status_code} for {url}")
+                result, retry = self._handle_response(
+                    host, url, cache_key, stale_data, response, elapsed
+                )
+                if result is not None:
+                    return result
+                if not retry:
                     break
-                else:
-                    self.logger.warning(f"HTTP {response.status_code} for {url}, retrying...")
                     
             except requests.exceptions.RequestException as e:
                 self.logger.warning(f"Request error for {url} (attempt {attempt + 1}): {e}")
+                self._record_failure(host, url)
+        
+        self.logger.error(f"Failed to fetch {url} after {self.max_retries + 1} attempts")
+        return None
+    
+    async def async_make_request(self, url: str, params: Optional[Dict] = None,
+                                 cache_hours: int = 24, **kwargs) -> Optional[requests.Response]:
+        """
+        Asynchronous counterpart of make_request.
+        
+        Cache lookups, status handling and retries behave exactly as in
+        make_request; the blocking HTTP call runs in a worker thread and
+        pacing is enforced per host by the adaptive limiter, so requests to
+        the same supplier stay paced while other work proceeds concurrently.
+        """
+        cache_key = self.get_cache_key(url, params)
+        cached_data = self.load_from_cache(cache_key, cache_hours)
+        
+        if cached_data:
+            return self._response_from_cache(cached_data)
+        
+        stale_data = self.load_stale_from_cache(cache_key)
+        request_kwargs = self._conditional_kwargs(stale_data, kwargs)
+        
+        host = urlparse(url).netloc
+        
+        for attempt in range(self.max_retries + 1):
+            if not self.host_limiter.allow(host):
+                self._skip_request(host, url)
+                return None
+            await self.host_limiter.acquire_async(host)
+            
+            try:
+                self.logger.debug(f"Making async request to {url} (attempt {attempt + 1})")
+                
+                started = time.monotonic()
+                response = await asyncio.to_thread(
+                    self.session.get,
+                    url,
+                    params=params,
+                    timeout=self.timeout,
+                    **request_kwargs
+                )
+                elapsed = time.monotonic() - started
+                
+                self.request_count += 1
                 
-                if attempt < self.max_retries:
-                    # Exponential backoff
-                    wait_time = (2 ** attempt) + random.uniform(0, 1)
-                    time.sleep(wait_time)
+                result, retry = self._handle_response(
+                    host, url, cache_key, stale_data, response, elapsed
+                )
+                if result is not None:
+                    return result
+                if not retry:
+                    break
+                    
+            except requests.exceptions.RequestException as e:
+                self.logger.warning(f"Request error for {url} (attempt {attempt + 1}): {e}")
+                self._record_failure(host, url)
         
         self.logger.error(f"Failed to fetch {url} after {self.max_retries + 1} attempts")
         return None
     
+    def _handle_response(self, host: str, url: str, cache_key: str, stale_data: Optional[Dict],
+                         response: requests.Response, elapsed: float):
+        """
+        Classify a live response and feed it to the host limiter.
+        
+        Returns (response to hand back or None, whether to retry):
+        - 200 and 304 (with a stale entry) succeed and may speed the host up
+        - 429 and 503 back the host off, honoring Retry-After, and retry
+        - other 5xx and 408 count as host failures and retry
+        - any other status will not change on retry
+        """
+        status = response.status_code
+        
+        if status == 200:
+            self.host_limiter.record_success(host, elapsed)
+            self._cache_response(cache_key, response)
+            return response, False
+        if status == 304 and stale_data:
+            self.host_limiter.record_success(host, elapsed)
+            return self._revalidated_response(cache_key, stale_data), False
+        
+        if status in THROTTLE_STATUS_KINDS:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            tripped = self.host_limiter.record_throttle(host, retry_after)
+            self._record_throttle(ThrottleEvent(
+                host=host, url=url, kind=THROTTLE_STATUS_KINDS[status], status_code=status,
+                retry_after=retry_after, delay=self.host_limiter.delay_for(host)
+            ))
+            self.logger.warning(
+                f"HTTP {status} for {url}, backing off"
+                + (f" {retry_after:.0f}s (Retry-After)" if retry_after is not None else "")
+            )
+            if tripped:
+                self._open_circuit(host, url)
+            return None, True
+        
+        if status >= 500 or status == 408:
+            self.logger.warning(f"HTTP {status} for {url}, retrying...")
+            self._record_failure(host, url)
+            return None, True
+        
+        # Don't retry client errors (403, 404, 410, ...)
+        self.logger.warning(f"HTTP {status} for {url}")
+        return None, False
+    
+    def _record_failure(self, host: str, url: str):
+        """Count a server error or connection failure against the host"""
+        if self.host_limiter.record_failure(host):
+            self._open_circuit(host, url)
+    
+    def _open_circuit(self, host: str, url: str):
+        """Record the host's circuit breaker opening"""
+        self._record_throttle(ThrottleEvent(
+            host=host, url=url, kind=THROTTLE_CIRCUIT_OPEN,
+            delay=self.host_limiter.delay_for(host)
+        ))
+        message = (f"Circuit breaker open for {host} after repeated failures; "
+                   f"skipping it for {self.host_limiter.cooldown:.0f}s")
+        self.logger.error(message)
+        if self.current_session:
+            self.current_session.errors.append(message)
+    
+    def _skip_request(self, host: str, url: str):
+        """Count a request not sent because the host's breaker is open"""
+        self.skipped_request_count += 1
+        self.logger.info(f"Skipping {url}: circuit breaker open for {host}")
+    
+    def _record_throttle(self, event: ThrottleEvent):
+        self.throttle_count += 1
+        if len(self.throttle_events) < MAX_THROTTLE_EVENTS:
+            self.throttle_events.append(event)
+    
+    async def async_fetch_many(self, urls: List[str], params: Optional[Dict] = None,
+                               cache_hours: int = 24, max_concurrency: Optional[int] = None,
+                               **kwargs) -> List[Optional[requests.Response]]:
+        """Fetch many URLs concurrently; results are returned in input order"""
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        
+        async def fetch(url: str) -> Optional[requests.Response]:
+            async with semaphore:
+                return await self.async_make_request(url, params, cache_hours, **kwargs)
+        
+        return await asyncio.gather(*(fetch(url) for url in urls))
+    
+    def fetch_many(self, urls: List[str], params: Optional[Dict] = None,
+                   cache_hours: int = 24, max_concurrency: Optional[int] = None,
+                   **kwargs) -> List[Optional[requests.Response]]:
+        """
+        Synchronous entry point for concurrent fetching.
+        
+        Runs its own event loop, so it must not be called from inside a
+        running loop - use async_fetch_many there instead.
+        """
+        if not urls:
+            return []
+        
+        return asyncio.run(self.async_fetch_many(
+            list(urls), params, cache_hours, max_concurrency, **kwargs
+        ))
+    
+    def run_pipeline(self, pages: Iterable[Tuple[str, Dict[str, Any]]],
+                     write: Optional[Callable[[List[PageResult]], None]] = None,
+                     write_batch_size: int = 25,
+                     cache_hours: int = 24) -> Iterator[PageResult]:
+        """
+        Fetch, parse and write pages as overlapping stages (see pipeline.py).
+        
+        pages yields (url, context) pairs. Pages are fetched concurrently
+        with async_make_request (revalidating the cached copy when the
+        context carries a sitemap 'lastmod' or is a scheduled 'refresh'),
+        parsed with parse_page in parse_workers threads, and passed in
+        batches of write_batch_size to write (e.g. checkpoint_pages) before
+        being yielded. Stage timings accumulate in pipeline_stats for the
+        session.
+        
+        With reuse_extractions, a page whose content hash matches the one
+        stored when it was last parsed yields the stored product instead of
+        being parsed again (see page_extractions.py).
+        """
+        version = self.extraction_version
+        known = (load_extractions(self.db_path, self.supplier_name, version)
+                 if self.reuse_extractions else None)
+        extracted: Dict[str, Extraction] = {}
+        reused = set()
+        
+        def parse(url: str, response, context: Dict[str, Any]) -> Optional[ScrapedProduct]:
+            if known is None:
+                return self.parse_page(url, response, context)
+            
+            # Hash the decoded text: live and cached responses carry the same text
+            digest = content_hash(response.text, version, context)
+            stored = known.get(url)
+            if stored and stored[0] == digest:
+                reused.add(url)
+                return self._stored_product(stored[1])
+            
+            product = self.parse_page(url, response, context)
+            extracted[url] = (digest, asdict(product) if product else None)
+            return product
+        
+        def write_batch(batch: List[PageResult]):
+            if write is not None:
+                write(batch)
+            # Only remembered once written, so a reused product was persisted before
+            record_extractions(self.db_path, self.supplier_name, version, {
+                result.url: extracted.pop(result.url) for result in batch if result.url in extracted
+            })
+            self.reused_page_count += sum(1 for result in batch if result.url in reused)
+        
+        pipeline = PagePipeline(
+            fetch=lambda url, context: self.async_make_request(
+                url, cache_hours=0 if context.get('lastmod') or context.get('refresh') else cache_hours
+            ),
+            parse=parse,
+            write=write_batch if known is not None else write,
+            concurrency=self.max_concurrency,
+            parse_workers=self.parse_workers,
+            queue_size=self.pipeline_queue_size,
+            write_batch_size=write_batch_size,
+            logger=self.logger
+        )
+        try:
+            yield from pipeline.run(pages)
+        finally:
+            self.pipeline_stats.add(pipeline.stats)
+            self.logger.info(f"Pipeline: {pipeline.stats.summary()}")
+    
+    @property
+    def extraction_version(self) -> str:
+        """Parser version and HTML backend, which stored extractions must match"""
+        return f"{self.parser_version}/{self.html_parser}"
+    
+    @staticmethod
+    def _stored_product(stored: Optional[Dict[str, Any]]) -> Optional[ScrapedProduct]:
+        """Rebuild a stored extraction as a product observed now"""
+        if stored is None:
+            return None
+        known_fields = {f.name for f in fields(ScrapedProduct)} - {'scraped_at'}
+        return ScrapedProduct(**{key: value for key, value in stored.items() if key in known_fields})
+    
+    def parse_html(self, response, only: ParseRestriction = None):
+        """
+        Parse a response (or raw markup) with this scraper's HTML parser.
+        
+        Pass only= a SoupStrainer or tag name(s) to build just the elements
+        the caller reads; everything else on the page is skipped.
+        """
+        return parse_html(response, self.html_parser, only)
+    
     def parse_price(self, price_text: str) -> Optional[float]:
         """Extract numeric price from text"""
         if not price_text:
@@ -395,188 +879,243 @@ class BaseScraper(ABC):
         
         return issues
     
-    def _get_or_create_session(self, conn: sqlite3.Connection, session_id: Optional[str]) -> Optional[int]:
-        """Get or create collection session and return database session ID"""
-        if not session_id:
-            return None
-            
-        conn.execute("""
-            INSERT OR IGNORE INTO collection_sessions 
-            (session_name, milestone, status)
-            VALUES (?, ?, ?)
-        """, (session_id, MILESTONE_DATA_COLLECTION, SESSION_STATUS_IN_PROGRESS))
-        
-        cursor = conn.execute(
-            "SELECT id FROM collection_sessions WHERE session_name = ?",
-            (session_id,)
-        )
-        session_row = cursor.fetchone()
-        return session_row[0] if session_row else None
-    
-    def _insert_cost_item(self, conn: sqlite3.Connection, product: ScrapedProduct) -> Optional[int]:
-        """Insert cost item and return the cost item ID"""
-        conn.execute("""
-            INSERT OR REPLACE INTO cost_items 
-            (item_id, item_name, category_id, specifications, notes, status)
-            VALUES (?, ?, 
-                   (SELECT id FROM cost_categories WHERE code = ? LIMIT 1), 
-                   ?, ?, ?)
-        """, (
-            product.item_id,
-            product.item_name,
-            product.category,
-            json.dumps(product.specifications) if product.specifications else None,
-            product.notes,
-            STATUS_ACTIVE
-        ))
+    @property
+    def bulk_writer(self) -> BulkProductWriter:
+        """Set-based writer for this scraper's database"""
+        if self._bulk_writer is None or self._bulk_writer.db_path != self.db_path:
+            self._bulk_writer = BulkProductWriter(self.db_path, self.supplier_name, self.logger)
+        return self._bulk_writer
+    
+    def save_products(self, products: List[ScrapedProduct], 
+                     session_id: Optional[str] = None) -> int:
+        """
+        Save scraped products to database.
+        
+        The whole list is written in one transaction by the bulk writer, or
+        by db_writer's thread when one is set.
+        Products whose price fingerprint matches the stored one are only
+        marked as seen. If the transaction fails (e.g. a constraint violation
+        on one product) it is rolled back and the products are written one
+        per transaction, so a bad product only costs itself.
+        """
+        if not products:
+            return 0
+        
+        session_id = session_id or (self.current_session.session_id if self.current_session else None)
         
-        cursor = conn.execute(
-            "SELECT id FROM cost_items WHERE item_id = ?",
-            (product.item_id,)
+        try:
+            stats = self._write_products(products, session_id)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Bulk save failed ({e}), saving products individually")
+            stats = self._save_products_individually(products, session_id)
+        
+        self.save_stats.add(stats)
+        self.logger.info(
+            f"Saved {stats.saved} products to database "
+            f"({stats.new} new, {stats.changed} changed, {stats.unchanged} unchanged)"
         )
-        cost_item_row = cursor.fetchone()
-        return cost_item_row[0] if cost_item_row else None
+        return stats.saved
     
-    def _insert_pricing(self, conn: sqlite3.Connection, cost_item_id: int, product: ScrapedProduct) -> Optional[int]:
-        """Insert pricing information and return pricing ID"""
-        if product.unit_cost is None:
-            return None
-            
-        conn.execute("""
-            INSERT INTO cost_pricing 
-            (cost_item_id, unit_cost, unit, effective_date, confidence_level)
-            VALUES (?, ?, ?, DATE('now'), ?)
-        """, (
-            cost_item_id,
-            product.unit_cost,
-            product.unit or DEFAULT_UNIT,
-            product.confidence_level
-        ))
+    def _save_products_individually(self, products: List[ScrapedProduct],
+                                    session_id: Optional[str]) -> SaveStats:
+        """Write each product in its own transaction, skipping those that fail"""
+        stats = SaveStats()
+        for product in products:
+            try:
+                stats.add(self._write_products([product], session_id))
+            except sqlite3.Error as e:
+                self.logger.error(f"Database error saving product {product.item_id}: {e}")
+                stats.skipped += 1
+        return stats
+    
+    def _write_products(self, products: List[ScrapedProduct], session_id: Optional[str]) -> SaveStats:
+        """One transaction of products, on the shared writer thread if there is one"""
+        if self.db_writer is not None:
+            return self.db_writer.write_products(self.supplier_name, products, session_id).result()
+        return self.bulk_writer.write(products, session_id)
+    
+    @property
+    def frontier(self) -> CrawlFrontier:
+        """Crawl frontier checkpoint for the current session"""
+        if not self.current_session:
+            raise ValueError("No active session for crawl checkpoints")
+        if self._frontier is None:
+            self._frontier = CrawlFrontier(self.db_path, self.current_session.session_id,
+                                           self.supplier_name)
+        return self._frontier
+    
+    def checkpoint_products(self, products_by_url: Dict[str, ScrapedProduct]) -> int:
+        """
+        Persist products now and record their URLs as done in the crawl
+        frontier, so a resumed session skips them. run_scraping_session will
+        not save these products a second time.
+        """
+        if not products_by_url:
+            return 0
         
-        cursor = conn.execute(
-            "SELECT id FROM cost_pricing WHERE cost_item_id = ? ORDER BY id DESC LIMIT 1",
-            (cost_item_id,)
-        )
-        pricing_row = cursor.fetchone()
-        return pricing_row[0] if pricing_row else None
+        saved_count = self.persist_products(list(products_by_url.values()))
+        self.current_session.products_saved += saved_count
+        self.frontier.mark_persisted({url: p.item_id for url, p in products_by_url.items()})
+        self._checkpointed_item_ids.update(p.item_id for p in products_by_url.values())
+        return saved_count
     
-    def _insert_source_reference(self, conn: sqlite3.Connection, pricing_id: int, product: ScrapedProduct) -> bool:
-        """Insert source reference and return success status"""
-        if not product.source_url:
-            return False
-            
-        # Get or create source
-        conn.execute("""
-            INSERT OR IGNORE INTO sources (company_name, company_type, tier)
-            VALUES (?, ?, ?)
-        """, (self.supplier_name, COMPANY_TYPE_SUPPLIER, SOURCE_TIER_PRIMARY))
-        
-        cursor = conn.execute(
-            "SELECT id FROM sources WHERE company_name = ?",
-            (self.supplier_name,)
-        )
-        source_row = cursor.fetchone()
-        source_id = source_row[0] if source_row else None
+    def checkpoint_pages(self, results: List[PageResult]) -> int:
+        """
+        Checkpoint a batch of pipeline results in the crawl frontier.
         
-        if not source_id:
-            return False
-            
-        conn.execute("""
-            INSERT INTO source_references 
-            (cost_pricing_id, source_id, reference_type, source_url, 
-             product_code, date_accessed)
-            VALUES (?, ?, ?, ?, ?, DATE('now'))
-        """, (
-            pricing_id, source_id, REFERENCE_TYPE_PRIMARY, product.source_url,
-            product.product_code
-        ))
+        Pages with a product are persisted, fetched pages without one are
+        marked visited, and pages that could not be fetched are marked
+        failed so a resumed session retries them. The sitemap lastmod of
+        fetched pages (context key 'lastmod') is recorded for discover_urls.
+        """
+        found = {result.url: result.product for result in results if result.product}
+        saved_count = self.checkpoint_products(found)
+        self.frontier.mark_visited([r.url for r in results if r.fetched and not r.product])
+        self.frontier.mark_failed([r.url for r in results if not r.fetched])
         
-        return True
-    
-    def _log_collection_activity(self, conn: sqlite3.Connection, db_session_id: int, 
-                               cost_item_id: int, product: ScrapedProduct) -> None:
-        """Log collection activity for audit trail"""
-        conn.execute("""
-            INSERT INTO collection_log 
-            (session_id, cost_item_id, action_type, new_values)
-            VALUES (?, ?, ?, ?)
-        """, (
-            db_session_id, cost_item_id, ACTIVITY_TYPE_CREATED,
-            json.dumps(asdict(product))
-        ))
+        # Pages queued from a sitemap are not refetched until their lastmod moves on
+        record_fetched(self.db_path, self.supplier_name, {
+            r.url: r.context['lastmod'] for r in results if r.fetched and r.context.get('lastmod')
+        })
+        return saved_count
     
-    def save_products(self, products: List[ScrapedProduct], 
-                     session_id: Optional[str] = None) -> int:
-        """Save scraped products to database"""
-        if not products:
-            return 0
+    def discover_urls(self, url_filter: Optional[Callable[[str], bool]] = None,
+                      changed_only: bool = True) -> Optional[List[SitemapEntry]]:
+        """
+        Page URLs listed in the site's sitemaps (see discovery.py).
         
-        session_id = session_id or (self.current_session.session_id if self.current_session else None)
-        saved_count = 0
+        robots.txt and sitemaps are revalidated on every call. With
+        changed_only, URLs whose lastmod has not moved on since they were
+        last fetched are left out. Returns None when the site has no
+        readable sitemap, so the caller can fall back to crawling.
+        """
+        discovery = SitemapDiscovery(
+            self.base_url, lambda url: self.make_request(url, cache_hours=0), logger=self.logger
+        )
+        entries = discovery.discover()
+        if entries is None:
+            self.logger.info(f"No sitemap found for {self.base_url}")
+            return None
         
-        with sqlite3.connect(self.db_path) as conn:
-            db_session_id = self._get_or_create_session(conn, session_id)
-            
-            for product in products:
-                try:
-                    # Insert cost item
-                    cost_item_id = self._insert_cost_item(conn, product)
-                    if not cost_item_id:
-                        continue
-                    
-                    # Insert pricing and source reference if available
-                    pricing_id = self._insert_pricing(conn, cost_item_id, product)
-                    if pricing_id:
-                        self._insert_source_reference(conn, pricing_id, product)
-                    
-                    # Log collection activity
-                    if db_session_id:
-                        self._log_collection_activity(conn, db_session_id, cost_item_id, product)
-                    
-                    saved_count += 1
-                    
-                except sqlite3.Error as e:
-                    self.logger.error(f"Database error saving product {product.item_id}: {e}")
-                    continue
-            
-            conn.commit()
+        if url_filter:
+            entries = [entry for entry in entries if url_filter(entry.loc)]
+        if changed_only:
+            total = len(entries)
+            entries = changed_entries(self.db_path, self.supplier_name, entries)
+            self.logger.info(f"{len(entries)} of {total} sitemap URLs changed since last fetched")
+        return entries
+    
+    def plan_refresh(self, budget: int) -> FetchPlan:
+        """
+        This supplier's items most in need of a refresh, within budget page
+        fetches (see scheduler.py).
+        """
+        return RescrapeScheduler(self.db_path, logger=self.logger).plan(
+            budget, supplier=self.supplier_name
+        )
+    
+    def persist_products(self, products: List[ScrapedProduct]) -> int:
+        """Save products for the current session, via product_sink when one is set"""
+        if self.product_sink is None:
+            return self.save_products(products)
         
-        self.logger.info(f"Saved {saved_count} products to database")
-        return saved_count
+        session_id = self.current_session.session_id if self.current_session else None
+        return self.product_sink(products, session_id)
+    
+    def parse_page(self, url: str, response: requests.Response,
+                   context: Dict[str, Any]) -> Optional[ScrapedProduct]:
+        """
+        Parse one fetched page into a product; None if it holds none.
+        
+        This is the parse hook of run_pipeline and offline replay, and may
+        run in several threads at once. context is what was queued with the
+        URL (e.g. the crawl frontier context). The default extracts nothing.
+        """
+        return None
+    
+    def parse_cached_page(self, response: requests.Response,
+                          context: Dict[str, Any]) -> Optional[ScrapedProduct]:
+        """
+        Rebuild a product from a cached response for offline replay.
+        
+        context holds what was recorded for the URL in the crawl frontier
+        (empty if none). Defaults to parse_page.
+        """
+        return self.parse_page(response.url, response, context)
+    
+    def replay_cache(self, workers: Optional[int] = None, batch_size: int = 200,
+                     apply: bool = False):
+        """Re-extract products from this scraper's cache offline; see replay.py"""
+        from scripts.scrapers.replay import replay_cache
+        return replay_cache(self, workers=workers, batch_size=batch_size, apply=apply)
     
     @abstractmethod
-    def scrape_products(self, **kwargs) -> List[ScrapedProduct]:
+    def scrape_products(self, **kwargs) -> Iterable[ScrapedProduct]:
         """
         Abstract method to be implemented by concrete scrapers.
-        Should return a list of ScrapedProduct objects.
+        Should yield ScrapedProduct objects as they are scraped (returning
+        a list also works, but holds the whole catalog in memory).
         """
         pass
     
-    def run_scraping_session(self, **kwargs) -> ScrapingResult:
+    def _record_product(self, product: ScrapedProduct):
+        """Count and validate a scraped product, keeping only a sample"""
+        session = self.current_session
+        session.products_count += 1
+        if len(session.products_scraped) < self.product_sample_size:
+            session.products_scraped.append(product)
+        
+        for issue in self.validate_product(product):
+            session.warning_count += 1
+            if len(session.warnings) < MAX_SESSION_WARNINGS:
+                session.warnings.append(f"{product.item_id}: {issue}")
+    
+    def _save_chunk(self, products: List[ScrapedProduct]):
+        """Persist one chunk of a streaming session"""
+        saved_count = self.persist_products(products)
+        self.current_session.products_saved += saved_count
+        self.logger.info(f"Saved {saved_count}/{len(products)} products")
+    
+    def run_scraping_session(self, resume_session_id: Optional[str] = None, **kwargs) -> ScrapingResult:
         """
-        Run complete scraping session with proper session management
+        Run complete scraping session with proper session management.
+        
+        Pass resume_session_id to continue an interrupted session from its
+        crawl checkpoint (scrapers that use self.frontier only).
         """
-        self.start_session()
+        if resume_session_id and not CrawlFrontier.exists(self.db_path, resume_session_id):
+            raise ValueError(f"No crawl checkpoint found for session {resume_session_id}")
+        
+        self.start_session(resume_session_id)
         exception_occurred = None
         
+        if resume_session_id:
+            requeued = self.frontier.requeue_failed()
+            self.logger.info(
+                f"Resuming from checkpoint: {self.frontier.counts()} "
+                f"({requeued} failed URLs requeued)"
+            )
+        
         try:
-            # Run the actual scraping
-            products = self.scrape_products(**kwargs)
-            
-            # Validate products
-            for product in products:
-                issues = self.validate_product(product)
-                if issues:
-                    self.current_session.warnings.extend([
-                        f"{product.item_id}: {issue}" for issue in issues
-                    ])
+            # Validate and save products in chunks as the scraper produces them,
+            # so memory stays bounded and progress is durable
+            chunk = []
+            for product in self.scrape_products(**kwargs):
+                self._record_product(product)
+                
+                if product.item_id in self._checkpointed_item_ids:
+                    continue
+                
+                chunk.append(product)
+                if len(chunk) >= self.save_chunk_size:
+                    self._save_chunk(chunk)
+                    chunk = []
             
-            # Save to database
-            if products:
-                saved_count = self.save_products(products)
-                self.logger.info(f"Saved {saved_count}/{len(products)} products")
+            if chunk:
+                self._save_chunk(chunk)
             
-            self.current_session.products_scraped = products
+            if self._frontier:
+                self._frontier.complete()
             
         except Exception as e:
             self.logger.error(f"Scraping session failed: {e}")
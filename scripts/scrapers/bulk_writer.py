@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Bulk Product Writer
+
+Set-based persistence for scraped products. A chunk of products is written
+in one transaction with a fixed number of statements, independent of the
+chunk size:
+
+1. Existing fingerprints and item details for the chunk are read in one
+   query and each product is classified as new, changed or unchanged
+2. Unchanged items only get last_seen_at touched in item_fingerprints
+3. New and changed items are upserted into cost_items from a JSON array
+   (INSERT ... SELECT FROM json_each ... ON CONFLICT(item_id) DO UPDATE
+   ... RETURNING id, item_id); items whose specifications changed get
+   their item_attributes re-parsed (see item_attributes.py)
+4. cost_pricing rows are inserted the same way, RETURNING the new ids, for
+   items whose fingerprint changed; write() validates them in one statement
+   at the end (see validation/pricing_validation.py)
+5. source_references, collection_log and item_fingerprints rows are
+   written with executemany
+
+A fingerprint covers (unit_cost, unit, currency, specifications), so
+re-scraping an unchanged catalog adds no pricing history. A changed name,
+category or notes with the same fingerprint, or an inactive item seen
+again, updates the item only (and makes it active).
+
+Category, source and session ids are resolved once and kept in memory,
+so no per-product lookups are needed.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.constants import (
+    STATUS_ACTIVE, COMPANY_TYPE_SUPPLIER, SOURCE_TIER_PRIMARY,
+    MILESTONE_DATA_COLLECTION, SESSION_STATUS_IN_PROGRESS,
+    REFERENCE_TYPE_PRIMARY, ACTIVITY_TYPE_CREATED, ACTIVITY_TYPE_UPDATED,
+    DEFAULT_UNIT, DEFAULT_CURRENCY
+)
+from scripts.db import get_connection
+from scripts.item_attributes import refresh_attributes
+from scripts.schema_migrations import apply_migrations
+from scripts.validation.pricing_validation import deferred_validation
+
+
+@dataclass
+class SaveStats:
+    """Outcome of writing products, by change-detection class"""
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+
+    @property
+    def saved(self) -> int:
+        return self.new + self.changed + self.unchanged
+
+    def add(self, other: 'SaveStats'):
+        self.new += other.new
+        self.changed += other.changed
+        self.unchanged += other.unchanged
+        self.skipped += other.skipped
+
+
+def price_fingerprint(product) -> str:
+    """Fingerprint of the product fields whose change warrants a new price row"""
+    payload = json.dumps([
+        round(float(product.unit_cost), 2) if product.unit_cost is not None else None,
+        product.unit or DEFAULT_UNIT,
+        product.currency or DEFAULT_CURRENCY,
+        product.specifications or None
+    ], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class BulkProductWriter:
+    """Writes chunks of ScrapedProducts for one supplier"""
+
+    def __init__(self, db_path: str, supplier_name: str, logger: Optional[logging.Logger] = None):
+        self.db_path = db_path
+        self.supplier_name = supplier_name
+        self.logger = logger or logging.getLogger(f"bulk_writer.{supplier_name.lower()}")
+
+        # In-memory id maps, filled on first use
+        self._category_ids: Optional[Dict[str, int]] = None
+        self._source_id: Optional[int] = None
+        self._session_ids: Dict[str, int] = {}
+        self._migrated = False
+
+    def _load_category_ids(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        if self._category_ids is None:
+            # Same resolution as a per-row "WHERE code = ? LIMIT 1" lookup
+            self._category_ids = dict(conn.execute(
+                "SELECT code, MIN(id) FROM cost_categories GROUP BY code"
+            ).fetchall())
+        return self._category_ids
+
+    def _get_source_id(self, conn: sqlite3.Connection) -> int:
+        if self._source_id is None:
+            conn.execute("""
+                INSERT OR IGNORE INTO sources (company_name, company_type, tier)
+                VALUES (?, ?, ?)
+            """, (self.supplier_name, COMPANY_TYPE_SUPPLIER, SOURCE_TIER_PRIMARY))
+            self._source_id = conn.execute(
+                "SELECT id FROM sources WHERE company_name = ?", (self.supplier_name,)
+            ).fetchone()[0]
+        return self._source_id
+
+    def _get_session_id(self, conn: sqlite3.Connection, session_id: Optional[str]) -> Optional[int]:
+        if not session_id:
+            return None
+        if session_id not in self._session_ids:
+            conn.execute("""
+                INSERT OR IGNORE INTO collection_sessions
+                (session_name, milestone, status)
+                VALUES (?, ?, ?)
+            """, (session_id, MILESTONE_DATA_COLLECTION, SESSION_STATUS_IN_PROGRESS))
+            row = conn.execute(
+                "SELECT id FROM collection_sessions WHERE session_name = ?", (session_id,)
+            ).fetchone()
+            if not row:
+                return None
+            self._session_ids[session_id] = row[0]
+        return self._session_ids[session_id]
+
+    def write(self, products: List, session_id: Optional[str] = None) -> SaveStats:
+        """
+        Write products in a single transaction and return what was saved.
+
+        Products whose category is unknown are skipped and logged. Within a
+        chunk the last product for a given item_id wins. Any database error
+        rolls the whole chunk back and is re-raised.
+        """
+        if not products:
+            return SaveStats()
+
+        try:
+            with get_connection(self.db_path) as conn:
+                if not self._migrated:
+                    apply_migrations(conn)
+                    self._migrated = True
+                conn.execute("BEGIN")
+                with deferred_validation(conn):
+                    return self._write(conn, products, session_id)
+        except Exception:
+            self.forget_ids()
+            raise
+
+    def write_in_transaction(self, conn: sqlite3.Connection, products: List,
+                             session_id: Optional[str] = None) -> SaveStats:
+        """
+        Write products inside a transaction the caller owns (see db_writer.py).
+
+        Nothing is committed or rolled back here; a caller that rolls back
+        must call forget_ids().
+        """
+        if not products:
+            return SaveStats()
+        return self._write(conn, products, session_id)
+
+    def forget_ids(self):
+        """Drop cached ids that may refer to rows of a rolled back transaction"""
+        self._source_id = None
+        self._session_ids.clear()
+
+    def _write(self, conn: sqlite3.Connection, products: List, session_id: Optional[str]) -> SaveStats:
+        stats = SaveStats()
+        category_ids = self._load_category_ids(conn)
+
+        # Keep the last occurrence of each item_id, in first-seen order
+        by_item_id = {}
+        for product in products:
+            if product.category not in category_ids:
+                self.logger.error(
+                    f"Database error saving product {product.item_id}: "
+                    f"unknown category '{product.category}'"
+                )
+                stats.skipped += 1
+                continue
+            by_item_id[product.item_id] = product
+        if not by_item_id:
+            return stats
+
+        # 1. Classify against the stored fingerprints and item details
+        fingerprints = {item_id: price_fingerprint(p) for item_id, p in by_item_id.items()}
+        existing = {row[0]: row[1:] for row in conn.execute("""
+            SELECT ci.item_id, f.fingerprint, ci.item_name, ci.category_id, ci.notes, ci.status
+            FROM cost_items ci
+            LEFT JOIN item_fingerprints f ON f.cost_item_id = ci.id
+            WHERE ci.item_id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(by_item_id)),))}
+
+        products, repriced, unchanged = [], set(), []
+        for item_id, product in by_item_id.items():
+            if item_id not in existing:
+                stats.new += 1
+                repriced.add(item_id)
+                products.append(product)
+                continue
+
+            fingerprint, item_name, category_id, notes, status = existing[item_id]
+            if fingerprint != fingerprints[item_id]:
+                repriced.add(item_id)
+            elif (item_name, category_id, notes, status) == (
+                    product.item_name, category_ids[product.category], product.notes, STATUS_ACTIVE):
+                unchanged.append(item_id)
+                continue
+            # Details-only changes (including reactivating a deprecated or
+            # pending item) update the item but add no pricing row
+            stats.changed += 1
+            products.append(product)
+        stats.unchanged = len(unchanged)
+
+        # 2. Unchanged items: touch only
+        if unchanged:
+            conn.execute("""
+                UPDATE item_fingerprints SET last_seen_at = CURRENT_TIMESTAMP
+                WHERE cost_item_id IN (
+                    SELECT id FROM cost_items WHERE item_id IN (SELECT value FROM json_each(?))
+                )
+            """, (json.dumps(unchanged),))
+        if not products:
+            return stats
+
+        # 3. Upsert cost items and map item_id -> cost_items.id
+        item_rows = [{
+            'item_id': p.item_id,
+            'item_name': p.item_name,
+            'category_id': category_ids[p.category],
+            'specifications': json.dumps(p.specifications) if p.specifications else None,
+            'notes': p.notes,
+            'status': STATUS_ACTIVE
+        } for p in products]
+
+        cost_item_ids = dict((item_id, row_id) for row_id, item_id in conn.execute("""
+            INSERT INTO cost_items (item_id, item_name, category_id, specifications, notes, status)
+            SELECT value ->> 'item_id', value ->> 'item_name', value ->> 'category_id',
+                   value ->> 'specifications', value ->> 'notes', value ->> 'status'
+            FROM json_each(?)
+            WHERE true
+            ON CONFLICT(item_id) DO UPDATE SET
+                item_name = excluded.item_name,
+                category_id = excluded.category_id,
+                specifications = excluded.specifications,
+                notes = excluded.notes,
+                status = excluded.status
+            RETURNING id, item_id
+        """, (json.dumps(item_rows),)).fetchall())
+
+        # Typed attributes of items whose specifications changed
+        refresh_attributes(conn)
+
+        # 4. Insert pricing for priced products and map cost_item_id -> pricing id
+        pricing_rows = [{
+            'cost_item_id': cost_item_ids[p.item_id],
+            'unit_cost': p.unit_cost,
+            'unit': p.unit or DEFAULT_UNIT,
+            'currency': p.currency or DEFAULT_CURRENCY,
+            'confidence_level': p.confidence_level
+        } for p in products if p.unit_cost is not None and p.item_id in repriced]
+
+        pricing_ids = {}
+        if pricing_rows:
+            pricing_ids = dict((cost_item_id, row_id) for row_id, cost_item_id in conn.execute("""
+                INSERT INTO cost_pricing
+                (cost_item_id, unit_cost, unit, currency, effective_date, confidence_level)
+                SELECT value ->> 'cost_item_id', value ->> 'unit_cost', value ->> 'unit',
+                       value ->> 'currency', DATE('now'), value ->> 'confidence_level'
+                FROM json_each(?)
+                RETURNING id, cost_item_id
+            """, (json.dumps(pricing_rows),)).fetchall())
+
+        # 5. Source references for newly priced products with a URL
+        referenced = [p for p in products
+                      if cost_item_ids[p.item_id] in pricing_ids and p.source_url]
+        if referenced:
+            source_id = self._get_source_id(conn)
+            conn.executemany("""
+                INSERT INTO source_references
+                (cost_pricing_id, source_id, reference_type, source_url,
+                 product_code, date_accessed)
+                VALUES (?, ?, ?, ?, ?, DATE('now'))
+            """, [(pricing_ids[cost_item_ids[p.item_id]], source_id, REFERENCE_TYPE_PRIMARY,
+                   p.source_url, p.product_code) for p in referenced])
+
+        # Collection activity log
+        db_session_id = self._get_session_id(conn, session_id)
+        if db_session_id:
+            conn.executemany("""
+                INSERT INTO collection_log
+                (session_id, cost_item_id, action_type, new_values)
+                VALUES (?, ?, ?, ?)
+            """, [(db_session_id, cost_item_ids[p.item_id],
+                   ACTIVITY_TYPE_UPDATED if p.item_id in existing else ACTIVITY_TYPE_CREATED,
+                   json.dumps(asdict(p))) for p in products])
+
+        # Remember what was observed
+        conn.executemany("""
+            INSERT INTO item_fingerprints (cost_item_id, fingerprint)
+            VALUES (?, ?)
+            ON CONFLICT(cost_item_id) DO UPDATE SET
+                last_changed_at = CASE WHEN fingerprint = excluded.fingerprint
+                                       THEN last_changed_at ELSE CURRENT_TIMESTAMP END,
+                fingerprint = excluded.fingerprint,
+                last_seen_at = CURRENT_TIMESTAMP
+        """, [(cost_item_ids[p.item_id], fingerprints[p.item_id]) for p in products])
+
+        return stats
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Response Cache Budgets
+
+Keeps scraper response caches within byte budgets. Eviction runs in two
+passes: entries older than the TTL are dropped first, then the least
+recently used entries until the cache fits its budget. Each supplier's
+cache has its own budget; the compact command additionally applies a
+global budget across all suppliers.
+
+Usage:
+    python scripts/scrapers/cache_manager.py compact [--cache-root data/cache]
+        [--supplier-budget-mb 256] [--total-budget-mb 2048] [--ttl-hours 168]
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.scrapers.cache_store import (
+    CacheEntryInfo, CacheStore, JsonFileCacheStore, SQLiteCacheStore, SQLITE_CACHE_FILENAME
+)
+
+DEFAULT_SUPPLIER_BUDGET_MB = 256
+DEFAULT_TOTAL_BUDGET_MB = 2048
+DEFAULT_TTL_HOURS = 24 * 7
+
+BYTES_PER_MB = 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    """Outcome of enforcing a budget on one or more cache stores"""
+    entries: int = 0          # entries left after eviction
+    bytes: int = 0            # bytes left after eviction
+    expired_evictions: int = 0
+    lru_evictions: int = 0
+    bytes_evicted: int = 0
+
+    @property
+    def evictions(self) -> int:
+        return self.expired_evictions + self.lru_evictions
+
+
+class CacheManager:
+    """
+    Applies a byte budget and TTL to a set of cache stores.
+
+    Either limit may be None to disable it. Stores are treated as one pool,
+    so a supplier with both a JSON and a packed cache shares one budget.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, ttl_hours: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.ttl_hours = ttl_hours
+
+    def plan_evictions(self, entries: List[Tuple[CacheStore, CacheEntryInfo]],
+                       now: Optional[datetime] = None
+                       ) -> Tuple[List[Tuple[CacheStore, CacheEntryInfo]],
+                                  List[Tuple[CacheStore, CacheEntryInfo]],
+                                  List[Tuple[CacheStore, CacheEntryInfo]]]:
+        """Split entries into (expired, least recently used, kept)"""
+        expired = []
+        kept = list(entries)
+
+        if self.ttl_hours is not None:
+            cutoff = (now or datetime.now()) - timedelta(hours=self.ttl_hours)
+            expired = [item for item in kept if item[1].timestamp < cutoff]
+            kept = [item for item in kept if item[1].timestamp >= cutoff]
+
+        lru = []
+        if self.max_bytes is not None:
+            kept.sort(key=lambda item: item[1].last_accessed)
+            total = sum(info.size_bytes for _, info in kept)
+            evict_count = 0
+            while total > self.max_bytes and evict_count < len(kept):
+                total -= kept[evict_count][1].size_bytes
+                evict_count += 1
+            lru, kept = kept[:evict_count], kept[evict_count:]
+
+        return expired, lru, kept
+
+    def enforce(self, stores: Union[CacheStore, Sequence[CacheStore]],
+                now: Optional[datetime] = None) -> CacheStats:
+        """Evict expired, then least recently used, entries until within budget"""
+        if isinstance(stores, CacheStore):
+            stores = [stores]
+
+        entries = [(store, info) for store in stores for info in store.entries()]
+        expired, lru, kept = self.plan_evictions(entries, now)
+        evict_entries(expired + lru)
+
+        return CacheStats(
+            entries=len(kept),
+            bytes=sum(info.size_bytes for _, info in kept),
+            expired_evictions=len(expired),
+            lru_evictions=len(lru),
+            bytes_evicted=sum(info.size_bytes for _, info in expired + lru)
+        )
+
+
+def evict_entries(entries: List[Tuple[CacheStore, CacheEntryInfo]]):
+    """Delete entries, batching the deletes per store"""
+    by_store: Dict[int, Tuple[CacheStore, List[str]]] = {}
+    for store, info in entries:
+        by_store.setdefault(id(store), (store, []))[1].append(info.cache_key)
+
+    for store, cache_keys in by_store.values():
+        store.delete_many(cache_keys)
+
+
+def open_supplier_stores(cache_dir: Path) -> List[CacheStore]:
+    """Open whichever cache backends exist in a supplier cache directory"""
+    stores: List[CacheStore] = []
+    if any(cache_dir.glob('*.json')):
+        stores.append(JsonFileCacheStore(cache_dir))
+    if (cache_dir / SQLITE_CACHE_FILENAME).exists():
+        stores.append(SQLiteCacheStore(cache_dir / SQLITE_CACHE_FILENAME))
+    return stores
+
+
+def disk_usage(cache_dir: Path) -> int:
+    """Bytes used on disk by a cache directory"""
+    return sum(path.stat().st_size for path in cache_dir.iterdir() if path.is_file())
+
+
+def compact_cache(cache_root: Union[str, Path],
+                  supplier_budget_bytes: Optional[int] = None,
+                  total_budget_bytes: Optional[int] = None,
+                  ttl_hours: Optional[float] = None) -> Dict[str, CacheStats]:
+    """
+    Enforce per-supplier and global budgets over every cache under cache_root.
+
+    Suppliers are first trimmed to their own budget (TTL, then LRU); if the
+    remainder still exceeds the global budget, the least recently used
+    entries across all suppliers go next. Packed stores are vacuumed so the
+    space is actually returned. Returns stats keyed by supplier directory.
+    """
+    cache_root = Path(cache_root)
+    supplier_manager = CacheManager(supplier_budget_bytes, ttl_hours)
+    global_manager = CacheManager(total_budget_bytes)
+
+    results: Dict[str, CacheStats] = {}
+    supplier_stores: Dict[str, List[CacheStore]] = {}
+
+    for cache_dir in sorted(path for path in cache_root.iterdir() if path.is_dir()):
+        stores = open_supplier_stores(cache_dir)
+        if stores:
+            supplier_stores[cache_dir.name] = stores
+            results[cache_dir.name] = supplier_manager.enforce(stores)
+
+    # Global pass over whatever survived the per-supplier pass
+    store_owner = {id(store): name for name, stores in supplier_stores.items() for store in stores}
+    entries = [(store, info)
+               for stores in supplier_stores.values()
+               for store in stores
+               for info in store.entries()]
+    _, lru, _ = global_manager.plan_evictions(entries)
+    evict_entries(lru)
+
+    for store, info in lru:
+        stats = results[store_owner[id(store)]]
+        stats.lru_evictions += 1
+        stats.entries -= 1
+        stats.bytes -= info.size_bytes
+        stats.bytes_evicted += info.size_bytes
+
+    for stores in supplier_stores.values():
+        for store in stores:
+            store.vacuum()
+            store.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Enforce size budgets on Terra35 scraper caches')
+    parser.add_argument('command', choices=['compact'],
+                       help='compact: evict expired and least recently used entries')
+    parser.add_argument('--cache-root', default=str(project_root / 'data' / 'cache'),
+                       help='Directory containing one cache directory per supplier')
+    parser.add_argument('--supplier-budget-mb', type=float, default=DEFAULT_SUPPLIER_BUDGET_MB,
+                       help='Maximum cache size per supplier in MB')
+    parser.add_argument('--total-budget-mb', type=float, default=DEFAULT_TOTAL_BUDGET_MB,
+                       help='Maximum cache size across all suppliers in MB')
+    parser.add_argument('--ttl-hours', type=float, default=DEFAULT_TTL_HOURS,
+                       help='Evict entries fetched longer ago than this')
+
+    args = parser.parse_args()
+    cache_root = Path(args.cache_root)
+
+    if not cache_root.exists():
+        print(f"Cache root not found: {cache_root}")
+        sys.exit(1)
+
+    supplier_dirs = [path for path in cache_root.iterdir() if path.is_dir()]
+    bytes_before = {path.name: disk_usage(path) for path in supplier_dirs}
+
+    results = compact_cache(
+        cache_root,
+        supplier_budget_bytes=int(args.supplier_budget_mb * BYTES_PER_MB),
+        total_budget_bytes=int(args.total_budget_mb * BYTES_PER_MB),
+        ttl_hours=args.ttl_hours
+    )
+
+    total_reclaimed = 0
+    for name, stats in results.items():
+        reclaimed = bytes_before[name] - disk_usage(cache_root / name)
+        total_reclaimed += reclaimed
+        print(f"{name}: {stats.entries} entries kept ({stats.bytes:,} bytes), "
+              f"{stats.expired_evictions} expired and {stats.lru_evictions} LRU evictions, "
+              f"{reclaimed:,} bytes reclaimed on disk")
+
+    print(f"Total reclaimed: {total_reclaimed:,} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Response Cache Stores
+
+Pluggable storage backends for BaseScraper's HTTP response cache.
+
+Backends:
+- JsonFileCacheStore: one pretty-printed JSON file per response (legacy layout)
+- SQLiteCacheStore: a single SQLite file per supplier with zlib-compressed
+  bodies and an indexed (cache_key, timestamp) table, so expiry checks
+  never read the body
+
+Usage:
+    python scripts/scrapers/cache_store.py migrate [--cache-root data/cache] [--remove-json]
+    python scripts/scrapers/cache_store.py stats [--cache-root data/cache]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+CACHE_BACKEND_JSON = 'json'
+CACHE_BACKEND_SQLITE = 'sqlite'
+
+SQLITE_CACHE_FILENAME = 'responses.db'
+
+
+@dataclass
+class CacheEntryInfo:
+    """Bookkeeping for one cache entry, used by eviction"""
+    cache_key: str
+    timestamp: datetime        # when the response was fetched or last revalidated
+    last_accessed: datetime    # when the entry was last written or served
+    size_bytes: int            # bytes the entry occupies in the store
+
+
+class CacheStore(ABC):
+    """
+    Abstract response cache backend.
+
+    Entries are dictionaries with the keys written by BaseScraper.save_to_cache:
+    timestamp, url, status_code, headers, content, encoding and the HTTP
+    validators etag and last_modified. Implementations raise ValueError (or
+    a subclass) for corrupt entries.
+    """
+
+    @abstractmethod
+    def get_timestamp(self, cache_key: str) -> Optional[datetime]:
+        """Return when the entry was cached, or None if it does not exist"""
+
+    @abstractmethod
+    def load(self, cache_key: str) -> Optional[Dict]:
+        """Return the full cache entry, or None if it does not exist"""
+
+    @abstractmethod
+    def save(self, cache_key: str, cached_data: Dict):
+        """Store a cache entry, replacing any existing one"""
+
+    @abstractmethod
+    def touch(self, cache_key: str, timestamp: Optional[datetime] = None):
+        """Reset an entry's timestamp (e.g. after a 304 revalidation)"""
+
+    @abstractmethod
+    def delete(self, cache_key: str):
+        """Remove an entry if present"""
+
+    @abstractmethod
+    def keys(self) -> Iterator[str]:
+        """Iterate over all cache keys"""
+
+    @abstractmethod
+    def entries(self) -> Iterator[CacheEntryInfo]:
+        """Iterate over size and access bookkeeping for every entry"""
+
+    def peek(self, cache_key: str) -> Optional[Dict]:
+        """Return the full cache entry without recording an access (e.g. for offline replay)"""
+        return self.load(cache_key)
+
+    def delete_many(self, cache_keys: Iterable[str]):
+        """Remove several entries"""
+        for cache_key in cache_keys:
+            self.delete(cache_key)
+
+    def total_bytes(self) -> int:
+        """Bytes occupied by all entries"""
+        return sum(entry.size_bytes for entry in self.entries())
+
+    def vacuum(self):
+        """Return space freed by deletions to the filesystem"""
+
+    def load_if_fresh(self, cache_key: str, max_age_hours: float) -> Tuple[Optional[Dict], Optional[float]]:
+        """
+        Return (entry, age_hours). The entry is None when missing or older
+        than max_age_hours; age_hours is None only when the entry is missing.
+        """
+        cached_time = self.get_timestamp(cache_key)
+        if cached_time is None:
+            return None, None
+
+        age_hours = (datetime.now() - cached_time).total_seconds() / 3600
+        if age_hours > max_age_hours:
+            return None, age_hours
+
+        return self.load(cache_key), age_hours
+
+    def close(self):
+        """Release any resources held by the store"""
+
+
+class JsonFileCacheStore(CacheStore):
+    """Legacy layout: one JSON document per cache key"""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get_path(self, cache_key: str) -> Path:
+        """Get cache file path for given key"""
+        return self.cache_dir / f"{cache_key}.json"
+
+    def _read(self, cache_key: str) -> Optional[Dict]:
+        cache_path = self.get_path(cache_key)
+        if not cache_path.exists():
+            return None
+
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+
+    def get_timestamp(self, cache_key: str) -> Optional[datetime]:
+        cached_data = self._read(cache_key)
+        if cached_data is None:
+            return None
+        return datetime.fromisoformat(cached_data['timestamp'])
+
+    def _record_access(self, cache_key: str):
+        # The file's mtime doubles as the LRU clock; the fetch time is inside the document
+        try:
+            os.utime(self.get_path(cache_key))
+        except OSError:
+            pass
+
+    def load(self, cache_key: str) -> Optional[Dict]:
+        cached_data = self._read(cache_key)
+        if cached_data is not None:
+            self._record_access(cache_key)
+        return cached_data
+
+    def peek(self, cache_key: str) -> Optional[Dict]:
+        return self._read(cache_key)
+
+    def load_if_fresh(self, cache_key: str, max_age_hours: float) -> Tuple[Optional[Dict], Optional[float]]:
+        # The timestamp lives inside the document, so read it only once
+        cached_data = self._read(cache_key)
+        if cached_data is None:
+            return None, None
+
+        cached_time = datetime.fromisoformat(cached_data['timestamp'])
+        age_hours = (datetime.now() - cached_time).total_seconds() / 3600
+        if age_hours > max_age_hours:
+            return None, age_hours
+
+        self._record_access(cache_key)
+        return cached_data, age_hours
+
+    def save(self, cache_key: str, cached_data: Dict):
+        with open(self.get_path(cache_key), 'w') as f:
+            json.dump(cached_data, f, indent=2)
+
+    def touch(self, cache_key: str, timestamp: Optional[datetime] = None):
+        cached_data = self._read(cache_key)
+        if cached_data is None:
+            return
+        cached_data['timestamp'] = (timestamp or datetime.now()).isoformat()
+        self.save(cache_key, cached_data)
+
+    def delete(self, cache_key: str):
+        self.get_path(cache_key).unlink(missing_ok=True)
+
+    def keys(self) -> Iterator[str]:
+        for cache_path in sorted(self.cache_dir.glob('*.json')):
+            yield cache_path.stem
+
+    def total_bytes(self) -> int:
+        # File sizes alone answer this; no need to parse every document
+        return sum(cache_path.stat().st_size for cache_path in self.cache_dir.glob('*.json'))
+
+    def entries(self) -> Iterator[CacheEntryInfo]:
+        for cache_path in sorted(self.cache_dir.glob('*.json')):
+            try:
+                stat = cache_path.stat()
+            except OSError:
+                continue
+            try:
+                with open(cache_path, 'r') as f:
+                    timestamp = datetime.fromisoformat(json.load(f)['timestamp'])
+            except (OSError, KeyError, ValueError, TypeError):
+                # Unreadable files are treated as infinitely old so TTL removes them
+                timestamp = datetime.min
+            yield CacheEntryInfo(
+                cache_key=cache_path.stem,
+                timestamp=timestamp,
+                last_accessed=datetime.fromtimestamp(stat.st_mtime),
+                size_bytes=stat.st_size
+            )
+
+
+class SQLiteCacheStore(CacheStore):
+    """
+    Packed cache: all entries for a supplier in one SQLite file.
+
+    Timestamps live in a narrow WITHOUT ROWID table keyed by cache_key, so
+    expiry checks read a single small B-tree and never touch the bodies.
+    Bodies are zlib-compressed in a separate table.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache_index (
+            cache_key TEXT PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            last_accessed TEXT
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS cache_bodies (
+            cache_key TEXT PRIMARY KEY,
+            url TEXT,
+            status_code INTEGER,
+            headers TEXT,
+            encoding TEXT,
+            body BLOB,
+            body_size INTEGER,
+            etag TEXT,
+            last_modified TEXT
+        );
+    """
+
+    # Columns added after the first release of the packed store
+    ADDED_COLUMNS = {
+        'cache_index': [('last_accessed', 'TEXT')],
+        'cache_bodies': [('etag', 'TEXT'), ('last_modified', 'TEXT')],
+    }
+
+    def __init__(self, db_path: Union[str, Path], compression_level: int = 6):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.compression_level = compression_level
+
+        # One connection shared across threads, serialized by a lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._add_missing_columns()
+        self.conn.commit()
+
+    def _add_missing_columns(self):
+        """Upgrade stores created before newer columns existed"""
+        for table, columns in self.ADDED_COLUMNS.items():
+            existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for column, column_type in columns:
+                if column not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    def get_timestamp(self, cache_key: str) -> Optional[datetime]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT timestamp FROM cache_index WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def load(self, cache_key: str) -> Optional[Dict]:
+        return self._read(cache_key, record_access=True)
+
+    def peek(self, cache_key: str) -> Optional[Dict]:
+        return self._read(cache_key, record_access=False)
+
+    def _read(self, cache_key: str, record_access: bool) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute("""
+                SELECT ci.timestamp, cb.url, cb.status_code, cb.headers, cb.encoding, cb.body,
+                       cb.etag, cb.last_modified
+                FROM cache_index ci
+                JOIN cache_bodies cb ON cb.cache_key = ci.cache_key
+                WHERE ci.cache_key = ?
+            """, (cache_key,)).fetchone()
+            if row and record_access:
+                self.conn.execute(
+                    "UPDATE cache_index SET last_accessed = ? WHERE cache_key = ?",
+                    (datetime.now().isoformat(), cache_key)
+                )
+                self.conn.commit()
+
+        if not row:
+            return None
+
+        timestamp, url, status_code, headers, encoding, body, etag, last_modified = row
+        encoding = encoding or 'utf-8'
+        try:
+            content = zlib.decompress(body).decode(encoding) if body is not None else ''
+        except zlib.error as e:
+            raise ValueError(f"Corrupt compressed body: {e}")
+
+        return {
+            'timestamp': timestamp,
+            'url': url or '',
+            'status_code': status_code or 0,
+            'headers': json.loads(headers) if headers else {},
+            'content': content,
+            'encoding': encoding,
+            'etag': etag,
+            'last_modified': last_modified
+        }
+
+    def save(self, cache_key: str, cached_data: Dict):
+        encoding = cached_data.get('encoding') or 'utf-8'
+        raw_body = (cached_data.get('content') or '').encode(encoding)
+        body = zlib.compress(raw_body, self.compression_level)
+
+        with self._lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO cache_index (cache_key, timestamp, last_accessed)
+                VALUES (?, ?, ?)
+            """, (
+                cache_key,
+                cached_data.get('timestamp') or datetime.now().isoformat(),
+                datetime.now().isoformat()
+            ))
+            self.conn.execute("""
+                INSERT OR REPLACE INTO cache_bodies
+                (cache_key, url, status_code, headers, encoding, body, body_size,
+                 etag, last_modified)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                cache_key,
+                cached_data.get('url', ''),
+                cached_data.get('status_code', 0),
+                json.dumps(dict(cached_data.get('headers', {}))),
+                encoding,
+                body,
+                len(raw_body),
+                cached_data.get('etag'),
+                cached_data.get('last_modified')
+            ))
+            self.conn.commit()
+
+    def touch(self, cache_key: str, timestamp: Optional[datetime] = None):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE cache_index SET timestamp = ?, last_accessed = ? WHERE cache_key = ?",
+                ((timestamp or datetime.now()).isoformat(), datetime.now().isoformat(), cache_key)
+            )
+            self.conn.commit()
+
+    def delete(self, cache_key: str):
+        with self._lock:
+            self.conn.execute("DELETE FROM cache_index WHERE cache_key = ?", (cache_key,))
+            self.conn.execute("DELETE FROM cache_bodies WHERE cache_key = ?", (cache_key,))
+            self.conn.commit()
+
+    def delete_many(self, cache_keys: Iterable[str]):
+        params = [(cache_key,) for cache_key in cache_keys]
+        with self._lock:
+            self.conn.executemany("DELETE FROM cache_index WHERE cache_key = ?", params)
+            self.conn.executemany("DELETE FROM cache_bodies WHERE cache_key = ?", params)
+            self.conn.commit()
+
+    def keys(self) -> Iterator[str]:
+        with self._lock:
+            rows = self.conn.execute("SELECT cache_key FROM cache_index ORDER BY cache_key").fetchall()
+        for row in rows:
+            yield row[0]
+
+    def entries(self) -> Iterator[CacheEntryInfo]:
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT ci.cache_key, ci.timestamp, COALESCE(ci.last_accessed, ci.timestamp),
+                       COALESCE(length(cb.body), 0) + COALESCE(length(cb.headers), 0)
+                           + COALESCE(length(cb.url), 0)
+                FROM cache_index ci
+                LEFT JOIN cache_bodies cb ON cb.cache_key = ci.cache_key
+                ORDER BY ci.cache_key
+            """).fetchall()
+        for cache_key, timestamp, last_accessed, size_bytes in rows:
+            yield CacheEntryInfo(
+                cache_key=cache_key,
+                timestamp=datetime.fromisoformat(timestamp),
+                last_accessed=datetime.fromisoformat(last_accessed),
+                size_bytes=size_bytes
+            )
+
+    def vacuum(self):
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.execute("VACUUM")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def create_cache_store(backend: Union[str, CacheStore], cache_dir: Union[str, Path]) -> CacheStore:
+    """Build a cache store from a backend name, or pass an existing store through"""
+    if isinstance(backend, CacheStore):
+        return backend
+
+    if backend == CACHE_BACKEND_JSON:
+        return JsonFileCacheStore(cache_dir)
+    if backend == CACHE_BACKEND_SQLITE:
+        return SQLiteCacheStore(Path(cache_dir) / SQLITE_CACHE_FILENAME)
+
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+def migrate_json_cache(cache_dir: Union[str, Path], store: Optional[CacheStore] = None,
+                       remove_json: bool = False) -> Dict[str, int]:
+    """
+    Copy every JSON cache file in cache_dir into a packed store.
+
+    Original timestamps are preserved so expiry behaves as before. Corrupt
+    files are skipped and counted. Returns migrated/skipped/bytes_before
+    counters.
+    """
+    cache_dir = Path(cache_dir)
+    json_store = JsonFileCacheStore(cache_dir)
+    target = store or SQLiteCacheStore(cache_dir / SQLITE_CACHE_FILENAME)
+
+    stats = {'migrated': 0, 'skipped': 0, 'bytes_before': 0}
+
+    for cache_key in list(json_store.keys()):
+        cache_path = json_store.get_path(cache_key)
+        try:
+            cached_data = json_store.load(cache_key)
+            if not cached_data or 'timestamp' not in cached_data:
+                raise ValueError("missing timestamp")
+        except ValueError:
+            stats['skipped'] += 1
+            continue
+
+        stats['bytes_before'] += cache_path.stat().st_size
+        target.save(cache_key, cached_data)
+        stats['migrated'] += 1
+
+        if remove_json:
+            cache_path.unlink()
+
+    if store is None:
+        target.close()
+
+    return stats
+
+
+def _supplier_cache_dirs(cache_root: Path) -> Iterator[Path]:
+    for path in sorted(cache_root.iterdir()):
+        if path.is_dir():
+            yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage Terra35 scraper response caches')
+    parser.add_argument('command', choices=['migrate', 'stats'],
+                       help='migrate: pack JSON caches into SQLite; stats: show cache sizes')
+    parser.add_argument('--cache-root', default=str(project_root / 'data' / 'cache'),
+                       help='Directory containing one cache directory per supplier')
+    parser.add_argument('--remove-json', action='store_true',
+                       help='Delete JSON files after they are migrated')
+
+    args = parser.parse_args()
+    cache_root = Path(args.cache_root)
+
+    if not cache_root.exists():
+        print(f"Cache root not found: {cache_root}")
+        sys.exit(1)
+
+    for cache_dir in _supplier_cache_dirs(cache_root):
+        if args.command == 'migrate':
+            stats = migrate_json_cache(cache_dir, remove_json=args.remove_json)
+            packed_size = (cache_dir / SQLITE_CACHE_FILENAME).stat().st_size
+            print(f"{cache_dir.name}: migrated {stats['migrated']} entries "
+                  f"({stats['skipped']} skipped), "
+                  f"{stats['bytes_before']:,} bytes of JSON -> {packed_size:,} bytes packed")
+        else:
+            json_files = list(cache_dir.glob('*.json'))
+            json_bytes = sum(p.stat().st_size for p in json_files)
+            packed_path = cache_dir / SQLITE_CACHE_FILENAME
+            packed_bytes = packed_path.stat().st_size if packed_path.exists() else 0
+            print(f"{cache_dir.name}: {len(json_files)} JSON files ({json_bytes:,} bytes), "
+                  f"packed store {packed_bytes:,} bytes")
+
+
+if __name__ == '__main__':
+    main()
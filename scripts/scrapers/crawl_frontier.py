@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Crawl Frontier Checkpoints
+
+Persistent URL frontier for resumable scraping sessions. Each session's
+frontier lives in the crawl_frontier table, keyed by its collection_sessions
+row, and records which URLs are still pending, which were visited, and which
+produced a product that has already been persisted. A session interrupted
+part-way can be resumed by session ID without refetching finished work.
+
+URL states:
+- pending:   discovered but not processed yet
+- visited:   processed, nothing left to persist (e.g. a category page whose
+             product links were added, or a page with no product)
+- persisted: a product from this URL has been saved
+- failed:    the URL could not be fetched; retried when the session resumes
+"""
+
+import json
+import sqlite3
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.constants import (
+    MILESTONE_DATA_COLLECTION, SESSION_STATUS_IN_PROGRESS, SESSION_STATUS_COMPLETED
+)
+from scripts.db import get_connection
+from scripts.schema_migrations import apply_migrations
+
+FRONTIER_PENDING = 'pending'
+FRONTIER_VISITED = 'visited'
+FRONTIER_PERSISTED = 'persisted'
+FRONTIER_FAILED = 'failed'
+
+
+@dataclass
+class FrontierEntry:
+    """One URL in a crawl frontier"""
+    url: str
+    url_type: str
+    context: Dict[str, Any]
+    status: str
+    item_id: Optional[str] = None
+    attempts: int = 0
+
+
+class CrawlFrontier:
+    """Checkpointed URL frontier for one scraping session"""
+
+    def __init__(self, db_path: str, session_name: str, supplier: Optional[str] = None):
+        self.db_path = db_path
+        self.session_name = session_name
+        self.supplier = supplier
+
+        with get_connection(self.db_path) as conn:
+            apply_migrations(conn)
+            conn.execute("""
+                INSERT OR IGNORE INTO collection_sessions
+                (session_name, milestone, status)
+                VALUES (?, ?, ?)
+            """, (session_name, MILESTONE_DATA_COLLECTION, SESSION_STATUS_IN_PROGRESS))
+            self.session_db_id = conn.execute(
+                "SELECT id FROM collection_sessions WHERE session_name = ? AND milestone = ?",
+                (session_name, MILESTONE_DATA_COLLECTION)
+            ).fetchone()[0]
+            conn.commit()
+
+    @staticmethod
+    def exists(db_path: str, session_name: str) -> bool:
+        """Check whether a checkpoint was recorded for a session"""
+        with get_connection(db_path) as conn:
+            apply_migrations(conn)
+            row = conn.execute("""
+                SELECT 1 FROM crawl_frontier f
+                JOIN collection_sessions cs ON cs.id = f.session_id
+                WHERE cs.session_name = ? LIMIT 1
+            """, (session_name,)).fetchone()
+        return row is not None
+
+    @staticmethod
+    def known_contexts(db_path: str, supplier: str,
+                       urls: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Context a supplier's sessions recorded for the given URLs, or all its URLs (latest wins)"""
+        if not Path(db_path).exists():
+            return {}
+        query = """
+            SELECT url, context FROM crawl_frontier
+            WHERE supplier = ? AND context IS NOT NULL
+        """
+        params: List[Any] = [supplier]
+        if urls is not None:
+            query += " AND url IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(list(urls)))
+        with get_connection(db_path) as conn:
+            apply_migrations(conn)
+            rows = conn.execute(query + " ORDER BY id", params).fetchall()
+        return {url: json.loads(context) for url, context in rows}
+
+    def add(self, urls: Iterable[str], url_type: str = 'page',
+            context: Optional[Dict[str, Any]] = None) -> int:
+        """Add URLs as pending; URLs already in the frontier keep their state"""
+        context_json = json.dumps(context) if context else None
+        with get_connection(self.db_path) as conn:
+            cursor = conn.executemany("""
+                INSERT OR IGNORE INTO crawl_frontier (session_id, supplier, url, url_type, context)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(self.session_db_id, self.supplier, url, url_type, context_json) for url in urls])
+            conn.commit()
+            return cursor.rowcount
+
+    def add_with_contexts(self, contexts: Dict[str, Dict[str, Any]], url_type: str = 'page') -> int:
+        """Add URLs as pending, each with its own context given as {url: context}"""
+        with get_connection(self.db_path) as conn:
+            cursor = conn.executemany("""
+                INSERT OR IGNORE INTO crawl_frontier (session_id, supplier, url, url_type, context)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(self.session_db_id, self.supplier, url, url_type, json.dumps(context) if context else None)
+                  for url, context in contexts.items()])
+            conn.commit()
+            return cursor.rowcount
+
+    def pending(self, url_type: Optional[str] = None, limit: Optional[int] = None) -> List[FrontierEntry]:
+        """Return pending entries in discovery order"""
+        query = """
+            SELECT url, url_type, context, status, item_id, attempts
+            FROM crawl_frontier
+            WHERE session_id = ? AND status = ?
+        """
+        params: List[Any] = [self.session_db_id, FRONTIER_PENDING]
+        if url_type:
+            query += " AND url_type = ?"
+            params.append(url_type)
+        query += " ORDER BY id"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with get_connection(self.db_path) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return [
+            FrontierEntry(
+                url=url, url_type=row_type,
+                context=json.loads(context) if context else {},
+                status=status, item_id=item_id, attempts=attempts
+            )
+            for url, row_type, context, status, item_id, attempts in rows
+        ]
+
+    def fill_context(self, urls: Iterable[str], key: str, value: Any) -> int:
+        """Set a context key on pending URLs that do not have it yet; returns how many"""
+        with get_connection(self.db_path) as conn:
+            cursor = conn.executemany("""
+                UPDATE crawl_frontier
+                SET context = json_set(COALESCE(context, '{}'), '$.' || ?, ?),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE session_id = ? AND url = ? AND status = ?
+                  AND json_type(COALESCE(context, '{}'), '$.' || ?) IS NULL
+            """, [(key, value, self.session_db_id, url, FRONTIER_PENDING, key) for url in urls])
+            conn.commit()
+            return cursor.rowcount
+
+    def _set_status(self, conn: sqlite3.Connection, urls: Iterable[str], status: str):
+        conn.executemany("""
+            UPDATE crawl_frontier
+            SET status = ?, attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE session_id = ? AND url = ?
+        """, [(status, self.session_db_id, url) for url in urls])
+
+    def mark_visited(self, urls: Iterable[str]):
+        """Record URLs as processed with nothing left to persist"""
+        with get_connection(self.db_path) as conn:
+            self._set_status(conn, urls, FRONTIER_VISITED)
+            conn.commit()
+
+    def mark_failed(self, urls: Iterable[str]):
+        """Record URLs that could not be fetched"""
+        with get_connection(self.db_path) as conn:
+            self._set_status(conn, urls, FRONTIER_FAILED)
+            conn.commit()
+
+    def mark_persisted(self, item_ids_by_url: Dict[str, str]):
+        """Record URLs whose products have been saved"""
+        with get_connection(self.db_path) as conn:
+            conn.executemany("""
+                UPDATE crawl_frontier
+                SET status = ?, item_id = ?, attempts = attempts + 1,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE session_id = ? AND url = ?
+            """, [(FRONTIER_PERSISTED, item_id, self.session_db_id, url)
+                  for url, item_id in item_ids_by_url.items()])
+            conn.commit()
+
+    def requeue_failed(self) -> int:
+        """Make failed URLs pending again; returns how many were requeued"""
+        with get_connection(self.db_path) as conn:
+            cursor = conn.execute("""
+                UPDATE crawl_frontier SET status = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE session_id = ? AND status = ?
+            """, (FRONTIER_PENDING, self.session_db_id, FRONTIER_FAILED))
+            conn.commit()
+            return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of URLs in each state"""
+        with get_connection(self.db_path) as conn:
+            rows = conn.execute("""
+                SELECT status, COUNT(*) FROM crawl_frontier
+                WHERE session_id = ? GROUP BY status
+            """, (self.session_db_id,)).fetchall()
+        counts = {status: 0 for status in
+                  (FRONTIER_PENDING, FRONTIER_VISITED, FRONTIER_PERSISTED, FRONTIER_FAILED)}
+        counts.update(dict(rows))
+        return counts
+
+    def is_empty(self) -> bool:
+        """True when nothing has been added to this session's frontier yet"""
+        return sum(self.counts().values()) == 0
+
+    def persisted_item_ids(self) -> List[str]:
+        """Item IDs of products already saved by this session"""
+        with get_connection(self.db_path) as conn:
+            rows = conn.execute("""
+                SELECT item_id FROM crawl_frontier
+                WHERE session_id = ? AND status = ? AND item_id IS NOT NULL
+                ORDER BY id
+            """, (self.session_db_id, FRONTIER_PERSISTED)).fetchall()
+        return [row[0] for row in rows]
+
+    def complete(self):
+        """Mark the owning collection session as completed"""
+        with get_connection(self.db_path) as conn:
+            conn.execute("""
+                UPDATE collection_sessions
+                SET status = ?, end_time = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (SESSION_STATUS_COMPLETED, self.session_db_id))
+            conn.commit()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Serialized Database Writer
+
+SQLite lets one connection write at a time. Scrapers running side by side
+that each open their own connection contend for the write lock and fail
+with "database is locked" once a wait outlasts the busy timeout.
+
+DatabaseWriter is a thread that owns a single write connection. Producers
+in any thread hand it work over a queue and get a Future back:
+
+- write_products(supplier, products, session_id) writes a chunk with the
+  supplier's BulkProductWriter and resolves to its SaveStats
+- submit(job) runs any job(conn) - e.g. a pricing batch inserted with
+  RETURNING id - and resolves to what the job returns
+
+Jobs are group-committed: the thread takes whatever is waiting on the
+queue (up to max_batch jobs, waiting commit_interval seconds for more after
+the first) and runs it in one transaction, each job inside its own
+SAVEPOINT. A failing job is rolled back to its savepoint and its Future
+raises; the rest of the group still commits. Futures resolve only after
+COMMIT, so a result means the rows are durable. Pricing rows of the group
+are validated in one statement just before COMMIT (validation/pricing_validation.py).
+"""
+
+import logging
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import connect, resolve_db_path
+from scripts.schema_migrations import apply_migrations
+from scripts.scrapers.bulk_writer import BulkProductWriter
+from scripts.validation.pricing_validation import defer_validation, run_deferred_validation
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_COMMIT_INTERVAL = 0.01  # seconds to wait for more jobs before committing
+DEFAULT_BUSY_TIMEOUT = 30.0     # seconds, for locks held by other processes
+
+# Queue marker that stops the writer thread once earlier jobs are done
+_STOP = object()
+
+Job = Callable[[sqlite3.Connection], Any]
+
+
+@dataclass
+class WriterStats:
+    """Work done by a DatabaseWriter"""
+    jobs: int = 0     # committed jobs
+    failed: int = 0   # jobs rolled back
+    commits: int = 0  # transactions, each holding one or more jobs
+
+
+class DatabaseWriter:
+    """
+    Single-connection writer thread with group commit.
+
+    Use as a context manager, or call start() and close().
+    """
+
+    def __init__(self, db_path: Optional[str] = None,
+                 max_batch: int = DEFAULT_MAX_BATCH,
+                 commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+                 busy_timeout: float = DEFAULT_BUSY_TIMEOUT,
+                 logger: Optional[logging.Logger] = None):
+        self.db_path = resolve_db_path(db_path)
+        self.max_batch = max(1, max_batch)
+        self.commit_interval = commit_interval
+        self.busy_timeout = busy_timeout
+        self.logger = logger or logging.getLogger('scraper.db_writer')
+
+        self.stats = WriterStats()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+        # Product writers by supplier; only touched by the writer thread
+        self._product_writers: Dict[str, BulkProductWriter] = {}
+
+    def start(self) -> 'DatabaseWriter':
+        """Open the write connection and start the thread"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("DatabaseWriter is closed")
+            if self._thread is not None:
+                return self
+            # Opened here so connection errors reach the caller; used only by the thread
+            self._conn = connect(self.db_path, timeout=self.busy_timeout,
+                                 isolation_level=None, check_same_thread=False)
+            apply_migrations(self._conn)
+            self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        """Finish every queued job, then stop the thread and close the connection"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is None:
+                return
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self) -> 'DatabaseWriter':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def submit(self, job: Job) -> Future:
+        """Queue job(conn) for the next group commit"""
+        if self._thread is None:
+            self.start()
+        future: Future = Future()
+        with self._lock:
+            # Checked under the lock so nothing is queued behind the stop marker
+            if self._closed:
+                raise RuntimeError("DatabaseWriter is closed")
+            self._queue.put((job, future))
+        return future
+
+    def write_products(self, supplier_name: str, products: List,
+                       session_id: Optional[str] = None) -> Future:
+        """Queue a chunk of ScrapedProducts; resolves to its SaveStats"""
+        return self.submit(
+            lambda conn: self._product_writer(supplier_name).write_in_transaction(
+                conn, products, session_id
+            )
+        )
+
+    def _product_writer(self, supplier_name: str) -> BulkProductWriter:
+        if supplier_name not in self._product_writers:
+            self._product_writers[supplier_name] = BulkProductWriter(
+                self.db_path, supplier_name, self.logger
+            )
+        return self._product_writers[supplier_name]
+
+    def _run(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    return
+                group = [item]
+                stop = False
+
+                # Gather whatever else arrives shortly into the same transaction
+                deadline = time.monotonic() + self.commit_interval
+                while len(group) < self.max_batch:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    group.append(item)
+
+                self._commit_group(group)
+                if stop:
+                    return
+        finally:
+            self._conn.close()
+            self._fail_pending(RuntimeError("DatabaseWriter stopped"))
+
+    def _commit_group(self, group: List):
+        conn = self._conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            defer_validation(conn)
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self.logger.error(f"Could not start a write transaction: {e}")
+            for _, future in group:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            self.stats.failed += len(group)
+            return
+
+        done = []
+        for job, future in group:
+            if not future.set_running_or_notify_cancel():
+                continue
+            conn.execute("SAVEPOINT job")
+            try:
+                result = job(conn)
+            except Exception as e:
+                conn.execute("ROLLBACK TO job")
+                conn.execute("RELEASE job")
+                self._forget_ids()
+                self.stats.failed += 1
+                self.logger.warning(f"Write job failed and was rolled back: {e}")
+                future.set_exception(e)
+                continue
+            conn.execute("RELEASE job")
+            done.append((future, result))
+
+        try:
+            run_deferred_validation(conn)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._forget_ids()
+            self.stats.failed += len(done)
+            self.logger.error(f"Group commit of {len(done)} jobs failed: {e}")
+            for future, _ in done:
+                future.set_exception(e)
+            return
+
+        self.stats.commits += 1
+        self.stats.jobs += len(done)
+        for future, result in done:
+            future.set_result(result)
+
+    def _forget_ids(self):
+        for writer in self._product_writers.values():
+            writer.forget_ids()
+
+    def _fail_pending(self, error: Exception):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(error)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Sitemap URL Discovery
+
+Finds a supplier's pages from its robots.txt and XML sitemaps instead of
+crawling category pages:
+
+1. robots.txt is read for ``Sitemap:`` lines (falling back to
+   /sitemap.xml) and for the Disallow rules discovered URLs must respect
+2. Sitemaps are read breadth-first; sitemap indexes add their children
+3. Each URL keeps its ``<lastmod>``, normalized to ISO 8601 UTC
+
+The sitemap_urls table remembers the lastmod each URL had when its page
+was last fetched, so incremental sessions only queue URLs that are new or
+whose lastmod moved on. URLs without a lastmod are always queued.
+"""
+
+import gzip
+import json
+import logging
+import sys
+import xml.etree.ElementTree as ET
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+from urllib.robotparser import RobotFileParser
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import get_connection
+from scripts.schema_migrations import apply_migrations
+
+# Upper bound on sitemap files read per discovery, indexes included
+MAX_SITEMAPS = 50
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+@dataclass
+class SitemapEntry:
+    """A URL listed in a sitemap (or a child sitemap listed in an index)"""
+    loc: str
+    lastmod: Optional[str] = None  # ISO 8601 UTC
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a W3C datetime <lastmod> to ISO 8601 UTC.
+
+    Date-only values are taken as midnight UTC; returns None for missing or
+    malformed values.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat(timespec='seconds')
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_sitemap(content) -> Tuple[List[SitemapEntry], List[SitemapEntry]]:
+    """
+    Parse a sitemap or sitemap index into (page entries, child sitemaps).
+
+    Accepts text or bytes, gzipped or not. Raises ValueError when the
+    content is not a sitemap.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    if content.startswith(GZIP_MAGIC):
+        content = gzip.decompress(content)
+
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        raise ValueError(f"Invalid sitemap XML: {e}")
+
+    kind = _local_name(root.tag)
+    if kind not in ('urlset', 'sitemapindex'):
+        raise ValueError(f"Not a sitemap: <{kind}>")
+
+    entries = []
+    for element in root:
+        fields = {_local_name(child.tag): (child.text or '').strip() for child in element}
+        if fields.get('loc'):
+            entries.append(SitemapEntry(fields['loc'], parse_lastmod(fields.get('lastmod'))))
+
+    return (entries, []) if kind == 'urlset' else ([], entries)
+
+
+def parse_robots(text: str, robots_url: str) -> RobotFileParser:
+    """Parse robots.txt content"""
+    robots = RobotFileParser(robots_url)
+    robots.parse(text.splitlines())
+    return robots
+
+
+class SitemapDiscovery:
+    """
+    Reads a site's robots.txt and sitemaps through a fetch callable.
+
+    fetch(url) returns a response-like object (with .text and .content) or
+    None when the URL could not be fetched.
+    """
+
+    def __init__(self, base_url: str, fetch: Callable[[str], Optional[object]],
+                 user_agent: str = '*', max_sitemaps: int = MAX_SITEMAPS,
+                 logger: Optional[logging.Logger] = None):
+        self.base_url = base_url
+        self.fetch = fetch
+        self.user_agent = user_agent
+        self.max_sitemaps = max_sitemaps
+        self.logger = logger or logging.getLogger('scraper.discovery')
+        self.robots: Optional[RobotFileParser] = None
+
+    def load_robots(self) -> Optional[RobotFileParser]:
+        """Fetch and parse robots.txt; None when the site has none"""
+        robots_url = urljoin(self.base_url, '/robots.txt')
+        response = self.fetch(robots_url)
+        self.robots = parse_robots(response.text, robots_url) if response else None
+        return self.robots
+
+    def sitemap_urls(self) -> List[str]:
+        """Sitemaps announced in robots.txt, or the conventional location"""
+        if self.robots is None:
+            self.load_robots()
+        announced = self.robots.site_maps() if self.robots else None
+        return list(announced or [urljoin(self.base_url, '/sitemap.xml')])
+
+    def allowed(self, url: str) -> bool:
+        return self.robots is None or self.robots.can_fetch(self.user_agent, url)
+
+    def discover(self) -> Optional[List[SitemapEntry]]:
+        """
+        All page URLs listed in the site's sitemaps that robots.txt allows.
+
+        Returns None when no sitemap could be read, so callers can fall
+        back to crawling. A URL listed more than once keeps its newest
+        lastmod.
+        """
+        to_read = deque(self.sitemap_urls())
+        seen = set(to_read)
+        entries: Dict[str, SitemapEntry] = {}
+        read = 0
+
+        while to_read and read < self.max_sitemaps:
+            sitemap_url = to_read.popleft()
+            response = self.fetch(sitemap_url)
+            if not response:
+                continue
+
+            try:
+                pages, children = parse_sitemap(response.content)
+            except (ValueError, OSError) as e:
+                self.logger.warning(f"Skipping sitemap {sitemap_url}: {e}")
+                continue
+            read += 1
+
+            for child in children:
+                if child.loc not in seen:
+                    seen.add(child.loc)
+                    to_read.append(child.loc)
+
+            for entry in pages:
+                if not self.allowed(entry.loc):
+                    continue
+                known = entries.get(entry.loc)
+                if known is None or (entry.lastmod or '') > (known.lastmod or ''):
+                    entries[entry.loc] = entry
+
+        if to_read:
+            self.logger.warning(f"Stopped after {self.max_sitemaps} sitemaps, {len(to_read)} not read")
+        if not read:
+            return None
+
+        self.logger.info(f"Discovered {len(entries)} URLs in {read} sitemaps")
+        return list(entries.values())
+
+
+def changed_entries(db_path: str, supplier: str, entries: List[SitemapEntry]) -> List[SitemapEntry]:
+    """Entries that are new, have no lastmod, or changed since last fetched"""
+    if not entries:
+        return []
+
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        stored = dict(conn.execute("""
+            SELECT url, lastmod FROM sitemap_urls
+            WHERE supplier = ? AND url IN (SELECT value FROM json_each(?))
+        """, (supplier, json.dumps([entry.loc for entry in entries]))).fetchall())
+
+    return [
+        entry for entry in entries
+        if entry.loc not in stored or not entry.lastmod or not stored[entry.loc]
+        or entry.lastmod > stored[entry.loc]
+    ]
+
+
+def record_fetched(db_path: str, supplier: str, lastmods: Dict[str, Optional[str]]):
+    """Remember the sitemap lastmod of pages that have been fetched"""
+    if not lastmods:
+        return
+
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        conn.executemany("""
+            INSERT INTO sitemap_urls (supplier, url, lastmod)
+            VALUES (?, ?, ?)
+            ON CONFLICT(supplier, url) DO UPDATE SET
+                lastmod = excluded.lastmod,
+                fetched_at = CURRENT_TIMESTAMP
+        """, [(supplier, url, lastmod) for url, lastmod in lastmods.items()])
+        conn.commit()
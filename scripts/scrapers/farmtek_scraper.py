@@ -11,18 +11,29 @@ Key Categories: Greenhouse Kits, Benching, HVAC, Irrigation
 """
 
 import re
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Optional, Any
+from typing import Iterator, List, Dict, Optional, Any
 import time
 
 from .base_scraper import BaseScraper, ScrapedProduct
+from .html_parsing import AnyOfStrainer
+
+# Partial parsing: only the elements the parsers below read are built
+PRODUCT_LINK_STRAINER = SoupStrainer('a', href=re.compile(r'/product/'))
+PRODUCT_DETAIL_STRAINER = AnyOfStrainer(
+    SoupStrainer(['h1', 'title']),
+    SoupStrainer(attrs={'data-sku': True}),
+    SoupStrainer(attrs={'class': re.compile(r'price|cost|spec|detail|feature|sku|model')})
+)
 
 class FarmTekScraper(BaseScraper):
     """
     Scraper for FarmTek greenhouse and horticultural equipment
     """
     
+    parser_version = '1'
+    
     def __init__(self, **kwargs):
         super().__init__(
             supplier_name="FarmTek",
@@ -51,62 +62,178 @@ class FarmTekScraper(BaseScraper):
             '/growing-supplies/'
         ]
     
-    def scrape_products(self, max_products_per_category: int = 50) -> List[ScrapedProduct]:
+    def scrape_products(self, max_products_per_category: int = 50,
+                        checkpoint_every: int = 25,
+                        use_sitemap: bool = True,
+                        refresh_budget: Optional[int] = None) -> Iterator[ScrapedProduct]:
         """
-        Scrape FarmTek products relevant to vanilla cultivation
+        Scrape FarmTek products relevant to vanilla cultivation.
+        
+        The crawl is driven by the session's crawl frontier. A new session
+        is seeded from the sitemap with the product URLs that changed since
+        they were last fetched, or from the category pages when there is no
+        sitemap. With refresh_budget, the session instead refetches the
+        products the re-scrape scheduler ranks as most likely stale, up to
+        that many pages. Category pages are expanded into product URLs, which then
+        go through the fetch/parse/write pipeline. Products are saved every
+        checkpoint_every pages, so an interrupted session can be resumed
+        without refetching finished work.
         """
-        all_products = []
+        frontier = self.frontier
+        if frontier.is_empty():
+            self.seed_frontier(use_sitemap, refresh_budget)
         
-        for url_path in self.target_urls:
+        # Expand category pages into product URLs
+        category_failed = False
+        for entry in frontier.pending('category'):
+            url_path = entry.context['category_path']
             self.logger.info(f"Scraping category: {url_path}")
             
             try:
-                products = self.scrape_category(url_path, max_products_per_category)
-                all_products.extend(products)
-                
-                self.logger.info(f"Found {len(products)} products in {url_path}")
-                
+                product_urls = self.collect_product_urls(url_path, max_products_per_category)
             except Exception as e:
+                product_urls = None
                 self.logger.error(f"Failed to scrape category {url_path}: {e}")
                 if self.current_session:
                     self.current_session.errors.append(f"Category {url_path}: {e}")
+            
+            if product_urls is None:
+                frontier.mark_failed([entry.url])
+                category_failed = True
                 continue
+            
+            if entry.context.get('sitemap_only'):
+                # Only place the sitemap's new products; the rest are unchanged
+                placed = frontier.fill_context(product_urls, 'category_path', url_path)
+                self.logger.info(f"Placed {placed} new sitemap products in {url_path}")
+            else:
+                frontier.add(product_urls, 'product', {'category_path': url_path})
+                self.logger.info(f"Found {len(product_urls)} product links in {url_path}")
+            frontier.mark_visited([entry.url])
+        
+        # Sitemap products no category page placed are outside the target
+        # categories (or past their cap) and would be filed under a default
+        # category, so they are not fetched. After a failed category page
+        # they stay pending for the resumed session to place.
+        pages, unplaced = [], []
+        for entry in frontier.pending('product'):
+            if entry.context.get('category_path'):
+                pages.append((entry.url, entry.context))
+            else:
+                unplaced.append(entry.url)
+        if unplaced and not category_failed:
+            frontier.mark_visited(unplaced)
+            self.logger.info(f"Skipped {len(unplaced)} sitemap products outside the target categories")
+        
+        # Fetch, parse and checkpoint product pages as overlapping stages
+        product_count = 0
+        for result in self.run_pipeline(pages, write=self.checkpoint_pages,
+                                        write_batch_size=checkpoint_every):
+            if result.product:
+                product_count += 1
+                yield result.product
         
-        self.logger.info(f"Total products scraped: {len(all_products)}")
-        return all_products
+        self.logger.info(f"Total products scraped: {product_count}")
     
-    def scrape_category(self, url_path: str, max_products: int = 50) -> List[ScrapedProduct]:
+    def seed_frontier(self, use_sitemap: bool = True, refresh_budget: Optional[int] = None):
+        """
+        Queue the first URLs of a new session.
+        
+        Changed sitemap products whose category is known from earlier
+        crawls are queued directly. Category pages are only queued when
+        there is no sitemap, or to find the category of new products.
+        With refresh_budget, only the scheduler's planned products are queued.
         """
-        Scrape a specific product category
+        frontier = self.frontier
+        if refresh_budget is not None:
+            self.seed_refresh(refresh_budget)
+            return
+        
+        is_product = lambda url: '/product/' in urlparse(url).path
+        entries = self.discover_urls(url_filter=is_product) if use_sitemap else None
+        
+        if entries is None:
+            for url_path in self.target_urls:
+                frontier.add([urljoin(self.base_url, url_path)], 'category',
+                             {'category_path': url_path})
+            return
+        
+        known = frontier.known_contexts(self.db_path, self.supplier_name,
+                                        [entry.loc for entry in entries])
+        contexts = {}
+        for entry in entries:
+            context = {'lastmod': entry.lastmod} if entry.lastmod else {}
+            category_path = known.get(entry.loc, {}).get('category_path')
+            if category_path:
+                context['category_path'] = category_path
+            contexts[entry.loc] = context
+        frontier.add_with_contexts(contexts, 'product')
+        
+        if any('category_path' not in context for context in contexts.values()):
+            for url_path in self.target_urls:
+                frontier.add([urljoin(self.base_url, url_path)], 'category',
+                             {'category_path': url_path, 'sitemap_only': True})
+        
+        self.logger.info(f"Queued {len(entries)} changed products from the sitemap")
+    
+    def seed_refresh(self, budget: int):
+        """Queue the planned refetches whose category is known from earlier crawls"""
+        plan = self.plan_refresh(budget)
+        known = self.frontier.known_contexts(self.db_path, self.supplier_name, plan.urls())
+        contexts = {}
+        for url in plan.urls():
+            category_path = known.get(url, {}).get('category_path')
+            if category_path:
+                contexts[url] = {'category_path': category_path, 'refresh': True}
+            else:
+                self.logger.warning(f"Not refreshing {url}: category unknown")
+        self.frontier.add_with_contexts(contexts, 'product')
+        self.logger.info(f"Queued {len(contexts)} of {len(plan.planned)} planned refreshes")
+    
+    def collect_product_urls(self, url_path: str, max_products: int = 50) -> Optional[List[str]]:
+        """
+        Collect product page URLs from a category page; None if it could not be fetched
         """
         category_url = urljoin(self.base_url, url_path)
         response = self.make_request(category_url)
         
         if not response:
-            return []
+            return None
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        products = []
+        soup = self.parse_html(response, only=PRODUCT_LINK_STRAINER)
         
         # Find product listings (this is a mock implementation - would need real HTML analysis)
         product_links = soup.find_all('a', href=re.compile(r'/product/'))
         
-        for i, link in enumerate(product_links[:max_products]):
+        product_urls = []
+        for link in product_links[:max_products]:
             if not link.get('href'):
                 continue
-                
-            product_url = urljoin(self.base_url, link.get('href'))
-            
-            try:
-                product = self.scrape_product_detail(product_url, url_path)
-                if product:
-                    products.append(product)
-                    
-            except Exception as e:
-                self.logger.warning(f"Failed to scrape product {product_url}: {e}")
-                continue
+            product_urls.append(urljoin(self.base_url, link.get('href')))
+        
+        return product_urls
+    
+    def scrape_product_pages(self, pages: Dict[str, str]) -> Dict[str, Optional[ScrapedProduct]]:
+        """
+        Fetch and parse product pages given as {product_url: category_path}.
+        
+        Returns a product (or None when nothing could be parsed) for every
+        page that was fetched; pages that could not be fetched are omitted.
+        """
+        contexts = ((url, {'category_path': category_path}) for url, category_path in pages.items())
+        return {result.url: result.product
+                for result in self.run_pipeline(contexts) if result.fetched}
+    
+    def scrape_category(self, url_path: str, max_products: int = 50) -> List[ScrapedProduct]:
+        """
+        Scrape a specific product category without checkpointing
+        """
+        product_urls = self.collect_product_urls(url_path, max_products)
+        if not product_urls:
+            return []
         
-        return products
+        pages = {product_url: url_path for product_url in product_urls}
+        return [product for product in self.scrape_product_pages(pages).values() if product]
     
     def scrape_product_detail(self, product_url: str, category_path: str) -> Optional[ScrapedProduct]:
         """
@@ -116,7 +243,15 @@ class FarmTekScraper(BaseScraper):
         if not response:
             return None
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        return self.parse_product_detail(response, product_url, category_path)
+    
+    def parse_product_detail(self, response, product_url: str, category_path: str) -> Optional[ScrapedProduct]:
+        """
+        Parse product details from a fetched product page
+        """
+        # Title, SKU, price and spec containers only; dimensions are read from
+        # their text rather than from the whole page
+        soup = self.parse_html(response, only=PRODUCT_DETAIL_STRAINER)
         
         # Extract product information (mock implementation - would need real selectors)
         try:
@@ -201,6 +336,12 @@ class FarmTekScraper(BaseScraper):
             self.logger.error(f"Error parsing product details from {product_url}: {e}")
             return None
     
+    def parse_page(self, url: str, response, context: Dict[str, Any]) -> Optional[ScrapedProduct]:
+        """Parse a fetched or cached product page; category pages yield nothing"""
+        if '/product/' not in urlparse(url).path:
+            return None
+        return self.parse_product_detail(response, url, context.get('category_path', ''))
+    
     def extract_dimensions(self, text: str) -> Dict[str, str]:
         """Extract dimensional specifications from text"""
         dimensions = {}
@@ -232,8 +373,16 @@ class FarmTekScraper(BaseScraper):
 
 # Example usage and testing
 if __name__ == '__main__':
+    import argparse
     import logging
     
+    parser = argparse.ArgumentParser(description='Run the FarmTek scraper')
+    parser.add_argument('--max-products', type=int, default=5,
+                       help='Maximum products per category')
+    parser.add_argument('--resume', metavar='SESSION_ID',
+                       help='Resume an interrupted session from its crawl checkpoint')
+    args = parser.parse_args()
+    
     # Setup logging
     logging.basicConfig(level=logging.INFO)
     
@@ -244,10 +393,16 @@ if __name__ == '__main__':
     
     # Run a small test session
     try:
-        results = scraper.run_scraping_session(max_products_per_category=5)
+        results = scraper.run_scraping_session(
+            resume_session_id=args.resume,
+            max_products_per_category=args.max_products
+        )
         
         print(f"\nSession Results:")
-        print(f"- Products scraped: {len(results.products_scraped)}")
+        print(f"- Session ID: {results.session_id}")
+        print(f"- Products scraped: {results.products_count} ({results.products_saved} saved)")
+        print(f"- New/changed/unchanged: {results.products_new}/{results.products_changed}/"
+              f"{results.products_unchanged}")
         print(f"- Requests made: {results.requests_made}")
         print(f"- Cache hits: {results.cache_hits}")
         print(f"- Errors: {len(results.errors)}")
@@ -262,4 +417,4 @@ if __name__ == '__main__':
     except Exception as e:
         print(f"Test failed: {e}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
@@ -24,11 +24,12 @@ from scripts.scrapers.base_scraper import BaseScraper, ScrapedProduct
 class GreenhouseDataCollector(BaseScraper):
     """Collector for manually researched greenhouse structure data"""
     
-    def __init__(self):
+    def __init__(self, **kwargs):
+        kwargs.setdefault('cache_dir', str(project_root / 'data' / 'cache' / 'greenhouse_research'))
         super().__init__(
             supplier_name="Manual_Research", 
             base_url="https://manual-research",
-            cache_dir=str(project_root / 'data' / 'cache' / 'greenhouse_research')
+            **kwargs
         )
     
     def scrape_products(self) -> List[ScrapedProduct]:
@@ -193,9 +194,11 @@ def main():
     result = collector.run_scraping_session()
     
     print(f"\nCollection Summary:")
-    print(f"Products collected: {len(result.products_scraped)}")
+    print(f"Products collected: {result.products_count} ({result.products_saved} saved)")
+    print(f"New/changed/unchanged: {result.products_new}/{result.products_changed}/"
+          f"{result.products_unchanged}")
     print(f"Errors: {len(result.errors)}")
-    print(f"Warnings: {len(result.warnings)}")
+    print(f"Warnings: {result.warning_count}")
     
     if result.errors:
         print(f"\nErrors encountered:")
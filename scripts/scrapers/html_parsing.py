@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - HTML Parsing
+
+Parser backend selection and partial parsing for scrapers. Scraper CPU time
+is dominated by building BeautifulSoup trees, so:
+
+- the fastest installed tree builder is used by default (lxml when it is
+  installed, otherwise Python's built-in html.parser)
+- callers can pass a SoupStrainer (or tag names) so only the elements they
+  read are built into the tree
+
+Both backends produce the same BeautifulSoup API, so scraper code does not
+change with the backend.
+"""
+
+from typing import Iterable, List, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+
+# Tree builders in order of preference (fastest first)
+HTML_PARSER_PREFERENCE = ('lxml', 'html.parser')
+
+# What parse_html accepts as a restriction: a strainer, a tag name or tag names
+ParseRestriction = Union[SoupStrainer, str, Iterable[str], None]
+
+
+def available_parsers() -> List[str]:
+    """Tree builders from HTML_PARSER_PREFERENCE that are installed"""
+    return [name for name in HTML_PARSER_PREFERENCE if builder_registry.lookup(name)]
+
+
+def default_html_parser() -> str:
+    """The fastest installed tree builder"""
+    return available_parsers()[0]
+
+
+def validate_parser(parser: str) -> str:
+    """Return parser if BeautifulSoup can use it, otherwise raise ValueError"""
+    if not builder_registry.lookup(parser):
+        raise ValueError(
+            f"HTML parser '{parser}' is not available (installed: {', '.join(available_parsers())})"
+        )
+    return parser
+
+
+class AnyOfStrainer(SoupStrainer):
+    """
+    SoupStrainer keeping elements matched by any of several strainers.
+
+    A single SoupStrainer ANDs its name and attribute rules; scrapers often
+    need e.g. "the h1, or anything with a price class". Both the
+    beautifulsoup4 >= 4.13 hooks and the older search_tag hook are provided.
+    """
+
+    def __init__(self, *strainers: SoupStrainer):
+        super().__init__()
+        self.strainers = strainers
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return any(s.allow_tag_creation(nsprefix, name, attrs) for s in self.strainers)
+
+    def allow_string_creation(self, string) -> bool:
+        return any(s.allow_string_creation(string) for s in self.strainers)
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        for strainer in self.strainers:
+            found = strainer.search_tag(markup_name, markup_attrs)
+            if found:
+                return found
+        return None
+
+
+def make_strainer(only: ParseRestriction) -> Optional[SoupStrainer]:
+    """Turn a parse restriction into a SoupStrainer (None parses everything)"""
+    if only is None or isinstance(only, SoupStrainer):
+        return only
+    if isinstance(only, str):
+        return SoupStrainer(only)
+    return SoupStrainer(list(only))
+
+
+def parse_html(markup, parser: Optional[str] = None, only: ParseRestriction = None) -> BeautifulSoup:
+    """
+    Parse markup (bytes, str or a requests.Response) into a BeautifulSoup tree.
+
+    Args:
+        markup: Page content, or a response whose content is parsed
+        parser: Tree builder name; defaults to the fastest installed
+        only: Restrict the tree to matching elements (and their contents)
+    """
+    if hasattr(markup, 'content'):
+        markup = markup.content
+    return BeautifulSoup(markup, parser or default_html_parser(), parse_only=make_strainer(only))
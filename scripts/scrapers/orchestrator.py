@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Multi-Supplier Scraping Orchestrator
+
+Discovers every concrete BaseScraper subclass in scripts/scrapers and runs
+them in parallel worker processes. Suppliers are independent hosts, so each
+scraper keeps its own rate_limit_delay inside its own process while the
+others proceed.
+
+Workers never write products themselves: scraped products are sent back in
+chunks over a queue and handed to a DatabaseWriter thread in the parent
+process (see db_writer.py). It owns the only product write connection and
+group-commits the chunks, so suppliers never contend for the SQLite lock.
+A worker waits for each chunk's commit before it checkpoints the pages the
+products came from, so a failed write leaves them to be fetched again.
+
+Usage:
+    python scripts/scrapers/orchestrator.py [--suppliers FarmTekScraper ...]
+        [--workers 4] [--chunk-size 100] [--list]
+"""
+
+import argparse
+import importlib
+import inspect
+import multiprocessing
+import queue
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Type
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.scrapers.base_scraper import BaseScraper, ScrapedProduct
+from scripts.scrapers.bulk_writer import SaveStats
+from scripts.scrapers.db_writer import DatabaseWriter
+
+SCRAPER_PACKAGE = 'scripts.scrapers'
+DEFAULT_CHUNK_SIZE = 100
+
+# How long the writer waits on the queue before checking worker status
+QUEUE_POLL_SECONDS = 0.2
+
+
+@dataclass
+class SupplierRunSummary:
+    """Outcome of one scraper's run inside the orchestrator"""
+    scraper: str
+    supplier: str = ""
+    session_id: str = ""
+    products_scraped: int = 0
+    products_saved: int = 0
+    products_new: int = 0
+    products_changed: int = 0
+    products_unchanged: int = 0
+    requests_made: int = 0
+    cache_hits: int = 0
+    throttle_count: int = 0
+    requests_skipped: int = 0
+    pages_reused: int = 0
+    duration_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.errors
+
+
+@dataclass
+class OrchestratorSummary:
+    """Aggregated results across all suppliers in one orchestrated run"""
+    start_time: datetime
+    end_time: Optional[datetime] = None
+    suppliers: List[SupplierRunSummary] = field(default_factory=list)
+
+    @property
+    def products_scraped(self) -> int:
+        return sum(s.products_scraped for s in self.suppliers)
+
+    @property
+    def products_saved(self) -> int:
+        return sum(s.products_saved for s in self.suppliers)
+
+    @property
+    def requests_made(self) -> int:
+        return sum(s.requests_made for s in self.suppliers)
+
+    @property
+    def failed(self) -> List[str]:
+        return [s.scraper for s in self.suppliers if not s.succeeded]
+
+
+def discover_scrapers(package_dir: Optional[Path] = None,
+                      package: str = SCRAPER_PACKAGE) -> Dict[str, Type[BaseScraper]]:
+    """
+    Import every module in the scraper package and collect concrete
+    BaseScraper subclasses defined there, keyed by class name.
+    """
+    package_dir = Path(package_dir or Path(__file__).parent)
+    scrapers: Dict[str, Type[BaseScraper]] = {}
+
+    for module_path in sorted(package_dir.glob('*.py')):
+        if module_path.stem.startswith('_'):
+            continue
+
+        module_name = f"{package}.{module_path.stem}"
+        module = importlib.import_module(module_name)
+
+        for name, obj in inspect.getmembers(module, inspect.isclass):
+            if (issubclass(obj, BaseScraper) and obj is not BaseScraper
+                    and not inspect.isabstract(obj) and obj.__module__ == module_name):
+                scrapers[name] = obj
+
+    return scrapers
+
+
+class WriterError(Exception):
+    """Products sent to the parent's writer were not saved"""
+
+
+def _writer_sink(class_name: str, supplier_name: str, product_queue, reply_queue,
+                 chunk_size: int) -> Callable[[List[ScrapedProduct], Optional[str]], int]:
+    """
+    A product_sink that sends products to the parent's writer in chunks and
+    returns once every chunk is committed, so the scraper only checkpoints
+    its crawl frontier for products that are in the database.
+    """
+    def send_to_writer(products: List[ScrapedProduct], session_id: Optional[str]) -> int:
+        chunks = [products[i:i + chunk_size] for i in range(0, len(products), chunk_size)]
+        for chunk in chunks:
+            product_queue.put((class_name, supplier_name, session_id, chunk))
+
+        # One reply per chunk: the number saved, or the error that lost it
+        saved, errors = 0, []
+        for _ in chunks:
+            reply = reply_queue.get()
+            if isinstance(reply, str):
+                errors.append(reply)
+            else:
+                saved += reply
+        if errors:
+            raise WriterError('; '.join(errors))
+        return saved
+
+    return send_to_writer
+
+
+def _run_scraper(module_name: str, class_name: str, scraper_options: Dict[str, Any],
+                 scrape_kwargs: Dict[str, Any], product_queue, reply_queue,
+                 chunk_size: int) -> SupplierRunSummary:
+    """
+    Worker entry point: run one scraper's session, streaming products to the
+    parent's writer instead of saving them.
+    """
+    summary = SupplierRunSummary(scraper=class_name)
+    start = time.time()
+
+    try:
+        scraper_class = getattr(importlib.import_module(module_name), class_name)
+        scraper = scraper_class(**scraper_options)
+        summary.supplier = scraper.supplier_name
+
+        scraper.product_sink = _writer_sink(class_name, scraper.supplier_name, product_queue,
+                                            reply_queue, chunk_size)
+        result = scraper.run_scraping_session(**scrape_kwargs)
+
+        summary.session_id = result.session_id
+        summary.products_scraped = result.products_count
+        summary.requests_made = result.requests_made
+        summary.cache_hits = result.cache_hits
+        summary.throttle_count = result.throttle_count
+        summary.requests_skipped = result.requests_skipped
+        summary.pages_reused = result.pages_reused
+        summary.errors.extend(result.errors)
+        summary.warnings.extend(result.warnings)
+    except Exception as e:
+        summary.errors.append(f"{type(e).__name__}: {e}")
+
+    summary.duration_seconds = time.time() - start
+    return summary
+
+
+class ScrapingOrchestrator:
+    """Runs supplier scrapers in parallel with a single database writer"""
+
+    def __init__(self,
+                 db_path: Optional[str] = None,
+                 max_workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 scraper_options: Optional[Dict[str, Dict[str, Any]]] = None,
+                 scrape_kwargs: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Args:
+            db_path: Database the writer saves to (defaults to the scrapers' own)
+            max_workers: Worker processes; defaults to one per scraper
+            chunk_size: Products per queue message and per write job
+            scraper_options: Constructor kwargs per scraper class name
+            scrape_kwargs: run_scraping_session kwargs per scraper class name
+        """
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.scraper_options = scraper_options or {}
+        self.scrape_kwargs = scrape_kwargs or {}
+        self.available = discover_scrapers()
+
+    def _options_for(self, class_name: str) -> Dict[str, Any]:
+        options = dict(self.scraper_options.get(class_name, {}))
+        if self.db_path:
+            # Workers keep their crawl checkpoints in the same database
+            options['db_path'] = self.db_path
+        return options
+
+    def _collect_write(self, writer: DatabaseWriter, message, write) -> SaveStats:
+        """
+        Wait for a chunk's write; if it failed, retry its products one job
+        each so a bad product only costs itself (as BaseScraper.save_products).
+        """
+        class_name, supplier_name, session_id, products = message
+        try:
+            return write.result()
+        except sqlite3.Error:
+            pass
+
+        stats = SaveStats()
+        retries = [writer.write_products(supplier_name, [product], session_id) for product in products]
+        for retry in retries:
+            try:
+                stats.add(retry.result())
+            except sqlite3.Error:
+                stats.skipped += 1
+        return stats
+
+    def run(self, scraper_names: Optional[List[str]] = None) -> OrchestratorSummary:
+        """Run the named scrapers (default: all discovered) and return a summary"""
+        names = scraper_names or sorted(self.available)
+        unknown = [name for name in names if name not in self.available]
+        if unknown:
+            raise ValueError(f"Unknown scrapers: {', '.join(unknown)}")
+
+        summary = OrchestratorSummary(start_time=datetime.now())
+
+        save_stats = {name: SaveStats() for name in names}
+        pending = []
+
+        with multiprocessing.Manager() as manager, DatabaseWriter(self.db_path) as writer:
+            product_queue = manager.Queue()
+            reply_queues = {name: manager.Queue() for name in names}
+
+            with ProcessPoolExecutor(max_workers=self.max_workers or len(names)) as executor:
+                futures = {
+                    executor.submit(
+                        _run_scraper,
+                        self.available[name].__module__,
+                        name,
+                        self._options_for(name),
+                        self.scrape_kwargs.get(name, {}),
+                        product_queue,
+                        reply_queues[name],
+                        self.chunk_size
+                    ): name
+                    for name in names
+                }
+
+                def collect(wait: bool):
+                    # Tally finished writes, answer the worker waiting on each and
+                    # drop them, so only chunks still being written are held in memory
+                    still_pending = []
+                    for message, write in pending:
+                        if not wait and not write.done():
+                            still_pending.append((message, write))
+                            continue
+                        class_name, products = message[0], message[3]
+                        try:
+                            stats = self._collect_write(writer, message, write)
+                        except Exception as e:
+                            reply_queues[class_name].put(f"Writer failed for {len(products)} products: {e}")
+                            continue
+                        save_stats[class_name].add(stats)
+                        reply_queues[class_name].put(stats.saved)
+                    pending[:] = still_pending
+
+                def submit(message):
+                    class_name, supplier_name, session_id, products = message
+                    pending.append((message, writer.write_products(supplier_name, products, session_id)))
+
+                # Hand chunks to the writer thread while workers are still running
+                while True:
+                    collect(wait=False)
+                    try:
+                        submit(product_queue.get(timeout=QUEUE_POLL_SECONDS))
+                    except queue.Empty:
+                        if all(future.done() for future in futures):
+                            break
+                # A worker may have sent its last chunk after the final poll
+                while True:
+                    try:
+                        submit(product_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                collect(wait=True)
+
+                for future, name in futures.items():
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = SupplierRunSummary(scraper=name, errors=[f"Worker crashed: {e}"])
+                    result.products_saved = save_stats[name].saved
+                    result.products_new = save_stats[name].new
+                    result.products_changed = save_stats[name].changed
+                    result.products_unchanged = save_stats[name].unchanged
+                    summary.suppliers.append(result)
+
+        summary.end_time = datetime.now()
+        return summary
+
+
+def print_summary(summary: OrchestratorSummary):
+    """Print an aggregated run summary"""
+    duration = (summary.end_time - summary.start_time).total_seconds()
+
+    print(f"\nOrchestrated Run Summary ({duration:.1f}s)")
+    print("=" * 60)
+    for supplier in summary.suppliers:
+        status = "OK" if supplier.succeeded else "FAILED"
+        print(f"{supplier.scraper:<28} {status:<7} "
+              f"{supplier.products_saved}/{supplier.products_scraped} saved "
+              f"({supplier.products_new} new, {supplier.products_changed} changed, "
+              f"{supplier.products_unchanged} unchanged), "
+              f"{supplier.requests_made} requests, {supplier.cache_hits} cache hits, "
+              f"{supplier.throttle_count} throttled, {supplier.requests_skipped} skipped, "
+              f"{supplier.pages_reused} reused, "
+              f"{supplier.duration_seconds:.1f}s")
+        for error in supplier.errors:
+            print(f"    - {error}")
+
+    print("-" * 60)
+    print(f"Total: {summary.products_saved}/{summary.products_scraped} products saved "
+          f"from {len(summary.suppliers)} suppliers, {summary.requests_made} requests")
+    if summary.failed:
+        print(f"Failed: {', '.join(summary.failed)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run all Terra35 supplier scrapers in parallel')
+    parser.add_argument('--suppliers', nargs='+', help='Scraper class names to run (default: all)')
+    parser.add_argument('--workers', type=int, help='Number of worker processes')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                       help='Products per write transaction')
+    parser.add_argument('--db-path', help='Database path (default: data/costs/vanilla_costs.db)')
+    parser.add_argument('--list', action='store_true', help='List discovered scrapers and exit')
+
+    args = parser.parse_args()
+
+    if args.list:
+        for name, scraper_class in sorted(discover_scrapers().items()):
+            print(f"{name} ({scraper_class.__module__})")
+        return
+
+    orchestrator = ScrapingOrchestrator(
+        db_path=args.db_path,
+        max_workers=args.workers,
+        chunk_size=args.chunk_size
+    )
+
+    try:
+        summary = orchestrator.run(args.suppliers)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print_summary(summary)
+    sys.exit(1 if summary.failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Page Extraction Store
+
+Routine refresh runs mostly fetch pages that have not changed, and parsing
+them again is the bulk of a session's CPU time. The page_extractions table
+keeps, per supplier URL, the product its page last parsed into together
+with a content hash. When a fetched or revalidated page hashes the same,
+the stored product is reused and the page is not parsed.
+
+The hash covers more than the body: the scraper's parser version (bump it
+when parse_page changes what it extracts) and the parse context queued with
+the URL (e.g. FarmTek's category path), minus crawl bookkeeping keys that
+do not change the result.
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import get_connection
+from scripts.schema_migrations import apply_migrations
+
+# Context keys that steer crawling but are not read by parse_page
+PAGE_STATE_KEYS = frozenset({'lastmod', 'refresh', 'sitemap_only'})
+
+# (content hash, product fields or None) per URL
+Extraction = Tuple[str, Optional[Dict[str, Any]]]
+
+
+def content_hash(body: Union[str, bytes], parser_version: str,
+                 context: Optional[Dict[str, Any]] = None) -> str:
+    """Hash of everything a page's parse result depends on"""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    parse_context = {key: value for key, value in (context or {}).items()
+                     if key not in PAGE_STATE_KEYS}
+    digest = hashlib.sha256()
+    digest.update(parser_version.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(json.dumps(parse_context, sort_keys=True).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def load_extractions(db_path: str, supplier: str, parser_version: str) -> Dict[str, Extraction]:
+    """Stored extractions of a supplier's pages made by this parser version"""
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        rows = conn.execute("""
+            SELECT url, content_hash, product FROM page_extractions
+            WHERE supplier = ? AND parser_version = ?
+        """, (supplier, parser_version)).fetchall()
+    return {url: (digest, json.loads(product) if product else None) for url, digest, product in rows}
+
+
+def record_extractions(db_path: str, supplier: str, parser_version: str,
+                       extractions: Dict[str, Extraction]):
+    """Remember what pages parsed into, replacing earlier extractions"""
+    if not extractions:
+        return
+
+    with get_connection(db_path) as conn:
+        apply_migrations(conn)
+        conn.executemany("""
+            INSERT INTO page_extractions (supplier, url, content_hash, parser_version, product)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(supplier, url) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                parser_version = excluded.parser_version,
+                product = excluded.product,
+                extracted_at = CURRENT_TIMESTAMP
+        """, [(supplier, url, digest, parser_version, json.dumps(product) if product else None)
+              for url, (digest, product) in extractions.items()])
+        conn.commit()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - HTML Parser Benchmark
+
+Micro-benchmark of HTML parsing on cached supplier pages. Each installed
+tree builder is timed on the same pages, once building the full tree and
+once with the supplier's partial-parsing strainers, so backend and strainer
+changes can be measured on real markup without touching the network.
+
+Usage:
+    python scripts/scrapers/parser_benchmark.py [--cache-dir data/cache/farmtek]
+        [--limit 200] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from bs4 import SoupStrainer
+
+from scripts.scrapers.cache_manager import open_supplier_stores
+from scripts.scrapers.farmtek_scraper import PRODUCT_DETAIL_STRAINER, PRODUCT_LINK_STRAINER
+from scripts.scrapers.html_parsing import available_parsers, parse_html
+
+
+@dataclass
+class ParserBenchmarkResult:
+    """Timing of one parser configuration over a set of pages"""
+    parser: str
+    partial: bool
+    pages: int
+    bytes_parsed: int
+    seconds: float  # best of the repeats
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes_parsed / self.seconds / 1024 / 1024 if self.seconds else 0.0
+
+
+def farmtek_strainer(url: str) -> SoupStrainer:
+    """Strainer FarmTekScraper uses for a page"""
+    return PRODUCT_DETAIL_STRAINER if '/product/' in url else PRODUCT_LINK_STRAINER
+
+
+def load_cached_pages(cache_dir: Path, limit: Optional[int] = None) -> Dict[str, bytes]:
+    """Read up to limit cached page bodies as {url: content}"""
+    pages: Dict[str, bytes] = {}
+    for store in open_supplier_stores(Path(cache_dir)):
+        try:
+            for cache_key in store.keys():
+                if limit and len(pages) >= limit:
+                    return pages
+                cached_data = store.load(cache_key)
+                if cached_data and cached_data.get('content'):
+                    pages[cached_data['url']] = cached_data['content'].encode(
+                        cached_data.get('encoding') or 'utf-8', errors='replace'
+                    )
+        finally:
+            store.close()
+    return pages
+
+
+def benchmark_parsers(pages: Dict[str, bytes],
+                      strainer_for: Callable[[str], SoupStrainer] = farmtek_strainer,
+                      parsers: Optional[List[str]] = None,
+                      repeat: int = 3) -> List[ParserBenchmarkResult]:
+    """Time each parser on the pages with full and partial parsing"""
+    bytes_parsed = sum(len(content) for content in pages.values())
+    results = []
+
+    for parser in parsers or available_parsers():
+        for partial in (False, True):
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for url, content in pages.items():
+                    parse_html(content, parser, strainer_for(url) if partial else None)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            results.append(ParserBenchmarkResult(
+                parser=parser, partial=partial, pages=len(pages),
+                bytes_parsed=bytes_parsed, seconds=best or 0.0
+            ))
+
+    return results
+
+
+def print_results(results: List[ParserBenchmarkResult]):
+    """Print results relative to the slowest configuration"""
+    slowest = max(result.seconds for result in results) if results else 0.0
+
+    print(f"{'Parser':<14} {'Mode':<8} {'Pages':>6} {'Seconds':>9} {'Pages/s':>9} {'MB/s':>7} {'Speedup':>8}")
+    print("-" * 67)
+    for result in results:
+        speedup = slowest / result.seconds if result.seconds else 0.0
+        print(f"{result.parser:<14} {'partial' if result.partial else 'full':<8} "
+              f"{result.pages:>6} {result.seconds:>9.3f} {result.pages_per_second:>9.1f} "
+              f"{result.mb_per_second:>7.2f} {speedup:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser backends on cached pages')
+    parser.add_argument('--cache-dir', default=str(project_root / 'data' / 'cache' / 'farmtek'),
+                       help='Supplier cache directory (default: data/cache/farmtek)')
+    parser.add_argument('--limit', type=int, default=200, help='Maximum pages to parse')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repeats (best is reported)')
+
+    args = parser.parse_args()
+
+    pages = load_cached_pages(Path(args.cache_dir), args.limit)
+    if not pages:
+        print(f"No cached pages found in {args.cache_dir}")
+        sys.exit(1)
+
+    print(f"Parsing {len(pages)} cached pages with: {', '.join(available_parsers())}\n")
+    print_results(benchmark_parsers(pages, repeat=args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Fetch/Parse/Write Pipeline
+
+Staged page processing for scraping sessions. Rather than fetching a batch
+of pages and then parsing it, three stages run at the same time and pass
+work along through bounded queues:
+
+1. fetch: an asyncio loop in its own thread fetches pages concurrently
+2. parse: a pool of worker threads runs the scraper's parse hook
+3. write: one thread persists parsed results in batches
+
+Because the queues are bounded, a slow stage holds back the stages before
+it and fetched pages never pile up in memory. Each stage records how long
+it spent working and how long it was blocked on the next stage, which shows
+where a session's time goes.
+
+Parsing stays in threads: the parser holds the GIL, but page fetches and
+database writes release it, so network, CPU and disk work overlap.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Seconds between checks for a stopped pipeline while waiting on a queue
+QUEUE_POLL_SECONDS = 0.1
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+@dataclass
+class PageResult:
+    """One page after the pipeline: its product, if any was parsed"""
+    url: str
+    context: Dict[str, Any]
+    product: Optional[Any] = None
+    fetched: bool = False
+
+
+@dataclass
+class StageStats:
+    """Work done by one pipeline stage"""
+    items: int = 0
+    busy_seconds: float = 0.0     # summed over the stage's concurrent workers
+    blocked_seconds: float = 0.0  # waiting for room in the next stage's queue
+
+    def add(self, other: 'StageStats'):
+        self.items += other.items
+        self.busy_seconds += other.busy_seconds
+        self.blocked_seconds += other.blocked_seconds
+
+
+@dataclass
+class PipelineStats:
+    """Per-stage timing of one or more pipeline runs"""
+    fetch: StageStats = field(default_factory=StageStats)
+    parse: StageStats = field(default_factory=StageStats)
+    write: StageStats = field(default_factory=StageStats)
+    wall_seconds: float = 0.0
+
+    def add(self, other: 'PipelineStats'):
+        self.fetch.add(other.fetch)
+        self.parse.add(other.parse)
+        self.write.add(other.write)
+        self.wall_seconds += other.wall_seconds
+
+    def summary(self) -> str:
+        stages = ', '.join(
+            f"{name} {stats.items} in {stats.busy_seconds:.1f}s "
+            f"(blocked {stats.blocked_seconds:.1f}s)"
+            for name, stats in (('fetch', self.fetch), ('parse', self.parse), ('write', self.write))
+        )
+        return f"{stages}; {self.wall_seconds:.1f}s wall"
+
+
+class PagePipeline:
+    """
+    Runs fetch, parse and write over a stream of pages.
+
+    fetch(url, context) is a coroutine returning a response or None,
+    parse(url, response, context) returns a product or None, and the
+    optional write(results) persists a batch of PageResults. Results are
+    yielded in write batches, after they have been written.
+
+    An exception from parse is logged and the page yields no product; one
+    from write stops the pipeline and is re-raised to the caller.
+    """
+
+    def __init__(self,
+                 fetch: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+                 parse: Callable[[str, Any, Dict[str, Any]], Optional[Any]],
+                 write: Optional[Callable[[List[PageResult]], None]] = None,
+                 concurrency: int = 8,
+                 parse_workers: int = 2,
+                 queue_size: int = 32,
+                 write_batch_size: int = 25,
+                 logger: Optional[logging.Logger] = None):
+        self.fetch = fetch
+        self.parse = parse
+        self.write = write
+        self.concurrency = max(1, concurrency)
+        self.parse_workers = max(1, parse_workers)
+        self.queue_size = max(1, queue_size)
+        self.write_batch_size = max(1, write_batch_size)
+        self.logger = logger or logging.getLogger('scraper.pipeline')
+
+        self.stats = PipelineStats()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def run(self, pages: Iterable[Tuple[str, Dict[str, Any]]]) -> Iterator[PageResult]:
+        """Process (url, context) pairs, yielding a PageResult per page"""
+        self.stats = PipelineStats()
+        self._stop.clear()
+        self._error = None
+
+        parse_queue = queue.Queue(maxsize=self.queue_size)
+        write_queue = queue.Queue(maxsize=self.queue_size)
+        output_queue = queue.Queue(maxsize=2)
+
+        threads = [threading.Thread(target=self._guard, args=(self._fetch_stage, pages, parse_queue),
+                                    name='pipeline-fetch', daemon=True)]
+        threads += [threading.Thread(target=self._guard, args=(self._parse_stage, parse_queue, write_queue),
+                                     name=f'pipeline-parse-{i}', daemon=True)
+                    for i in range(self.parse_workers)]
+        threads.append(threading.Thread(target=self._guard,
+                                        args=(self._write_stage, write_queue, output_queue),
+                                        name='pipeline-write', daemon=True))
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                batch = self._get(output_queue)
+                if batch is _DONE:
+                    break
+                yield from batch
+        finally:
+            # Also reached when the caller stops iterating early
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            self.stats.wall_seconds = time.perf_counter() - started
+
+        if self._error is not None:
+            raise self._error
+
+    def _guard(self, stage: Callable, *args):
+        try:
+            stage(*args)
+        except Exception as e:
+            if self._error is None:
+                self._error = e
+            self._stop.set()
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Put with backpressure; False if the pipeline stopped meanwhile"""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        """Next item, or _DONE once the pipeline has stopped"""
+        while True:
+            try:
+                return q.get(timeout=QUEUE_POLL_SECONDS)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _DONE
+
+    def _put_timed(self, q: queue.Queue, item, stats: StageStats) -> bool:
+        started = time.perf_counter()
+        put = self._put(q, item)
+        with self._lock:
+            stats.blocked_seconds += time.perf_counter() - started
+        return put
+
+    def _fetch_stage(self, pages: Iterable[Tuple[str, Dict[str, Any]]], parse_queue: queue.Queue):
+        asyncio.run(self._fetch_all(pages, parse_queue))
+        for _ in range(self.parse_workers):
+            self._put(parse_queue, _DONE)
+
+    async def _fetch_all(self, pages: Iterable[Tuple[str, Dict[str, Any]]], parse_queue: queue.Queue):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        stats = self.stats.fetch
+
+        async def fetch_one(url: str, context: Dict[str, Any]):
+            try:
+                started = time.perf_counter()
+                try:
+                    response = await self.fetch(url, context)
+                except Exception as e:
+                    self.logger.warning(f"Failed to fetch {url}: {e}")
+                    response = None
+                stats.items += 1
+                stats.busy_seconds += time.perf_counter() - started
+
+                # Holding the semaphore while the parse queue is full stops new fetches
+                await asyncio.to_thread(self._put_timed, parse_queue, (url, context, response), stats)
+            finally:
+                semaphore.release()
+
+        tasks = set()
+        for url, context in pages:
+            await semaphore.acquire()
+            if self._stop.is_set():
+                semaphore.release()
+                break
+            task = asyncio.create_task(fetch_one(url, context or {}))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def _parse_stage(self, parse_queue: queue.Queue, write_queue: queue.Queue):
+        stats = self.stats.parse
+        while True:
+            item = self._get(parse_queue)
+            if item is _DONE:
+                break
+
+            url, context, response = item
+            product = None
+            if response is not None:
+                started = time.perf_counter()
+                try:
+                    product = self.parse(url, response, context)
+                except Exception as e:
+                    self.logger.warning(f"Failed to parse {url}: {e}")
+                with self._lock:
+                    stats.items += 1
+                    stats.busy_seconds += time.perf_counter() - started
+
+            result = PageResult(url=url, context=context, product=product,
+                                fetched=response is not None)
+            if not self._put_timed(write_queue, result, stats):
+                return
+
+        self._put(write_queue, _DONE)
+
+    def _write_stage(self, write_queue: queue.Queue, output_queue: queue.Queue):
+        batch: List[PageResult] = []
+        remaining = self.parse_workers
+        while remaining:
+            item = self._get(write_queue)
+            if item is _DONE:
+                if self._stop.is_set():
+                    return
+                remaining -= 1
+                continue
+
+            batch.append(item)
+            if len(batch) >= self.write_batch_size:
+                if not self._flush(batch, output_queue):
+                    return
+                batch = []
+
+        if batch and not self._flush(batch, output_queue):
+            return
+        self._put(output_queue, _DONE)
+
+    def _flush(self, batch: List[PageResult], output_queue: queue.Queue) -> bool:
+        stats = self.stats.write
+        if self.write is not None:
+            started = time.perf_counter()
+            self.write(batch)
+            stats.busy_seconds += time.perf_counter() - started
+        stats.items += len(batch)
+        return self._put_timed(output_queue, batch, stats)
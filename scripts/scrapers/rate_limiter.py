@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Per-Host Rate Limiting
+
+Token-bucket rate limiting keyed by host, shared by the synchronous and
+asynchronous request paths of BaseScraper. Each host gets its own bucket
+refilled at ``1 / delay`` tokens per second, so requests to different
+suppliers never wait on each other while requests to the same supplier
+stay as polite as the configured ``rate_limit_delay``.
+
+AdaptiveHostRateLimiter additionally tunes each host's delay from the
+responses it returns: fast, clean responses shrink the delay towards a
+floor, slow responses and failures grow it, ``429``/``503`` responses
+block the host until their ``Retry-After`` has passed, and a run of
+consecutive failures opens a circuit breaker so the host is skipped until
+a cooldown expires.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Adaptive pacing
+MIN_DELAY_FACTOR = 0.25             # floor for the delay, as a fraction of the configured one
+MAX_DELAY_SECONDS = 60.0
+SPEEDUP_STREAK = 5                  # fast, clean responses needed per speed-up step
+SPEEDUP_FACTOR = 0.9
+SLOWDOWN_FACTOR = 1.25
+BACKOFF_FACTOR = 2.0
+FAST_RESPONSE_SECONDS = 1.0
+SLOW_RESPONSE_SECONDS = 5.0
+MAX_RETRY_AFTER_SECONDS = 600.0
+
+# Circuit breaker
+CIRCUIT_BREAKER_THRESHOLD = 8       # consecutive failures before a host is skipped
+CIRCUIT_BREAKER_COOLDOWN_SECONDS = 300.0
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket state for a single host"""
+    rate: float          # tokens added per second
+    capacity: float      # maximum burst size
+    tokens: float
+    updated_at: float
+
+    def refill(self, now: float):
+        """Add tokens accrued since the last update"""
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return how long the caller must wait for it"""
+        self.refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class HostRateLimiter:
+    """
+    Per-host token-bucket limiter.
+
+    Tokens are reserved under a lock and the wait happens outside it, so
+    concurrent callers queue up in arrival order without holding each other
+    up on other hosts.
+    """
+
+    def __init__(self, delay: float = 1.0, burst: int = 1):
+        self.delay = delay
+        self.burst = max(1, burst)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, host: str) -> float:
+        if self.delay <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(
+                    rate=1.0 / self.delay,
+                    capacity=float(self.burst),
+                    tokens=float(self.burst),
+                    updated_at=now
+                )
+                self._buckets[host] = bucket
+            return bucket.reserve(now)
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to ``host`` is allowed; returns seconds waited"""
+        wait_time = self._reserve(host)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    async def acquire_async(self, host: str) -> float:
+        """Asynchronous variant of :meth:`acquire`"""
+        wait_time = self._reserve(host)
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        return wait_time
+
+    def reset(self, host: Optional[str] = None):
+        """Forget bucket state for one host, or for all hosts"""
+        with self._lock:
+            if host is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(host, None)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header value.
+
+    Accepts both delta-seconds and HTTP-date forms; returns None when the
+    header is missing or malformed. The result is capped at
+    MAX_RETRY_AFTER_SECONDS.
+    """
+    if not value:
+        return None
+    value = value.strip()
+
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - (now or datetime.now(timezone.utc))).total_seconds()
+
+    return min(max(0.0, seconds), MAX_RETRY_AFTER_SECONDS)
+
+
+@dataclass
+class HostState:
+    """Adaptive pacing and circuit breaker state for a single host"""
+    delay: float
+    bucket: Optional[TokenBucket] = None
+    clean_streak: int = 0
+    consecutive_failures: int = 0
+    blocked_until: float = 0.0       # monotonic time before which no request is sent
+    circuit_open_until: float = 0.0  # monotonic time the breaker stays open until
+    trial_in_flight: bool = False    # half-open: the one trial request has not been reported
+
+
+class AdaptiveHostRateLimiter(HostRateLimiter):
+    """
+    Per-host limiter whose delay follows the host's responses.
+
+    Callers report each outcome with :meth:`record_success`,
+    :meth:`record_throttle` or :meth:`record_failure` and check
+    :meth:`allow` before sending. ``delay`` is the starting delay for hosts
+    seen for the first time; each host then moves between ``min_delay`` and
+    ``max_delay`` on its own. A configured delay of 0 stays 0, but
+    Retry-After and the circuit breaker still apply.
+    """
+
+    def __init__(self, delay: float = 1.0, burst: int = 1,
+                 min_delay: Optional[float] = None,
+                 max_delay: float = MAX_DELAY_SECONDS,
+                 failure_threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+                 cooldown: float = CIRCUIT_BREAKER_COOLDOWN_SECONDS):
+        super().__init__(delay, burst)
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self._hosts: Dict[str, HostState] = {}
+
+    def _state(self, host: str, now: float) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(delay=max(0.0, self.delay))
+            self._set_delay(state, state.delay, now)
+            self._hosts[host] = state
+        return state
+
+    def _set_delay(self, state: HostState, delay: float, now: float):
+        if self.delay <= 0:
+            state.delay = 0.0
+            state.bucket = None
+            return
+
+        floor = self.min_delay if self.min_delay is not None else self.delay * MIN_DELAY_FACTOR
+        state.delay = min(self.max_delay, max(floor, delay))
+        if state.bucket is None:
+            state.bucket = TokenBucket(
+                rate=1.0 / state.delay,
+                capacity=float(self.burst),
+                tokens=float(self.burst),
+                updated_at=now
+            )
+        else:
+            state.bucket.refill(now)
+            state.bucket.rate = 1.0 / state.delay
+
+    def _reserve(self, host: str) -> float:
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host, now)
+            blocked = max(0.0, state.blocked_until - now)
+            if state.bucket is None:
+                return blocked
+            # The token is taken at the moment the host unblocks
+            return blocked + state.bucket.reserve(now + blocked)
+
+    def allow(self, host: str) -> bool:
+        """
+        Whether a request to ``host`` may be sent.
+
+        Returns False while the host's circuit breaker is open. Once the
+        cooldown has passed a single trial request is let through and other
+        callers keep getting False until its outcome is reported: a success
+        closes the breaker, another failure reopens it straight away. A
+        trial that is never reported is replaced by a new one after another
+        cooldown.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host, now)
+            if not state.circuit_open_until:
+                return True
+            if now < state.circuit_open_until:
+                return False
+            # Half-open: hold everyone else back for the trial's outcome
+            state.circuit_open_until = now + self.cooldown
+            state.trial_in_flight = True
+            state.consecutive_failures = self.failure_threshold - 1
+            return True
+
+    def is_open(self, host: str) -> bool:
+        """Whether the circuit breaker for ``host`` is currently open"""
+        with self._lock:
+            state = self._hosts.get(host)
+            return bool(state and time.monotonic() < state.circuit_open_until)
+
+    def delay_for(self, host: str) -> float:
+        """Current delay between requests to ``host``"""
+        with self._lock:
+            return self._state(host, time.monotonic()).delay
+
+    def record_success(self, host: str, elapsed: float):
+        """Report a successful response that took ``elapsed`` seconds"""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host, now)
+            state.consecutive_failures = 0
+            state.circuit_open_until = 0.0
+            state.trial_in_flight = False
+
+            if elapsed >= SLOW_RESPONSE_SECONDS:
+                state.clean_streak = 0
+                self._set_delay(state, state.delay * SLOWDOWN_FACTOR, now)
+            elif elapsed <= FAST_RESPONSE_SECONDS:
+                state.clean_streak += 1
+                if state.clean_streak >= SPEEDUP_STREAK:
+                    state.clean_streak = 0
+                    self._set_delay(state, state.delay * SPEEDUP_FACTOR, now)
+
+    def record_throttle(self, host: str, retry_after: Optional[float] = None) -> bool:
+        """
+        Report a 429/503 response.
+
+        The host's delay is backed off and no request is sent to it before
+        ``retry_after`` seconds (or the new delay, without a Retry-After).
+        Returns True when this response opened the circuit breaker.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host, now)
+            self._back_off(state, now)
+            wait = retry_after if retry_after is not None else state.delay
+            state.blocked_until = max(state.blocked_until, now + wait)
+            return self._count_failure(state, now)
+
+    def record_failure(self, host: str) -> bool:
+        """
+        Report a server error or connection failure.
+
+        Returns True when this failure opened the circuit breaker.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host, now)
+            self._back_off(state, now)
+            return self._count_failure(state, now)
+
+    def _back_off(self, state: HostState, now: float):
+        state.clean_streak = 0
+        self._set_delay(state, max(state.delay * BACKOFF_FACTOR, self.delay), now)
+
+    def _count_failure(self, state: HostState, now: float) -> bool:
+        state.consecutive_failures += 1
+        if state.consecutive_failures >= self.failure_threshold and (
+                state.trial_in_flight or not state.circuit_open_until):
+            state.circuit_open_until = now + self.cooldown
+            state.trial_in_flight = False
+            return True
+        return False
+
+    def reset(self, host: Optional[str] = None):
+        """Forget pacing and breaker state for one host, or for all hosts"""
+        super().reset(host)
+        with self._lock:
+            if host is None:
+                self._hosts.clear()
+            else:
+                self._hosts.pop(host, None)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Offline Cache Replay
+
+Re-extracts products from a supplier's response cache without touching the
+network, e.g. after fixing a selector. Cache keys are split into batches
+and parsed in a process pool; each worker opens the supplier's cache stores
+itself, so page bodies never cross process boundaries. The rebuilt products
+are diffed against the latest stored cost_items/cost_pricing rows and can
+optionally be saved.
+
+Scrapers opt in by implementing BaseScraper.parse_cached_page. Context that
+is only known while crawling (e.g. FarmTek's category path) is taken from
+the crawl_frontier rows recorded for each URL.
+
+Usage:
+    python scripts/scrapers/replay.py FarmTekScraper [--workers 8]
+        [--batch-size 200] [--apply] [--db-path data/costs/vanilla_costs.db]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.constants import DEFAULT_UNIT, DEFAULT_CURRENCY
+from scripts.db import get_connection
+from scripts.scrapers.base_scraper import BaseScraper, ScrapedProduct
+from scripts.scrapers.cache_manager import open_supplier_stores
+from scripts.scrapers.cache_store import CacheStore
+from scripts.scrapers.crawl_frontier import CrawlFrontier
+from scripts.scrapers.orchestrator import discover_scrapers
+
+DEFAULT_BATCH_SIZE = 200
+
+DIFF_NEW = 'new'
+DIFF_CHANGED = 'changed'
+DIFF_UNCHANGED = 'unchanged'
+
+# Fields compared between stored and replayed products
+DIFF_FIELDS = ('item_name', 'category', 'specifications', 'unit_cost', 'unit', 'currency')
+
+
+@dataclass
+class ProductDiff:
+    """How a replayed product differs from what is stored"""
+    item_id: str
+    status: str
+    source_url: str
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)  # field -> (stored, replayed)
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of replaying one supplier's cache"""
+    supplier: str
+    pages: int = 0
+    products: List[ScrapedProduct] = field(default_factory=list)
+    diffs: List[ProductDiff] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    products_saved: int = 0
+    duration_seconds: float = 0.0
+
+    def count(self, status: str) -> int:
+        return sum(1 for diff in self.diffs if diff.status == status)
+
+
+def parse_cached_entries(scraper: BaseScraper, store: CacheStore, cache_keys: List[str],
+                         contexts: Dict[str, Dict[str, Any]]) -> Tuple[List[ScrapedProduct], List[str]]:
+    """Parse cache entries with a scraper; returns (products, errors)"""
+    products, errors = [], []
+
+    for cache_key in cache_keys:
+        try:
+            cached_data = store.peek(cache_key)
+            if not cached_data or cached_data.get('status_code', 200) >= 400:
+                continue
+            response = scraper._response_from_cache(cached_data)
+            product = scraper.parse_cached_page(response, contexts.get(response.url, {}))
+        except Exception as e:
+            errors.append(f"{cache_key}: {type(e).__name__}: {e}")
+            continue
+        if product:
+            products.append(product)
+
+    return products, errors
+
+
+# Per-process state for pool workers, set up once by _init_worker
+_worker_scraper: Optional[BaseScraper] = None
+_worker_stores: List[CacheStore] = []
+_worker_contexts: Dict[str, Dict[str, Any]] = {}
+
+
+def _init_worker(module_name: str, class_name: str, options: Dict[str, Any],
+                 contexts: Dict[str, Dict[str, Any]]):
+    global _worker_scraper, _worker_stores, _worker_contexts
+    scraper_class = getattr(importlib.import_module(module_name), class_name)
+    _worker_scraper = scraper_class(**options)
+    _worker_stores = open_supplier_stores(_worker_scraper.cache_dir)
+    _worker_contexts = contexts
+
+
+def _parse_batch(store_index: int, cache_keys: List[str]) -> Tuple[List[ScrapedProduct], List[str]]:
+    return parse_cached_entries(_worker_scraper, _worker_stores[store_index], cache_keys, _worker_contexts)
+
+
+def load_page_contexts(db_path: str, supplier: str) -> Dict[str, Dict[str, Any]]:
+    """Crawl context recorded for each of a supplier's URLs in crawl_frontier (latest wins)"""
+    return CrawlFrontier.known_contexts(db_path, supplier)
+
+
+def load_stored_products(db_path: str, item_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Stored item fields and latest price for the given item IDs"""
+    with get_connection(db_path, read_only=True) as conn:
+        rows = conn.execute("""
+            SELECT ci.item_id, ci.item_name, cc.code, ci.specifications,
+                   cp.unit_cost, cp.unit, cp.currency
+            FROM cost_items ci
+            JOIN cost_categories cc ON cc.id = ci.category_id
+            LEFT JOIN cost_pricing cp ON cp.id = (
+                SELECT id FROM cost_pricing
+                WHERE cost_item_id = ci.id
+                ORDER BY effective_date DESC, id DESC LIMIT 1
+            )
+            WHERE ci.item_id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(item_ids),)).fetchall()
+
+    return {
+        item_id: {
+            'item_name': item_name,
+            'category': category,
+            'specifications': json.loads(specifications) if specifications else None,
+            'unit_cost': unit_cost,
+            'unit': unit,
+            'currency': currency
+        }
+        for item_id, item_name, category, specifications, unit_cost, unit, currency in rows
+    }
+
+
+def _replayed_fields(product: ScrapedProduct) -> Dict[str, Any]:
+    return {
+        'item_name': product.item_name,
+        'category': product.category,
+        'specifications': product.specifications or None,
+        'unit_cost': product.unit_cost,
+        'unit': (product.unit or DEFAULT_UNIT) if product.unit_cost is not None else None,
+        'currency': (product.currency or DEFAULT_CURRENCY) if product.unit_cost is not None else None
+    }
+
+
+def diff_products(products: List[ScrapedProduct], stored: Dict[str, Dict[str, Any]]) -> List[ProductDiff]:
+    """Compare replayed products with their stored counterparts"""
+    diffs = []
+    for product in products:
+        if product.item_id not in stored:
+            diffs.append(ProductDiff(product.item_id, DIFF_NEW, product.source_url))
+            continue
+
+        replayed = _replayed_fields(product)
+        current = stored[product.item_id]
+        changes = {}
+        for name in DIFF_FIELDS:
+            old, new = current[name], replayed[name]
+            if name == 'unit_cost' and old is not None and new is not None:
+                if round(float(old), 2) == round(float(new), 2):
+                    continue
+            elif old == new:
+                continue
+            changes[name] = (old, new)
+
+        diffs.append(ProductDiff(
+            product.item_id, DIFF_CHANGED if changes else DIFF_UNCHANGED,
+            product.source_url, changes
+        ))
+    return diffs
+
+
+def replay_cache(scraper: BaseScraper, workers: Optional[int] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, apply: bool = False) -> ReplayResult:
+    """
+    Re-extract products from a scraper's cache and diff them against the database.
+
+    Args:
+        scraper: Scraper whose cache, parser and database are used
+        workers: Worker processes (default: CPU count); 1 parses in-process
+        batch_size: Cache keys per pool task
+        apply: Save new and changed products in a replay collection session
+    """
+    start = time.time()
+    result = ReplayResult(supplier=scraper.supplier_name)
+    contexts = load_page_contexts(scraper.db_path, scraper.supplier_name)
+    workers = workers or os.cpu_count() or 1
+
+    stores = open_supplier_stores(scraper.cache_dir)
+    try:
+        tasks = []
+        for store_index, store in enumerate(stores):
+            keys = list(store.keys())
+            result.pages += len(keys)
+            tasks.extend((store_index, keys[i:i + batch_size]) for i in range(0, len(keys), batch_size))
+
+        if workers == 1:
+            outputs = [parse_cached_entries(scraper, stores[index], keys, contexts) for index, keys in tasks]
+        else:
+            options = {'cache_dir': str(scraper.cache_dir), 'db_path': scraper.db_path,
+                       'html_parser': scraper.html_parser}
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker,
+                initargs=(type(scraper).__module__, type(scraper).__name__, options, contexts)
+            ) as executor:
+                outputs = list(executor.map(_parse_batch, *zip(*tasks))) if tasks else []
+    finally:
+        for store in stores:
+            store.close()
+
+    # The last page seen for an item wins, as it would in a crawl
+    by_item_id: Dict[str, ScrapedProduct] = {}
+    for products, errors in outputs:
+        result.errors.extend(errors)
+        for product in products:
+            by_item_id[product.item_id] = product
+    result.products = list(by_item_id.values())
+
+    stored = load_stored_products(scraper.db_path, list(by_item_id))
+    result.diffs = diff_products(result.products, stored)
+
+    if apply:
+        to_save = [by_item_id[diff.item_id] for diff in result.diffs if diff.status != DIFF_UNCHANGED]
+        session_id = f"{scraper.supplier_name}_replay_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        for i in range(0, len(to_save), scraper.save_chunk_size):
+            result.products_saved += scraper.save_products(to_save[i:i + scraper.save_chunk_size], session_id)
+
+    result.duration_seconds = time.time() - start
+    scraper.logger.info(
+        f"Replayed {result.pages} cached pages into {len(result.products)} products: "
+        f"{result.count(DIFF_NEW)} new, {result.count(DIFF_CHANGED)} changed, "
+        f"{result.count(DIFF_UNCHANGED)} unchanged, {len(result.errors)} errors "
+        f"in {result.duration_seconds:.1f}s"
+    )
+    return result
+
+
+def print_result(result: ReplayResult, show_unchanged: bool = False):
+    """Print a replay summary followed by per-product differences"""
+    print(f"\nReplay of {result.supplier} cache ({result.duration_seconds:.1f}s)")
+    print("=" * 60)
+    print(f"Pages: {result.pages}, products: {len(result.products)}, errors: {len(result.errors)}")
+    print(f"New: {result.count(DIFF_NEW)}, changed: {result.count(DIFF_CHANGED)}, "
+          f"unchanged: {result.count(DIFF_UNCHANGED)}")
+    if result.products_saved:
+        print(f"Saved: {result.products_saved}")
+
+    for diff in result.diffs:
+        if diff.status == DIFF_UNCHANGED and not show_unchanged:
+            continue
+        print(f"\n[{diff.status}] {diff.item_id} ({diff.source_url})")
+        for name, (old, new) in diff.changes.items():
+            print(f"    {name}: {old!r} -> {new!r}")
+
+    for error in result.errors:
+        print(f"  ! {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-extract products from a scraper response cache')
+    parser.add_argument('scraper', help='Scraper class name, e.g. FarmTekScraper')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help='Cached pages per worker task')
+    parser.add_argument('--apply', action='store_true', help='Save new and changed products')
+    parser.add_argument('--db-path', help='Database path (default: data/costs/vanilla_costs.db)')
+    parser.add_argument('--cache-dir', help="Cache directory (default: the scraper's own)")
+    parser.add_argument('--show-unchanged', action='store_true', help='List unchanged products too')
+
+    args = parser.parse_args()
+
+    scrapers = discover_scrapers()
+    if args.scraper not in scrapers:
+        print(f"Unknown scraper: {args.scraper} (available: {', '.join(sorted(scrapers))})")
+        sys.exit(1)
+
+    options = {key: value for key, value in
+               (('db_path', args.db_path), ('cache_dir', args.cache_dir)) if value}
+    scraper = scrapers[args.scraper](**options)
+
+    result = replay_cache(scraper, workers=args.workers, batch_size=args.batch_size, apply=args.apply)
+    print_result(result, show_unchanged=args.show_unchanged)
+
+
+if __name__ == '__main__':
+    main()
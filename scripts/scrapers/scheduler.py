@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Re-scrape Scheduler
+
+Ranks cost items by how likely their stored price is to be out of date, so
+a scraping run with a limited request budget refreshes the right items
+first instead of everything on the same cadence.
+
+An item's score combines:
+
+1. Age: days since its price was last confirmed - the latest
+   cost_pricing.effective_date, or a later observation of the same price
+   recorded in item_fingerprints.last_seen_at
+2. Freshness policy: the data_freshness windows in validation_config.json.
+   Categories are assigned to a category_specific_freshness class through
+   category_freshness_classes (a subcategory inherits its parent's class);
+   other categories use the global max_age_days / preferred_age_days
+3. Volatility: how much the item's price has moved per 30 days over its
+   pricing history, times the age - the change expected since last checked
+
+Items that were never priced come first. The plan keeps the highest
+scoring items that have a source URL, up to the budget.
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.constants import STATUS_ACTIVE
+from scripts.db import get_connection, resolve_db_path
+from scripts.schema_migrations import apply_migrations
+
+DEFAULT_CONFIG_PATH = project_root / 'config' / 'validation_config.json'
+DEFAULT_MAX_AGE_DAYS = 365
+DEFAULT_PREFERRED_AGE_DAYS = 90
+DEFAULT_POLICY_CLASS = 'default'
+
+# Items confirmed this recently are never planned
+MIN_AGE_DAYS = 1
+
+# Scoring: age counts in preferred-age units; expected relative price change
+# (volatility per 30 days times age) is weighted so that a 10% expected move
+# scores like one preferred age
+VOLATILITY_WEIGHT = 10.0
+VOLATILITY_PERIOD_DAYS = 30
+OVERDUE_BONUS = 1.0
+NEVER_PRICED_PRIORITY = 1000.0
+
+# Reasons an item is due
+REASON_NEVER_PRICED = 'never_priced'
+REASON_OVERDUE = 'overdue'      # older than max_age_days
+REASON_STALE = 'stale'          # older than preferred_age_days
+REASON_VOLATILE = 'volatile'    # expected price move of 5% or more
+REASON_DUE = 'due'
+
+VOLATILE_EXPECTED_CHANGE = 0.05
+
+
+@dataclass
+class FreshnessPolicy:
+    """Age windows for one freshness class"""
+    name: str
+    max_age_days: int
+    preferred_age_days: int
+
+
+@dataclass
+class ItemStaleness:
+    """One cost item's refresh score"""
+    cost_item_id: int
+    item_id: str
+    category: str
+    policy: str
+    age_days: Optional[int]          # None when never priced
+    volatility: float                # relative price change per 30 days
+    priority: float
+    reasons: List[str] = field(default_factory=list)
+    source_url: Optional[str] = None
+    supplier: Optional[str] = None
+
+
+@dataclass
+class FetchPlan:
+    """The items a run should refresh, in priority order"""
+    budget: int
+    planned: List[ItemStaleness] = field(default_factory=list)
+    candidates: int = 0   # items due for a refresh
+    deferred: int = 0     # due but over budget
+    unfetchable: int = 0  # due but without a source URL
+
+    def urls(self) -> List[str]:
+        return [item.source_url for item in self.planned]
+
+
+def load_freshness_policies(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read the data_freshness section of validation_config.json.
+
+    Returns {'default': FreshnessPolicy, 'classes': {name: FreshnessPolicy},
+    'categories': {category code: class name}}.
+    """
+    freshness = {}
+    path = Path(config_path or DEFAULT_CONFIG_PATH)
+    if path.exists():
+        try:
+            with open(path, 'r') as f:
+                freshness = json.load(f).get('data_freshness', {})
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Could not load validation config: {e}")
+
+    default = FreshnessPolicy(
+        DEFAULT_POLICY_CLASS,
+        freshness.get('max_age_days', DEFAULT_MAX_AGE_DAYS),
+        freshness.get('preferred_age_days', DEFAULT_PREFERRED_AGE_DAYS)
+    )
+    classes = {
+        name: FreshnessPolicy(name,
+                              windows.get('max_age_days', default.max_age_days),
+                              windows.get('preferred_age_days', default.preferred_age_days))
+        for name, windows in freshness.get('category_specific_freshness', {}).items()
+    }
+    categories = {code: name for code, name in freshness.get('category_freshness_classes', {}).items()
+                  if name in classes}
+    return {'default': default, 'classes': classes, 'categories': categories}
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+class RescrapeScheduler:
+    """
+    Scores active cost items for a refresh and builds budgeted fetch plans
+    """
+
+    def __init__(self, db_path: Optional[str] = None, config_path: Optional[str] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.db_path = resolve_db_path(db_path)
+        self.policies = load_freshness_policies(config_path)
+        self.logger = logger or logging.getLogger('scraper.scheduler')
+
+    def policy_for(self, category: str, parent_category: Optional[str] = None) -> FreshnessPolicy:
+        """The freshness policy of a category, else of its parent, else the default"""
+        for code in (category, parent_category):
+            name = self.policies['categories'].get(code)
+            if name:
+                return self.policies['classes'][name]
+        return self.policies['default']
+
+    def _load_items(self, supplier: Optional[str]) -> List[sqlite3.Row]:
+        with get_connection(self.db_path) as conn:
+            apply_migrations(conn)
+            conn.row_factory = sqlite3.Row
+            return conn.execute("""
+                WITH pricing AS (
+                    SELECT cost_item_id, effective_date, unit_cost,
+                           LAG(unit_cost) OVER (
+                               PARTITION BY cost_item_id, unit, currency
+                               ORDER BY effective_date, id
+                           ) AS previous_cost
+                    FROM cost_pricing
+                ),
+                price_history AS (
+                    SELECT cost_item_id,
+                           MIN(effective_date) AS first_priced,
+                           MAX(effective_date) AS last_priced,
+                           SUM(CASE WHEN previous_cost > 0
+                                    THEN ABS(unit_cost - previous_cost) / CAST(previous_cost AS REAL)
+                                    ELSE 0 END) AS total_change
+                    FROM pricing
+                    GROUP BY cost_item_id
+                ),
+                latest_source AS (
+                    SELECT cost_item_id, source_url, company_name FROM (
+                        SELECT cp.cost_item_id, sr.source_url, s.company_name,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY cp.cost_item_id
+                                   ORDER BY cp.effective_date DESC, sr.id DESC
+                               ) AS source_rank
+                        FROM source_references sr
+                        JOIN cost_pricing cp ON cp.id = sr.cost_pricing_id
+                        JOIN sources s ON s.id = sr.source_id
+                        WHERE sr.source_url LIKE 'http%'
+                    )
+                    WHERE source_rank = 1
+                )
+                SELECT ci.id, ci.item_id, cc.code AS category, parent.code AS parent_category,
+                       ph.first_priced, ph.last_priced, ph.total_change,
+                       f.last_seen_at, ls.source_url, ls.company_name
+                FROM cost_items ci
+                JOIN cost_categories cc ON cc.id = ci.category_id
+                LEFT JOIN cost_categories parent ON parent.id = cc.parent_category_id
+                LEFT JOIN price_history ph ON ph.cost_item_id = ci.id
+                LEFT JOIN item_fingerprints f ON f.cost_item_id = ci.id
+                LEFT JOIN latest_source ls ON ls.cost_item_id = ci.id
+                WHERE ci.status = ?
+                  AND (? IS NULL OR ls.company_name = ? COLLATE NOCASE)
+            """, (STATUS_ACTIVE, supplier, supplier)).fetchall()
+
+    def score(self, row, as_of: date) -> ItemStaleness:
+        """Score one item row from _load_items"""
+        policy = self.policy_for(row['category'], row['parent_category'])
+        item = ItemStaleness(
+            cost_item_id=row['id'], item_id=row['item_id'], category=row['category'],
+            policy=policy.name, age_days=None, volatility=0.0, priority=NEVER_PRICED_PRIORITY,
+            source_url=row['source_url'], supplier=row['company_name']
+        )
+
+        last_priced = _parse_date(row['last_priced'])
+        if last_priced is None:
+            item.reasons.append(REASON_NEVER_PRICED)
+            return item
+
+        # An unchanged observation confirms the price as much as a new row
+        last_confirmed = max(filter(None, (last_priced, _parse_date(row['last_seen_at']))))
+        item.age_days = max(0, (as_of - last_confirmed).days)
+
+        # Relative change per period, over at least one period of history
+        span_days = (last_priced - (_parse_date(row['first_priced']) or last_priced)).days
+        item.volatility = (row['total_change'] or 0.0) * VOLATILITY_PERIOD_DAYS / max(
+            span_days, VOLATILITY_PERIOD_DAYS)
+        expected_change = item.volatility * item.age_days / VOLATILITY_PERIOD_DAYS
+
+        item.priority = (item.age_days / max(policy.preferred_age_days, 1)
+                         + VOLATILITY_WEIGHT * expected_change)
+        if item.age_days >= policy.max_age_days:
+            item.priority += OVERDUE_BONUS
+            item.reasons.append(REASON_OVERDUE)
+        elif item.age_days >= policy.preferred_age_days:
+            item.reasons.append(REASON_STALE)
+        if expected_change >= VOLATILE_EXPECTED_CHANGE:
+            item.reasons.append(REASON_VOLATILE)
+        if not item.reasons:
+            item.reasons.append(REASON_DUE)
+        return item
+
+    def rank(self, supplier: Optional[str] = None, as_of: Optional[date] = None) -> List[ItemStaleness]:
+        """Items due for a refresh, highest priority first"""
+        as_of = as_of or date.today()
+        scored = (self.score(row, as_of) for row in self._load_items(supplier))
+        due = [item for item in scored if item.age_days is None or item.age_days >= MIN_AGE_DAYS]
+        return sorted(due, key=lambda item: (-item.priority, item.item_id))
+
+    def plan(self, budget: int, supplier: Optional[str] = None,
+             as_of: Optional[date] = None) -> FetchPlan:
+        """
+        The top items to refresh within budget page fetches.
+
+        Items without a source URL cannot be fetched and are only counted;
+        items sharing a URL take one fetch.
+        """
+        ranked = self.rank(supplier, as_of)
+        plan = FetchPlan(budget=budget, candidates=len(ranked))
+        seen_urls = set()
+        for item in ranked:
+            if not item.source_url:
+                plan.unfetchable += 1
+            elif item.source_url in seen_urls:
+                continue
+            elif len(plan.planned) < budget:
+                seen_urls.add(item.source_url)
+                plan.planned.append(item)
+            else:
+                plan.deferred += 1
+
+        self.logger.info(
+            f"Planned {len(plan.planned)} of {plan.candidates} due items "
+            f"({plan.deferred} deferred, {plan.unfetchable} without a source URL)"
+        )
+        return plan
+
+
+def print_plan(plan: FetchPlan):
+    print(f"\n📅 Re-scrape plan: {len(plan.planned)} fetches (budget {plan.budget})")
+    print(f"   Due items: {plan.candidates}, deferred: {plan.deferred}, "
+          f"without source URL: {plan.unfetchable}")
+    for item in plan.planned:
+        age = 'never' if item.age_days is None else f"{item.age_days}d"
+        print(f"   {item.priority:8.2f}  {item.item_id:<30} {age:>6}  {item.policy:<18} "
+              f"{','.join(item.reasons):<20} {item.source_url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Plan which cost items to re-scrape first')
+    parser.add_argument('--budget', type=int, default=100, help='Page fetches available to the run')
+    parser.add_argument('--supplier', help='Only items last sourced from this supplier')
+    parser.add_argument('--as-of', type=date.fromisoformat, help='Score as of this date (YYYY-MM-DD)')
+    parser.add_argument('--db-path', help='Database path (default: data/costs/vanilla_costs.db)')
+    parser.add_argument('--config-path', help='Validation config (default: config/validation_config.json)')
+
+    args = parser.parse_args()
+
+    scheduler = RescrapeScheduler(db_path=args.db_path, config_path=args.config_path)
+    print_plan(scheduler.plan(args.budget, supplier=args.supplier, as_of=args.as_of))
+
+
+if __name__ == '__main__':
+    main()
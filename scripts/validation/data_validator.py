@@ -27,6 +27,8 @@ import sys
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.db import get_connection, resolve_db_path
+
 class ValidationLevel(Enum):
     """Validation severity levels"""
     INFO = "info"
@@ -69,7 +71,7 @@ class DataValidator:
     
     def __init__(self, db_path: Optional[str] = None, config_path: Optional[str] = None):
         self.project_root = project_root
-        self.db_path = db_path or str(project_root / 'data' / 'costs' / 'vanilla_costs.db')
+        self.db_path = resolve_db_path(db_path)
         self.config_path = config_path or str(project_root / 'config' / 'validation_config.json')
         
         # Load validation configuration
@@ -77,6 +79,9 @@ class DataValidator:
         
         # Initialize validation rules
         self.rules = self.initialize_validation_rules()
+
+        # Taxonomy codes, read once on first use
+        self._category_codes: Optional[set] = None
     
     def load_validation_config(self) -> Dict[str, Any]:
         """Load validation configuration"""
@@ -249,26 +254,31 @@ class DataValidator:
             return None
         
         # Check against database
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
-                    "SELECT COUNT(*) FROM cost_categories WHERE code = ?",
-                    (category,)
-                )
-                if cursor.fetchone()[0] == 0:
-                    return ValidationResult(
-                        rule_name='category_exists',
-                        level=ValidationLevel.ERROR,
-                        message="Category does not exist in taxonomy",
-                        field='category',
-                        actual=category,
-                        suggestion="Use valid category from cost_category_taxonomy.json"
-                    )
-        except sqlite3.Error:
-            pass  # Database not available, skip check
+        category_codes = self.load_category_codes()
+        if category_codes is not None and category not in category_codes:
+            return ValidationResult(
+                rule_name='category_exists',
+                level=ValidationLevel.ERROR,
+                message="Category does not exist in taxonomy",
+                field='category',
+                actual=category,
+                suggestion="Use valid category from cost_category_taxonomy.json"
+            )
         
         return None
     
+    def load_category_codes(self) -> Optional[set]:
+        """Category codes in the database, or None if it is not available"""
+        if self._category_codes is None:
+            try:
+                with get_connection(self.db_path, read_only=True) as conn:
+                    self._category_codes = {
+                        row[0] for row in conn.execute("SELECT code FROM cost_categories")
+                    }
+            except sqlite3.Error:
+                return None  # Database not available, skip check
+        return self._category_codes
+    
     def validate_price_range(self, item_data: Dict[str, Any]) -> List[ValidationResult]:
         """Validate price is within reasonable ranges"""
         results = []
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Terra35 Vanilla Operations Cost Analysis - Deferred Pricing Validation
+
+tr_validate_pricing records a validation_results row for every active rule
+each time a cost_pricing row is inserted, one row at a time. Bulk writers
+can defer that work to the end of their transaction instead, where the
+same results for all pricing rows they inserted are written by a single
+INSERT ... SELECT from v_pricing_validation (migration 010):
+
+    with get_connection(db_path) as conn:
+        conn.execute("BEGIN")
+        with deferred_validation(conn):
+            ...insert pricing rows...
+
+Deferral is switched on with a row in validation_deferred that only exists
+inside the writer's transaction, so other connections keep validating row
+by row. Deferring needs an open transaction; nested deferrals in the same
+transaction leave the work to the outermost one.
+"""
+
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def is_deferred(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM validation_deferred").fetchone() is not None
+
+
+def defer_validation(conn: sqlite3.Connection) -> Optional[int]:
+    """
+    Stop validating pricing rows as they are inserted on this transaction
+
+    Returns the id new pricing rows will be above, or None if validation
+    was already deferred. run_deferred_validation() must be called before
+    the transaction commits.
+
+    Raises:
+        ValueError: If no transaction is open on conn; with sqlite3's implicit
+            transactions MAX(id) would be read before the BEGIN
+    """
+    if not conn.in_transaction:
+        raise ValueError("Deferred validation needs an open transaction (BEGIN first)")
+    if is_deferred(conn):
+        return None
+    after_pricing_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM cost_pricing").fetchone()[0]
+    conn.execute("INSERT INTO validation_deferred (id, after_pricing_id) VALUES (1, ?)", (after_pricing_id,))
+    return after_pricing_id
+
+
+def run_deferred_validation(conn: sqlite3.Connection) -> int:
+    """Validate the pricing rows inserted since defer_validation() and stop deferring; returns results written"""
+    row = conn.execute("SELECT after_pricing_id FROM validation_deferred").fetchone()
+    if row is None:
+        return 0
+    written = conn.execute("""
+        INSERT INTO validation_results (cost_pricing_id, validation_rule_id, passed, failure_reason)
+        SELECT cost_pricing_id, validation_rule_id, passed, failure_reason
+        FROM v_pricing_validation
+        WHERE cost_pricing_id > ?
+        ORDER BY cost_pricing_id, validation_rule_id
+    """, row).rowcount
+    conn.execute("DELETE FROM validation_deferred")
+    return written
+
+
+@contextmanager
+def deferred_validation(conn: sqlite3.Connection) -> Iterator[None]:
+    """Validate the pricing rows inserted in the block in one statement when it ends"""
+    after_pricing_id = defer_validation(conn)
+    if after_pricing_id is None:
+        yield
+        return
+    try:
+        yield
+        run_deferred_validation(conn)
+    finally:
+        if conn.in_transaction:
+            conn.execute("DELETE FROM validation_deferred")
@@ -25,6 +25,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from scripts.constants import STATUS_ACTIVE
+from scripts.db import get_connection, resolve_db_path
 from scripts.validation.data_validator import DataValidator, ValidationLevel
 
 class ValidationRunner:
@@ -32,14 +33,14 @@ class ValidationRunner:
     
     def __init__(self, db_path: Optional[str] = None, output_file: Optional[str] = None):
         self.project_root = project_root
-        self.db_path = db_path or str(project_root / 'data' / 'costs' / 'vanilla_costs.db')
+        self.db_path = resolve_db_path(db_path)
         self.output_file = output_file
         self.validator = DataValidator(self.db_path)
         
     def get_item_from_database(self, item_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve item data from database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 # Get cost item
                 cursor = conn.execute("""
                     SELECT ci.*, cc.code as category_code, rs.code as revenue_stream
@@ -115,7 +116,7 @@ class ValidationRunner:
     def get_all_items_from_database(self) -> List[Dict[str, Any]]:
         """Retrieve all items from database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 cursor = conn.execute("SELECT item_id FROM cost_items WHERE status = ?", (STATUS_ACTIVE,))
                 item_ids = [row[0] for row in cursor.fetchall()]
                 
@@ -134,7 +135,7 @@ class ValidationRunner:
     def get_items_by_session(self, session_name: str) -> List[Dict[str, Any]]:
         """Retrieve items from specific collection session"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with get_connection(self.db_path) as conn:
                 cursor = conn.execute("""
                     SELECT DISTINCT ci.item_id
                     FROM collection_log cl
@@ -12,11 +12,16 @@ from unittest.mock import MagicMock, patch
 from datetime import datetime, timedelta
 import sys
 import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.scrapers.cache_store import CACHE_BACKEND_JSON, CACHE_BACKEND_SQLITE, create_cache_store
+
 @pytest.fixture
 def temp_db():
     """Create temporary SQLite database for testing using full schema"""
@@ -75,9 +80,12 @@ def temp_db():
             """)
     
     yield db_path
-    
+
     # Cleanup
-    Path(db_path).unlink(missing_ok=True)
+    from scripts.db import close_all
+    close_all()
+    for suffix in ('', '-wal', '-shm'):
+        Path(db_path + suffix).unlink(missing_ok=True)
 
 @pytest.fixture
 def temp_cache_dir():
@@ -86,6 +94,30 @@ def temp_cache_dir():
     yield Path(temp_dir)
     shutil.rmtree(temp_dir, ignore_errors=True)
 
+@pytest.fixture(params=[CACHE_BACKEND_JSON, CACHE_BACKEND_SQLITE])
+def cache_store(request, temp_cache_dir):
+    """Each store backend, rooted in a temporary directory"""
+    store = create_cache_store(request.param, temp_cache_dir)
+    yield store
+    store.close()
+
+@pytest.fixture
+def make_cache_entry():
+    """Build cache entries as BaseScraper.save_to_cache would"""
+    def make(content='<html>cached page</html>', age_hours=0):
+        return {
+            'timestamp': (datetime.now() - timedelta(hours=age_hours)).isoformat(),
+            'url': 'https://example.com/page',
+            'status_code': 200,
+            'headers': {'Content-Type': 'text/html'},
+            'content': content,
+            'encoding': 'utf-8',
+            'etag': None,
+            'last_modified': None
+        }
+
+    return make
+
 @pytest.fixture
 def sample_config_data():
     """Sample configuration data for testing"""
@@ -328,4 +360,93 @@ def temp_config_files(tmp_path):
         with open(config_dir / "cost_category_taxonomy.json", 'w') as f:
             json.dump(taxonomy, f)
     
-    return config_dir
\ No newline at end of file
+    return config_dir
+
+
+@pytest.fixture
+def local_http_server():
+    """
+    Local stand-in HTTP server for exercising real network code paths.
+    
+    Register responses with ``server.routes[path] = (status, headers, body)``;
+    every request is recorded in ``server.requests`` as ``(path, headers)``.
+    """
+    class StandInHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            server = self.server
+            with server.lock:
+                server.requests.append((self.path, dict(self.headers)))
+            
+            route = server.routes.get(self.path)
+            if callable(route):
+                route = route(self)
+            status, headers, body = route or (404, {}, 'not found')
+            if server.delay:
+                time.sleep(server.delay)
+            
+            payload = body.encode('utf-8') if isinstance(body, str) else body
+            self.send_response(status)
+            headers = dict(headers)
+            headers.setdefault('Content-Type', 'text/html; charset=utf-8')
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.routes = {}
+    server.requests = []
+    server.delay = 0.0
+    server.lock = threading.Lock()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    
+    yield server
+    
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=5)
+
+
+def farmtek_category_page(count):
+    links = ''.join(f'<a href="/product/{i}">Product {i}</a>' for i in range(count))
+    return f'<html><body>{links}</body></html>'
+
+
+def farmtek_product_page(i):
+    return (f'<html><h1>Bench {i}</h1><span data-sku="BENCH-{i}"></span>'
+            f'<span class="price">${100 + i}.00</span></html>')
+
+
+@pytest.fixture
+def farmtek_site(local_http_server):
+    """
+    FarmTek-like site on local_http_server: /greenhouse-benching/ lists
+    products 0-5, and /product/6 exists but is not listed.
+    """
+    local_http_server.routes['/greenhouse-benching/'] = (200, {}, farmtek_category_page(6))
+    for i in range(7):
+        local_http_server.routes[f'/product/{i}'] = (200, {}, farmtek_product_page(i))
+    return local_http_server
+
+
+@pytest.fixture
+def make_farmtek_scraper(farmtek_site, temp_db):
+    """Factory for FarmTekScrapers that crawl farmtek_site into temp_db without delays"""
+    from scripts.scrapers.farmtek_scraper import FarmTekScraper
+
+    def make(cache_dir):
+        scraper = FarmTekScraper(db_path=temp_db, cache_dir=str(cache_dir))
+        scraper.base_url = farmtek_site.base_url
+        scraper.target_urls = ['/greenhouse-benching/']
+        scraper.rate_limit_delay = 0.0
+        scraper.host_limiter.delay = 0.0
+        return scraper
+
+    return make
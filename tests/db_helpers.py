@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Row builders shared by the database tests
+"""
+
+import json
+
+
+def add_item(conn, item_id, category='infrastructure', item_name=None, specifications=None, notes=None,
+             status='active'):
+    """Insert a cost item under a category code and return its row id"""
+    if specifications is not None and not isinstance(specifications, str):
+        specifications = json.dumps(specifications)
+    return conn.execute("""
+        INSERT INTO cost_items (item_id, item_name, category_id, specifications, notes, status)
+        SELECT ?, ?, id, ?, ?, ? FROM cost_categories WHERE code = ?
+        RETURNING id
+    """, (item_id, item_name or f"{item_id} name", specifications, notes, status, category)).fetchone()[0]
+
+
+def add_price(conn, cost_item_id, unit_cost, effective_date, confidence='MEDIUM', total_cost=None):
+    """Insert a pricing row for a cost item and return its row id"""
+    return conn.execute("""
+        INSERT INTO cost_pricing (cost_item_id, unit_cost, unit, effective_date, confidence_level, total_cost_5000sqft)
+        VALUES (?, ?, 'each', ?, ?, ?)
+        RETURNING id
+    """, (cost_item_id, unit_cost, effective_date, confidence, total_cost)).fetchone()[0]
@@ -4,12 +4,14 @@ Unit tests for base scraper framework (base_scraper.py)
 """
 
 import pytest
+import asyncio
 import json
 import time
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import patch, MagicMock, call
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import requests
 import tempfile
 import sys
@@ -18,7 +20,13 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from scripts.scrapers.base_scraper import BaseScraper, ScrapedProduct, ScrapingResult
+from scripts.scrapers.base_scraper import (
+    BaseScraper, ScrapedProduct, ScrapingResult, MAX_SESSION_WARNINGS,
+    THROTTLE_RATE_LIMITED, THROTTLE_CIRCUIT_OPEN
+)
+from scripts.scrapers.rate_limiter import (
+    AdaptiveHostRateLimiter, HostRateLimiter, SPEEDUP_STREAK, parse_retry_after
+)
 
 
 # Test implementation of abstract BaseScraper for testing
@@ -484,6 +492,20 @@ class TestBaseScraper:
             assert result[0] == sample_scraped_product.item_id
             assert result[1] == sample_scraped_product.item_name
             
+    def test_save_products_falls_back_per_product(self, temp_cache_dir, temp_db, sample_scraped_product):
+        """Test a product failing the bulk write does not lose the rest of the chunk"""
+        scraper = MockScraper("TestSupplier", "https://example.com",
+                             cache_dir=str(temp_cache_dir), db_path=temp_db)
+
+        broken = ScrapedProduct(item_id="BROKEN_1", item_name="Broken", category="infrastructure",
+                                unit_cost=1.0, confidence_level=None)
+        saved_count = scraper.save_products([sample_scraped_product, broken], session_id="test_session")
+
+        assert saved_count == 1
+        with sqlite3.connect(temp_db) as conn:
+            pricing_count = conn.execute("SELECT COUNT(*) FROM cost_pricing").fetchone()[0]
+        assert pricing_count == 1
+
     def test_save_products_empty_list(self, temp_cache_dir, temp_db):
         """Test saving empty product list"""
         scraper = MockScraper("TestSupplier", "https://example.com", 
@@ -532,4 +554,468 @@ class TestBaseScraper:
                 result = scraper.run_scraping_session()
         
         # Session should still be ended
-        assert scraper.current_session is None
\ No newline at end of file
+        assert scraper.current_session is None
+
+class TestHostRateLimiter:
+    """Test suite for the per-host token-bucket limiter"""
+    
+    def test_first_request_is_immediate(self):
+        """Test that a fresh host has a token available"""
+        limiter = HostRateLimiter(delay=0.2)
+        
+        assert limiter.acquire("example.com") == 0.0
+        
+    def test_same_host_is_paced(self):
+        """Test that back-to-back requests to one host are spaced by the delay"""
+        limiter = HostRateLimiter(delay=0.1)
+        
+        limiter.acquire("example.com")
+        waited = limiter.acquire("example.com")
+        
+        assert waited > 0.05
+        
+    def test_hosts_are_independent(self):
+        """Test that different hosts do not share a bucket"""
+        limiter = HostRateLimiter(delay=0.5)
+        
+        limiter.acquire("a.example.com")
+        assert limiter.acquire("b.example.com") == 0.0
+        
+    def test_burst_capacity(self):
+        """Test that burst allows several immediate requests"""
+        limiter = HostRateLimiter(delay=1.0, burst=3)
+        
+        waits = [limiter.acquire("example.com") for _ in range(3)]
+        assert waits == [0.0, 0.0, 0.0]
+
+
+class TestAdaptiveHostRateLimiter:
+    """Test suite for response-driven pacing and the circuit breaker"""
+    
+    def test_fast_responses_speed_up_to_floor(self):
+        """Test a run of fast, clean responses shrinks the delay but not below min_delay"""
+        limiter = AdaptiveHostRateLimiter(delay=1.0, min_delay=0.8)
+        
+        for _ in range(SPEEDUP_STREAK):
+            limiter.record_success("example.com", 0.05)
+        assert limiter.delay_for("example.com") == pytest.approx(0.9)
+        
+        for _ in range(SPEEDUP_STREAK * 5):
+            limiter.record_success("example.com", 0.05)
+        assert limiter.delay_for("example.com") == pytest.approx(0.8)
+        
+    def test_throttle_backs_off_and_blocks(self):
+        """Test a 429 doubles the delay and holds the host for Retry-After"""
+        limiter = AdaptiveHostRateLimiter(delay=0.05)
+        limiter.acquire("example.com")
+        
+        limiter.record_throttle("example.com", retry_after=0.2)
+        
+        assert limiter.delay_for("example.com") == pytest.approx(0.1)
+        assert limiter.acquire("example.com") >= 0.15
+        assert limiter.acquire("other.example.com") == 0.0
+        
+    def test_circuit_breaker_opens_and_half_opens(self):
+        """Test repeated failures skip the host until the cooldown passes"""
+        limiter = AdaptiveHostRateLimiter(delay=0.0, failure_threshold=3, cooldown=0.1)
+        
+        assert [limiter.record_failure("example.com") for _ in range(3)] == [False, False, True]
+        assert not limiter.allow("example.com")
+        assert limiter.allow("other.example.com")
+        
+        time.sleep(0.15)
+        assert limiter.allow("example.com")
+        # One more failure on the trial request reopens it
+        assert limiter.record_failure("example.com")
+        assert limiter.is_open("example.com")
+        
+    def test_half_open_lets_one_trial_through(self):
+        """Test concurrent callers get a single trial request after the cooldown"""
+        limiter = AdaptiveHostRateLimiter(delay=0.0, failure_threshold=1, cooldown=0.1)
+        limiter.record_failure("example.com")
+        time.sleep(0.15)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            allowed = list(executor.map(lambda _: limiter.allow("example.com"), range(8)))
+        assert allowed.count(True) == 1
+        assert not limiter.allow("example.com")
+        
+        # The trial's success closes the breaker for everyone
+        limiter.record_success("example.com", 0.05)
+        assert limiter.allow("example.com")
+        assert limiter.allow("example.com")
+        
+    def test_success_closes_breaker_count(self):
+        """Test failures must be consecutive to open the breaker"""
+        limiter = AdaptiveHostRateLimiter(delay=0.0, failure_threshold=2)
+        
+        limiter.record_failure("example.com")
+        limiter.record_success("example.com", 0.05)
+        
+        assert not limiter.record_failure("example.com")
+        
+    def test_parse_retry_after(self):
+        """Test delta-seconds and HTTP-date Retry-After values"""
+        now = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        
+        assert parse_retry_after("120") == 120.0
+        assert parse_retry_after("Wed, 01 Jan 2025 12:00:30 GMT", now) == 30.0
+        assert parse_retry_after("Wed, 01 Jan 2025 11:00:00 GMT", now) == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestThrottling:
+    """Test suite for 429/503 handling and host skipping against a local server"""
+    
+    def test_retry_after_is_honored(self, temp_cache_dir, local_http_server):
+        """Test a 429 with Retry-After waits, retries and is recorded in the session"""
+        responses = iter([(429, {'Retry-After': '1'}, 'slow down'), (200, {}, 'ok')])
+        local_http_server.routes['/page'] = lambda handler: next(responses)
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0)
+        scraper.start_session()
+        
+        start_time = time.time()
+        response = scraper.make_request(f"{local_http_server.base_url}/page")
+        elapsed = time.time() - start_time
+        result = scraper.end_session()
+        
+        assert response.text == 'ok'
+        assert elapsed >= 0.9
+        assert result.throttle_count == 1
+        event = result.throttle_events[0]
+        assert (event.kind, event.status_code, event.retry_after) == (THROTTLE_RATE_LIMITED, 429, 1.0)
+        
+    def test_client_errors_are_not_retried(self, temp_cache_dir, local_http_server):
+        """Test 4xx responses other than 408/429 are given up on immediately"""
+        local_http_server.routes['/bad'] = (400, {}, 'bad request')
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0)
+        
+        assert scraper.make_request(f"{local_http_server.base_url}/bad") is None
+        assert len(local_http_server.requests) == 1
+        
+    def test_circuit_breaker_skips_host(self, temp_cache_dir, local_http_server):
+        """Test a failing host is skipped for the rest of the session"""
+        for i in range(4):
+            local_http_server.routes[f'/error/{i}'] = (500, {}, 'boom')
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0)
+        scraper.host_limiter.failure_threshold = 3
+        scraper.start_session()
+        
+        urls = [f"{local_http_server.base_url}/error/{i}" for i in range(4)]
+        responses = scraper.fetch_many(urls, max_concurrency=1)
+        result = scraper.end_session()
+        
+        assert responses == [None] * 4
+        # The first URL's retries open the breaker; its last retry and the
+        # other URLs are never sent
+        assert len(local_http_server.requests) == 3
+        assert result.requests_skipped == 4
+        assert [e.kind for e in result.throttle_events] == [THROTTLE_CIRCUIT_OPEN]
+        assert any('Circuit breaker open' in error for error in result.errors)
+
+
+class TestAsyncFetch:
+    """Test suite for the concurrent fetch engine against a local server"""
+    
+    def test_async_make_request_success(self, temp_cache_dir, local_http_server):
+        """Test a single async request is fetched and cached"""
+        local_http_server.routes['/page'] = (200, {}, '<html>async page</html>')
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.01)
+        
+        url = f"{local_http_server.base_url}/page"
+        response = asyncio.run(scraper.async_make_request(url))
+        
+        assert response is not None
+        assert response.status_code == 200
+        assert response.text == '<html>async page</html>'
+        assert scraper.request_count == 1
+        assert scraper.get_cache_path(scraper.get_cache_key(url)).exists()
+        
+    def test_fetch_many_preserves_order(self, temp_cache_dir, local_http_server):
+        """Test fetch_many returns responses aligned with the input URLs"""
+        for i in range(5):
+            local_http_server.routes[f'/product/{i}'] = (200, {}, f'product {i}')
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0)
+        
+        urls = [f"{local_http_server.base_url}/product/{i}" for i in range(5)]
+        responses = scraper.fetch_many(urls)
+        
+        assert [r.text for r in responses] == [f'product {i}' for i in range(5)]
+        
+    def test_fetch_many_runs_concurrently(self, temp_cache_dir, local_http_server):
+        """Test slow responses overlap instead of running back to back"""
+        local_http_server.delay = 0.2
+        for i in range(6):
+            local_http_server.routes[f'/slow/{i}'] = (200, {}, 'slow')
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0,
+                             max_concurrency=6)
+        
+        urls = [f"{local_http_server.base_url}/slow/{i}" for i in range(6)]
+        start_time = time.time()
+        responses = scraper.fetch_many(urls)
+        elapsed = time.time() - start_time
+        
+        assert all(r is not None for r in responses)
+        assert elapsed < 6 * 0.2
+        
+    def test_fetch_many_respects_host_rate_limit(self, temp_cache_dir, local_http_server):
+        """Test requests to one host stay rate_limit_delay apart"""
+        for i in range(4):
+            local_http_server.routes[f'/paced/{i}'] = (200, {}, 'paced')
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.1)
+        
+        urls = [f"{local_http_server.base_url}/paced/{i}" for i in range(4)]
+        start_time = time.time()
+        scraper.fetch_many(urls)
+        elapsed = time.time() - start_time
+        
+        # First request is immediate, the remaining three wait ~0.1s each
+        assert elapsed >= 0.25
+        
+    def test_fetch_many_uses_cache(self, temp_cache_dir, local_http_server):
+        """Test cached URLs are served without hitting the server again"""
+        local_http_server.routes['/cached'] = (200, {}, 'cached body')
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0)
+        
+        url = f"{local_http_server.base_url}/cached"
+        scraper.fetch_many([url])
+        responses = scraper.fetch_many([url, url])
+        
+        assert [r.text for r in responses] == ['cached body', 'cached body']
+        assert len(local_http_server.requests) == 1
+        assert scraper.cache_hit_count == 2
+        
+    def test_fetch_many_retries_and_gives_up(self, temp_cache_dir, local_http_server):
+        """Test retry semantics match make_request"""
+        local_http_server.routes['/error'] = (500, {}, 'error')
+        local_http_server.routes['/missing'] = (404, {}, 'missing')
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0,
+                             max_retries=2)
+        
+        responses = scraper.fetch_many([
+            f"{local_http_server.base_url}/error",
+            f"{local_http_server.base_url}/missing"
+        ])
+        
+        assert responses == [None, None]
+        paths = [path for path, _ in local_http_server.requests]
+        assert paths.count('/error') == 3  # Initial call + 2 retries
+        assert paths.count('/missing') == 1  # No retries for 404
+        
+    def test_fetch_many_empty(self, temp_cache_dir):
+        """Test fetch_many with no URLs"""
+        scraper = MockScraper("TestSupplier", "https://example.com", cache_dir=str(temp_cache_dir))
+        
+        assert scraper.fetch_many([]) == []
+
+
+class TestConditionalRevalidation:
+    """Test suite for ETag / Last-Modified revalidation of expired cache entries"""
+    
+    ETAG = '"v1-abc123"'
+    LAST_MODIFIED = 'Wed, 01 Oct 2025 08:00:00 GMT'
+    
+    def conditional_route(self, handler):
+        """Answer 304 when the client's validators match, else the full page"""
+        if (handler.headers.get('If-None-Match') == self.ETAG or
+                handler.headers.get('If-Modified-Since') == self.LAST_MODIFIED):
+            return (304, {'ETag': self.ETAG}, b'')
+        return (200, {'ETag': self.ETAG, 'Last-Modified': self.LAST_MODIFIED},
+                '<html>catalog page</html>')
+    
+    def expire_entry(self, scraper, url):
+        """Backdate a cache entry past its freshness window"""
+        scraper.cache_store.touch(scraper.get_cache_key(url), datetime.now() - timedelta(hours=48))
+    
+    @pytest.mark.parametrize('backend', ['json', 'sqlite'])
+    def test_validators_are_cached(self, temp_cache_dir, local_http_server, backend):
+        """Test ETag and Last-Modified are stored with the entry"""
+        local_http_server.routes['/catalog'] = self.conditional_route
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0,
+                             cache_backend=backend)
+        
+        url = f"{local_http_server.base_url}/catalog"
+        scraper.make_request(url)
+        
+        entry = scraper.cache_store.load(scraper.get_cache_key(url))
+        assert entry['etag'] == self.ETAG
+        assert entry['last_modified'] == self.LAST_MODIFIED
+    
+    @pytest.mark.parametrize('backend', ['json', 'sqlite'])
+    def test_not_modified_serves_cached_body(self, temp_cache_dir, local_http_server, backend):
+        """Test an expired entry is revalidated and its body reused on 304"""
+        local_http_server.routes['/catalog'] = self.conditional_route
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0,
+                             cache_backend=backend)
+        
+        url = f"{local_http_server.base_url}/catalog"
+        scraper.make_request(url)
+        self.expire_entry(scraper, url)
+        
+        response = scraper.make_request(url)
+        
+        assert response.status_code == 200
+        assert response.text == '<html>catalog page</html>'
+        assert scraper.revalidation_count == 1
+        
+        _, request_headers = local_http_server.requests[-1]
+        assert request_headers['If-None-Match'] == self.ETAG
+        assert request_headers['If-Modified-Since'] == self.LAST_MODIFIED
+        
+        # The 304 refreshed the entry, so the next call is a plain cache hit
+        scraper.make_request(url)
+        assert len(local_http_server.requests) == 2
+        assert scraper.cache_hit_count == 1
+    
+    def test_async_not_modified(self, temp_cache_dir, local_http_server):
+        """Test the async path revalidates the same way"""
+        local_http_server.routes['/catalog'] = self.conditional_route
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0)
+        
+        url = f"{local_http_server.base_url}/catalog"
+        scraper.fetch_many([url])
+        self.expire_entry(scraper, url)
+        responses = scraper.fetch_many([url])
+        
+        assert responses[0].text == '<html>catalog page</html>'
+        assert scraper.revalidation_count == 1
+    
+    def test_changed_page_is_refetched(self, temp_cache_dir, local_http_server):
+        """Test a 200 answer to a conditional request replaces the entry"""
+        local_http_server.routes['/catalog'] = self.conditional_route
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0)
+        
+        url = f"{local_http_server.base_url}/catalog"
+        scraper.make_request(url)
+        self.expire_entry(scraper, url)
+        local_http_server.routes['/catalog'] = (200, {'ETag': '"v2"'}, '<html>new prices</html>')
+        
+        response = scraper.make_request(url)
+        
+        assert response.text == '<html>new prices</html>'
+        assert scraper.revalidation_count == 0
+        assert scraper.cache_store.load(scraper.get_cache_key(url))['etag'] == '"v2"'
+    
+    def test_entries_without_validators_are_not_conditional(self, temp_cache_dir, local_http_server):
+        """Test no conditional headers are sent when nothing was cached to validate"""
+        local_http_server.routes['/plain'] = (200, {}, 'plain page')
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0)
+        
+        url = f"{local_http_server.base_url}/plain"
+        scraper.make_request(url)
+        self.expire_entry(scraper, url)
+        scraper.make_request(url)
+        
+        _, request_headers = local_http_server.requests[-1]
+        assert 'If-None-Match' not in request_headers
+        assert 'If-Modified-Since' not in request_headers
+    
+    def test_session_reports_revalidations(self, temp_cache_dir, local_http_server):
+        """Test revalidations are counted in the session result"""
+        local_http_server.routes['/catalog'] = self.conditional_route
+        scraper = MockScraper("TestSupplier", local_http_server.base_url,
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0)
+        
+        url = f"{local_http_server.base_url}/catalog"
+        scraper.start_session()
+        scraper.make_request(url)
+        self.expire_entry(scraper, url)
+        scraper.make_request(url)
+        result = scraper.end_session()
+        
+        assert result.revalidations == 1
+        assert result.requests_made == 2
+
+
+class StreamingScraper(BaseScraper):
+    """Scraper that yields products one at a time, optionally failing part-way"""
+    
+    def scrape_products(self, count=0, fail_after=None, category="infrastructure"):
+        for i in range(count):
+            if fail_after is not None and i == fail_after:
+                raise RuntimeError("connection reset")
+            yield ScrapedProduct(
+                item_id=f"STREAM_{i:03d}",
+                item_name=f"Streamed Product {i}",
+                category=category,
+                unit_cost=10.0 + i,
+                unit="each",
+                source_url=f"https://example.com/product/{i}"
+            )
+
+
+class TestStreamingSession:
+    """Test suite for chunked saving of streamed products"""
+    
+    def count_items(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM cost_items WHERE item_id LIKE 'STREAM_%'"
+            ).fetchone()[0]
+    
+    def test_products_saved_in_chunks(self, temp_cache_dir, temp_db):
+        """Test products are committed chunk by chunk and only a sample is kept"""
+        scraper = StreamingScraper("TestSupplier", "https://example.com",
+                                   cache_dir=str(temp_cache_dir), db_path=temp_db,
+                                   save_chunk_size=10, product_sample_size=3)
+        
+        with patch.object(scraper, 'persist_products', wraps=scraper.persist_products) as persist:
+            result = scraper.run_scraping_session(count=25)
+        
+        assert [len(call.args[0]) for call in persist.call_args_list] == [10, 10, 5]
+        assert result.products_count == 25
+        assert result.products_saved == 25
+        assert [p.item_id for p in result.products_scraped] == ['STREAM_000', 'STREAM_001', 'STREAM_002']
+        assert self.count_items(temp_db) == 25
+    
+    def test_partial_progress_survives_failure(self, temp_cache_dir, temp_db):
+        """Test chunks committed before a crash stay in the database"""
+        scraper = StreamingScraper("TestSupplier", "https://example.com",
+                                   cache_dir=str(temp_cache_dir), db_path=temp_db,
+                                   save_chunk_size=10)
+        
+        with pytest.raises(RuntimeError):
+            scraper.run_scraping_session(count=50, fail_after=23)
+        
+        assert self.count_items(temp_db) == 20
+    
+    def test_warnings_are_capped(self, temp_cache_dir, temp_db):
+        """Test validation warnings are counted in full but stored as a sample"""
+        scraper = StreamingScraper("TestSupplier", "https://example.com",
+                                   cache_dir=str(temp_cache_dir), db_path=temp_db)
+        scraper.validate_product = lambda product: ["suspicious price"]
+        
+        result = scraper.run_scraping_session(count=MAX_SESSION_WARNINGS + 20)
+        
+        assert result.warning_count == MAX_SESSION_WARNINGS + 20
+        assert len(result.warnings) == MAX_SESSION_WARNINGS
+    
+    def test_rescrape_reports_unchanged(self, temp_cache_dir, temp_db):
+        """Test a second session over the same catalog adds no pricing rows"""
+        scraper = StreamingScraper("TestSupplier", "https://example.com",
+                                   cache_dir=str(temp_cache_dir), db_path=temp_db,
+                                   save_chunk_size=10)
+        
+        first = scraper.run_scraping_session(count=15)
+        second = scraper.run_scraping_session(count=15)
+        
+        assert (first.products_new, first.products_changed, first.products_unchanged) == (15, 0, 0)
+        assert (second.products_new, second.products_changed, second.products_unchanged) == (0, 0, 15)
+        assert second.products_saved == 15
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM cost_pricing").fetchone()[0] == 15
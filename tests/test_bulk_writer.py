@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Unit tests for set-based product persistence (bulk_writer.py)
+"""
+
+import pytest
+import sqlite3
+import time
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.scrapers.base_scraper import ScrapedProduct
+from scripts.scrapers.bulk_writer import BulkProductWriter, SaveStats, price_fingerprint
+
+
+def make_products(count, category="infrastructure", price=10.0):
+    return [
+        ScrapedProduct(
+            item_id=f"BULK_{i:05d}",
+            item_name=f"Bulk Item {i}",
+            category=category,
+            specifications={"index": i},
+            unit_cost=price + i,
+            unit="each",
+            source_url=f"https://example.com/product/{i}",
+            product_code=f"B{i}"
+        )
+        for i in range(count)
+    ]
+
+
+def table_count(db_path, table):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestBulkProductWriter:
+    """Test suite for chunked set-based writes"""
+
+    def test_write_chunk(self, temp_db):
+        """Test items, pricing, source references and log rows are written together"""
+        writer = BulkProductWriter(temp_db, "BulkSupplier")
+
+        stats = writer.write(make_products(50), "Bulk_20250101_000000")
+
+        assert stats.saved == 50
+        assert table_count(temp_db, "cost_items") == 50
+        assert table_count(temp_db, "cost_pricing") == 50
+        assert table_count(temp_db, "source_references") == 50
+        assert table_count(temp_db, "collection_log") == 50
+        assert table_count(temp_db, "item_attributes") == 50
+        assert table_count(temp_db, "item_attributes_pending") == 0
+        assert table_count(temp_db, "validation_results") == 50 * 4
+        assert table_count(temp_db, "validation_deferred") == 0
+
+        with sqlite3.connect(temp_db) as conn:
+            row = conn.execute("""
+                SELECT ci.specifications, cp.unit_cost, sr.source_url, s.company_name
+                FROM cost_items ci
+                JOIN cost_pricing cp ON cp.cost_item_id = ci.id
+                JOIN source_references sr ON sr.cost_pricing_id = cp.id
+                JOIN sources s ON s.id = sr.source_id
+                WHERE ci.item_id = 'BULK_00007'
+            """).fetchone()
+        assert row == ('{"index": 7}', 17.0, "https://example.com/product/7", "BulkSupplier")
+
+    def test_upsert_keeps_cost_item_id(self, temp_db):
+        """Test re-saving an item updates it in place and adds a new price"""
+        writer = BulkProductWriter(temp_db, "BulkSupplier")
+        writer.write(make_products(3))
+        with sqlite3.connect(temp_db) as conn:
+            ids_before = conn.execute("SELECT item_id, id FROM cost_items").fetchall()
+
+        updated = make_products(3, price=20.0)
+        updated[0].item_name = "Renamed Item"
+        writer.write(updated)
+
+        with sqlite3.connect(temp_db) as conn:
+            ids_after = conn.execute("SELECT item_id, id FROM cost_items").fetchall()
+            name = conn.execute(
+                "SELECT item_name FROM cost_items WHERE item_id = 'BULK_00000'"
+            ).fetchone()[0]
+        assert ids_after == ids_before
+        assert name == "Renamed Item"
+        assert table_count(temp_db, "cost_pricing") == 6
+
+    def test_unknown_category_skipped(self, temp_db):
+        """Test products with an unknown category are skipped, not fatal"""
+        writer = BulkProductWriter(temp_db, "BulkSupplier")
+        products = make_products(3)
+        products[1].category = "test"
+
+        assert writer.write(products).saved == 2
+        assert table_count(temp_db, "cost_items") == 2
+
+    def test_duplicate_item_ids_last_wins(self, temp_db):
+        """Test a chunk repeating an item_id saves it once with the last values"""
+        writer = BulkProductWriter(temp_db, "BulkSupplier")
+        products = make_products(1) + make_products(1, price=99.0)
+
+        assert writer.write(products).saved == 1
+        with sqlite3.connect(temp_db) as conn:
+            prices = conn.execute("SELECT unit_cost FROM cost_pricing").fetchall()
+        assert prices == [(99.0,)]
+
+    def test_failed_chunk_rolls_back(self, temp_db):
+        """Test a database error leaves nothing from the chunk behind"""
+        writer = BulkProductWriter(temp_db, "BulkSupplier")
+        products = make_products(3)
+        products[2].confidence_level = None
+
+        with pytest.raises(sqlite3.Error):
+            writer.write(products, "Bulk_20250101_000000")
+
+        assert table_count(temp_db, "cost_items") == 0
+        assert table_count(temp_db, "cost_pricing") == 0
+
+    def test_five_thousand_products(self, temp_db):
+        """Test a large batch is saved in seconds"""
+        writer = BulkProductWriter(temp_db, "BulkSupplier")
+
+        start = time.perf_counter()
+        stats = writer.write(make_products(5000), "Bulk_20250101_000000")
+        elapsed = time.perf_counter() - start
+
+        assert stats.saved == 5000
+        assert table_count(temp_db, "cost_pricing") == 5000
+        assert elapsed < 5.0
+
+
+class TestChangeDetection:
+    """Test suite for fingerprint-based change detection"""
+
+    def test_fingerprint_fields(self):
+        """Test the fingerprint follows price, unit, currency and specs only"""
+        product = make_products(1)[0]
+        same = make_products(1)[0]
+        same.item_name = "Other Name"
+        same.unit_cost = 10
+        same.specifications = {"index": 0}
+
+        assert price_fingerprint(product) == price_fingerprint(same)
+
+        for field, value in [("unit_cost", 10.5), ("unit", "per_sq_ft"),
+                             ("currency", "EUR"), ("specifications", {"index": 1})]:
+            changed = make_products(1)[0]
+            setattr(changed, field, value)
+            assert price_fingerprint(changed) != price_fingerprint(product), field
+
+    def test_unchanged_products_only_touched(self, temp_db):
+        """Test re-saving identical products adds no pricing or log rows"""
+        writer = BulkProductWriter(temp_db, "BulkSupplier")
+        first = writer.write(make_products(4), "Bulk_20250101_000000")
+
+        products = make_products(4)
+        products[1].unit_cost = 50.0
+        second = writer.write(products + make_products(6)[4:], "Bulk_20250102_000000")
+
+        assert first == SaveStats(new=4)
+        assert second == SaveStats(new=2, changed=1, unchanged=3)
+        assert table_count(temp_db, "cost_pricing") == 7
+        assert table_count(temp_db, "collection_log") == 7
+        assert table_count(temp_db, "item_fingerprints") == 6
+
+        with sqlite3.connect(temp_db) as conn:
+            actions = conn.execute("""
+                SELECT cl.action_type, COUNT(*) FROM collection_log cl
+                JOIN collection_sessions cs ON cs.id = cl.session_id
+                WHERE cs.session_name = 'Bulk_20250102_000000'
+                GROUP BY cl.action_type ORDER BY cl.action_type
+            """).fetchall()
+        assert actions == [('created', 2), ('updated', 1)]
+
+    def test_unchanged_touch_moves_last_seen(self, temp_db):
+        """Test an unchanged observation updates last_seen_at but not last_changed_at"""
+        writer = BulkProductWriter(temp_db, "BulkSupplier")
+        writer.write(make_products(1))
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("""
+                UPDATE item_fingerprints
+                SET last_seen_at = '2020-01-01 00:00:00', last_changed_at = '2020-01-01 00:00:00'
+            """)
+
+        writer.write(make_products(1))
+
+        with sqlite3.connect(temp_db) as conn:
+            last_seen, last_changed = conn.execute(
+                "SELECT last_seen_at, last_changed_at FROM item_fingerprints"
+            ).fetchone()
+        assert last_seen > '2020-01-01 00:00:00'
+        assert last_changed == '2020-01-01 00:00:00'
+
+    def test_details_change_updates_item_without_price(self, temp_db):
+        """Test a renamed item at the same price is updated but not repriced"""
+        writer = BulkProductWriter(temp_db, "BulkSupplier")
+        writer.write(make_products(2))
+
+        products = make_products(2)
+        products[0].item_name = "Corrected Name"
+        stats = writer.write(products)
+
+        assert stats == SaveStats(changed=1, unchanged=1)
+        assert table_count(temp_db, "cost_pricing") == 2
+        with sqlite3.connect(temp_db) as conn:
+            name = conn.execute(
+                "SELECT item_name FROM cost_items WHERE item_id = 'BULK_00000'"
+            ).fetchone()[0]
+        assert name == "Corrected Name"
+
+    def test_inactive_item_seen_again_is_reactivated(self, temp_db):
+        """Test a deprecated item scraped again at the same price becomes active"""
+        writer = BulkProductWriter(temp_db, "BulkSupplier")
+        writer.write(make_products(2))
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("UPDATE cost_items SET status = 'deprecated' WHERE item_id = 'BULK_00000'")
+
+        stats = writer.write(make_products(2))
+
+        assert stats == SaveStats(changed=1, unchanged=1)
+        assert table_count(temp_db, "cost_pricing") == 2
+        with sqlite3.connect(temp_db) as conn:
+            statuses = conn.execute("SELECT status FROM cost_items ORDER BY item_id").fetchall()
+        assert statuses == [('active',), ('active',)]
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scraper cache budgets and eviction (cache_manager.py)
+"""
+
+import pytest
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.test_base_scraper import MockScraper
+from scripts.scrapers.cache_store import (
+    JsonFileCacheStore, SQLiteCacheStore, CACHE_BACKEND_SQLITE, SQLITE_CACHE_FILENAME
+)
+from scripts.scrapers.cache_manager import CacheManager, compact_cache
+
+
+def fill_store(store, count, make_cache_entry):
+    """Save entries key0..keyN with strictly increasing access times"""
+    for i in range(count):
+        # Random bodies so compressed and uncompressed stores have comparable sizes
+        store.save(f'key{i}', make_cache_entry(content=os.urandom(500).hex()))
+        if isinstance(store, JsonFileCacheStore):
+            # Filesystem mtimes can be coarse; space them out explicitly
+            stamp = time.time() - (count - i)
+            os.utime(store.get_path(f'key{i}'), (stamp, stamp))
+        else:
+            time.sleep(0.002)
+
+
+class TestCacheManager:
+    """Test suite for TTL and LRU eviction"""
+
+    def test_unbounded_manager_evicts_nothing(self, cache_store, make_cache_entry):
+        """Test a manager without limits leaves the store alone"""
+        fill_store(cache_store, 3, make_cache_entry)
+
+        stats = CacheManager().enforce(cache_store)
+
+        assert stats.evictions == 0
+        assert stats.entries == 3
+        assert len(list(cache_store.keys())) == 3
+
+    def test_ttl_eviction(self, cache_store, make_cache_entry):
+        """Test entries older than the TTL are evicted first"""
+        cache_store.save('old', make_cache_entry(age_hours=200))
+        cache_store.save('new', make_cache_entry(age_hours=1))
+
+        stats = CacheManager(ttl_hours=168).enforce(cache_store)
+
+        assert stats.expired_evictions == 1
+        assert stats.lru_evictions == 0
+        assert list(cache_store.keys()) == ['new']
+
+    def test_lru_eviction_to_budget(self, cache_store, make_cache_entry):
+        """Test least recently used entries go until the store fits"""
+        fill_store(cache_store, 5, make_cache_entry)
+        entry_size = max(info.size_bytes for info in cache_store.entries())
+
+        stats = CacheManager(max_bytes=entry_size * 2).enforce(cache_store)
+
+        assert stats.lru_evictions == 3
+        assert stats.bytes <= entry_size * 2
+        assert sorted(cache_store.keys()) == ['key3', 'key4']
+
+    def test_reads_refresh_recency(self, cache_store, make_cache_entry):
+        """Test a recently served entry survives over newer unread ones"""
+        fill_store(cache_store, 3, make_cache_entry)
+        cache_store.load('key0')
+        entry_size = max(info.size_bytes for info in cache_store.entries())
+
+        CacheManager(max_bytes=entry_size).enforce(cache_store)
+
+        assert list(cache_store.keys()) == ['key0']
+
+
+class TestCompactCache:
+    """Test suite for budget enforcement across supplier caches"""
+
+    def test_supplier_and_global_budgets(self, tmp_path, make_cache_entry):
+        """Test per-supplier budgets apply first, then the global budget"""
+        json_store = JsonFileCacheStore(tmp_path / 'farmtek')
+        fill_store(json_store, 4, make_cache_entry)
+        packed_store = SQLiteCacheStore(tmp_path / 'growspan' / SQLITE_CACHE_FILENAME)
+        fill_store(packed_store, 4, make_cache_entry)
+        packed_store.close()
+
+        json_size = max(info.size_bytes for info in json_store.entries())
+        results = compact_cache(tmp_path,
+                                supplier_budget_bytes=json_size * 3,
+                                total_budget_bytes=json_size * 4)
+
+        # One eviction to fit the supplier budget, more for the global one; the
+        # packed cache was used more recently so it is left alone
+        assert results['farmtek'].lru_evictions >= 2
+        assert results['growspan'].lru_evictions == 0
+        total = results['farmtek'].bytes + results['growspan'].bytes
+        assert total <= json_size * 4
+
+    def test_compact_vacuums_packed_store(self, tmp_path, make_cache_entry):
+        """Test evicted bodies are returned to the filesystem"""
+        db_path = tmp_path / 'supplier' / SQLITE_CACHE_FILENAME
+        store = SQLiteCacheStore(db_path)
+        fill_store(store, 50, make_cache_entry)
+        store.close()
+        size_before = db_path.stat().st_size
+
+        compact_cache(tmp_path, ttl_hours=0)
+
+        assert db_path.stat().st_size < size_before / 2
+
+
+class TestScraperCacheBudget:
+    """Test budget enforcement and statistics in BaseScraper"""
+
+    @patch('requests.Session.get')
+    def test_session_reports_cache_statistics(self, mock_get, temp_cache_dir):
+        """Test hits, misses, evictions and bytes are reported per session"""
+        def fake_get(url, **kwargs):
+            response = MagicMock()
+            response.status_code = 200
+            response.text = os.urandom(500).hex()
+            response.url = url
+            response.headers = {}
+            response.encoding = 'utf-8'
+            return response
+        mock_get.side_effect = fake_get
+
+        scraper = MockScraper("TestSupplier", "https://example.com",
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.0,
+                             cache_backend=CACHE_BACKEND_SQLITE, cache_max_bytes=1200)
+
+        scraper.start_session()
+        for i in range(5):
+            scraper.make_request(f"https://example.com/page/{i}")
+        scraper.make_request("https://example.com/page/4")
+        result = scraper.end_session()
+
+        assert result.cache_misses == 5
+        assert result.cache_hits == 1
+        assert result.cache_bytes_written == 5000
+        assert result.cache_evictions >= 3
+        assert 0 < result.cache_bytes <= 1200
+
+    def test_unbounded_scraper_reports_cache_size(self, temp_cache_dir):
+        """Test cache size is reported even without a budget"""
+        scraper = MockScraper("TestSupplier", "https://example.com", cache_dir=str(temp_cache_dir))
+        scraper.save_to_cache('key', {'url': 'https://example.com', 'content': 'page'})
+
+        scraper.start_session()
+        result = scraper.end_session()
+
+        assert scraper.cache_manager is None
+        assert result.cache_evictions == 0
+        assert result.cache_bytes > 0
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scraper response cache stores (cache_store.py)
+"""
+
+import pytest
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.test_base_scraper import MockScraper
+from scripts.scrapers.cache_store import (
+    JsonFileCacheStore, SQLiteCacheStore, migrate_json_cache, CACHE_BACKEND_SQLITE, SQLITE_CACHE_FILENAME
+)
+
+
+class TestCacheStores:
+    """Behaviour shared by all cache store backends"""
+
+    def test_save_and_load_roundtrip(self, cache_store, make_cache_entry):
+        """Test an entry comes back exactly as stored"""
+        entry = make_cache_entry()
+        cache_store.save('key1', entry)
+
+        loaded = cache_store.load('key1')
+        assert loaded == entry
+
+    def test_missing_entry(self, cache_store):
+        """Test missing keys return None"""
+        assert cache_store.load('missing') is None
+        assert cache_store.get_timestamp('missing') is None
+        assert cache_store.load_if_fresh('missing', 24) == (None, None)
+
+    def test_load_if_fresh_expired(self, cache_store, make_cache_entry):
+        """Test expired entries are reported with their age"""
+        cache_store.save('old', make_cache_entry(age_hours=30))
+
+        entry, age_hours = cache_store.load_if_fresh('old', 24)
+        assert entry is None
+        assert age_hours > 29
+
+    def test_load_if_fresh_valid(self, cache_store, make_cache_entry):
+        """Test fresh entries are returned"""
+        cache_store.save('new', make_cache_entry(age_hours=1))
+
+        entry, age_hours = cache_store.load_if_fresh('new', 24)
+        assert entry is not None
+        assert age_hours < 2
+
+    def test_delete_and_keys(self, cache_store, make_cache_entry):
+        """Test key listing and deletion"""
+        cache_store.save('a', make_cache_entry())
+        cache_store.save('b', make_cache_entry())
+        assert sorted(cache_store.keys()) == ['a', 'b']
+
+        cache_store.delete('a')
+        assert list(cache_store.keys()) == ['b']
+
+    def test_peek_does_not_record_access(self, cache_store, make_cache_entry):
+        """Test peek returns the entry without moving it up the LRU order"""
+        cache_store.save('a', make_cache_entry())
+        before = {info.cache_key: info.last_accessed for info in cache_store.entries()}
+
+        assert cache_store.peek('a')['content'] == '<html>cached page</html>'
+        after = {info.cache_key: info.last_accessed for info in cache_store.entries()}
+        assert after == before
+
+    def test_unicode_content(self, cache_store, make_cache_entry):
+        """Test non-ASCII bodies survive storage"""
+        entry = make_cache_entry(content='<p>Gavita 1900 μmol/s — 85°F</p>')
+        cache_store.save('unicode', entry)
+
+        assert cache_store.load('unicode')['content'] == entry['content']
+
+
+class TestSQLiteCacheStore:
+    """Test suite for the packed SQLite store"""
+
+    def test_bodies_are_compressed(self, temp_cache_dir, make_cache_entry):
+        """Test that stored bodies are smaller than the raw HTML"""
+        store = SQLiteCacheStore(temp_cache_dir / SQLITE_CACHE_FILENAME)
+        content = '<tr><td>Greenhouse bench</td><td>$695.00</td></tr>' * 500
+        store.save('big', make_cache_entry(content=content))
+
+        stored_size = store.conn.execute(
+            "SELECT length(body), body_size FROM cache_bodies WHERE cache_key = 'big'"
+        ).fetchone()
+        store.close()
+
+        assert stored_size[1] == len(content)
+        assert stored_size[0] < len(content) / 10
+
+    def test_expiry_check_never_touches_bodies(self, temp_cache_dir):
+        """Test timestamp lookups are answered from the narrow index table"""
+        store = SQLiteCacheStore(temp_cache_dir / SQLITE_CACHE_FILENAME)
+        plan = store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT timestamp FROM cache_index WHERE cache_key = ?",
+            ('key',)
+        ).fetchall()
+        store.close()
+
+        detail = ' '.join(row[-1] for row in plan)
+        assert 'SEARCH cache_index USING PRIMARY KEY' in detail
+        assert 'cache_bodies' not in detail
+
+    def test_corrupt_body_raises_value_error(self, temp_cache_dir, make_cache_entry):
+        """Test corrupt compressed bodies surface as ValueError"""
+        store = SQLiteCacheStore(temp_cache_dir / SQLITE_CACHE_FILENAME)
+        store.save('corrupt', make_cache_entry())
+        store.conn.execute("UPDATE cache_bodies SET body = X'00FF' WHERE cache_key = 'corrupt'")
+
+        with pytest.raises(ValueError):
+            store.load('corrupt')
+        store.close()
+
+
+    def test_upgrades_store_without_validator_columns(self, temp_cache_dir, make_cache_entry):
+        """Test stores created before ETag support gain the new columns"""
+        db_path = temp_cache_dir / SQLITE_CACHE_FILENAME
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE cache_bodies (
+                    cache_key TEXT PRIMARY KEY, url TEXT, status_code INTEGER,
+                    headers TEXT, encoding TEXT, body BLOB, body_size INTEGER
+                )
+            """)
+
+        store = SQLiteCacheStore(db_path)
+        entry = dict(make_cache_entry(), etag='"abc"')
+        store.save('key', entry)
+
+        assert store.load('key') == entry
+        store.close()
+
+    def test_touch_resets_timestamp(self, temp_cache_dir, make_cache_entry):
+        """Test touch refreshes the index timestamp only"""
+        store = SQLiteCacheStore(temp_cache_dir / SQLITE_CACHE_FILENAME)
+        store.save('old', make_cache_entry(age_hours=30))
+
+        store.touch('old')
+
+        assert store.load_if_fresh('old', 24)[0]['content'] == '<html>cached page</html>'
+        store.close()
+
+
+class TestCacheMigration:
+    """Test suite for one-shot JSON to SQLite migration"""
+
+    def test_migrate_preserves_entries_and_timestamps(self, temp_cache_dir, make_cache_entry):
+        """Test every JSON entry is copied with its original timestamp"""
+        json_store = JsonFileCacheStore(temp_cache_dir)
+        entries = {f'key{i}': make_cache_entry(content=f'page {i}', age_hours=i) for i in range(3)}
+        for key, entry in entries.items():
+            json_store.save(key, entry)
+
+        stats = migrate_json_cache(temp_cache_dir)
+
+        assert stats['migrated'] == 3
+        assert stats['skipped'] == 0
+
+        packed = SQLiteCacheStore(temp_cache_dir / SQLITE_CACHE_FILENAME)
+        for key, entry in entries.items():
+            assert packed.load(key) == entry
+        packed.close()
+
+        # JSON files are kept unless removal is requested
+        assert len(list(temp_cache_dir.glob('*.json'))) == 3
+
+    def test_migrate_skips_corrupt_and_removes_json(self, temp_cache_dir, make_cache_entry):
+        """Test corrupt files are skipped and migrated files removed on request"""
+        JsonFileCacheStore(temp_cache_dir).save('good', make_cache_entry())
+        (temp_cache_dir / 'bad.json').write_text("invalid json content")
+
+        stats = migrate_json_cache(temp_cache_dir, remove_json=True)
+
+        assert stats == {'migrated': 1, 'skipped': 1,
+                         'bytes_before': stats['bytes_before']}
+        assert not (temp_cache_dir / 'good.json').exists()
+        assert (temp_cache_dir / 'bad.json').exists()
+
+
+class TestScraperCacheBackend:
+    """Test BaseScraper with a pluggable cache backend"""
+
+    def test_default_backend_is_json(self, temp_cache_dir):
+        """Test the JSON layout remains the default"""
+        scraper = MockScraper("TestSupplier", "https://example.com", cache_dir=str(temp_cache_dir))
+
+        assert isinstance(scraper.cache_store, JsonFileCacheStore)
+
+    def test_unknown_backend(self, temp_cache_dir):
+        """Test an unknown backend name is rejected"""
+        with pytest.raises(ValueError, match="Unknown cache backend"):
+            MockScraper("TestSupplier", "https://example.com",
+                        cache_dir=str(temp_cache_dir), cache_backend='memcached')
+
+    @patch('requests.Session.get')
+    def test_make_request_with_sqlite_backend(self, mock_get, temp_cache_dir):
+        """Test responses are cached in and served from the packed store"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = '<html>packed content</html>'
+        mock_response.url = 'https://example.com/packed'
+        mock_response.headers = {'Content-Type': 'text/html'}
+        mock_response.encoding = 'utf-8'
+        mock_get.return_value = mock_response
+
+        scraper = MockScraper("TestSupplier", "https://example.com",
+                             cache_dir=str(temp_cache_dir), rate_limit_delay=0.01,
+                             cache_backend=CACHE_BACKEND_SQLITE)
+
+        scraper.make_request("https://example.com/packed")
+        response = scraper.make_request("https://example.com/packed")
+
+        assert response.text == '<html>packed content</html>'
+        assert mock_get.call_count == 1
+        assert scraper.cache_hit_count == 1
+        assert (temp_cache_dir / SQLITE_CACHE_FILENAME).exists()
+        assert not list(temp_cache_dir.glob('*.json'))
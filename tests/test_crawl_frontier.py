@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Unit tests for resumable crawl checkpoints (crawl_frontier.py)
+"""
+
+import pytest
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.scrapers.crawl_frontier import (
+    CrawlFrontier, FRONTIER_PENDING, FRONTIER_VISITED, FRONTIER_PERSISTED, FRONTIER_FAILED
+)
+
+
+class TestCrawlFrontier:
+    """Test suite for frontier bookkeeping"""
+
+    def test_add_and_pending(self, temp_db):
+        """Test URLs are queued once, in discovery order, with their context"""
+        frontier = CrawlFrontier(temp_db, 'Test_20250101_000000')
+
+        frontier.add(['https://example.com/a', 'https://example.com/b'], 'product',
+                     {'category_path': '/kits/'})
+        frontier.add(['https://example.com/a'], 'product')
+
+        pending = frontier.pending('product')
+        assert [entry.url for entry in pending] == ['https://example.com/a', 'https://example.com/b']
+        assert pending[0].context == {'category_path': '/kits/'}
+        assert frontier.pending('category') == []
+
+    def test_state_transitions(self, temp_db):
+        """Test visited, persisted and failed URLs leave the pending set"""
+        frontier = CrawlFrontier(temp_db, 'Test_20250101_000000')
+        urls = [f'https://example.com/{i}' for i in range(4)]
+        frontier.add(urls)
+
+        frontier.mark_visited([urls[0]])
+        frontier.mark_persisted({urls[1]: 'ITEM_1'})
+        frontier.mark_failed([urls[2]])
+
+        assert frontier.counts() == {
+            FRONTIER_PENDING: 1, FRONTIER_VISITED: 1, FRONTIER_PERSISTED: 1, FRONTIER_FAILED: 1
+        }
+        assert frontier.persisted_item_ids() == ['ITEM_1']
+
+        assert frontier.requeue_failed() == 1
+        assert [entry.url for entry in frontier.pending()] == [urls[2], urls[3]]
+
+    def test_known_contexts_are_scoped_to_supplier(self, temp_db):
+        """Test context lookups see only the supplier's rows for the requested URLs"""
+        CrawlFrontier(temp_db, 'FarmTek_20250101_000000', 'FarmTek').add(
+            ['https://example.com/a', 'https://example.com/b'], 'product', {'category_path': '/kits/'})
+        CrawlFrontier(temp_db, 'FarmTek_20250201_000000', 'FarmTek').add(
+            ['https://example.com/a'], 'product', {'category_path': '/benching/'})
+        CrawlFrontier(temp_db, 'Other_20250101_000000', 'Other').add(
+            ['https://example.com/c'], 'product', {'category_path': '/lighting/'})
+
+        assert CrawlFrontier.known_contexts(temp_db, 'FarmTek', ['https://example.com/a',
+                                                                 'https://example.com/c']) == {
+            'https://example.com/a': {'category_path': '/benching/'}
+        }
+        assert set(CrawlFrontier.known_contexts(temp_db, 'FarmTek')) == {
+            'https://example.com/a', 'https://example.com/b'
+        }
+        assert CrawlFrontier.known_contexts(temp_db, 'Other', []) == {}
+
+    def test_frontier_belongs_to_collection_session(self, temp_db):
+        """Test the frontier is keyed by the session's collection_sessions row"""
+        frontier = CrawlFrontier(temp_db, 'Test_20250101_000000')
+        frontier.add(['https://example.com/a'])
+
+        assert CrawlFrontier.exists(temp_db, 'Test_20250101_000000')
+        assert not CrawlFrontier.exists(temp_db, 'Other_20250101_000000')
+
+        with sqlite3.connect(temp_db) as conn:
+            session_name = conn.execute("""
+                SELECT cs.session_name FROM crawl_frontier f
+                JOIN collection_sessions cs ON cs.id = f.session_id
+            """).fetchone()[0]
+        assert session_name == 'Test_20250101_000000'
+
+
+class TestResumableFarmTekSession:
+    """Test interrupted FarmTek sessions resume from their checkpoint"""
+
+    def test_resume_skips_persisted_products(self, farmtek_site, make_farmtek_scraper, temp_db, tmp_path):
+        """Test a crashed session resumes without refetching saved products"""
+        scraper = make_farmtek_scraper(tmp_path / 'first')
+        original = scraper.checkpoint_pages
+        calls = []
+
+        def crash_on_second_batch(results):
+            calls.append(results)
+            if len(calls) == 2:
+                raise RuntimeError("worker killed")
+            return original(results)
+
+        with patch.object(scraper, 'checkpoint_pages', side_effect=crash_on_second_batch):
+            with pytest.raises(RuntimeError):
+                scraper.run_scraping_session(checkpoint_every=2)
+
+        with sqlite3.connect(temp_db) as conn:
+            session_id = conn.execute(
+                "SELECT session_name FROM collection_sessions WHERE session_name LIKE 'FarmTek_%'"
+            ).fetchone()[0]
+            persisted = {row[0] for row in conn.execute("SELECT item_id FROM cost_items")}
+            assert len(persisted) == 2
+
+        # A fresh process with an empty cache picks up where the first stopped
+        farmtek_site.requests.clear()
+        resumed = make_farmtek_scraper(tmp_path / 'second')
+        result = resumed.run_scraping_session(resume_session_id=session_id, checkpoint_every=2)
+
+        fetched = [path for path, _ in farmtek_site.requests]
+        # Parse workers finish out of order, so any two products may be the persisted ones
+        assert sorted(fetched) == [f'/product/{i}' for i in range(6)
+                                   if f'FARMTEK_BENCH-{i}' not in persisted]
+        assert result.session_id == session_id
+        assert len(result.products_scraped) == 4
+
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM cost_items").fetchone()[0] == 6
+            assert conn.execute("SELECT COUNT(*) FROM cost_pricing").fetchone()[0] == 6
+            status = conn.execute(
+                "SELECT status FROM collection_sessions WHERE session_name = ?", (session_id,)
+            ).fetchone()[0]
+        assert status == 'completed'
+
+    def test_resume_unknown_session(self, make_farmtek_scraper, tmp_path):
+        """Test resuming a session without a checkpoint is rejected"""
+        scraper = make_farmtek_scraper(tmp_path)
+
+        with pytest.raises(ValueError, match="No crawl checkpoint"):
+            scraper.run_scraping_session(resume_session_id='FarmTek_19990101_000000')
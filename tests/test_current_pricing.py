@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the trigger-maintained current_pricing table (migration 005)
+"""
+
+import pytest
+import shutil
+import sqlite3
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.db_helpers import add_item, add_price
+from scripts.schema_migrations import MIGRATIONS_DIR, apply_migrations
+
+# v_current_pricing as first defined, reading the full pricing history
+LEGACY_CURRENT_PRICING = """
+    SELECT ci.item_id, ci.item_name, rs.name, cc.name, cp.unit_cost, cp.unit, cp.currency,
+           cp.total_cost_5000sqft, cp.confidence_level, cp.effective_date, s.company_name, sr.source_url
+    FROM cost_items ci
+    JOIN cost_categories cc ON ci.category_id = cc.id
+    JOIN revenue_streams rs ON cc.revenue_stream_id = rs.id
+    JOIN cost_pricing cp ON ci.id = cp.cost_item_id
+    LEFT JOIN source_references sr ON cp.id = sr.cost_pricing_id AND sr.reference_type = 'primary'
+    LEFT JOIN sources s ON sr.source_id = s.id
+    WHERE ci.status = 'active'
+    AND cp.effective_date = (SELECT MAX(effective_date) FROM cost_pricing cp2 WHERE cp2.cost_item_id = ci.id)
+    ORDER BY ci.item_id
+"""
+
+
+def add_reference(conn, cost_pricing_id, company, reference_type='primary'):
+    conn.execute("INSERT OR IGNORE INTO sources (company_name, tier) VALUES (?, 1)", (company,))
+    conn.execute("""
+        INSERT INTO source_references (cost_pricing_id, source_id, reference_type, source_url, date_accessed)
+        SELECT ?, id, ?, ?, DATE('now') FROM sources WHERE company_name = ?
+    """, (cost_pricing_id, reference_type, f"https://{company.lower()}.example.com", company))
+
+
+def current(conn, cost_item_id):
+    return conn.execute("""
+        SELECT unit_cost, effective_date, source_url FROM current_pricing WHERE cost_item_id = ?
+    """, (cost_item_id,)).fetchone()
+
+
+class TestCurrentPricing:
+    """Test suite for keeping current_pricing in step with pricing history"""
+
+    @pytest.fixture
+    def conn(self, temp_db):
+        conn = sqlite3.connect(temp_db)
+        yield conn
+        conn.close()
+
+    def test_latest_price_follows_history(self, conn):
+        """Test inserts, backdated prices and deletes leave the latest price current"""
+        item = add_item(conn, 'ITEM_A')
+        assert current(conn, item) is None
+
+        add_price(conn, item, 10, '2025-01-01')
+        newest = add_price(conn, item, 12, '2025-03-01')
+        add_price(conn, item, 8, '2024-12-01')
+        assert current(conn, item) == (12, '2025-03-01', None)
+
+        conn.execute("UPDATE cost_pricing SET unit_cost = 13 WHERE id = ?", (newest,))
+        assert current(conn, item)[0] == 13
+
+        conn.execute("DELETE FROM cost_pricing WHERE id = ?", (newest,))
+        assert current(conn, item) == (10, '2025-01-01', None)
+
+    def test_only_active_items(self, conn):
+        """Test items drop out while not active and come back when reactivated"""
+        item = add_item(conn, 'ITEM_B')
+        add_price(conn, item, 5, '2025-01-01')
+
+        conn.execute("UPDATE cost_items SET status = 'deprecated' WHERE id = ?", (item,))
+        assert current(conn, item) is None
+
+        conn.execute("UPDATE cost_items SET status = 'active' WHERE id = ?", (item,))
+        assert current(conn, item) == (5, '2025-01-01', None)
+
+    def test_primary_source(self, conn):
+        """Test the primary reference of the current price is tracked"""
+        item = add_item(conn, 'ITEM_C')
+        old = add_price(conn, item, 5, '2024-01-01')
+        latest = add_price(conn, item, 6, '2025-01-01')
+
+        add_reference(conn, old, 'Oldco')
+        add_reference(conn, latest, 'Compareco', reference_type='comparison')
+        assert current(conn, item)[2] is None
+
+        add_reference(conn, latest, 'Farmco')
+        assert current(conn, item)[2] == 'https://farmco.example.com'
+
+        conn.execute("DELETE FROM source_references WHERE cost_pricing_id = ? AND reference_type = 'primary'",
+                     (latest,))
+        assert current(conn, item)[2] is None
+
+    def test_views_match_history(self, conn):
+        """Test the rebased views agree with the history-scanning definitions"""
+        for n in range(6):
+            item = add_item(conn, f"ITEM_{n}", category='infrastructure' if n % 2 else 'utilities')
+            for month in range(1, n + 2):
+                pricing_id = add_price(conn, item, 10 * n + month, f"2025-{month:02d}-01",
+                                       confidence='HIGH' if month % 2 else 'MEDIUM')
+                if n % 3 == 0:
+                    add_reference(conn, pricing_id, f"Supplier{n}")
+        conn.execute("UPDATE cost_items SET status = 'deprecated' WHERE item_id = 'ITEM_5'")
+
+        assert conn.execute("SELECT * FROM v_current_pricing ORDER BY item_id").fetchall() == \
+            conn.execute(LEGACY_CURRENT_PRICING).fetchall()
+
+        summary = conn.execute("SELECT category, item_count, avg_unit_cost FROM v_cost_summary").fetchall()
+        assert sorted(summary) == [('Greenhouse Infrastructure', 2, 23.0), ('Utilities', 3, 23.0)]
+
+        quality = conn.execute("SELECT total_items, items_with_sources FROM v_data_quality").fetchall()
+        assert quality == [(5, 2)]
+
+    def test_migration_backfills_existing_items(self, tmp_path):
+        """Test migrating a populated database fills current_pricing"""
+        earlier = tmp_path / 'migrations'
+        earlier.mkdir()
+        for path in MIGRATIONS_DIR.glob('00[1-4]_*.sql'):
+            shutil.copy(path, earlier)
+
+        db_path = tmp_path / 'old.db'
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript((project_root / 'config' / 'database_schema.sql').read_text())
+            apply_migrations(conn, earlier)
+            conn.execute("INSERT INTO cost_categories (revenue_stream_id, name, code) VALUES (1, 'Kits', 'kits')")
+            item = add_item(conn, 'OLD_ITEM', category='kits')
+            add_price(conn, item, 3, '2024-06-01')
+            add_price(conn, item, 4, '2024-07-01')
+            conn.commit()
+
+            assert apply_migrations(conn)[0] == '005_current_pricing'
+            assert current(conn, item) == (4, '2024-07-01', None)
+        conn.close()
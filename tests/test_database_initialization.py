@@ -26,7 +26,7 @@ class TestDatabaseInitializer:
         """Test initialization with default parameters"""
         db_init = DatabaseInitializer()
         
-        assert db_init.db_path == Path('data/costs/vanilla_costs.db')
+        assert db_init.db_path == project_root / 'data' / 'costs' / 'vanilla_costs.db'
         assert db_init.recreate == False
         assert db_init.schema_path == project_root / 'config' / 'database_schema.sql'
         
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared database access layer (db.py)
+"""
+
+import pytest
+import sqlite3
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db import BUSY_TIMEOUT_MS, CACHE_SIZE_KIB, close_all, connect, get_connection
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = tmp_path / 'test.db'
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.close()
+    yield str(path)
+    close_all()
+
+
+class TestConnect:
+    """Test suite for configured connections"""
+
+    def test_standard_pragmas(self, db_file):
+        """Test connections come up in WAL mode with the tuned settings"""
+        conn = connect(db_file)
+        try:
+            pragma = lambda name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+            assert pragma('journal_mode') == 'wal'
+            assert pragma('synchronous') == 1  # NORMAL
+            assert pragma('foreign_keys') == 1
+            assert pragma('busy_timeout') == BUSY_TIMEOUT_MS
+            assert pragma('cache_size') == -CACHE_SIZE_KIB
+        finally:
+            conn.close()
+
+    def test_foreign_keys_enforced(self, temp_db):
+        """Test REFERENCES clauses reject rows pointing nowhere"""
+        conn = connect(temp_db)
+        try:
+            with pytest.raises(sqlite3.IntegrityError, match="FOREIGN KEY"):
+                conn.execute("""
+                    INSERT INTO cost_items (item_id, item_name, category_id)
+                    VALUES ('ORPHAN', 'Orphan item', 999999)
+                """)
+        finally:
+            conn.close()
+
+    def test_read_only(self, db_file, tmp_path):
+        """Test read-only connections can read but not write or create files"""
+        conn = connect(db_file, read_only=True)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 0
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                conn.execute("INSERT INTO notes (body) VALUES ('x')")
+        finally:
+            conn.close()
+
+        missing = tmp_path / 'missing.db'
+        with pytest.raises(sqlite3.OperationalError):
+            connect(missing, read_only=True)
+        assert not missing.exists()
+
+
+class TestGetConnection:
+    """Test suite for pooled connections"""
+
+    def test_connections_are_reused(self, db_file):
+        """Test a returned connection is handed out again, but never shared"""
+        with get_connection(db_file) as first:
+            with get_connection(db_file) as nested:
+                assert nested is not first
+        with get_connection(db_file) as again:
+            assert again is first or again is nested
+
+    def test_commit_and_rollback(self, db_file):
+        """Test a block commits on success and rolls back when it raises"""
+        with get_connection(db_file) as conn:
+            conn.execute("INSERT INTO notes (body) VALUES ('kept')")
+
+        with pytest.raises(RuntimeError):
+            with get_connection(db_file) as conn:
+                conn.execute("INSERT INTO notes (body) VALUES ('dropped')")
+                raise RuntimeError("abort")
+
+        with get_connection(db_file, read_only=True) as conn:
+            assert conn.execute("SELECT body FROM notes").fetchall() == [('kept',)]
+
+    def test_close_all(self, db_file):
+        """Test close_all closes idle pooled connections"""
+        with get_connection(db_file) as conn:
+            pass
+        close_all()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        with get_connection(db_file) as fresh:
+            assert fresh is not conn
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the serialized database writer (db_writer.py)
+"""
+
+import pytest
+import sqlite3
+import threading
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.scrapers.base_scraper import ScrapedProduct
+from scripts.scrapers.db_writer import DatabaseWriter
+from scripts.scrapers.greenhouse_data_collector import GreenhouseDataCollector
+
+
+def make_products(prefix, count, category='infrastructure'):
+    return [
+        ScrapedProduct(item_id=f"{prefix}_{i:04d}", item_name=f"{prefix} item {i}", category=category,
+                       unit_cost=10.0 + i, unit='each', source_url=f"https://example.com/{prefix}/{i}")
+        for i in range(count)
+    ]
+
+
+def insert_pricing(cost_item_id, unit_cost):
+    """A pricing batch job returning the new row's id"""
+    def job(conn):
+        return conn.execute("""
+            INSERT INTO cost_pricing (cost_item_id, unit_cost, unit, effective_date, confidence_level)
+            VALUES (?, ?, 'each', DATE('now'), 'MEDIUM')
+            RETURNING id
+        """, (cost_item_id, unit_cost)).fetchone()[0]
+    return job
+
+
+class TestDatabaseWriter:
+    """Test suite for the group-committing writer thread"""
+
+    def test_concurrent_producers(self, temp_db):
+        """Test many threads writing at once lose nothing and share commits"""
+        with DatabaseWriter(temp_db, commit_interval=0.05) as writer:
+            results = {}
+
+            def produce(supplier):
+                futures = [writer.write_products(supplier, make_products(f"{supplier}_{chunk}", 10))
+                           for chunk in range(5)]
+                results[supplier] = [future.result() for future in futures]
+
+            threads = [threading.Thread(target=produce, args=(f"Supplier{i}",)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert all(stats.new == 10 for chunks in results.values() for stats in chunks)
+        assert writer.stats.jobs == 40
+        assert writer.stats.commits < writer.stats.jobs
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM cost_items").fetchone()[0] == 400
+            assert conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0] == 8
+
+    def test_jobs_return_results(self, temp_db):
+        """Test arbitrary jobs resolve to their own return value after commit"""
+        with DatabaseWriter(temp_db) as writer:
+            writer.write_products('FarmTek', make_products('ITEM', 1)).result()
+            cost_item_id = writer.submit(
+                lambda conn: conn.execute("SELECT id FROM cost_items").fetchone()[0]
+            ).result()
+            pricing_ids = [writer.submit(insert_pricing(cost_item_id, price)) for price in (11.0, 12.0)]
+            pricing_ids = [future.result() for future in pricing_ids]
+
+        with sqlite3.connect(temp_db) as conn:
+            stored = conn.execute("SELECT id FROM cost_pricing WHERE unit_cost > 10.5 ORDER BY id").fetchall()
+        assert [row[0] for row in stored] == pricing_ids
+
+    def test_failing_job_is_isolated(self, temp_db):
+        """Test one failing job rolls back alone while its group commits"""
+        def failing(conn):
+            conn.execute("INSERT INTO sources (company_name, tier) VALUES ('Half Written', 1)")
+            raise sqlite3.IntegrityError("bad batch")
+
+        with DatabaseWriter(temp_db, commit_interval=0.05) as writer:
+            first = writer.write_products('FarmTek', make_products('A', 2))
+            bad = writer.submit(failing)
+            last = writer.write_products('FarmTek', make_products('B', 2))
+
+            assert first.result().new == 2 and last.result().new == 2
+            with pytest.raises(sqlite3.IntegrityError, match="bad batch"):
+                bad.result()
+
+        assert writer.stats.failed == 1
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM cost_items").fetchone()[0] == 4
+            assert conn.execute(
+                "SELECT COUNT(*) FROM sources WHERE company_name = 'Half Written'"
+            ).fetchone()[0] == 0
+
+    def test_closed_writer_rejects_jobs(self, temp_db):
+        """Test jobs queued before close finish and later ones are refused"""
+        writer = DatabaseWriter(temp_db).start()
+        queued = writer.write_products('FarmTek', make_products('LATE', 3))
+        writer.close()
+
+        assert queued.result().new == 3
+        with pytest.raises(RuntimeError, match="closed"):
+            writer.write_products('FarmTek', make_products('REFUSED', 1))
+
+    def test_scrapers_share_writer(self, temp_db, temp_cache_dir):
+        """Test scrapers given a db_writer save through its thread"""
+        with DatabaseWriter(temp_db) as writer:
+            scraper = GreenhouseDataCollector(db_path=temp_db, cache_dir=str(temp_cache_dir),
+                                              db_writer=writer)
+            result = scraper.run_scraping_session()
+
+        assert result.products_saved == result.products_count > 0
+        assert writer.stats.jobs >= 1
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Unit tests for sitemap URL discovery (discovery.py)
+"""
+
+import pytest
+import gzip
+import sqlite3
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.scrapers.discovery import (
+    SitemapDiscovery, SitemapEntry, changed_entries, parse_lastmod, parse_sitemap, record_fetched
+)
+from scripts.scrapers.farmtek_scraper import FarmTekScraper
+
+
+def urlset(entries):
+    urls = ''.join(
+        f'<url><loc>{loc}</loc>' + (f'<lastmod>{lastmod}</lastmod>' if lastmod else '') + '</url>'
+        for loc, lastmod in entries
+    )
+    return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+
+
+def sitemap_index(locs):
+    sitemaps = ''.join(f'<sitemap><loc>{loc}</loc></sitemap>' for loc in locs)
+    return (f'<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f'{sitemaps}</sitemapindex>')
+
+
+class TestSitemapParsing:
+    """Test suite for sitemap and lastmod parsing"""
+
+    def test_parse_lastmod(self):
+        """Test W3C datetimes normalize to comparable UTC strings"""
+        assert parse_lastmod('2025-03-01') == '2025-03-01T00:00:00+00:00'
+        assert parse_lastmod('2025-03-01T10:00:00Z') == '2025-03-01T10:00:00+00:00'
+        assert parse_lastmod('2025-03-01T10:00:00-05:00') == '2025-03-01T15:00:00+00:00'
+        assert parse_lastmod('last tuesday') is None
+        assert parse_lastmod(None) is None
+
+    def test_parse_urlset_and_index(self):
+        """Test page entries and child sitemaps are told apart"""
+        pages, children = parse_sitemap(urlset([('https://x.com/a', '2025-01-02'), ('https://x.com/b', None)]))
+        assert pages == [SitemapEntry('https://x.com/a', '2025-01-02T00:00:00+00:00'),
+                         SitemapEntry('https://x.com/b')]
+        assert children == []
+
+        pages, children = parse_sitemap(sitemap_index(['https://x.com/s1.xml']).encode())
+        assert pages == [] and children == [SitemapEntry('https://x.com/s1.xml')]
+
+    def test_parse_gzipped(self):
+        """Test gzipped sitemap bodies are decompressed"""
+        pages, _ = parse_sitemap(gzip.compress(urlset([('https://x.com/a', None)]).encode()))
+        assert [entry.loc for entry in pages] == ['https://x.com/a']
+
+    def test_invalid_sitemap(self):
+        """Test non-sitemap content is rejected"""
+        with pytest.raises(ValueError):
+            parse_sitemap('<html><body>Not found</body></html>')
+        with pytest.raises(ValueError):
+            parse_sitemap('not xml at all')
+
+
+class TestSitemapDiscovery:
+    """Test suite for robots.txt and sitemap index traversal"""
+
+    def test_robots_sitemaps_and_disallow(self, local_http_server, temp_cache_dir):
+        """Test sitemaps announced in robots.txt are followed and Disallow is respected"""
+        base = local_http_server.base_url
+        local_http_server.routes['/robots.txt'] = (200, {}, (
+            f"User-agent: *\nDisallow: /private/\nSitemap: {base}/sitemap_index.xml\n"
+        ))
+        local_http_server.routes['/sitemap_index.xml'] = (200, {}, sitemap_index(
+            [f'{base}/sitemap-1.xml', f'{base}/sitemap-2.xml', f'{base}/sitemap-1.xml']
+        ))
+        local_http_server.routes['/sitemap-1.xml'] = (200, {}, urlset([
+            (f'{base}/product/1', '2025-01-01'), (f'{base}/private/2', '2025-01-01')
+        ]))
+        local_http_server.routes['/sitemap-2.xml'] = (200, {}, urlset([
+            (f'{base}/product/1', '2025-02-01'), (f'{base}/product/3', None)
+        ]))
+        scraper = FarmTekScraper(cache_dir=str(temp_cache_dir))
+        scraper.base_url = base
+        scraper.host_limiter.delay = 0.0
+
+        entries = scraper.discover_urls(changed_only=False)
+
+        assert {entry.loc: entry.lastmod for entry in entries} == {
+            f'{base}/product/1': '2025-02-01T00:00:00+00:00',
+            f'{base}/product/3': None
+        }
+        sitemap_fetches = [path for path, _ in local_http_server.requests if 'sitemap' in path]
+        assert sorted(sitemap_fetches) == ['/sitemap-1.xml', '/sitemap-2.xml', '/sitemap_index.xml']
+
+    def test_no_sitemap(self, local_http_server):
+        """Test a site without robots.txt or sitemap reports None"""
+        fetch = lambda url: None
+        assert SitemapDiscovery(local_http_server.base_url, fetch).discover() is None
+
+    def test_changed_entries(self, temp_db):
+        """Test only new, undated and newer entries are returned"""
+        record_fetched(temp_db, 'FarmTek', {'a': '2025-01-01T00:00:00+00:00',
+                                            'b': '2025-01-01T00:00:00+00:00'})
+        entries = [
+            SitemapEntry('a', '2025-01-01T00:00:00+00:00'),  # unchanged
+            SitemapEntry('b', '2025-02-01T00:00:00+00:00'),  # newer
+            SitemapEntry('c', '2025-01-01T00:00:00+00:00'),  # new
+            SitemapEntry('a2', None)                         # no lastmod
+        ]
+
+        changed = changed_entries(temp_db, 'FarmTek', entries)
+
+        assert [entry.loc for entry in changed] == ['b', 'c', 'a2']
+        assert changed_entries(temp_db, 'Other', entries[:1]) == entries[:1]
+
+
+class TestIncrementalFarmTekSession:
+    """Test FarmTek sessions seeded from the sitemap"""
+
+    @pytest.fixture
+    def farmtek_site(self, local_http_server):
+        base = local_http_server.base_url
+        local_http_server.routes['/robots.txt'] = (200, {}, f"User-agent: *\nSitemap: {base}/sitemap.xml\n")
+        local_http_server.routes['/greenhouse-benching/'] = (200, {}, ''.join(
+            f'<a href="/product/{i}">Product {i}</a>' for i in range(3)
+        ))
+        for i in range(3):
+            local_http_server.routes[f'/product/{i}'] = (200, {}, (
+                f'<html><h1>Bench {i}</h1><span data-sku="BENCH-{i}"></span>'
+                f'<span class="price">${100 + i}.00</span></html>'
+            ))
+        local_http_server.set_lastmods = lambda lastmods: local_http_server.routes.__setitem__(
+            '/sitemap.xml', (200, {}, urlset([(f'{base}/product/{i}', lastmod)
+                                              for i, lastmod in enumerate(lastmods)]))
+        )
+        return local_http_server
+
+    def make_scraper(self, farmtek_site, temp_db, temp_cache_dir):
+        scraper = FarmTekScraper(db_path=temp_db, cache_dir=str(temp_cache_dir))
+        scraper.base_url = farmtek_site.base_url
+        scraper.target_urls = ['/greenhouse-benching/']
+        scraper.rate_limit_delay = 0.0
+        scraper.host_limiter.delay = 0.0
+        return scraper
+
+    def fetched_pages(self, farmtek_site):
+        return sorted(path for path, _ in farmtek_site.requests
+                      if path not in ('/robots.txt', '/sitemap.xml'))
+
+    def test_only_changed_products_are_refetched(self, farmtek_site, temp_db, temp_cache_dir):
+        """Test a second session fetches only products whose lastmod moved on"""
+        farmtek_site.set_lastmods(['2025-01-01', '2025-01-01', '2025-01-01'])
+        scraper = self.make_scraper(farmtek_site, temp_db, temp_cache_dir)
+
+        first = scraper.run_scraping_session()
+
+        # New products are placed in their category via the category page
+        assert first.products_count == 3
+        assert self.fetched_pages(farmtek_site) == [
+            '/greenhouse-benching/', '/product/0', '/product/1', '/product/2'
+        ]
+        with sqlite3.connect(temp_db) as conn:
+            categories = {row[0] for row in conn.execute("""
+                SELECT cc.code FROM cost_items ci JOIN cost_categories cc ON cc.id = ci.category_id
+            """)}
+        assert categories == {'infrastructure'}
+
+        farmtek_site.requests.clear()
+        farmtek_site.set_lastmods(['2025-01-01', '2025-03-01', '2025-01-01'])
+        scraper.start_session('FarmTek_incremental')
+        products = list(scraper.scrape_products())
+        scraper.end_session()
+
+        assert self.fetched_pages(farmtek_site) == ['/product/1']
+        assert [product.item_id for product in products] == ['FARMTEK_BENCH-1']
+        assert products[0].notes == 'Scraped from FarmTek category: /greenhouse-benching/'
+
+    def test_unplaced_sitemap_products_are_skipped(self, farmtek_site, temp_db, temp_cache_dir):
+        """Test sitemap products no target category links to are not fetched"""
+        base = farmtek_site.base_url
+        farmtek_site.routes['/product/9'] = (200, {}, '<html><h1>Garden Hose</h1></html>')
+        farmtek_site.routes['/sitemap.xml'] = (200, {}, urlset(
+            [(f'{base}/product/{i}', '2025-01-01') for i in (0, 1, 2, 9)]
+        ))
+        scraper = self.make_scraper(farmtek_site, temp_db, temp_cache_dir)
+
+        result = scraper.run_scraping_session()
+
+        assert result.products_count == 3
+        assert '/product/9' not in self.fetched_pages(farmtek_site)
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM cost_items WHERE item_name = 'Garden Hose'").fetchone()[0] == 0
+
+    def test_category_crawl_without_sitemap(self, farmtek_site, temp_db, temp_cache_dir):
+        """Test sessions fall back to category pages when there is no sitemap"""
+        del farmtek_site.routes['/robots.txt']
+        scraper = self.make_scraper(farmtek_site, temp_db, temp_cache_dir)
+
+        result = scraper.run_scraping_session()
+
+        assert result.products_count == 3
+        assert '/greenhouse-benching/' in self.fetched_pages(farmtek_site)
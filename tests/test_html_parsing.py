@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Unit tests for HTML parser backends and partial parsing (html_parsing.py)
+"""
+
+import pytest
+import re
+import requests
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from bs4 import SoupStrainer
+
+from scripts.scrapers.html_parsing import (
+    AnyOfStrainer, available_parsers, default_html_parser, parse_html, validate_parser
+)
+from scripts.scrapers.farmtek_scraper import FarmTekScraper
+from scripts.scrapers.cache_store import JsonFileCacheStore
+from scripts.scrapers.parser_benchmark import benchmark_parsers, load_cached_pages
+
+
+PRODUCT_PAGE = b"""
+<html><head><title>FarmTek - Bench</title><script>var tracking = 1;</script></head>
+<body>
+  <nav><a href="/greenhouse-kits/">Kits</a><a href="/product/99">Featured</a></nav>
+  <h1>Rolling Bench 12 ft long</h1>
+  <span data-sku="BENCH-12"></span>
+  <div class="product-price">$249.00</div>
+  <ul class="specifications"><li>Material: galvanized steel</li><li>Width: 4 ft</li></ul>
+  <footer>Shipping is 100 sq ft of paperwork</footer>
+</body></html>
+"""
+
+
+def make_response(content: bytes, url: str = "https://www.farmtek.com/product/1") -> requests.Response:
+    response = requests.Response()
+    response._content = content
+    response.status_code = 200
+    response.url = url
+    return response
+
+
+class TestParserSelection:
+    """Test suite for choosing the tree builder"""
+
+    def test_builtin_parser_always_available(self):
+        """Test html.parser is the fallback when nothing faster is installed"""
+        assert 'html.parser' in available_parsers()
+        assert default_html_parser() == available_parsers()[0]
+
+    def test_unknown_parser_rejected(self):
+        """Test an unavailable backend fails early with a clear error"""
+        with pytest.raises(ValueError, match="not available"):
+            validate_parser('no-such-parser')
+
+    def test_scraper_parser_option(self, temp_cache_dir):
+        """Test scrapers take their parser from the constructor"""
+        scraper = FarmTekScraper(cache_dir=str(temp_cache_dir), html_parser='html.parser')
+        assert scraper.html_parser == 'html.parser'
+
+        with pytest.raises(ValueError):
+            FarmTekScraper(cache_dir=str(temp_cache_dir), html_parser='no-such-parser')
+
+
+class TestPartialParsing:
+    """Test suite for strainer-restricted parsing"""
+
+    def test_tag_name_restriction(self):
+        """Test only= tag names keeps just those elements"""
+        soup = parse_html(make_response(PRODUCT_PAGE), only='a')
+        assert [a['href'] for a in soup.find_all('a')] == ['/greenhouse-kits/', '/product/99']
+        assert soup.find('h1') is None
+
+    def test_any_of_strainer(self):
+        """Test elements matching any strainer are kept with their contents"""
+        strainer = AnyOfStrainer(
+            SoupStrainer('h1'),
+            SoupStrainer(attrs={'class': re.compile(r'price')})
+        )
+        soup = parse_html(PRODUCT_PAGE, only=strainer)
+
+        assert soup.find('h1').get_text() == 'Rolling Bench 12 ft long'
+        assert soup.find(class_='product-price').get_text() == '$249.00'
+        assert soup.find('script') is None
+        assert 'paperwork' not in soup.get_text()
+
+    def test_farmtek_product_parsed_from_partial_tree(self, temp_cache_dir):
+        """Test FarmTek products parse the same from the restricted tree"""
+        scraper = FarmTekScraper(cache_dir=str(temp_cache_dir))
+        product = scraper.parse_product_detail(
+            make_response(PRODUCT_PAGE), "https://www.farmtek.com/product/1", "/greenhouse-benching/"
+        )
+
+        assert product.item_name == 'Rolling Bench 12 ft long'
+        assert product.product_code == 'BENCH-12'
+        assert product.unit_cost == 249.0
+        assert product.specifications['Material'] == 'galvanized steel'
+        assert product.specifications['length'] == '12'
+        # Footer text is no longer scanned for dimensions
+        assert 'area' not in product.specifications
+
+    def test_farmtek_category_links(self, temp_cache_dir, local_http_server):
+        """Test category pages only build product links"""
+        local_http_server.routes['/greenhouse-benching/'] = (200, {}, PRODUCT_PAGE.decode())
+        scraper = FarmTekScraper(cache_dir=str(temp_cache_dir))
+        scraper.base_url = local_http_server.base_url
+        scraper.rate_limit_delay = 0.0
+
+        urls = scraper.collect_product_urls('/greenhouse-benching/')
+
+        assert urls == [f"{local_http_server.base_url}/product/99"]
+
+
+class TestParserBenchmark:
+    """Test suite for the parser micro-benchmark"""
+
+    def test_benchmark_cached_pages(self, temp_cache_dir):
+        """Test every available parser is timed in full and partial mode"""
+        store = JsonFileCacheStore(temp_cache_dir)
+        store.save('page1', {
+            'url': 'https://www.farmtek.com/product/1', 'status_code': 200, 'headers': {},
+            'content': PRODUCT_PAGE.decode(), 'encoding': 'utf-8',
+            'timestamp': '2025-01-01T00:00:00'
+        })
+
+        pages = load_cached_pages(temp_cache_dir)
+        results = benchmark_parsers(pages, repeat=1)
+
+        assert list(pages) == ['https://www.farmtek.com/product/1']
+        assert [(r.parser, r.partial) for r in results] == [
+            (parser, partial) for parser in available_parsers() for partial in (False, True)
+        ]
+        assert all(r.pages == 1 and r.seconds > 0 for r in results)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit tests for typed specification attributes (item_attributes.py, migration 008)
+"""
+
+import pytest
+import json
+import sqlite3
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.db_helpers import add_item
+from scripts.item_attributes import (
+    Attribute, AttributeCondition, extract_attributes, find_items, parse_condition, parse_quantity
+)
+
+
+def found(conditions, db_path, **kwargs):
+    return [match.item_id for match in find_items([parse_condition(c) for c in conditions],
+                                                  db_path=db_path, **kwargs)]
+
+
+class TestParsing:
+    """Test suite for reading numbers and units out of specification values"""
+
+    @pytest.mark.parametrize('value, expected', [
+        ("645W", (645.0, 'W')),
+        ("0.65 kW", (650.0, 'W')),
+        ("3,840 sq ft", (3840.0, 'sq_ft')),
+        ("2.7 µmol/J", (2.7, 'umol/J')),
+        ("$14,000-34,000/year", (14000.0, 'USD/year')),
+        ("$2.19 per CCF (verified)", (2.19, 'USD/CCF')),
+        ("$1.2M", (1200000.0, 'USD')),
+        ("10'", (10.0, 'ft')),
+        ("2,000+ gallons per month", (2000.0, 'gal/month')),
+        ("200 fixtures", (200.0, None)),
+        ("Madagascar", (None, None)),
+        ("Grade A, 18 cm", (None, None)),
+    ])
+    def test_parse_quantity(self, value, expected):
+        """Test leading quantities are converted to canonical units"""
+        number, unit = parse_quantity(value)
+        assert (round(number, 6) if number is not None else None, unit) == expected
+
+    @pytest.mark.parametrize('key, value, expected', [
+        ('area_sqft', 3840, (3840.0, 'sq_ft')),
+        ('power_kw', 1.5, (1500.0, 'W')),
+        ('price_per_lb', 5.0, (11.023122, 'USD/kg')),
+        ('cost_per_sqft', 12, (12.0, 'USD/sq_ft')),
+        ('usage_kwh_per_day', 40, (40.0, 'kWh/day')),
+        ('flow_gal_per_hour', 3, (3.0, 'gal/hour')),
+        ('plants_per_sqft', 4, (4.0, None)),
+    ])
+    def test_key_units(self, key, value, expected):
+        """Test numbers take their unit from the key, rates from both ends of it"""
+        [attribute] = extract_attributes({key: value})
+        assert (round(attribute.numeric_value, 6), attribute.unit) == expected
+
+    def test_extract_attributes(self):
+        """Test keys are normalized, nested objects flattened and lists expanded"""
+        attributes = extract_attributes(json.dumps({
+            'Power Draw': '645W',
+            'area_sq_ft': 3840,
+            'origin': {'Country': 'Madagascar'},
+            'voltages': ['120 V', '240 V'],
+            'dimmable': True,
+            'notes': None
+        }))
+
+        assert attributes == [
+            Attribute('power_draw', 645.0, 'W', '645W'),
+            Attribute('area_sq_ft', 3840.0, 'sq_ft', '3840'),
+            Attribute('origin.country', None, None, 'Madagascar'),
+            Attribute('voltages', 120.0, 'V', '120 V'),
+            Attribute('voltages', 240.0, 'V', '240 V'),
+            Attribute('dimmable', 1.0, None, 'true'),
+        ]
+        assert extract_attributes('not json') == []
+        assert extract_attributes('["a list"]') == []
+
+    def test_parse_condition(self):
+        """Test conditions take units and wildcards, and reject non-numbers"""
+        assert parse_condition('Power Draw <= 0.7kW') == AttributeCondition('power_draw', '<=', 700.0, 'W')
+        assert parse_condition('efficacy*>2.5') == AttributeCondition('efficacy*', '>', 2.5)
+
+        with pytest.raises(ValueError):
+            parse_condition('origin = Madagascar')
+
+
+class TestFindItems:
+    """Test suite for range queries over item attributes"""
+
+    @pytest.fixture
+    def catalog(self, temp_db):
+        with sqlite3.connect(temp_db) as conn:
+            add_item(conn, 'LED_A', 'lighting', specifications={'power': '645W', 'efficacy_umol_j': '2.7 umol/J'})
+            add_item(conn, 'LED_B', 'lighting', specifications={'power': '0.4 kW', 'efficacy_umol_j': '2.3 µmol/J'})
+            add_item(conn, 'HPS', 'lighting', specifications={'power': '1000 W', 'efficacy_umol_j': 1.7})
+            add_item(conn, 'HEATER', 'climate_control', specifications={'power': '5 kW'})
+        conn.close()
+        return temp_db
+
+    def test_range_conditions(self, catalog):
+        """Test every condition must hold, in the condition's unit"""
+        assert found(['efficacy_umol_j>2.5'], catalog) == ['LED_A']
+        assert found(['power<=700W'], catalog) == ['LED_A', 'LED_B']
+        assert found(['power>=0.5kW', 'efficacy*>=2'], catalog) == ['LED_A']
+        assert found(['power>1kW'], catalog) == ['HEATER']
+        assert found(['power>1kW'], catalog, category='lighting') == []
+        assert found(['power>500 sq ft'], catalog) == []
+
+        matches = find_items([parse_condition('power<500W')], db_path=catalog)
+        assert matches[0].attributes == {'power': [Attribute('power', 400.0, 'W', '0.4 kW')]}
+
+    def test_attributes_follow_item_changes(self, catalog):
+        """Test edited and deleted items are re-parsed by the next query"""
+        with sqlite3.connect(catalog) as conn:
+            conn.execute("UPDATE cost_items SET specifications = ? WHERE item_id = 'HPS'",
+                         (json.dumps({'power': '600 W'}),))
+            conn.execute("DELETE FROM cost_items WHERE item_id = 'LED_B'")
+        conn.close()
+
+        assert found(['power<=700W'], catalog) == ['HPS', 'LED_A']
+        with sqlite3.connect(catalog) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM item_attributes_pending").fetchone() == (0,)
+            assert conn.execute("SELECT COUNT(*) FROM item_attributes").fetchone() == (4,)
+        conn.close()
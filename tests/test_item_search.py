@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Unit tests for full-text item search (item_search.py, migration 007)
+"""
+
+import pytest
+import sqlite3
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.db_helpers import add_item
+from scripts.item_search import match_query, search_items
+
+
+def found(query, db_path, **kwargs):
+    return [match.item_id for match in search_items(query, db_path=db_path, **kwargs)]
+
+
+class TestItemSearch:
+    """Test suite for ranked full-text search over cost items"""
+
+    @pytest.fixture
+    def catalog(self, temp_db):
+        with sqlite3.connect(temp_db) as conn:
+            add_item(conn, 'MDG_BEANS', item_name='Madagascar Grade A Vanilla Beans', specifications={
+                'grade': 'Grade A (Gourmet)', 'origin': {'country': 'Madagascar', 'region': 'Sava'}})
+            add_item(conn, 'AIR_FREIGHT', 'shipping_import', item_name='Air Freight to USA',
+                     specifications={'route': 'Madagascar to USA'})
+            add_item(conn, 'TRELLIS', item_name='Steel Trellis System', notes='Quote from Sava region supplier')
+            add_item(conn, 'OLD_BENCH', item_name='Rolling Bench', specifications={'size': '4x8'},
+                     status='deprecated')
+        conn.close()
+        return temp_db
+
+    def test_names_specifications_and_notes(self, catalog):
+        """Test all three columns are searchable and name matches rank first"""
+        assert found('madagascar', catalog) == ['MDG_BEANS', 'AIR_FREIGHT']
+        assert found('sava', catalog) == ['MDG_BEANS', 'TRELLIS']
+        assert found('madag grade a', catalog) == ['MDG_BEANS']
+        assert found('country', catalog) == ['MDG_BEANS']
+        assert found('tomatoes', catalog) == []
+        assert found('  ', catalog) == []
+
+    def test_filters(self, catalog):
+        """Test category (code or name) and status filters"""
+        assert found('madagascar', catalog, category='shipping_import') == ['AIR_FREIGHT']
+        assert found('madagascar', catalog, category='Shipping & Import Costs') == ['AIR_FREIGHT']
+        assert found('bench', catalog) == []
+        assert found('bench', catalog, include_inactive=True) == ['OLD_BENCH']
+        assert found('madagascar', catalog, limit=1) == ['MDG_BEANS']
+
+    def test_index_follows_item_changes(self, catalog):
+        """Test edited and deleted items are re-indexed by the triggers"""
+        with sqlite3.connect(catalog) as conn:
+            conn.execute("UPDATE cost_items SET item_name = 'Cedar Trellis System', notes = NULL "
+                         "WHERE item_id = 'TRELLIS'")
+            conn.execute("UPDATE cost_items SET specifications = 'hand written: Uganda' WHERE item_id = 'AIR_FREIGHT'")
+            conn.execute("DELETE FROM cost_items WHERE item_id = 'MDG_BEANS'")
+        conn.close()
+
+        assert found('cedar', catalog) == ['TRELLIS']
+        assert found('steel', catalog) == []
+        assert found('sava', catalog) == []
+        assert found('uganda', catalog) == ['AIR_FREIGHT']
+        assert found('madagascar', catalog) == []
+
+    def test_match_query(self):
+        """Test plain text becomes quoted terms, longer ones as prefixes"""
+        assert match_query('Grade A "premium" 5x') == '"Grade"* "A" "premium"* "5x"'
+        assert match_query('AND OR (') == '"AND"* "OR"'
+
+    def test_raw_queries(self, catalog):
+        """Test FTS5 syntax is passed through with raw and rejected when invalid"""
+        assert found('item_name:madagascar', catalog, raw=True) == ['MDG_BEANS']
+        assert found('trellis OR freight', catalog, raw=True) == ['AIR_FREIGHT', 'TRELLIS']
+
+        with pytest.raises(ValueError):
+            search_items('AND (', db_path=catalog, raw=True)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the multi-supplier scraping orchestrator (orchestrator.py)
+"""
+
+import pytest
+import queue
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.scrapers.base_scraper import ScrapedProduct
+from scripts.scrapers.orchestrator import (
+    ScrapingOrchestrator, OrchestratorSummary, SupplierRunSummary, WriterError,
+    _writer_sink, discover_scrapers
+)
+from scripts.scrapers.pipeline import PageResult
+from scripts.scrapers.farmtek_scraper import FarmTekScraper
+from scripts.scrapers.greenhouse_data_collector import GreenhouseDataCollector
+
+
+class TestDiscovery:
+    """Test suite for scraper discovery"""
+
+    def test_discovers_concrete_scrapers(self):
+        """Test all supplier scrapers in the package are found"""
+        scrapers = discover_scrapers()
+
+        assert scrapers['FarmTekScraper'] is FarmTekScraper
+        assert scrapers['GreenhouseDataCollector'] is GreenhouseDataCollector
+        assert 'BaseScraper' not in scrapers
+
+
+class TestScrapingOrchestrator:
+    """Test suite for parallel runs with a single writer"""
+
+    def test_run_saves_through_single_writer(self, temp_db, temp_cache_dir):
+        """Test worker output is persisted by the parent in chunks"""
+        orchestrator = ScrapingOrchestrator(
+            db_path=temp_db,
+            chunk_size=2,
+            scraper_options={'GreenhouseDataCollector': {'cache_dir': str(temp_cache_dir)}}
+        )
+
+        summary = orchestrator.run(['GreenhouseDataCollector'])
+
+        assert summary.failed == []
+        supplier = summary.suppliers[0]
+        assert supplier.supplier == 'Manual_Research'
+        assert supplier.products_scraped > 0
+        assert supplier.products_saved == supplier.products_scraped
+
+        with sqlite3.connect(temp_db) as conn:
+            item_count = conn.execute("SELECT COUNT(*) FROM cost_items").fetchone()[0]
+            session_name = conn.execute("SELECT session_name FROM collection_sessions").fetchone()[0]
+        assert item_count == supplier.products_saved
+        assert session_name == supplier.session_id
+
+    def test_failing_scraper_does_not_stop_others(self, temp_db, temp_cache_dir):
+        """Test one supplier's failure is reported without losing the rest"""
+        orchestrator = ScrapingOrchestrator(
+            db_path=temp_db,
+            scraper_options={
+                'GreenhouseDataCollector': {'cache_dir': str(temp_cache_dir / 'greenhouse')},
+                'FarmTekScraper': {'cache_dir': str(temp_cache_dir / 'farmtek')}
+            },
+            scrape_kwargs={'FarmTekScraper': {'unsupported_option': True}}
+        )
+
+        summary = orchestrator.run(['FarmTekScraper', 'GreenhouseDataCollector'])
+
+        assert summary.failed == ['FarmTekScraper']
+        assert summary.products_saved > 0
+        assert 'unsupported_option' in summary.suppliers[0].errors[0]
+
+    def test_unknown_scraper(self, temp_db):
+        """Test unknown class names are rejected before any work starts"""
+        orchestrator = ScrapingOrchestrator(db_path=temp_db)
+
+        with pytest.raises(ValueError, match="Unknown scrapers"):
+            orchestrator.run(['NoSuchScraper'])
+
+
+class TestWriterSink:
+    """Test suite for workers waiting on the parent's commits"""
+
+    URLS = [f"https://www.farmtek.com/product/{i}" for i in range(3)]
+
+    @pytest.fixture
+    def scraper(self, temp_db, temp_cache_dir):
+        scraper = FarmTekScraper(cache_dir=str(temp_cache_dir), db_path=temp_db)
+        scraper.start_session()
+        scraper.frontier.add(self.URLS, 'product')
+        return scraper
+
+    def results(self):
+        return [PageResult(url, {}, ScrapedProduct(
+            item_id=f"SINK_{i}", item_name=f"Product {i}", category="infrastructure",
+            unit_cost=10.0, unit="each", source_url=url
+        ), fetched=True) for i, url in enumerate(self.URLS)]
+
+    def test_checkpoint_waits_for_commit(self, scraper):
+        """Test pages are checkpointed with the counts the parent committed"""
+        product_queue, reply_queue = queue.Queue(), queue.Queue()
+        scraper.product_sink = _writer_sink('FarmTekScraper', scraper.supplier_name,
+                                            product_queue, reply_queue, 2)
+        reply_queue.put(2)
+        reply_queue.put(1)
+
+        assert scraper.checkpoint_pages(self.results()) == 3
+        assert product_queue.qsize() == 2
+        assert scraper.frontier.pending() == []
+
+    def test_failed_write_leaves_urls_pending(self, scraper):
+        """Test a chunk the parent could not save is not marked persisted"""
+        product_queue, reply_queue = queue.Queue(), queue.Queue()
+        scraper.product_sink = _writer_sink('FarmTekScraper', scraper.supplier_name,
+                                            product_queue, reply_queue, 2)
+        reply_queue.put(2)
+        reply_queue.put("Writer failed for 1 products: disk I/O error")
+
+        with pytest.raises(WriterError, match="disk I/O error"):
+            scraper.checkpoint_pages(self.results())
+        assert [entry.url for entry in scraper.frontier.pending()] == self.URLS
+
+
+class TestOrchestratorSummary:
+    """Test suite for aggregated run summaries"""
+
+    def test_totals(self):
+        """Test totals are summed across suppliers"""
+        summary = OrchestratorSummary(start_time=datetime.now(), suppliers=[
+            SupplierRunSummary(scraper='A', products_scraped=5, products_saved=4, requests_made=10),
+            SupplierRunSummary(scraper='B', products_scraped=3, products_saved=3, requests_made=2,
+                               errors=['timeout'])
+        ])
+
+        assert summary.products_scraped == 8
+        assert summary.products_saved == 7
+        assert summary.requests_made == 12
+        assert summary.failed == ['B']
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the content-hash short-circuit (page_extractions.py)
+"""
+
+import pytest
+import sqlite3
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.scrapers.base_scraper import BaseScraper, ScrapedProduct
+from scripts.scrapers.page_extractions import content_hash, load_extractions, record_extractions
+
+
+class CountingScraper(BaseScraper):
+    """Scraper that counts how many pages it actually parses"""
+
+    def scrape_products(self, **kwargs):
+        return []
+
+    def parse_page(self, url, response, context):
+        self.parsed.append(url)
+        if 'empty' in url:
+            return None
+        return ScrapedProduct(item_id=f"COUNT_{url.rsplit('/', 1)[-1]}", item_name=response.text,
+                              category=context.get('category', 'infrastructure'),
+                              unit_cost=10.0, unit='each', source_url=url)
+
+
+class TestContentHash:
+    """Test suite for extraction hashing and storage"""
+
+    def test_hash_inputs(self):
+        """Test the hash follows body, parser version and parse context, not crawl state"""
+        base = content_hash(b'<html>a</html>', '1', {'category_path': '/kits/'})
+
+        assert content_hash('<html>a</html>', '1', {'category_path': '/kits/', 'lastmod': 'x',
+                                                    'refresh': True}) == base
+        assert content_hash(b'<html>b</html>', '1', {'category_path': '/kits/'}) != base
+        assert content_hash(b'<html>a</html>', '2', {'category_path': '/kits/'}) != base
+        assert content_hash(b'<html>a</html>', '1', {'category_path': '/bench/'}) != base
+
+    def test_record_and_load(self, temp_db):
+        """Test extractions round-trip per supplier and parser version"""
+        record_extractions(temp_db, 'FarmTek', '1', {'https://x.com/a': ('h1', {'item_id': 'A'}),
+                                                     'https://x.com/b': ('h2', None)})
+        record_extractions(temp_db, 'FarmTek', '1', {'https://x.com/a': ('h3', {'item_id': 'A2'})})
+
+        assert load_extractions(temp_db, 'FarmTek', '1') == {
+            'https://x.com/a': ('h3', {'item_id': 'A2'}),
+            'https://x.com/b': ('h2', None)
+        }
+        assert load_extractions(temp_db, 'FarmTek', '2') == {}
+        assert load_extractions(temp_db, 'Other', '1') == {}
+
+
+class TestPipelineReuse:
+    """Test suite for skipping the parse of unchanged pages"""
+
+    @pytest.fixture
+    def scraper(self, local_http_server, temp_db, temp_cache_dir):
+        for name in ('1', '2', 'empty'):
+            local_http_server.routes[f'/product/{name}'] = (200, {}, f'Product {name}')
+        scraper = CountingScraper("CountingSupplier", local_http_server.base_url, db_path=temp_db,
+                                  cache_dir=str(temp_cache_dir), rate_limit_delay=0.0)
+        scraper.parsed = []
+        scraper.runs = 0
+        return scraper
+
+    def run(self, scraper, names, context=None):
+        pages = [(f"{scraper.base_url}/product/{name}", dict(context or {'refresh': True}))
+                 for name in names]
+        scraper.runs += 1
+        scraper.start_session(f"CountingSupplier_run_{scraper.runs}")
+        products = [r.product for r in scraper.run_pipeline(pages, write=scraper.checkpoint_pages)]
+        return products, scraper.end_session()
+
+    def test_unchanged_pages_are_not_parsed(self, scraper, local_http_server):
+        """Test a refetched page with the same body reuses its stored product"""
+        first, _ = self.run(scraper, ['1', '2', 'empty'])
+        assert len(scraper.parsed) == 3
+
+        scraper.parsed.clear()
+        local_http_server.routes['/product/2'] = (200, {}, 'Product 2 repriced')
+        second, result = self.run(scraper, ['1', '2', 'empty'])
+
+        assert scraper.parsed == [f"{scraper.base_url}/product/2"]
+        assert result.pages_reused == 2
+        by_id = {p.item_id: p for p in second if p}
+        assert by_id['COUNT_1'].item_name == 'Product 1'
+        first_seen = next(p for p in first if p and p.item_id == 'COUNT_1')
+        assert by_id['COUNT_1'].scraped_at != first_seen.scraped_at
+        assert by_id['COUNT_2'].item_name == 'Product 2 repriced'
+        assert None in second
+
+        # Reused products are saved like parsed ones: only touched when unchanged
+        assert (result.products_unchanged, result.products_changed) == (1, 1)
+
+    def test_parser_version_and_context_force_parse(self, scraper):
+        """Test a new parser version or parse context invalidates stored products"""
+        self.run(scraper, ['1'])
+        scraper.parsed.clear()
+
+        scraper.parser_version = '2'
+        self.run(scraper, ['1'])
+        self.run(scraper, ['1'], context={'refresh': True, 'category': 'utilities'})
+
+        assert len(scraper.parsed) == 2
+
+    def test_reuse_can_be_disabled(self, scraper):
+        """Test reuse_extractions=False parses every page"""
+        self.run(scraper, ['1'])
+        scraper.reuse_extractions = False
+        self.run(scraper, ['1'])
+
+        assert len(scraper.parsed) == 2
+        with sqlite3.connect(scraper.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM page_extractions").fetchone()[0] == 1
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the fetch/parse/write pipeline (pipeline.py)
+"""
+
+import pytest
+import asyncio
+import time
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.scrapers.base_scraper import BaseScraper, ScrapedProduct
+from scripts.scrapers.pipeline import PagePipeline
+
+
+class PipelineScraper(BaseScraper):
+    """Scraper whose pages parse into one product each, slowly"""
+
+    parse_seconds = 0.0
+
+    def scrape_products(self, **kwargs):
+        return []
+
+    def parse_page(self, url, response, context):
+        time.sleep(self.parse_seconds)
+        return ScrapedProduct(item_id=url.rsplit('/', 1)[-1], item_name=response.text,
+                              category='infrastructure', source_url=url)
+
+
+async def echo_fetch(url, context):
+    await asyncio.sleep(0)
+    return None if url.endswith('missing') else f"page {url}"
+
+
+def echo_parse(url, response, context):
+    return (response, context.get('n'))
+
+
+class TestPagePipeline:
+    """Test suite for the staged pipeline engine"""
+
+    def test_every_page_gets_a_result(self):
+        """Test parsed, unparsed and unfetched pages all come out once"""
+        def parse(url, response, context):
+            if url == 'bad':
+                raise ValueError("unparseable")
+            return echo_parse(url, response, context)
+
+        pipeline = PagePipeline(echo_fetch, parse, parse_workers=3)
+        pages = [('a', {'n': 1}), ('bad', {}), ('missing', {}), ('b', {'n': 2})]
+
+        results = {result.url: result for result in pipeline.run(pages)}
+
+        assert results['a'].product == ('page a', 1)
+        assert results['b'].product == ('page b', 2)
+        assert results['bad'].fetched and results['bad'].product is None
+        assert not results['missing'].fetched
+        assert pipeline.stats.fetch.items == 4
+        assert pipeline.stats.parse.items == 3
+        assert pipeline.stats.write.items == 4
+
+    def test_results_are_written_in_batches_before_yield(self):
+        """Test write sees fixed-size batches and results only follow their write"""
+        written = []
+
+        def write(batch):
+            written.append([result.url for result in batch])
+
+        pipeline = PagePipeline(echo_fetch, echo_parse, write=write, write_batch_size=2)
+        seen = []
+        for result in pipeline.run((str(i), {}) for i in range(5)):
+            assert any(result.url in batch for batch in written)
+            seen.append(result.url)
+
+        assert sorted(len(batch) for batch in written) == [1, 2, 2]
+        assert sorted(seen) == [str(i) for i in range(5)]
+
+    def test_write_error_stops_pipeline(self):
+        """Test a failing write is re-raised to the consumer"""
+        def write(batch):
+            raise RuntimeError("disk full")
+
+        pipeline = PagePipeline(echo_fetch, echo_parse, write=write)
+
+        with pytest.raises(RuntimeError, match="disk full"):
+            list(pipeline.run((str(i), {}) for i in range(10)))
+
+    def test_backpressure_bounds_fetching(self):
+        """Test a consumer that stops early leaves most pages unfetched"""
+        fetched = []
+
+        async def fetch(url, context):
+            fetched.append(url)
+            return url
+
+        pipeline = PagePipeline(fetch, echo_parse, concurrency=1, parse_workers=1,
+                                queue_size=1, write_batch_size=1)
+        results = pipeline.run((str(i), {}) for i in range(500))
+        next(results)
+        results.close()
+
+        assert len(fetched) < 20
+
+
+class TestScraperPipeline:
+    """Test suite for BaseScraper.run_pipeline against a local server"""
+
+    def test_fetch_and_parse_overlap(self, temp_db, temp_cache_dir, local_http_server):
+        """Test network waits and parsing run at the same time"""
+        local_http_server.delay = 0.1
+        for i in range(8):
+            local_http_server.routes[f'/product/{i}'] = (200, {}, f'Product {i}')
+        scraper = PipelineScraper("TestSupplier", local_http_server.base_url, db_path=temp_db,
+                                  cache_dir=str(temp_cache_dir), rate_limit_delay=0.0,
+                                  max_concurrency=1, parse_workers=1)
+        scraper.parse_seconds = 0.1
+        scraper.start_session()
+
+        pages = [(f"{local_http_server.base_url}/product/{i}", {}) for i in range(8)]
+        start_time = time.time()
+        products = [result.product for result in scraper.run_pipeline(pages)]
+        elapsed = time.time() - start_time
+        result = scraper.end_session()
+
+        assert sorted(p.item_name for p in products) == [f'Product {i}' for i in range(8)]
+        # Serially this is 8 * (0.1 fetch + 0.1 parse) = 1.6s
+        assert elapsed < 1.3
+        stats = result.pipeline_stats
+        assert stats.fetch.items == 8 and stats.parse.items == 8
+        assert stats.parse.busy_seconds >= 0.8
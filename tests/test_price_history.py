@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit tests for pricing validity intervals and as-of queries (price_history.py, migration 009)
+"""
+
+import pytest
+import sqlite3
+from datetime import date
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.db_helpers import add_item, add_price
+from scripts.price_history import cost_rollup_as_of, price_as_of, price_history, prices_as_of
+
+
+def intervals(conn, cost_item_id):
+    return conn.execute("""
+        SELECT unit_cost, valid_from, valid_to FROM cost_pricing
+        WHERE cost_item_id = ? ORDER BY effective_date, id
+    """, (cost_item_id,)).fetchall()
+
+
+class TestValidityIntervals:
+    """Test suite for keeping valid_to in step with pricing history"""
+
+    @pytest.fixture
+    def conn(self, temp_db):
+        conn = sqlite3.connect(temp_db)
+        yield conn
+        conn.close()
+
+    def test_inserts(self, conn):
+        """Test appended, backdated and same-day prices split the intervals"""
+        item = add_item(conn, 'ITEM_A')
+        add_price(conn, item, 10, '2025-01-01')
+        add_price(conn, item, 12, '2025-03-01')
+        assert intervals(conn, item) == [(10, '2025-01-01', '2025-03-01'), (12, '2025-03-01', None)]
+
+        add_price(conn, item, 11, '2025-02-01')
+        add_price(conn, item, 13, '2025-03-01')
+        assert intervals(conn, item) == [
+            (10, '2025-01-01', '2025-02-01'),
+            (11, '2025-02-01', '2025-03-01'),
+            (12, '2025-03-01', '2025-03-01'),
+            (13, '2025-03-01', None),
+        ]
+
+    def test_deletes_and_moves(self, conn):
+        """Test deleted and re-dated prices hand their intervals on"""
+        item = add_item(conn, 'ITEM_B')
+        other = add_item(conn, 'ITEM_C')
+        add_price(conn, item, 10, '2025-01-01')
+        middle = add_price(conn, item, 11, '2025-02-01')
+        last = add_price(conn, item, 12, '2025-03-01')
+
+        conn.execute("DELETE FROM cost_pricing WHERE id = ?", (middle,))
+        assert intervals(conn, item) == [(10, '2025-01-01', '2025-03-01'), (12, '2025-03-01', None)]
+
+        conn.execute("UPDATE cost_pricing SET effective_date = '2024-12-01' WHERE id = ?", (last,))
+        assert intervals(conn, item) == [(12, '2024-12-01', '2025-01-01'), (10, '2025-01-01', None)]
+
+        conn.execute("UPDATE cost_pricing SET cost_item_id = ? WHERE id = ?", (other, last))
+        assert intervals(conn, item) == [(10, '2025-01-01', None)]
+        assert intervals(conn, other) == [(12, '2024-12-01', None)]
+
+        conn.execute("DELETE FROM cost_pricing WHERE cost_item_id = ?", (item,))
+        assert intervals(conn, item) == []
+
+    def test_valid_to_writes_keep_current_pricing(self, conn):
+        """Test current_pricing still follows the latest price"""
+        item = add_item(conn, 'ITEM_D')
+        add_price(conn, item, 10, '2025-01-01')
+        add_price(conn, item, 9, '2024-01-01')
+        assert conn.execute("SELECT unit_cost FROM current_pricing WHERE cost_item_id = ?",
+                            (item,)).fetchone() == (10,)
+
+
+class TestPriceQueries:
+    """Test suite for as-of, history and rollup queries"""
+
+    @pytest.fixture
+    def history(self, temp_db):
+        with sqlite3.connect(temp_db) as conn:
+            bench = add_item(conn, 'BENCH', 'benching')
+            add_price(conn, bench, 20, '2024-06-01')
+            add_price(conn, bench, 25, '2025-01-01')
+            add_price(conn, bench, 26, '2025-01-01')
+            add_price(conn, bench, 30, '2025-06-01', total_cost=300)
+            light = add_item(conn, 'LIGHT', 'lighting')
+            add_price(conn, light, 500, '2025-03-01', total_cost=5000)
+            old = add_item(conn, 'OLD_LIGHT', 'lighting')
+            add_price(conn, old, 400, '2024-01-01')
+            conn.execute("UPDATE cost_items SET status = 'deprecated' WHERE id = ?", (old,))
+        conn.close()
+        return temp_db
+
+    def test_price_as_of(self, history):
+        """Test the price in effect is found on and between price dates"""
+        assert price_as_of('BENCH', '2024-05-31', history) is None
+        assert price_as_of('BENCH', '2024-06-01', history).unit_cost == 20
+        assert price_as_of('BENCH', date(2024, 12, 31), history).unit_cost == 20
+        assert price_as_of('BENCH', '2025-01-01', history).unit_cost == 26
+
+        latest = price_as_of('BENCH', '2030-01-01', history)
+        assert (latest.unit_cost, latest.valid_from, latest.valid_to) == (30, '2025-06-01', None)
+        assert price_as_of('MISSING', '2025-01-01', history) is None
+
+    def test_price_history(self, history):
+        """Test a period includes the price already in effect when it starts"""
+        assert [p.unit_cost for p in price_history('BENCH', db_path=history)] == [20, 26, 30]
+        assert [p.unit_cost for p in price_history('BENCH', '2024-09-01', '2025-05-31', history)] == [20, 26]
+        assert [p.unit_cost for p in price_history('BENCH', start='2025-06-01', db_path=history)] == [30]
+        assert price_history('BENCH', end='2024-01-01', db_path=history) == []
+
+    def test_prices_as_of_and_rollup(self, history):
+        """Test every active item's as-of price and the category totals"""
+        assert [(p.item_id, p.unit_cost) for p in prices_as_of('2025-02-01', db_path=history)] == [('BENCH', 26)]
+        assert [(p.item_id, p.unit_cost) for p in prices_as_of('2025-04-01', db_path=history)] == \
+            [('BENCH', 26), ('LIGHT', 500)]
+        assert [p.item_id for p in prices_as_of('2025-04-01', category='lighting', include_inactive=True,
+                                                 db_path=history)] == ['LIGHT', 'OLD_LIGHT']
+
+        rollup = cost_rollup_as_of('2025-07-01', history)
+        assert [(r.category, r.item_count, r.avg_unit_cost, r.total_category_cost) for r in rollup] == [
+            ('Benching & Racking Systems', 1, 30.0, 300.0),
+            ('Supplemental Lighting', 1, 500.0, 5000.0),
+        ]
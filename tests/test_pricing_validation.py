@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Unit tests for deferred pricing validation (pricing_validation.py, migration 010)
+"""
+
+import pytest
+import re
+import sqlite3
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.validation.pricing_validation import (
+    defer_validation, deferred_validation, is_deferred, run_deferred_validation
+)
+
+# (unit_cost, confidence_level) pairs covering every pass/fail branch
+PRICES = [
+    (100.0, 'HIGH'),
+    (0.001, 'MEDIUM'),
+    (2000000, 'LOW'),
+    (50, 'UNVERIFIED'),
+    (75, 'VERIFIED'),
+]
+
+RESULTS = """
+    SELECT cost_pricing_id, validation_rule_id, passed, failure_reason
+    FROM validation_results ORDER BY cost_pricing_id, validation_rule_id
+"""
+
+
+def legacy_trigger() -> str:
+    schema = (project_root / 'config' / 'database_schema.sql').read_text()
+    return re.search(r'CREATE TRIGGER tr_validate_pricing.*?\nEND;', schema, re.S).group(0)
+
+
+def add_prices(conn, prices=PRICES):
+    item = conn.execute("""
+        INSERT INTO cost_items (item_id, item_name, category_id)
+        SELECT 'ITEM', 'Item', id FROM cost_categories LIMIT 1
+        RETURNING id
+    """).fetchone()[0]
+    conn.executemany("""
+        INSERT INTO cost_pricing (cost_item_id, unit_cost, unit, effective_date, confidence_level)
+        VALUES (?, ?, 'each', '2025-01-01', ?)
+    """, [(item, unit_cost, confidence) for unit_cost, confidence in prices])
+
+
+class TestDeferredValidation:
+    """Test suite for validating pricing rows at the end of a transaction"""
+
+    @pytest.fixture
+    def conn(self, temp_db):
+        conn = sqlite3.connect(temp_db)
+        # An inactive rule and a rule type the checks do not know about
+        conn.execute("UPDATE validation_rules SET is_active = FALSE WHERE rule_type = 'freshness'")
+        conn.execute("INSERT INTO validation_rules (rule_name, rule_type) VALUES ('custom', 'custom_check')")
+        conn.commit()
+        yield conn
+        conn.close()
+
+    def test_matches_row_by_row_trigger(self, conn, tmp_path):
+        """Test the deferred pass writes exactly what the original trigger did"""
+        legacy = sqlite3.connect(tmp_path / 'legacy.db')
+        conn.backup(legacy)
+        legacy.execute("DROP TRIGGER tr_validate_pricing")
+        legacy.execute(legacy_trigger())
+        add_prices(legacy)
+        expected = legacy.execute(RESULTS).fetchall()
+        legacy.close()
+
+        conn.execute("BEGIN")
+        with deferred_validation(conn):
+            add_prices(conn)
+            assert conn.execute("SELECT COUNT(*) FROM validation_results").fetchone()[0] == 0
+        conn.commit()
+
+        assert conn.execute(RESULTS).fetchall() == expected
+        assert len(expected) == len(PRICES) * 4
+        assert not is_deferred(conn)
+
+    def test_only_deferring_connection_skips_trigger(self, conn, temp_db):
+        """Test other connections keep validating row by row"""
+        other = sqlite3.connect(temp_db)
+        conn.execute("BEGIN")
+        assert defer_validation(conn) == 0
+        assert defer_validation(conn) is None
+        add_prices(conn, PRICES[:1])
+        assert other.execute("SELECT COUNT(*) FROM validation_deferred").fetchone()[0] == 0
+        assert run_deferred_validation(conn) == 4
+        assert run_deferred_validation(conn) == 0
+        conn.commit()
+
+        other.execute("""
+            INSERT INTO cost_pricing (cost_item_id, unit_cost, unit, effective_date, confidence_level)
+            SELECT id, 10, 'each', '2025-02-01', 'HIGH' FROM cost_items
+        """)
+        other.commit()
+        assert other.execute("SELECT COUNT(*) FROM validation_results").fetchone()[0] == 8
+        other.close()
+
+    def test_nesting_and_errors(self, conn):
+        """Test nested blocks, rollback and connections with no transaction open"""
+        conn.execute("BEGIN")
+        with deferred_validation(conn):
+            with deferred_validation(conn):
+                add_prices(conn, PRICES[:1])
+            assert conn.execute("SELECT COUNT(*) FROM validation_results").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM validation_results").fetchone()[0] == 4
+        conn.commit()
+
+        conn.execute("BEGIN")
+        with pytest.raises(sqlite3.IntegrityError):
+            with deferred_validation(conn):
+                conn.execute("INSERT INTO cost_pricing (cost_item_id, unit_cost, unit, effective_date) "
+                             "VALUES (NULL, 1, 'each', '2025-01-01')")
+        assert not is_deferred(conn)
+        conn.rollback()
+
+        # The implicit BEGIN would only come with the first insert
+        with pytest.raises(ValueError):
+            defer_validation(conn)
+        conn.isolation_level = None
+        with pytest.raises(ValueError):
+            defer_validation(conn)
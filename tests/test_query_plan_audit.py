@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the query plan audit (query_plan_audit.py)
+"""
+
+import pytest
+import json
+import sqlite3
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.query_plan_audit import (
+    BASELINE_PATH, Statement, audit_statements, baseline_data, build_synthetic_database,
+    collect_statements, compare_baseline, run_audit, suggest_indexes
+)
+
+
+@pytest.fixture
+def synthetic_db(tmp_path):
+    conn = sqlite3.connect(build_synthetic_database(str(tmp_path / 'audit.db'), scale=50))
+    yield conn
+    conn.close()
+
+
+class TestCollectStatements:
+    """Test suite for finding SQL in Python sources"""
+
+    def test_string_literals(self, tmp_path):
+        """Test queries and f-string queries are collected, docstrings and prose are not"""
+        source = tmp_path / 'module.py'
+        source.write_text('''
+def save(conn, table, ids):
+    """Insert rows and select them back"""
+    conn.execute("SELECT id FROM cost_items WHERE item_id = ?", ("A",))
+    conn.execute(f"DELETE FROM cost_pricing WHERE id IN ({','.join('?' * len(ids))})", ids)
+    print("Selected items are saved")
+''')
+        statements = collect_statements([source], root=tmp_path)
+
+        assert [s.sql for s in statements] == [
+            "SELECT id FROM cost_items WHERE item_id = ?",
+            "DELETE FROM cost_pricing WHERE id IN (?)"
+        ]
+        assert statements[0].source == 'module.py:4'
+
+
+class TestPlanAudit:
+    """Test suite for flagging scans and suggesting indexes"""
+
+    def test_scans_are_flagged_and_indexed(self, synthetic_db):
+        """Test a filtered scan gets a verified index and an unindexable one gets none"""
+        audits = audit_statements(synthetic_db, [
+            Statement("SELECT url FROM page_extractions WHERE content_hash = ?", 'a.py:1'),
+            Statement("SELECT id FROM cost_items WHERE item_name LIKE '%kit%'", 'a.py:2'),
+            Statement("SELECT id FROM cost_items WHERE item_id = ?", 'a.py:3'),
+            Statement("SELECT nope FROM missing_table", 'a.py:4'),
+        ])
+
+        assert audits[0].issues == ['SCAN page_extractions']
+        assert audits[1].issues == ['SCAN cost_items USING COVERING INDEX idx_cost_items_item_name']
+        assert audits[2].issues == []
+        assert 'no such table' in audits[3].error
+
+        suggestions = suggest_indexes(synthetic_db, audits)
+        assert [(s.table, s.columns, s.statements) for s in suggestions] == [
+            ('page_extractions', ('content_hash',), ['a.py:1'])
+        ]
+
+    def test_baseline_regressions(self, synthetic_db):
+        """Test a statement losing its index, or a new scanning statement, is a regression"""
+        synthetic_db.execute("CREATE INDEX idx_page_extractions_hash ON page_extractions(content_hash)")
+        statements = [Statement("SELECT url FROM page_extractions WHERE content_hash = ?", 'a.py:1')]
+        baseline = baseline_data(audit_statements(synthetic_db, statements), scale=50)
+        assert compare_baseline(audit_statements(synthetic_db, statements), baseline) == []
+
+        synthetic_db.execute("DROP INDEX idx_page_extractions_hash")
+        statements.append(Statement("SELECT url FROM sitemap_urls WHERE lastmod > ?", 'b.py:1'))
+        regressions = compare_baseline(audit_statements(synthetic_db, statements), baseline)
+
+        assert regressions == ['a.py:1: SCAN page_extractions',
+                               'b.py:1: new statement with SCAN sitemap_urls']
+
+    def test_project_matches_baseline(self):
+        """Test no project query plan regressed against the committed baseline"""
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+        if baseline['sqlite_version'] != sqlite3.sqlite_version:
+            pytest.skip(f"baseline recorded with SQLite {baseline['sqlite_version']}")
+
+        audits, _ = run_audit(baseline['scale'])
+        assert compare_baseline(audits, baseline) == []
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Unit tests for offline cache replay (replay.py)
+"""
+
+import pytest
+import sqlite3
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.scrapers.base_scraper import ScrapedProduct
+from scripts.scrapers.replay import (
+    DIFF_NEW, DIFF_CHANGED, DIFF_UNCHANGED, diff_products, load_page_contexts
+)
+
+
+class TestReplayCache:
+    """Test suite for re-extracting products from a crawled cache"""
+
+    @pytest.fixture
+    def crawled(self, farmtek_site, make_farmtek_scraper, temp_cache_dir):
+        """A FarmTek session crawled into temp_db, plus one cached page never saved"""
+        scraper = make_farmtek_scraper(temp_cache_dir)
+        scraper.run_scraping_session()
+        scraper.make_request(f"{farmtek_site.base_url}/product/6")
+        farmtek_site.requests.clear()
+        return scraper
+
+    def test_replay_diffs_without_network(self, crawled, farmtek_site, temp_db):
+        """Test replay parses every cached page in a pool and diffs against the database"""
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("""
+                UPDATE cost_pricing SET unit_cost = 1.0 WHERE cost_item_id =
+                (SELECT id FROM cost_items WHERE item_id = 'FARMTEK_BENCH-1')
+            """)
+
+        result = crawled.replay_cache(workers=2, batch_size=2)
+
+        assert farmtek_site.requests == []
+        assert result.pages == 8
+        assert result.errors == []
+        statuses = {diff.item_id: diff.status for diff in result.diffs}
+        assert statuses == {
+            **{f'FARMTEK_BENCH-{i}': DIFF_UNCHANGED for i in (0, 2, 3, 4, 5)},
+            'FARMTEK_BENCH-1': DIFF_CHANGED,
+            'FARMTEK_BENCH-6': DIFF_NEW
+        }
+        changed = next(diff for diff in result.diffs if diff.status == DIFF_CHANGED)
+        assert changed.changes == {'unit_cost': (1.0, 101.0)}
+
+    def test_replay_apply(self, crawled, temp_db):
+        """Test applying a replay saves only new and changed products"""
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("UPDATE cost_items SET item_name = 'Old Name' WHERE item_id = 'FARMTEK_BENCH-0'")
+
+        result = crawled.replay_cache(workers=1, apply=True)
+
+        assert result.products_saved == 2
+        assert crawled.replay_cache(workers=1).count(DIFF_UNCHANGED) == 7
+        with sqlite3.connect(temp_db) as conn:
+            name = conn.execute(
+                "SELECT item_name FROM cost_items WHERE item_id = 'FARMTEK_BENCH-0'"
+            ).fetchone()[0]
+        assert name == 'Bench 0'
+
+    def test_category_context_from_frontier(self, crawled, farmtek_site, temp_db):
+        """Test the crawl context recorded for product URLs is available to replay"""
+        contexts = load_page_contexts(temp_db, 'FarmTek')
+
+        url = f"{farmtek_site.base_url}/product/0"
+        assert contexts[url] == {'category_path': '/greenhouse-benching/'}
+
+
+class TestDiffProducts:
+    """Test suite for stored vs replayed comparison"""
+
+    def test_price_rounding_is_not_a_change(self):
+        """Test prices equal to the cent compare as unchanged"""
+        product = ScrapedProduct(item_id='A', item_name='A', category='infrastructure',
+                                 unit_cost=10.004, unit='each')
+        stored = {'A': {'item_name': 'A', 'category': 'infrastructure', 'specifications': None,
+                        'unit_cost': 10.0, 'unit': 'each', 'currency': 'USD'}}
+
+        assert diff_products([product], stored)[0].status == DIFF_UNCHANGED
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Unit tests for log retention (retention.py, migration 011)
+"""
+
+import pytest
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.retention import (
+    RetentionPolicy, apply_diff, collection_log_payloads, load_policy, payload_diff,
+    read_archive, run_retention
+)
+
+NOW = datetime(2025, 12, 31)
+
+PAYLOADS = [
+    {'item_id': 'LAMP', 'unit_cost': 100.0, 'specifications': {'power': '600W'}, 'notes': None},
+    {'item_id': 'LAMP', 'unit_cost': 110.0, 'specifications': {'power': '600W'}, 'notes': None},
+    {'item_id': 'LAMP', 'unit_cost': 110.0, 'specifications': {'power': '650W'}},
+    {'item_id': 'LAMP', 'unit_cost': 120.0, 'specifications': {'power': '650W'}, 'notes': 'sale'},
+]
+CREATED = ['2024-06-01 00:00:00', '2025-03-01 00:00:00', '2025-06-01 00:00:00', '2025-12-30 00:00:00']
+
+
+def add_log(conn):
+    item = conn.execute("""
+        INSERT INTO cost_items (item_id, item_name, category_id)
+        SELECT 'LAMP', 'Lamp', id FROM cost_categories LIMIT 1
+        RETURNING id
+    """).fetchone()[0]
+    conn.executemany("""
+        INSERT INTO collection_log (cost_item_id, action_type, new_values, created_at)
+        VALUES (?, 'updated', ?, ?)
+    """, [(item, json.dumps(payload), created) for payload, created in zip(PAYLOADS, CREATED)])
+    conn.commit()
+    return item
+
+
+def formats(conn):
+    return [row[0] for row in conn.execute("SELECT payload_format FROM collection_log ORDER BY id")]
+
+
+class TestCollectionLogRetention:
+    """Test suite for diffing and archiving collection_log payloads"""
+
+    @pytest.fixture
+    def conn(self, temp_db):
+        conn = sqlite3.connect(temp_db)
+        yield conn
+        conn.close()
+
+    def test_diffs(self):
+        """Test diffs rebuild the payload, including removed keys"""
+        diff = payload_diff(PAYLOADS[1], PAYLOADS[2])
+        assert diff == {'set': {'specifications': {'power': '650W'}}, 'unset': ['notes']}
+        assert apply_diff(PAYLOADS[1], diff) == PAYLOADS[2]
+
+    def test_old_payloads_become_diffs(self, conn, temp_db):
+        """Test payloads past the full-payload age are diffs and read back whole"""
+        item = add_log(conn)
+        policy = RetentionPolicy(collection_log_full_days=30, collection_log_archive_days=None)
+
+        report = run_retention(temp_db, policy, vacuum=False, now=NOW)
+        assert (report.compacted, report.archived) == (2, {})
+        assert report.compacted_bytes > 0
+        assert formats(conn) == ['full', 'diff', 'diff', 'full']
+        assert [json.loads(entry['new_values']) for entry in collection_log_payloads(item, temp_db)] == PAYLOADS
+
+        assert run_retention(temp_db, policy, vacuum=False, now=NOW).compacted == 0
+
+    def test_archive_rebases_first_kept_row(self, conn, temp_db):
+        """Test archived rows keep full payloads and the next row becomes full again"""
+        item = add_log(conn)
+        run_retention(temp_db, RetentionPolicy(collection_log_archive_days=None), vacuum=False, now=NOW)
+
+        policy = RetentionPolicy(collection_log_full_days=30, collection_log_archive_days=250)
+        report = run_retention(temp_db, policy, vacuum=False, now=NOW)
+        assert report.archived == {'collection_log': 2}
+        assert report.archive_bytes < report.archive_raw_bytes
+        assert formats(conn) == ['full', 'full']
+        assert [json.loads(entry['new_values']) for entry in collection_log_payloads(item, temp_db)] == PAYLOADS[2:]
+
+        archived = list(read_archive('collection_log', temp_db))
+        assert [json.loads(row['new_values']) for row in archived] == PAYLOADS[:2]
+        assert [row['created_at'] for row in archived] == CREATED[:2]
+
+
+class TestValidationResultsRetention:
+    """Test suite for archiving validation_results and reclaiming space"""
+
+    @pytest.fixture
+    def prices(self, temp_db):
+        with sqlite3.connect(temp_db) as conn:
+            item = conn.execute("""
+                INSERT INTO cost_items (item_id, item_name, category_id)
+                SELECT 'PUMP', 'Pump', id FROM cost_categories LIMIT 1
+                RETURNING id
+            """).fetchone()[0]
+            conn.executemany("""
+                INSERT INTO cost_pricing (cost_item_id, unit_cost, unit, effective_date, confidence_level)
+                VALUES (?, ?, 'each', ?, 'LOW')
+            """, [(item, 50, '2025-01-01'), (item, 55, '2025-02-01')])
+            conn.execute("UPDATE validation_results SET validated_at = '2025-02-01 00:00:00'")
+        conn.close()
+        return temp_db
+
+    def counts(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute("""
+                SELECT cost_pricing_id, SUM(passed), SUM(NOT passed) FROM validation_results
+                GROUP BY cost_pricing_id ORDER BY cost_pricing_id
+            """).fetchall()
+        conn.close()
+        return rows
+
+    def test_archives_superseded_passes(self, prices):
+        """Test only old passing results of superseded prices are archived by default"""
+        assert self.counts(prices) == [(1, 3, 1), (2, 3, 1)]
+
+        dry = run_retention(prices, RetentionPolicy(), dry_run=True, now=NOW)
+        assert dry.archived == {'validation_results': 3}
+        assert self.counts(prices) == [(1, 3, 1), (2, 3, 1)]
+
+        report = run_retention(prices, RetentionPolicy(), now=NOW)
+        assert report.archived == {'validation_results': 3}
+        assert self.counts(prices) == [(1, 0, 1), (2, 3, 1)]
+
+        policy = RetentionPolicy(keep_failed_validations=False, archive_batch_size=1)
+        assert run_retention(prices, policy, now=NOW).archived == {'validation_results': 1}
+        assert self.counts(prices) == [(2, 3, 1)]
+        assert len(list(read_archive('validation_results', prices))) == 4
+
+    def test_vacuum_reclaims_space(self, prices):
+        """Test freed pages leave the file and the report measures them"""
+        with sqlite3.connect(prices) as conn:
+            conn.executemany("""
+                INSERT INTO collection_log (cost_item_id, action_type, new_values, created_at)
+                VALUES (1, 'updated', ?, '2020-01-01 00:00:00')
+            """, [(json.dumps({'blob': 'x' * 2000, 'n': n}),) for n in range(500)])
+            assert conn.execute("PRAGMA auto_vacuum").fetchone() == (2,)
+        conn.close()
+
+        report = run_retention(prices, RetentionPolicy(), now=NOW)
+        assert report.archived['collection_log'] == 500
+        assert report.vacuumed
+        assert report.bytes_reclaimed > 500 * 2000 * 0.9
+        assert report.bytes_after == Path(prices).stat().st_size
+
+    def test_load_policy(self, tmp_path):
+        """Test config values override the defaults and null disables a step"""
+        config = tmp_path / 'retention.json'
+        config.write_text(json.dumps({
+            'collection_log': {'archive_after_days': None},
+            'validation_results': {'keep_failures': False}
+        }))
+        policy = load_policy(str(config))
+        assert policy.collection_log_full_days == 30
+        assert policy.collection_log_archive_days is None
+        assert policy.keep_failed_validations is False
+        assert load_policy(str(tmp_path / 'missing.json')) == RetentionPolicy()
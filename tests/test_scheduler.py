@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the re-scrape scheduler (scheduler.py)
+"""
+
+import pytest
+import sqlite3
+from datetime import date
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tests.db_helpers import add_price
+from scripts.scrapers.base_scraper import ScrapedProduct
+from scripts.scrapers.bulk_writer import BulkProductWriter
+from scripts.scrapers.farmtek_scraper import FarmTekScraper
+from scripts.scrapers.scheduler import (
+    REASON_NEVER_PRICED, REASON_OVERDUE, REASON_STALE, REASON_VOLATILE, RescrapeScheduler
+)
+
+AS_OF = date(2025, 6, 1)
+
+
+def save_item(db_path, item_id, category='infrastructure', price=100.0, supplier='FarmTek',
+              priced_on='2025-05-01', history=(), source_url=None):
+    """Save one item, then backdate its pricing; history adds earlier (date, price) rows"""
+    product = ScrapedProduct(
+        item_id=item_id, item_name=item_id.title(), category=category, unit_cost=price, unit='each',
+        source_url=source_url if source_url is not None else f"https://example.com/product/{item_id}"
+    )
+    BulkProductWriter(db_path, supplier).write([product])
+    with sqlite3.connect(db_path) as conn:
+        cost_item_id = conn.execute("SELECT id FROM cost_items WHERE item_id = ?", (item_id,)).fetchone()[0]
+        conn.execute("UPDATE cost_pricing SET effective_date = ? WHERE cost_item_id = ?",
+                     (priced_on, cost_item_id))
+        conn.execute("UPDATE item_fingerprints SET last_seen_at = ? WHERE cost_item_id = ?",
+                     (priced_on, cost_item_id))
+        for old_date, old_price in history:
+            add_price(conn, cost_item_id, old_price, old_date)
+
+
+class TestScoring:
+    """Test suite for staleness scoring"""
+
+    def test_category_policies(self, temp_db):
+        """Test category codes resolve to their class, a parent's class, or the default"""
+        scheduler = RescrapeScheduler(temp_db)
+
+        assert scheduler.policy_for('growing_supplies').name == 'commodity_prices'
+        assert scheduler.policy_for('benching', 'infrastructure').name == 'equipment_pricing'
+        default = scheduler.policy_for('insurance', 'regulatory_compliance')
+        assert (default.name, default.max_age_days, default.preferred_age_days) == ('default', 365, 90)
+
+    def test_freshness_class_shortens_windows(self, temp_db):
+        """Test a commodity item goes overdue long before equipment of the same age"""
+        save_item(temp_db, 'SUPPLY', category='growing_supplies', priced_on='2025-04-01')
+        save_item(temp_db, 'BENCH', category='infrastructure', priced_on='2025-04-01')
+
+        ranked = {item.item_id: item for item in RescrapeScheduler(temp_db).rank(as_of=AS_OF)}
+
+        assert ranked['SUPPLY'].age_days == ranked['BENCH'].age_days == 61
+        assert ranked['SUPPLY'].reasons == [REASON_OVERDUE]
+        assert ranked['BENCH'].reasons == [REASON_STALE]
+        assert ranked['SUPPLY'].priority > ranked['BENCH'].priority
+
+    def test_volatile_items_rank_first(self, temp_db):
+        """Test an item whose price keeps moving outranks a steady one of the same age"""
+        save_item(temp_db, 'STEADY', priced_on='2025-05-01',
+                  history=[('2025-01-01', 100.0), ('2025-03-01', 100.0)])
+        save_item(temp_db, 'MOVING', priced_on='2025-05-01',
+                  history=[('2025-01-01', 80.0), ('2025-03-01', 90.0)])
+
+        ranked = RescrapeScheduler(temp_db).rank(as_of=AS_OF)
+
+        assert [item.item_id for item in ranked] == ['MOVING', 'STEADY']
+        assert ranked[1].volatility == 0.0
+        # 12.5% + 11.1% over 120 days
+        assert ranked[0].volatility == pytest.approx((10 / 80 + 10 / 90) * 30 / 120)
+        assert REASON_VOLATILE in ranked[0].reasons
+
+    def test_unchanged_observation_counts_as_fresh(self, temp_db):
+        """Test an item seen recently at the same price is not due"""
+        save_item(temp_db, 'SEEN', priced_on='2025-01-01')
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("UPDATE item_fingerprints SET last_seen_at = '2025-06-01 08:00:00'")
+
+        assert RescrapeScheduler(temp_db).rank(as_of=AS_OF) == []
+
+    def test_never_priced_first(self, temp_db):
+        """Test items without any pricing outrank everything"""
+        save_item(temp_db, 'OLD', priced_on='2020-01-01')
+        BulkProductWriter(temp_db, 'FarmTek').write([
+            ScrapedProduct(item_id='UNPRICED', item_name='Unpriced', category='infrastructure')
+        ])
+
+        ranked = RescrapeScheduler(temp_db).rank(as_of=AS_OF)
+
+        assert [item.item_id for item in ranked] == ['UNPRICED', 'OLD']
+        assert ranked[0].reasons == [REASON_NEVER_PRICED] and ranked[0].age_days is None
+
+
+class TestFetchPlan:
+    """Test suite for budgeted fetch plans"""
+
+    def test_budget_and_counts(self, temp_db):
+        """Test the plan keeps the top items within budget and counts the rest"""
+        for i, priced_on in enumerate(['2025-01-01', '2025-02-01', '2025-03-01', '2025-04-01']):
+            save_item(temp_db, f'ITEM_{i}', priced_on=priced_on)
+        save_item(temp_db, 'NO_URL', priced_on='2024-01-01', source_url='')
+
+        plan = RescrapeScheduler(temp_db).plan(2, as_of=AS_OF)
+
+        assert [item.item_id for item in plan.planned] == ['ITEM_0', 'ITEM_1']
+        assert plan.urls() == ['https://example.com/product/ITEM_0', 'https://example.com/product/ITEM_1']
+        assert (plan.candidates, plan.deferred, plan.unfetchable) == (5, 2, 1)
+
+    def test_supplier_filter(self, temp_db):
+        """Test plans can be limited to one supplier's items"""
+        save_item(temp_db, 'FARMTEK_ITEM', supplier='FarmTek')
+        save_item(temp_db, 'OTHER_ITEM', supplier='Other Supplier', priced_on='2024-01-01')
+
+        plan = RescrapeScheduler(temp_db).plan(10, supplier='farmtek', as_of=AS_OF)
+
+        assert [item.item_id for item in plan.planned] == ['FARMTEK_ITEM']
+
+
+class TestFarmTekRefresh:
+    """Test FarmTek sessions seeded from the scheduler"""
+
+    def test_refresh_budget_refetches_stalest(self, local_http_server, temp_db, temp_cache_dir):
+        """Test a refresh session revalidates only the planned product pages"""
+        base = local_http_server.base_url
+        local_http_server.routes['/greenhouse-benching/'] = (200, {}, ''.join(
+            f'<a href="/product/{i}">Product {i}</a>' for i in range(3)
+        ))
+        for i in range(3):
+            local_http_server.routes[f'/product/{i}'] = (200, {}, (
+                f'<html><h1>Bench {i}</h1><span data-sku="BENCH-{i}"></span>'
+                f'<span class="price">${100 + i}.00</span></html>'
+            ))
+        scraper = FarmTekScraper(db_path=temp_db, cache_dir=str(temp_cache_dir))
+        scraper.base_url = base
+        scraper.target_urls = ['/greenhouse-benching/']
+        scraper.rate_limit_delay = 0.0
+        scraper.host_limiter.delay = 0.0
+        assert scraper.run_scraping_session(use_sitemap=False).products_count == 3
+
+        # Product 2 was last priced longest ago, product 0 next
+        with sqlite3.connect(temp_db) as conn:
+            for i, priced_on in enumerate(['2025-01-01', '2025-05-01', '2024-06-01']):
+                conn.execute("""
+                    UPDATE cost_pricing SET effective_date = ? WHERE cost_item_id =
+                        (SELECT id FROM cost_items WHERE item_id = ?)
+                """, (priced_on, f'FARMTEK_BENCH-{i}'))
+            conn.execute("UPDATE item_fingerprints SET last_seen_at = '2024-01-01'")
+        local_http_server.requests.clear()
+
+        scraper.start_session('FarmTek_refresh')
+        products = list(scraper.scrape_products(refresh_budget=2))
+        scraper.end_session()
+
+        assert sorted(path for path, _ in local_http_server.requests) == ['/product/0', '/product/2']
+        assert sorted(p.item_id for p in products) == ['FARMTEK_BENCH-0', 'FARMTEK_BENCH-2']
+        assert {p.notes for p in products} == {'Scraped from FarmTek category: /greenhouse-benching/'}
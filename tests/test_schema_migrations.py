@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Unit tests for schema migrations (schema_migrations.py)
+"""
+
+import pytest
+import sqlite3
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.schema_migrations import apply_migrations, applied_versions, available_migrations
+
+
+class TestSchemaMigrations:
+    """Test suite for applying numbered SQL migrations"""
+
+    def test_new_databases_are_fully_migrated(self, temp_db):
+        """Test DatabaseInitializer applies every migration"""
+        with sqlite3.connect(temp_db) as conn:
+            versions = applied_versions(conn)
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+        assert versions == [version for version, _, _ in available_migrations()]
+        assert 'crawl_frontier' in tables
+
+    def test_migrations_apply_once(self, tmp_path):
+        """Test pending migrations run in order and are not repeated"""
+        migrations_dir = tmp_path / 'migrations'
+        migrations_dir.mkdir()
+        (migrations_dir / '002_add_notes.sql').write_text("ALTER TABLE things ADD COLUMN notes TEXT;")
+        (migrations_dir / '001_create_things.sql').write_text("CREATE TABLE things (id INTEGER);")
+        (migrations_dir / 'README.txt').write_text("not a migration")
+        db_path = tmp_path / 'test.db'
+
+        assert apply_migrations(db_path, migrations_dir) == ['001_create_things', '002_add_notes']
+        assert apply_migrations(db_path, migrations_dir) == []
+
+        with sqlite3.connect(db_path) as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(things)")]
+        assert columns == ['id', 'notes']
+
+    def test_failed_migration_leaves_no_partial_changes(self, tmp_path):
+        """Test a failing migration is rolled back and stays pending"""
+        migrations_dir = tmp_path / 'migrations'
+        migrations_dir.mkdir()
+        (migrations_dir / '001_broken.sql').write_text(
+            "CREATE TABLE things (id INTEGER);\nINSERT INTO missing_table VALUES (1);"
+        )
+        db_path = tmp_path / 'test.db'
+
+        with pytest.raises(sqlite3.Error):
+            apply_migrations(db_path, migrations_dir)
+
+        with sqlite3.connect(db_path) as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+            assert applied_versions(conn) == []
+        assert 'things' not in tables